@@ -1,12 +1,17 @@
 from django.contrib import admin
-from .models import VerifyRecord, VerifyRule
+from .models import VerifyBatchJob, VerifyRecord, VerifyRule
 
 @admin.register(VerifyRecord)
 class VerifyRecordAdmin(admin.ModelAdmin):
-    list_display = ['document_type', 'verify_type', 'status', 'operator', 'created_at']
-    list_filter = ['verify_type', 'status']
+    list_display = ['document_type', 'verify_type', 'status', 'cache_hit', 'operator', 'created_at']
+    list_filter = ['verify_type', 'status', 'cache_hit']
 
 @admin.register(VerifyRule)
 class VerifyRuleAdmin(admin.ModelAdmin):
     list_display = ['name', 'rule_type', 'is_active']
     list_filter = ['rule_type', 'is_active']
+
+@admin.register(VerifyBatchJob)
+class VerifyBatchJobAdmin(admin.ModelAdmin):
+    list_display = ['document_type', 'verify_type', 'status', 'total', 'processed', 'failed_count', 'operator', 'created_at']
+    list_filter = ['document_type', 'status']
@@ -4,3 +4,6 @@ class AiVerifyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.ai_verify'
     verbose_name = 'AI文档校验'
+
+    def ready(self):
+        from . import signals  # noqa: F401  注册规则变更时清理校验缓存的信号
@@ -0,0 +1,105 @@
+"""
+批量校验的文档选择与内容构造
+
+- 原始记录：模板分类、名称、记录编号、试验日期，以及记录数据的“字段: 值”
+- 检测报告：标题、报告编号、报告内容（嵌套结构展开为“字段: 值”）和检测结论
+
+内容以分类开头，本地规则的 when 条件（如只对水泥记录生效）可以直接匹配。
+"""
+
+from typing import Dict, Iterable, List
+
+from apps.ocr.models import Report
+from apps.records.models import OriginalRecord
+
+# 单个批量任务最多校验的文档数
+BATCH_VERIFY_LIMIT = 500
+
+# 未指定状态时默认校验的文档：已提交待审核的原始记录、审核中的报告
+DEFAULT_STATUS = {
+    'original_record': 'submitted',
+    'report': 'reviewing',
+}
+
+
+def _format_value(value) -> str:
+    if isinstance(value, dict):
+        return ' '.join(f'{key}: {_format_value(item)}' for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_format_value(item) for item in value)
+    return '' if value is None else str(value)
+
+
+def record_content(record: OriginalRecord) -> str:
+    """原始记录的校验内容"""
+    template = record.template
+    parts = [
+        template.category, template.name,
+        f'记录编号: {record.record_code}',
+        f'试验日期: {record.test_date}',
+        _format_value(record.data),
+    ]
+    if record.remarks:
+        parts.append(f'备注: {record.remarks}')
+    return ' '.join(part for part in parts if part)
+
+
+def report_content(report: Report) -> str:
+    """检测报告的校验内容"""
+    parts = [report.title, f'报告编号: {report.report_code}', _format_value(report.content)]
+    if report.conclusion:
+        parts.append(f'检测结论: {report.conclusion}')
+    return ' '.join(part for part in parts if part)
+
+
+def document_queryset(document_type: str):
+    """文档类型对应的查询集"""
+    if document_type == 'original_record':
+        return OriginalRecord.objects.select_related('template')
+    if document_type == 'report':
+        return Report.objects.all()
+    raise ValueError(f'不支持的文档类型: {document_type}')
+
+
+def select_document_ids(document_type: str, ids: Iterable[int] = None, filters: Dict = None) -> List[int]:
+    """
+    确定批量任务要校验的文档
+
+    Args:
+        document_type: 文档类型 original_record / report
+        ids: 文档ID列表，指定时忽略筛选条件
+        filters: 筛选条件 status、date_from、date_to、template（仅原始记录）
+
+    Returns:
+        list: 文档ID，最多 BATCH_VERIFY_LIMIT + 1 个（用于判断是否超出上限）
+    """
+    queryset = document_queryset(document_type)
+    if ids:
+        queryset = queryset.filter(pk__in=list(ids))
+    else:
+        filters = filters or {}
+        queryset = queryset.filter(status=filters.get('status') or DEFAULT_STATUS[document_type])
+        # 原始记录按试验日期，报告按编制日期
+        date_field = 'test_date' if document_type == 'original_record' else 'created_at__date'
+        if filters.get('date_from'):
+            queryset = queryset.filter(**{f'{date_field}__gte': filters['date_from']})
+        if filters.get('date_to'):
+            queryset = queryset.filter(**{f'{date_field}__lte': filters['date_to']})
+        if filters.get('template') and document_type == 'original_record':
+            queryset = queryset.filter(template_id=filters['template'])
+    return list(queryset.order_by('pk').values_list('pk', flat=True)[:BATCH_VERIFY_LIMIT + 1])
+
+
+def build_contents(document_type: str, ids: List[int]) -> Dict[int, str]:
+    """
+    构造文档的校验内容
+
+    Args:
+        document_type: 文档类型
+        ids: 文档ID列表
+
+    Returns:
+        dict: {文档ID: 校验内容}，已删除的文档不在结果中
+    """
+    builder = record_content if document_type == 'original_record' else report_content
+    return {document.pk: builder(document) for document in document_queryset(document_type).filter(pk__in=ids)}
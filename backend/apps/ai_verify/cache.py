@@ -0,0 +1,89 @@
+"""
+AI校验结果缓存
+
+同一内容、同一校验类型、同一规则集和模型的校验结果是确定的，
+命中缓存时直接生成校验记录，不再调用大模型。
+
+缓存键 = hash(内容, 校验类型, 规则版本, 模型名)
+- 规则版本：VerifyRule 或 RecordTemplate 任一记录新增、修改、删除时递增（见 signals.py），旧结果随之失效
+- 有效期：AI_CONFIG['VERIFY_CACHE_TTL']（秒），为0时不缓存
+"""
+
+import hashlib
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+RULES_VERSION_KEY = 'ai_verify:rules_version'
+
+
+def _ttl() -> int:
+    return settings.AI_CONFIG.get('VERIFY_CACHE_TTL', 86400)
+
+
+def get_rules_version() -> int:
+    """
+    获取当前规则版本
+
+    版本号丢失（缓存被清理）时以当前时间重新初始化，保证不会与已缓存结果的旧版本号重复
+    """
+    version = cache.get(RULES_VERSION_KEY)
+    if version is None:
+        cache.add(RULES_VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(RULES_VERSION_KEY)
+    return version
+
+
+def bump_rules_version():
+    """规则变更后递增版本号，使已缓存的校验结果全部失效"""
+    try:
+        cache.incr(RULES_VERSION_KEY)
+    except ValueError:
+        # 版本号不存在时初始化即可，旧版本号不会再被使用
+        get_rules_version()
+
+
+def make_cache_key(content: str, verify_type: str, model_name: str) -> str:
+    """
+    生成校验结果缓存键
+
+    Args:
+        content: 校验内容
+        verify_type: 校验类型
+        model_name: 模型名称
+
+    Returns:
+        str: 缓存键
+    """
+    digest = hashlib.sha256()
+    for part in (content, verify_type, str(get_rules_version()), model_name or ''):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return f'ai_verify:result:{digest.hexdigest()}'
+
+
+def get_cached_result(key: str) -> Optional[dict]:
+    """
+    读取缓存的校验结果
+
+    Returns:
+        dict: 包含 issues、summary、model_used、record_id，未命中返回None
+    """
+    if not _ttl():
+        return None
+    return cache.get(key)
+
+
+def set_cached_result(key: str, record):
+    """缓存已完成的校验记录"""
+    ttl = _ttl()
+    if not ttl or record.status != 'completed':
+        return
+    cache.set(key, {
+        'issues': record.issues,
+        'summary': record.summary,
+        'model_used': record.model_used,
+        'record_id': record.pk,
+    }, ttl)
@@ -0,0 +1,183 @@
+"""
+长文档分段校验
+
+整篇文档放进一个提示词会超出模型上下文，且耗时随长度增长。这里把内容切分为相互重叠的片段：
+1. 按 AI_CONFIG['VERIFY_CHUNK_SIZE'] 切分，尽量在换行或句号处断开，相邻片段重叠 VERIFY_CHUNK_OVERLAP 个字符，
+   避免跨片段的问题被截断
+2. 线程池并行校验（AI_CONFIG['VERIFY_PARALLELISM']）
+3. 问题位置换算为原文偏移，重叠区域重复报告的问题去重后按位置排序
+
+每段的起止位置、耗时和问题数记录在 VerifyRecord.chunk_stats。
+"""
+
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+# 断句字符，优先在这些位置切分
+BREAK_CHARS = '\n。；;！？!?'
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """内容片段，start/end 为在原文中的偏移"""
+    index: int
+    start: int
+    end: int
+    text: str
+
+
+def split_content(content: str, size: int = None, overlap: int = None) -> List[Chunk]:
+    """
+    将内容切分为相互重叠的片段
+
+    Args:
+        content: 原文
+        size: 片段最大长度，默认 AI_CONFIG['VERIFY_CHUNK_SIZE']
+        overlap: 相邻片段重叠长度，默认 AI_CONFIG['VERIFY_CHUNK_OVERLAP']
+
+    Returns:
+        list: 片段列表，内容不超过 size 时只有一段
+    """
+    config = settings.AI_CONFIG
+    size = max(size or config.get('VERIFY_CHUNK_SIZE', 2000), 1)
+    overlap = min(overlap if overlap is not None else config.get('VERIFY_CHUNK_OVERLAP', 200), size // 2)
+
+    chunks = []
+    start = 0
+    while True:
+        end = min(start + size, len(content))
+        if end < len(content):
+            # 在片段末尾的重叠区内寻找断句位置，找不到则硬切
+            window_start = max(end - overlap, start + 1)
+            breaks = [content.rfind(char, window_start, end) for char in BREAK_CHARS]
+            best = max(breaks)
+            if best != -1:
+                end = best + 1
+        chunks.append(Chunk(len(chunks), start, end, content[start:end]))
+        if end >= len(content):
+            return chunks
+        start = max(end - overlap, start + 1)
+
+
+def _locate(issue: dict, chunk: Chunk, content: str) -> Optional[int]:
+    """
+    换算问题在原文中的位置
+
+    模型返回的 position 是片段内偏移，可能不准确：以 original 在片段中的实际位置为准
+    """
+    original = issue.get('original')
+    position = issue.get('position')
+    if isinstance(position, int) and 0 <= position < len(chunk.text):
+        offset = chunk.start + position
+        if not original or content.startswith(original, offset):
+            return offset
+    if original:
+        found = chunk.text.find(original)
+        if found != -1:
+            return chunk.start + found
+    return None
+
+
+def merge_issues(results: List[tuple], content: str) -> List[dict]:
+    """
+    合并各片段的问题
+
+    Args:
+        results: [(片段, 问题列表)]
+        content: 原文
+
+    Returns:
+        list: 位置换算为原文偏移、去重并排序后的问题列表
+    """
+    merged = {}
+    for chunk, issues in results:
+        for issue in issues:
+            if not isinstance(issue, dict):
+                continue
+            position = _locate(issue, chunk, content)
+            key = (issue.get('type'), position, issue.get('original'), issue.get('suggestion'))
+            if key not in merged:
+                merged[key] = {**issue, 'position': position}
+    return sorted(merged.values(), key=lambda item: (item['position'] is None, item['position'] or 0))
+
+
+def _verify_chunk(ai_service, chunk: Chunk):
+    start_time = time.time()
+    result = ai_service.verify_document(chunk.text)
+    return result or {'success': False, 'message': 'AI服务无响应'}, time.time() - start_time
+
+
+def chunk_stat(chunk: Chunk, process_time: float, result: dict) -> Dict:
+    """单个片段的校验统计"""
+    return {
+        'index': chunk.index,
+        'start': chunk.start,
+        'end': chunk.end,
+        'process_time': round(process_time, 3),
+        'success': bool(result.get('success')),
+        'issue_count': len(result.get('issues') or []),
+    }
+
+
+def summarize(chunks: List[Chunk], results: List[dict], issues: List[dict]) -> Dict:
+    """
+    汇总各片段的校验结果
+
+    Args:
+        chunks: 片段
+        results: 与片段一一对应的校验结果
+        issues: 合并后的问题
+
+    Returns:
+        dict: {'success', 'issues', 'summary'}，有片段失败时 success 为False，message 说明失败的片段
+    """
+    failed = [chunk.index + 1 for chunk, result in zip(chunks, results) if not result.get('success')]
+    if failed:
+        message = results[failed[0] - 1].get('message', '校验失败')
+        if len(chunks) > 1:
+            message = f"第{','.join(map(str, failed))}段校验失败: {message}"
+        return {'success': False, 'issues': issues, 'message': message}
+    if len(chunks) == 1:
+        return {'success': True, 'issues': issues, 'summary': results[0].get('summary', '')}
+    return {'success': True, 'issues': issues, 'summary': f'分{len(chunks)}段校验，发现{len(issues)}处问题'}
+
+
+def verify_content(ai_service, content: str) -> Dict:
+    """
+    分段并行校验
+
+    Args:
+        ai_service: AI服务
+        content: 待校验内容
+
+    Returns:
+        dict: {'success', 'issues', 'summary'/'message', 'chunk_stats'}
+    """
+    chunks = split_content(content)
+    workers = min(settings.AI_CONFIG.get('VERIFY_PARALLELISM', 2), len(chunks))
+
+    if workers <= 1:
+        outcomes = [_verify_chunk(ai_service, chunk) for chunk in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ai-verify') as executor:
+            # 复制上下文，使工作线程中的服务调用计入当前请求的耗时采集
+            futures = [
+                executor.submit(contextvars.copy_context().run, _verify_chunk, ai_service, chunk)
+                for chunk in chunks
+            ]
+            outcomes = [future.result() for future in futures]
+
+    results = [result for result, _ in outcomes]
+    issues = merge_issues(
+        [(chunk, result.get('issues') or []) for chunk, result in zip(chunks, results) if result.get('success')],
+        content,
+    )
+    return {
+        **summarize(chunks, results, issues),
+        'chunk_stats': [chunk_stat(chunk, process_time, result) for chunk, (result, process_time) in zip(chunks, outcomes)],
+    }
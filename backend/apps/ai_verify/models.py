@@ -70,6 +70,24 @@ class VerifyRecord(BaseModel):
         verbose_name='处理时间',
         help_text='秒'
     )
+    chunk_stats = models.JSONField(
+        default=list,
+        verbose_name='分段统计',
+        help_text='长文档分段校验时每段的起止位置、耗时和问题数'
+    )
+    cache_hit = models.BooleanField(
+        default=False,
+        verbose_name='命中缓存',
+        help_text='复用相同内容的校验结果，未调用大模型'
+    )
+    batch_job = models.ForeignKey(
+        'VerifyBatchJob',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='records',
+        verbose_name='批量校验任务'
+    )
     operator = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -83,6 +101,9 @@ class VerifyRecord(BaseModel):
         verbose_name = 'AI校验记录'
         verbose_name_plural = 'AI校验记录列表'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='idx_verify_record_cursor'),
+        ]
     
     def __str__(self):
         return f"{self.document_type} - {self.get_verify_type_display()}"
@@ -123,3 +144,107 @@ class VerifyRule(BaseModel):
     
     def __str__(self):
         return self.name
+
+
+class VerifyBatchJob(BaseModel):
+    """
+    批量校验任务模型
+    
+    按筛选条件或ID列表批量校验原始记录、检测报告，
+    每个文档生成一条 VerifyRecord（document_type/document_id 指向该文档）
+    """
+    
+    DOCUMENT_TYPE_CHOICES = [
+        ('original_record', '原始记录'),
+        ('report', '检测报告'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', '待执行'),
+        ('processing', '执行中'),
+        ('completed', '已完成'),
+        ('failed', '执行失败'),
+    ]
+    
+    document_type = models.CharField(
+        max_length=50,
+        choices=DOCUMENT_TYPE_CHOICES,
+        verbose_name='文档类型'
+    )
+    verify_type = models.CharField(
+        max_length=20,
+        choices=VerifyRecord.TYPE_CHOICES,
+        default='comprehensive',
+        verbose_name='校验类型'
+    )
+    filters = models.JSONField(
+        default=dict,
+        verbose_name='筛选条件',
+        help_text='status、date_from、date_to、template，按ID提交时为空'
+    )
+    document_ids = models.JSONField(
+        default=list,
+        verbose_name='文档ID列表',
+        help_text='创建任务时确定的待校验文档'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name='状态'
+    )
+    total = models.IntegerField(
+        default=0,
+        verbose_name='文档总数'
+    )
+    processed = models.IntegerField(
+        default=0,
+        verbose_name='已处理数',
+        help_text='含校验失败的文档'
+    )
+    failed_count = models.IntegerField(
+        default=0,
+        verbose_name='校验失败数'
+    )
+    issue_count = models.IntegerField(
+        default=0,
+        verbose_name='发现问题数'
+    )
+    started_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='开始时间'
+    )
+    finished_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='完成时间'
+    )
+    error_message = models.TextField(
+        blank=True,
+        default='',
+        verbose_name='错误信息'
+    )
+    operator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='verify_batch_jobs',
+        verbose_name='操作人'
+    )
+    
+    class Meta:
+        db_table = 'lims_verify_batch_job'
+        verbose_name = '批量校验任务'
+        verbose_name_plural = '批量校验任务列表'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.get_document_type_display()}批量校验 #{self.pk}"
+    
+    @property
+    def progress(self) -> float:
+        """完成百分比"""
+        if not self.total:
+            return 100.0 if self.status == 'completed' else 0.0
+        return round(self.processed * 100 / self.total, 1)
@@ -0,0 +1,337 @@
+"""
+本地规则引擎
+
+把启用的 VerifyRule 编译为本地检查，在调用大模型之前执行，毫秒级完成。
+
+支持的规则类型（rule_type / rule_content）：
+- range: 数值范围 {"field": "抗压强度", "min": 20, "max": 65, "unit": "MPa"}
+  查找“字段名: 数值[单位]”，超出范围或单位不一致时报告问题；
+  未设置 unit 时使用原始记录模板中同名字段的单位（启用的模板单位一致时）
+- required: 必填字段 {"fields": ["试验编号", "试验日期"]}，字段缺失或没有值时报告问题
+- regex: 正则 {"pattern": "...", "mode": "forbid"|"require", "message": "...", "suggestion": "..."}
+  forbid（默认）时每处匹配为一个问题，require 时没有匹配为一个问题
+- terminology: 术语 {"terms": {"砼": "混凝土"}}，出现不规范用语时给出规范用语
+
+所有规则都可以设置 "when": 正则，内容匹配时规则才生效（如只对水泥记录生效）；
+格式规则（regex/required）可以设置 "decisive": true，表示规则通过即可确认格式正确。
+
+规则能否替代大模型（decided）：
+- data: 发现了问题，或内容中的每个“字段: 数值”都有范围规则检查过
+- format: 发现了问题，或生效的规则中有设置 decisive 的规则
+- typo、comprehensive: 需要语义理解，始终继续调用大模型，规则发现的问题一并返回
+
+编译结果按规则版本（见 cache.py）缓存在进程内，规则或原始记录模板变更后各进程自动重新编译。
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .cache import get_rules_version
+
+logger = logging.getLogger(__name__)
+
+# 规则类型适用的校验类型，comprehensive 执行全部规则
+RULE_VERIFY_TYPES = {
+    'range': {'data'},
+    'required': {'data', 'format'},
+    'regex': {'format', 'typo'},
+    'terminology': {'typo'},
+}
+
+# 规则直接给出结论时记录的 model_used
+RULE_ENGINE_NAME = 'rule-engine'
+
+NUMBER = r'(-?\d+(?:\.\d+)?)'
+UNIT = r'\s*([A-Za-z%‰°℃²³/μ]+)?'
+
+# 内容中的“字段: 数值”，用于判断数据是否都被范围规则覆盖（排除日期、编号等带分隔符的数字）
+FIELD_VALUE_RE = re.compile(r'([一-龥A-Za-z]{2,})\s*[:：=]\s*' + NUMBER + r'(?![\d\-/年月.])')
+
+
+class RuleCompileError(ValueError):
+    """规则内容不合法"""
+    pass
+
+
+@dataclass
+class CompiledRule:
+    """编译后的规则"""
+    rule_id: Optional[int]
+    name: str
+    rule_type: str
+    check: Callable[[str], List[dict]]
+    when: Optional['re.Pattern'] = None
+    fields: Tuple[str, ...] = ()  # range 规则覆盖的字段
+    decisive: bool = False  # 规则通过即可给出格式结论
+
+    def applies(self, content: str, verify_type: str) -> bool:
+        if verify_type != 'comprehensive' and verify_type not in RULE_VERIFY_TYPES[self.rule_type]:
+            return False
+        return self.when is None or bool(self.when.search(content))
+
+    def run(self, content: str) -> List[dict]:
+        issues = self.check(content)
+        for issue in issues:
+            issue.update({'source': 'rule', 'rule': self.name, 'rule_id': self.rule_id})
+        return issues
+
+
+@dataclass
+class RuleOutcome:
+    """
+    规则检查结果
+
+    Attributes:
+        issues: 规则发现的问题
+        applied: 生效的规则数
+        decided: 规则是否已能给出结论（无需调用大模型）
+    """
+    issues: List[dict] = field(default_factory=list)
+    applied: int = 0
+    decided: bool = False
+
+    @property
+    def summary(self) -> str:
+        if self.issues:
+            return f'规则校验发现{len(self.issues)}处问题'
+        return f'规则校验通过（{self.applied}条规则）'
+
+
+# ==================== 规则编译 ====================
+
+def _compile_regex(pattern: str) -> 're.Pattern':
+    if not pattern or not isinstance(pattern, str):
+        raise RuleCompileError('正则表达式不能为空')
+    try:
+        return re.compile(pattern)
+    except (re.error, TypeError) as e:
+        raise RuleCompileError(f'正则表达式无效: {e}')
+
+
+def _range_check(content: dict):
+    field_name = content.get('field')
+    low, high = content.get('min'), content.get('max')
+    if not field_name or (low is None and high is None):
+        raise RuleCompileError('范围规则需要 field 以及 min/max')
+    unit = content.get('unit') or ''
+    # 分隔符必填，避免“抗压强度 28d: 35.2MPa”中的龄期被当作数值
+    regex = re.compile(re.escape(field_name) + r'\s*[:：=]\s*' + NUMBER + UNIT)
+
+    def check(text: str) -> List[dict]:
+        issues = []
+        for match in regex.finditer(text):
+            value, found_unit = float(match.group(1)), match.group(2)
+            original = match.group(0).strip()
+            if unit and found_unit and found_unit != unit:
+                issues.append({
+                    'type': 'unit', 'position': match.start(), 'original': original,
+                    'suggestion': f'{field_name}单位应为{unit}',
+                })
+            elif (low is not None and value < low) or (high is not None and value > high):
+                issues.append({
+                    'type': 'data', 'position': match.start(), 'original': original,
+                    'suggestion': f'{field_name}应在{low if low is not None else "-∞"}~{high if high is not None else "+∞"}{unit}之间',
+                })
+        return issues
+    return check, (field_name,)
+
+
+def _required_check(content: dict):
+    fields = content.get('fields')
+    if not isinstance(fields, list) or not fields:
+        raise RuleCompileError('必填规则需要 fields 列表')
+    patterns = [(name, re.compile(re.escape(name) + r'\s*[:：=]?\s*[^\s,，;；:：]')) for name in fields]
+
+    def check(text: str) -> List[dict]:
+        return [
+            {'type': 'missing', 'position': None, 'original': '', 'suggestion': f'缺少{name}'}
+            for name, regex in patterns if not regex.search(text)
+        ]
+    return check, ()
+
+
+def _regex_check(content: dict):
+    regex = _compile_regex(content.get('pattern'))
+    mode = content.get('mode', 'forbid')
+    if mode not in ('forbid', 'require'):
+        raise RuleCompileError('mode 只能为 forbid 或 require')
+    message = content.get('message') or ''
+    suggestion = content.get('suggestion') or message
+
+    def check(text: str) -> List[dict]:
+        if mode == 'require':
+            if regex.search(text):
+                return []
+            return [{'type': 'format', 'position': None, 'original': '', 'suggestion': suggestion or '缺少必需内容'}]
+        return [
+            {'type': 'format', 'position': match.start(), 'original': match.group(0), 'suggestion': suggestion}
+            for match in regex.finditer(text)
+        ]
+    return check, ()
+
+
+def _terminology_check(content: dict):
+    terms = content.get('terms')
+    if not isinstance(terms, dict) or not terms:
+        raise RuleCompileError('术语规则需要 terms 映射')
+    # 长词优先，避免短词先匹配
+    regex = re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)))
+
+    def check(text: str) -> List[dict]:
+        return [
+            {'type': 'typo', 'position': match.start(), 'original': match.group(0), 'suggestion': terms[match.group(0)]}
+            for match in regex.finditer(text)
+        ]
+    return check, ()
+
+
+COMPILERS = {
+    'range': _range_check,
+    'required': _required_check,
+    'regex': _regex_check,
+    'terminology': _terminology_check,
+}
+
+
+def compile_rule(rule_type: str, rule_content: dict, name: str = '', rule_id: int = None,
+                 field_units: Dict[str, str] = None) -> CompiledRule:
+    """
+    编译单条规则
+
+    Args:
+        rule_type: 规则类型
+        rule_content: 规则内容
+        name: 规则名称
+        rule_id: 规则ID
+        field_units: 字段名 -> 模板单位，范围规则未设置 unit 时使用
+
+    Returns:
+        CompiledRule: 编译后的规则
+
+    Raises:
+        RuleCompileError: 规则类型不支持或内容不合法
+    """
+    compiler = COMPILERS.get(rule_type)
+    if compiler is None:
+        raise RuleCompileError(f'不支持的规则类型: {rule_type}')
+    if not isinstance(rule_content, dict):
+        raise RuleCompileError('规则内容必须是对象')
+    if rule_type == 'range' and not rule_content.get('unit') and field_units:
+        rule_content = {**rule_content, 'unit': field_units.get(rule_content.get('field'))}
+    check, fields = compiler(rule_content)
+    when = rule_content.get('when')
+    return CompiledRule(
+        rule_id=rule_id,
+        name=name,
+        rule_type=rule_type,
+        check=check,
+        when=_compile_regex(when) if when else None,
+        fields=fields,
+        decisive=bool(rule_content.get('decisive')),
+    )
+
+
+def template_field_units(templates) -> Dict[str, str]:
+    """
+    原始记录模板中字段的单位
+
+    Args:
+        templates: RecordTemplate 可迭代对象
+
+    Returns:
+        dict: 字段名 -> 单位，同名字段在不同模板中单位不一致时不返回该字段
+    """
+    units, conflicts = {}, set()
+    for template in templates:
+        for item in template.fields or []:
+            if not isinstance(item, dict) or not item.get('name') or not item.get('unit'):
+                continue
+            name, unit = item['name'], item['unit']
+            if units.setdefault(name, unit) != unit:
+                conflicts.add(name)
+    return {name: unit for name, unit in units.items() if name not in conflicts}
+
+
+# ==================== 规则引擎 ====================
+
+class RuleEngine:
+    """
+    规则引擎
+
+    用法：
+        outcome = get_rule_engine().evaluate(content, 'data')
+        if not outcome.decided:
+            ...  # 调用大模型
+    """
+
+    def __init__(self, rules: List[CompiledRule]):
+        self.rules = rules
+
+    @classmethod
+    def from_queryset(cls, queryset, field_units: Dict[str, str] = None) -> 'RuleEngine':
+        """编译启用的规则，内容不合法的规则跳过并记录日志"""
+        rules = []
+        for rule in queryset:
+            try:
+                rules.append(compile_rule(rule.rule_type, rule.rule_content, rule.name, rule.pk, field_units))
+            except RuleCompileError as e:
+                logger.warning(f"校验规则 {rule.pk} 编译失败，已跳过: {e}")
+        return cls(rules)
+
+    def evaluate(self, content: str, verify_type: str) -> RuleOutcome:
+        """
+        执行规则检查
+
+        Args:
+            content: 待校验内容
+            verify_type: 校验类型
+
+        Returns:
+            RuleOutcome: 检查结果
+        """
+        applied = [rule for rule in self.rules if rule.applies(content, verify_type)]
+        issues = []
+        for rule in applied:
+            issues.extend(rule.run(content))
+        issues.sort(key=lambda item: (item['position'] is None, item['position'] or 0))
+
+        decided = False
+        if verify_type == 'data':
+            covered = {name for rule in applied for name in rule.fields}
+            values = {match.group(1) for match in FIELD_VALUE_RE.finditer(content)}
+            decided = bool(issues) or (bool(values) and values <= covered)
+        elif verify_type == 'format':
+            # 规则没有发现问题不代表格式正确，除非规则声明通过即可确认
+            decided = bool(issues) or any(rule.decisive for rule in applied)
+        return RuleOutcome(issues=issues, applied=len(applied), decided=decided)
+
+
+def combine_issues(rule_issues: List[dict], ai_issues: List[dict]) -> List[dict]:
+    """合并规则与大模型发现的问题，按位置排序，大模型的问题标记 source=ai"""
+    issues = rule_issues + [{**issue, 'source': issue.get('source', 'ai')} for issue in ai_issues]
+    return sorted(issues, key=lambda item: (item.get('position') is None, item.get('position') or 0))
+
+
+_engine: Tuple[Optional[int], Optional[RuleEngine]] = (None, None)
+_engine_lock = threading.Lock()
+
+
+def get_rule_engine() -> RuleEngine:
+    """获取按当前规则版本编译的规则引擎"""
+    global _engine
+    version = get_rules_version()
+    cached_version, engine = _engine
+    if engine is not None and cached_version == version:
+        return engine
+    with _engine_lock:
+        if _engine[0] != version or _engine[1] is None:
+            from apps.records.models import RecordTemplate
+            from .models import VerifyRule
+            _engine = (version, RuleEngine.from_queryset(
+                VerifyRule.objects.filter(is_active=True).order_by('id'),
+                template_field_units(RecordTemplate.objects.filter(is_active=True).only('fields')),
+            ))
+        return _engine[1]
@@ -1,6 +1,8 @@
 """AI校验序列化器"""
 from rest_framework import serializers
-from .models import VerifyRecord, VerifyRule
+from .batch import BATCH_VERIFY_LIMIT, select_document_ids
+from .models import VerifyBatchJob, VerifyRecord, VerifyRule
+from .rules import RuleCompileError, compile_rule
 
 
 class VerifyRecordSerializer(serializers.ModelSerializer):
@@ -13,8 +15,8 @@ class VerifyRecordSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'document_type', 'document_id', 'content',
             'verify_type', 'type_display', 'status', 'status_display',
-            'issues', 'summary', 'model_used', 'process_time',
-            'operator', 'operator_name', 'created_at'
+            'issues', 'summary', 'model_used', 'process_time', 'chunk_stats', 'cache_hit',
+            'batch_job', 'operator', 'operator_name', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
 
@@ -28,6 +30,7 @@ class VerifyRequestSerializer(serializers.Serializer):
     )
     document_type = serializers.CharField(required=False, default='')
     document_id = serializers.IntegerField(required=False)
+    use_cache = serializers.BooleanField(required=False, default=True, help_text='是否复用相同内容的校验结果')
 
 
 class VerifyRuleSerializer(serializers.ModelSerializer):
@@ -38,3 +41,73 @@ class VerifyRuleSerializer(serializers.ModelSerializer):
             'description', 'is_active', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
+    
+    def validate(self, attrs):
+        """保存前编译规则，规则类型或内容不合法时拒绝"""
+        rule_type = attrs.get('rule_type', getattr(self.instance, 'rule_type', None))
+        rule_content = attrs.get('rule_content', getattr(self.instance, 'rule_content', None))
+        try:
+            compile_rule(rule_type, rule_content)
+        except RuleCompileError as e:
+            raise serializers.ValidationError({'rule_content': str(e)})
+        return attrs
+
+
+class VerifyBatchJobSerializer(serializers.ModelSerializer):
+    """批量校验任务序列化器"""
+    document_type_display = serializers.CharField(source='get_document_type_display', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    operator_name = serializers.CharField(source='operator.username', read_only=True)
+    progress = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = VerifyBatchJob
+        fields = [
+            'id', 'document_type', 'document_type_display', 'verify_type', 'filters',
+            'status', 'status_display', 'total', 'processed', 'failed_count', 'issue_count', 'progress',
+            'started_at', 'finished_at', 'error_message', 'operator', 'operator_name', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+class VerifyBatchRequestSerializer(serializers.Serializer):
+    """
+    批量校验请求序列化器
+    
+    指定 ids 时按ID校验，否则按筛选条件选择文档
+    """
+    document_type = serializers.ChoiceField(choices=[choice for choice, _ in VerifyBatchJob.DOCUMENT_TYPE_CHOICES])
+    verify_type = serializers.ChoiceField(
+        choices=['typo', 'data', 'format', 'comprehensive'],
+        default='comprehensive'
+    )
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False,
+        max_length=BATCH_VERIFY_LIMIT, help_text='文档ID列表'
+    )
+    status = serializers.CharField(required=False, help_text='文档状态，默认原始记录为已提交、报告为审核中')
+    date_from = serializers.DateField(required=False, help_text='起始日期（原始记录按试验日期，报告按编制日期）')
+    date_to = serializers.DateField(required=False, help_text='截止日期')
+    template = serializers.IntegerField(required=False, help_text='原始记录模板ID')
+    
+    def validate(self, attrs):
+        if attrs.get('date_from') and attrs.get('date_to') and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError({'date_to': '截止日期不能早于起始日期'})
+        
+        filters = {}
+        if not attrs.get('ids'):
+            filters = {
+                key: str(attrs[key]) for key in ('status', 'date_from', 'date_to') if attrs.get(key)
+            }
+            if attrs.get('template'):
+                filters['template'] = attrs['template']
+        
+        document_ids = select_document_ids(attrs['document_type'], attrs.get('ids'), filters)
+        if not document_ids:
+            raise serializers.ValidationError('没有符合条件的文档')
+        if len(document_ids) > BATCH_VERIFY_LIMIT:
+            raise serializers.ValidationError(f'单次最多校验{BATCH_VERIFY_LIMIT}个文档，请缩小筛选范围')
+        
+        attrs['filters'] = filters
+        attrs['document_ids'] = document_ids
+        return attrs
@@ -0,0 +1,24 @@
+"""
+AI校验信号处理
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.records.models import RecordTemplate
+from .cache import bump_rules_version
+from .models import VerifyRule
+
+
+@receiver(post_save, sender=VerifyRule)
+@receiver(post_delete, sender=VerifyRule)
+def invalidate_verify_cache(sender, **kwargs):
+    """校验规则变更后使已缓存的校验结果失效"""
+    bump_rules_version()
+
+
+@receiver(post_save, sender=RecordTemplate)
+@receiver(post_delete, sender=RecordTemplate)
+def invalidate_template_units(sender, **kwargs):
+    """范围规则使用模板字段的单位，模板变更后同样重新编译规则"""
+    bump_rules_version()
@@ -0,0 +1,164 @@
+"""
+AI校验异步任务
+
+批量校验任务在 Celery worker 中执行（ai 队列），状态流转：
+pending -> processing -> completed / failed
+
+- 并发控制：文档分发到线程池并行校验，线程数为 AI_CONFIG['BATCH_WORKERS']；
+  工作线程只执行规则与大模型调用，校验记录和任务进度由主线程写入
+- 结果复用：命中校验结果缓存的文档直接生成记录，不调用大模型
+- 断点续跑：worker 异常退出后任务重新投递，已生成校验记录的文档不再重复校验
+"""
+
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from common.services import get_ai_service
+from .batch import build_contents
+from .cache import get_cached_result, make_cache_key, set_cached_result
+from .models import VerifyBatchJob, VerifyRecord
+from .rules import get_rule_engine
+from .verification import apply_result, verify_with_rules
+
+logger = logging.getLogger(__name__)
+
+# 执行中状态超过该时长未更新视为 worker 异常退出，允许重新领取（秒）
+PROCESSING_STALE_SECONDS = 600
+
+
+def _verify(ai_service, content: str, verify_type: str, engine):
+    """工作线程中执行校验，异常转为失败结果"""
+    start_time = time.time()
+    try:
+        result = verify_with_rules(ai_service, content, verify_type, engine)
+    except Exception as e:
+        logger.exception('批量校验文档失败')
+        result = {'success': False, 'message': str(e) or '校验失败', 'issues': [], 'chunk_stats': []}
+    return result, time.time() - start_time
+
+
+def _advance(job: VerifyBatchJob, record: VerifyRecord = None):
+    """记录一个文档处理完成，record 为空表示文档已被删除"""
+    failed = record is None or record.status == 'failed'
+    VerifyBatchJob.objects.filter(pk=job.pk).update(
+        processed=F('processed') + 1,
+        failed_count=F('failed_count') + int(failed),
+        issue_count=F('issue_count') + (len(record.issues) if record else 0),
+        updated_at=timezone.now(),
+    )
+
+
+def _resume_counters(job: VerifyBatchJob) -> set:
+    """按已生成的校验记录重算进度，返回已处理的文档ID"""
+    done, failed, issues = set(), 0, 0
+    for document_id, status, record_issues in job.records.values_list('document_id', 'status', 'issues'):
+        done.add(document_id)
+        failed += status == 'failed'
+        issues += len(record_issues or [])
+    VerifyBatchJob.objects.filter(pk=job.pk).update(
+        processed=len(done), failed_count=failed, issue_count=issues, updated_at=timezone.now(),
+    )
+    return done
+
+
+def _new_record(job: VerifyBatchJob, document_id: int, content: str, **fields) -> VerifyRecord:
+    return VerifyRecord(
+        document_type=job.document_type,
+        document_id=document_id,
+        content=content,
+        verify_type=job.verify_type,
+        batch_job=job,
+        operator_id=job.operator_id,
+        created_by_id=job.operator_id,
+        **fields
+    )
+
+
+@shared_task(acks_late=True)
+def run_verify_batch(job_id: int):
+    """
+    执行批量校验任务
+
+    Args:
+        job_id: 批量校验任务ID
+    """
+    now = timezone.now()
+    claimable = Q(status='pending') | Q(
+        status='processing', updated_at__lt=now - timedelta(seconds=PROCESSING_STALE_SECONDS)
+    )
+    claimed = VerifyBatchJob.objects.filter(claimable, pk=job_id).update(
+        status='processing', started_at=now, updated_at=now
+    )
+    if not claimed:
+        logger.info(f"批量校验任务 {job_id} 已被处理，跳过")
+        return
+
+    job = VerifyBatchJob.objects.get(pk=job_id)
+    try:
+        _run(job)
+    except Exception as e:
+        logger.exception(f"批量校验任务 {job_id} 执行失败")
+        VerifyBatchJob.objects.filter(pk=job_id).update(
+            status='failed', error_message=str(e), finished_at=timezone.now(), updated_at=timezone.now()
+        )
+        return
+
+    VerifyBatchJob.objects.filter(pk=job_id).update(
+        status='completed', finished_at=timezone.now(), updated_at=timezone.now()
+    )
+
+
+def _run(job: VerifyBatchJob):
+    done = _resume_counters(job)
+    document_ids = [pk for pk in job.document_ids if pk not in done]
+    contents = build_contents(job.document_type, document_ids)
+
+    ai_service = get_ai_service()
+    # 规则引擎在主线程中编译（需要查询数据库），工作线程共用
+    engine = get_rule_engine()
+
+    pending = []
+    for document_id in document_ids:
+        content = contents.get(document_id)
+        if content is None:
+            _advance(job)
+            continue
+        cache_key = make_cache_key(content, job.verify_type, ai_service.model_name)
+        cached = get_cached_result(cache_key)
+        if cached is not None:
+            record = _new_record(
+                job, document_id, content,
+                status='completed', issues=cached['issues'], summary=cached['summary'],
+                model_used=cached['model_used'], cache_hit=True,
+            )
+            record.save()
+            _advance(job, record)
+            continue
+        pending.append((document_id, content, cache_key))
+
+    if not pending:
+        return
+
+    workers = max(1, min(settings.AI_CONFIG.get('BATCH_WORKERS', 4), len(pending)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ai-verify-batch') as executor:
+        futures = {
+            executor.submit(contextvars.copy_context().run, _verify, ai_service, content, job.verify_type, engine):
+                (document_id, content, cache_key)
+            for document_id, content, cache_key in pending
+        }
+        for future in as_completed(futures):
+            document_id, content, cache_key = futures[future]
+            result, process_time = future.result()
+            record = _new_record(job, document_id, content, status='processing')
+            apply_result(record, result, process_time)
+            record.save()
+            set_cached_result(cache_key, record)
+            _advance(job, record)
@@ -1,12 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import VerifyRecordViewSet, VerifyRuleViewSet, VerifyView
+from .views import VerifyBatchJobViewSet, VerifyRecordViewSet, VerifyRuleViewSet, VerifyView, VerifyStreamView
 
 router = DefaultRouter()
 router.register('records', VerifyRecordViewSet, basename='verify-record')
 router.register('rules', VerifyRuleViewSet, basename='verify-rule')
+router.register('batches', VerifyBatchJobViewSet, basename='verify-batch')
 
 urlpatterns = [
     path('', include(router.urls)),
     path('verify/', VerifyView.as_view(), name='verify'),
+    path('verify/stream/', VerifyStreamView.as_view(), name='verify-stream'),
 ]
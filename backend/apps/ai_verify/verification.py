@@ -0,0 +1,62 @@
+"""
+校验流程
+
+单篇校验接口与批量校验任务共用：先执行本地规则，规则无法给出结论时分段调用大模型。
+verify_with_rules 只做计算、不访问数据库（规则引擎需预先取得），可以在工作线程中执行。
+"""
+
+from typing import Dict
+
+from .chunking import verify_content
+from .rules import RULE_ENGINE_NAME, RuleEngine, combine_issues, get_rule_engine
+
+
+def verify_with_rules(ai_service, content: str, verify_type: str, engine: RuleEngine = None) -> Dict:
+    """
+    规则优先的校验
+
+    Args:
+        ai_service: AI服务
+        content: 待校验内容
+        verify_type: 校验类型
+        engine: 规则引擎，在工作线程中调用时需由调用方传入
+
+    Returns:
+        dict: {'success', 'issues', 'summary'/'message', 'chunk_stats', 'model_used'}
+    """
+    outcome = (engine or get_rule_engine()).evaluate(content, verify_type)
+    if outcome.decided:
+        return {
+            'success': True,
+            'issues': outcome.issues,
+            'summary': outcome.summary,
+            'chunk_stats': [],
+            'model_used': RULE_ENGINE_NAME,
+        }
+
+    # 调用AI服务，长文档分段并行校验
+    result = verify_content(ai_service, content)
+    result['issues'] = combine_issues(outcome.issues, result['issues'])
+    result['model_used'] = ai_service.model_name
+    return result
+
+
+def apply_result(record, result: Dict, process_time: float):
+    """
+    将校验结果写入校验记录（不保存）
+
+    Args:
+        record: VerifyRecord
+        result: verify_with_rules 的返回值
+        process_time: 耗时（秒）
+    """
+    record.issues = result['issues']
+    record.chunk_stats = result['chunk_stats']
+    if result.get('success'):
+        record.status = 'completed'
+        record.summary = result.get('summary', '')
+        record.model_used = result['model_used']
+    else:
+        record.status = 'failed'
+        record.summary = result.get('message', '校验失败')
+    record.process_time = process_time
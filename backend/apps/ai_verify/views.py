@@ -1,27 +1,43 @@
 """AI校验视图"""
-from rest_framework import viewsets
+from contextlib import closing
+
+from django.http import StreamingHttpResponse
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 import time
 from common.response import success_response, error_response
 from common.permissions import RoleBasedPermission
-from common.services import get_ai_service
-from .models import VerifyRecord, VerifyRule
-from .serializers import VerifyRecordSerializer, VerifyRequestSerializer, VerifyRuleSerializer
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
+from common.services import AIServiceError, get_ai_service
+from common.sse import EventStreamRenderer, event_stream_headers, sse_event
+from .cache import get_cached_result, make_cache_key, set_cached_result
+from .chunking import chunk_stat, merge_issues, split_content, summarize
+from .rules import RULE_ENGINE_NAME, combine_issues, get_rule_engine
+from .verification import apply_result, verify_with_rules
+from .models import VerifyBatchJob, VerifyRecord, VerifyRule
+from .serializers import (
+    VerifyBatchJobSerializer, VerifyBatchRequestSerializer, VerifyRecordSerializer,
+    VerifyRequestSerializer, VerifyRuleSerializer,
+)
+from .tasks import run_verify_batch
 
 
-class VerifyRecordViewSet(viewsets.ReadOnlyModelViewSet):
+class VerifyRecordViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """校验记录视图集（只读）"""
-    queryset = VerifyRecord.objects.filter(is_deleted=False)
+    queryset = VerifyRecord.objects.all()
     serializer_class = VerifyRecordSerializer
     permission_classes = [IsAuthenticated]
-    filterset_fields = ['document_type', 'verify_type', 'status', 'operator']
+    filterset_fields = ['document_type', 'document_id', 'verify_type', 'status', 'operator', 'batch_job']
     ordering_fields = ['created_at']
+    cursor_ordering = ('-created_at', '-id')  # ?pagination=cursor 时使用游标分页
 
 
-class VerifyRuleViewSet(viewsets.ModelViewSet):
+class VerifyRuleViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """校验规则视图集"""
-    queryset = VerifyRule.objects.filter(is_deleted=False)
+    queryset = VerifyRule.objects.all()
     serializer_class = VerifyRuleSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['rule_type', 'is_active']
@@ -38,6 +54,104 @@ class VerifyRuleViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
 
+class VerifyBatchJobViewSet(ConditionalGetMixin, RelatedQuerysetMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin,
+                            viewsets.GenericViewSet):
+    """
+    批量校验任务视图集
+    
+    创建任务后在 ai 队列中异步执行，进度通过任务详情的 processed/total/progress 查询，
+    每个文档的校验记录通过 records 获取
+    """
+    queryset = VerifyBatchJob.objects.all()
+    serializer_class = VerifyBatchJobSerializer
+    permission_classes = [IsAuthenticated, RoleBasedPermission]
+    filterset_fields = ['document_type', 'status', 'operator']
+    ordering_fields = ['created_at']
+    
+    role_permissions = {
+        'list': ['admin', 'reviewer', 'approver'],
+        'retrieve': ['admin', 'reviewer', 'approver'],
+        'create': ['admin', 'reviewer', 'approver'],
+        'records': ['admin', 'reviewer', 'approver'],
+    }
+    
+    def create(self, request):
+        """
+        提交批量校验
+        
+        请求参数：
+        - document_type: 文档类型 original_record / report
+        - verify_type: 校验类型（可选，默认comprehensive）
+        - ids: 文档ID列表（可选，指定时忽略筛选条件）
+        - status: 文档状态（可选，默认原始记录为submitted、报告为reviewing）
+        - date_from / date_to: 日期范围（可选）
+        - template: 原始记录模板ID（可选）
+        """
+        serializer = VerifyBatchRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(serializer.errors)
+        
+        data = serializer.validated_data
+        job = VerifyBatchJob.objects.create(
+            document_type=data['document_type'],
+            verify_type=data['verify_type'],
+            filters=data['filters'],
+            document_ids=data['document_ids'],
+            total=len(data['document_ids']),
+            operator=request.user,
+            created_by=request.user,
+        )
+        run_verify_batch.delay(job_id=job.pk)
+        
+        job.refresh_from_db()
+        return success_response(
+            VerifyBatchJobSerializer(job).data,
+            f'已提交{job.total}个文档的批量校验',
+            code=202
+        )
+    
+    @action(detail=True, methods=['get'])
+    def records(self, request, pk=None):
+        """获取任务生成的校验记录"""
+        job = self.get_object()
+        queryset = job.records.filter(is_deleted=False).select_related('operator').order_by('document_id')
+        status = request.query_params.get('status')
+        if status:
+            queryset = queryset.filter(status=status)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(VerifyRecordSerializer(page, many=True).data)
+        return success_response(VerifyRecordSerializer(queryset, many=True).data)
+
+
+def _create_record(request, data, **fields) -> VerifyRecord:
+    """按校验请求创建校验记录"""
+    return VerifyRecord.objects.create(
+        document_type=data.get('document_type', ''),
+        document_id=data.get('document_id'),
+        content=data['content'],
+        verify_type=data['verify_type'],
+        operator=request.user,
+        created_by=request.user,
+        **fields
+    )
+
+
+def _create_cached_record(request, data, cache_key):
+    """命中缓存时直接生成已完成的校验记录，未命中返回None"""
+    cached = get_cached_result(cache_key) if data['use_cache'] else None
+    if cached is None:
+        return None
+    return _create_record(
+        request, data,
+        status='completed',
+        issues=cached['issues'],
+        summary=cached['summary'],
+        model_used=cached['model_used'],
+        cache_hit=True,
+    )
+
+
 class VerifyView(APIView):
     """
     AI校验视图
@@ -50,11 +164,15 @@ class VerifyView(APIView):
         """
         触发AI校验
         
+        相同内容、校验类型、规则集和模型的结果会被缓存，命中时直接返回，不调用大模型；
+        未命中时先执行本地规则（见 rules.py），规则无法给出结论时才调用大模型
+        
         请求参数：
         - content: 要校验的内容
         - verify_type: 校验类型
         - document_type: 文档类型（可选）
         - document_id: 文档ID（可选）
+        - use_cache: 是否复用缓存结果（可选，默认true）
         """
         serializer = VerifyRequestSerializer(data=request.data)
         if not serializer.is_valid():
@@ -64,37 +182,141 @@ class VerifyView(APIView):
         content = data['content']
         verify_type = data['verify_type']
         
-        # 创建校验记录
-        record = VerifyRecord.objects.create(
-            document_type=data.get('document_type', ''),
-            document_id=data.get('document_id'),
-            content=content,
-            verify_type=verify_type,
-            status='processing',
-            operator=request.user,
-            created_by=request.user
-        )
-        
-        # 调用AI服务
         ai_service = get_ai_service()
+        cache_key = make_cache_key(content, verify_type, ai_service.model_name)
         
-        start_time = time.time()
-        result = ai_service.verify_document(content)
-        process_time = time.time() - start_time
-        
-        if result.get('success'):
-            record.status = 'completed'
-            record.issues = result.get('data', {}).get('issues', [])
-            record.summary = result.get('data', {}).get('summary', '')
-            record.model_used = ai_service.model_name
-        else:
-            record.status = 'failed'
-            record.summary = result.get('message', '校验失败')
+        # 命中缓存：直接生成已完成的校验记录
+        record = _create_cached_record(request, data, cache_key)
+        if record is not None:
+            return success_response(VerifyRecordSerializer(record).data, '校验完成（缓存）')
         
-        record.process_time = process_time
+        # 创建校验记录
+        record = _create_record(request, data, status='processing')
+        
+        # 先执行本地规则，规则能给出结论时不调用大模型
+        start_time = time.time()
+        result = verify_with_rules(ai_service, content, verify_type)
+        apply_result(record, result, time.time() - start_time)
         record.save()
+        set_cached_result(cache_key, record)
         
         return success_response(
             VerifyRecordSerializer(record).data,
             '校验完成' if record.status == 'completed' else '校验失败'
         )
+
+
+class VerifyStreamView(APIView):
+    """
+    AI校验视图（流式）
+    
+    以 Server-Sent Events 逐段推送模型输出，生成结束后解析问题列表并保存校验记录。
+    本地规则能给出结论时直接返回 done；否则规则发现的问题与模型结果合并。
+    长文档按片段依次校验（流式输出不并行，保证各片段的输出不交错）。
+    事件：
+    - record: 校验记录已创建 {"id": 1}
+    - chunk: 开始校验某个片段（仅分段时发送）{"index": 0, "total": 3, "start": 0, "end": 2000}
+    - token: 模型输出片段 {"text": "..."}
+    - done: 校验完成，数据为校验记录
+    - error: 校验失败 {"message": "...", "record": {...}}
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+    
+    def post(self, request):
+        """
+        触发流式AI校验
+        
+        请求参数同 VerifyView
+        """
+        serializer = VerifyRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(serializer.errors)
+        
+        data = serializer.validated_data
+        ai_service = get_ai_service()
+        cache_key = make_cache_key(data['content'], data['verify_type'], ai_service.model_name)
+        
+        record = _create_cached_record(request, data, cache_key)
+        if record is not None:
+            events = iter([sse_event('done', VerifyRecordSerializer(record).data)])
+            return event_stream_headers(StreamingHttpResponse(events, content_type='text/event-stream'))
+        
+        start_time = time.time()
+        outcome = get_rule_engine().evaluate(data['content'], data['verify_type'])
+        if outcome.decided:
+            record = _create_record(
+                request, data,
+                status='completed',
+                issues=outcome.issues,
+                summary=outcome.summary,
+                model_used=RULE_ENGINE_NAME,
+                process_time=time.time() - start_time,
+            )
+            set_cached_result(cache_key, record)
+            events = iter([sse_event('done', VerifyRecordSerializer(record).data)])
+        else:
+            record = _create_record(request, data, status='processing')
+            events = self._stream(record, ai_service, cache_key, outcome.issues)
+        
+        return event_stream_headers(StreamingHttpResponse(events, content_type='text/event-stream'))
+    
+    @staticmethod
+    def _stream(record, ai_service, cache_key, rule_issues):
+        """逐段转发模型输出，结束后合并各段问题并保存校验记录"""
+        yield sse_event('record', {'id': record.pk})
+        
+        chunks = split_content(record.content)
+        results, stats = [], []
+        start_time = time.time()
+        try:
+            for chunk in chunks:
+                if len(chunks) > 1:
+                    yield sse_event('chunk', {
+                        'index': chunk.index, 'total': len(chunks), 'start': chunk.start, 'end': chunk.end,
+                    })
+                texts = []
+                chunk_start = time.time()
+                try:
+                    # 客户端断开时及时关闭上游连接，停止生成
+                    with closing(ai_service.stream_verify_document(chunk.text)) as stream:
+                        for text in stream:
+                            texts.append(text)
+                            yield sse_event('token', {'text': text})
+                except AIServiceError as e:
+                    result = {'success': False, 'message': str(e) or '校验失败'}
+                else:
+                    result = {'success': True, **ai_service.parse_verify_result(''.join(texts))}
+                results.append(result)
+                stats.append(chunk_stat(chunk, time.time() - chunk_start, result))
+                if not result['success']:
+                    break
+            
+            issues = merge_issues(
+                [(chunk, result.get('issues') or []) for chunk, result in zip(chunks, results) if result['success']],
+                record.content,
+            )
+            result = summarize(chunks[:len(results)], results, issues)
+            record.issues = combine_issues(rule_issues, result['issues'])
+            if result['success']:
+                record.status = 'completed'
+                record.summary = result['summary']
+                record.model_used = ai_service.model_name
+            else:
+                record.status = 'failed'
+                record.summary = result['message']
+        finally:
+            # 客户端中途断开时生成器被关闭，同样保存记录
+            if record.status == 'processing':
+                record.status = 'failed'
+                record.summary = '客户端已断开'
+            record.chunk_stats = stats
+            record.process_time = time.time() - start_time
+            record.save()
+        
+        set_cached_result(cache_key, record)
+        record_data = VerifyRecordSerializer(record).data
+        if record.status == 'completed':
+            yield sse_event('done', record_data)
+        else:
+            yield sse_event('error', {'message': record.summary, 'record': record_data})
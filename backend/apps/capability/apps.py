@@ -4,3 +4,6 @@ class CapabilityConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.capability'
     verbose_name = '试验室能力管理'
+
+    def ready(self):
+        from . import signals  # noqa: F401  注册标准、参数、价格变更时清理参考数据缓存的信号
@@ -0,0 +1,30 @@
+"""
+试验室能力管理信号处理
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.cache import invalidate_namespace
+from .models import ParameterPrice, TestParameter, TestStandard
+
+# 参考数据缓存命名空间（见 views.py）
+STANDARD_CACHE = 'capability.standards'
+PARAMETER_CACHE = 'capability.parameters'
+
+
+@receiver(post_save, sender=TestStandard)
+@receiver(post_delete, sender=TestStandard)
+def invalidate_standard_cache(sender, **kwargs):
+    """标准分类、检测参数列表中的标准编号和名称随标准变更"""
+    invalidate_namespace(STANDARD_CACHE)
+    invalidate_namespace(PARAMETER_CACHE)
+
+
+@receiver(post_save, sender=TestParameter)
+@receiver(post_delete, sender=TestParameter)
+@receiver(post_save, sender=ParameterPrice)
+@receiver(post_delete, sender=ParameterPrice)
+def invalidate_parameter_cache(sender, **kwargs):
+    """检测参数列表（含当前价格）随参数、价格变更"""
+    invalidate_namespace(PARAMETER_CACHE)
@@ -2,15 +2,20 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.utils import timezone
+from common.cache import read_through
 from common.response import success_response
 from common.permissions import RoleBasedPermission
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
 from .models import TestStandard, TestParameter, ParameterPrice
 from .serializers import TestStandardSerializer, TestParameterSerializer, ParameterPriceSerializer
+from .signals import PARAMETER_CACHE, STANDARD_CACHE
 
 
-class TestStandardViewSet(viewsets.ModelViewSet):
+class TestStandardViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """检测标准视图集"""
-    queryset = TestStandard.objects.filter(is_deleted=False)
+    queryset = TestStandard.objects.all()
     serializer_class = TestStandardSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['category', 'is_active']
@@ -30,21 +35,24 @@ class TestStandardViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def categories(self, request):
-        """获取标准分类列表"""
-        categories = TestStandard.objects.filter(
-            is_deleted=False, is_active=True
-        ).values_list('category', flat=True).distinct()
-        return success_response(list(categories))
+        """获取标准分类列表（缓存，标准变更时失效）"""
+        categories = read_through(STANDARD_CACHE, 'categories', lambda: list(
+            TestStandard.objects.filter(
+                is_active=True
+            ).values_list('category', flat=True).distinct()
+        ))
+        return success_response(categories)
 
 
-class TestParameterViewSet(viewsets.ModelViewSet):
+class TestParameterViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """检测参数视图集"""
-    queryset = TestParameter.objects.filter(is_deleted=False)
+    queryset = TestParameter.objects.all()
     serializer_class = TestParameterSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['standard', 'is_active']
     search_fields = ['name', 'code']
     ordering_fields = ['name', 'created_at']
+    conditional_list = False  # 列表已按查询参数缓存
     
     role_permissions = {
         'list': ['admin', 'client', 'receiver', 'tester', 'reviewer', 'approver'],
@@ -56,11 +64,24 @@ class TestParameterViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
+    
+    def list(self, request, *args, **kwargs):
+        """
+        检测参数列表
+        
+        按查询参数缓存，参数、价格或标准变更时失效；当前价格与日期有关，键中包含当天日期
+        """
+        build = super().list
+        params = request.query_params
+        key = f"{timezone.localdate()}?" + '&'.join(
+            f'{name}={value}' for name in sorted(params) for value in params.getlist(name)
+        )
+        return Response(read_through(PARAMETER_CACHE, key, lambda: build(request, *args, **kwargs).data))
 
 
-class ParameterPriceViewSet(viewsets.ModelViewSet):
+class ParameterPriceViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """参数价格视图集"""
-    queryset = ParameterPrice.objects.filter(is_deleted=False)
+    queryset = ParameterPrice.objects.all()
     serializer_class = ParameterPriceSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['parameter', 'price_type']
@@ -134,6 +134,9 @@ class QueryLog(BaseModel):
         verbose_name = '查询日志'
         verbose_name_plural = '查询日志列表'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='idx_query_log_cursor'),
+        ]
     
     def __str__(self):
         return f"{self.query_user.username} - {self.query_content}"
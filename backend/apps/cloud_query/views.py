@@ -6,6 +6,7 @@ from django.utils import timezone
 from datetime import timedelta
 from common.response import success_response, error_response
 from common.permissions import RoleBasedPermission, IsAdminUser
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
 from .models import QueryApplication, QueryLog
 from .serializers import (
     QueryApplicationSerializer, QueryApplicationCreateSerializer,
@@ -13,7 +14,7 @@ from .serializers import (
 )
 
 
-class QueryApplicationViewSet(viewsets.ModelViewSet):
+class QueryApplicationViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     查看申请视图集
     
@@ -24,7 +25,7 @@ class QueryApplicationViewSet(viewsets.ModelViewSet):
     - POST /applications/{id}/approve/ - 审批申请
     - GET /applications/my/ - 获取我的申请
     """
-    queryset = QueryApplication.objects.filter(is_deleted=False)
+    queryset = QueryApplication.objects.all()
     permission_classes = [IsAuthenticated]
     filterset_fields = ['status', 'applicant_role', 'applicant']
     ordering_fields = ['created_at', 'status']
@@ -36,7 +37,7 @@ class QueryApplicationViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        queryset = QueryApplication.objects.filter(is_deleted=False)
+        queryset = QueryApplication.objects.all()
         
         # 管理员可看所有，其他用户只能看自己的申请
         if user.role != 'admin':
@@ -86,8 +87,7 @@ class QueryApplicationViewSet(viewsets.ModelViewSet):
     def my(self, request):
         """获取我的申请"""
         applications = QueryApplication.objects.filter(
-            applicant=request.user,
-            is_deleted=False
+            applicant=request.user
         ).order_by('-created_at')
         
         serializer = QueryApplicationSerializer(applications, many=True)
@@ -100,21 +100,21 @@ class QueryApplicationViewSet(viewsets.ModelViewSet):
             return error_response('权限不足', code=403)
         
         applications = QueryApplication.objects.filter(
-            status='pending',
-            is_deleted=False
+            status='pending'
         ).order_by('created_at')
         
         serializer = QueryApplicationSerializer(applications, many=True)
         return success_response(serializer.data)
 
 
-class QueryLogViewSet(viewsets.ReadOnlyModelViewSet):
+class QueryLogViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """查询日志视图集（只读）"""
     queryset = QueryLog.objects.all()
     serializer_class = QueryLogSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
     filterset_fields = ['application', 'query_user']
     ordering_fields = ['created_at']
+    cursor_ordering = ('-created_at', '-id')  # ?pagination=cursor 时使用游标分页
 
 
 class CloudDataView(viewsets.ViewSet):
@@ -137,8 +137,7 @@ class CloudDataView(viewsets.ViewSet):
         valid_application = QueryApplication.objects.filter(
             applicant=user,
             status='approved',
-            valid_until__gte=timezone.now(),
-            is_deleted=False
+            valid_until__gte=timezone.now()
         ).first()
         
         if not valid_application:
@@ -154,8 +153,7 @@ class CloudDataView(viewsets.ViewSet):
             # 查询检测报告
             from apps.ocr.models import Report
             reports = Report.objects.filter(
-                status='issued',
-                is_deleted=False
+                status='issued'
             )
             # 根据 scope 过滤
             if query_scope.get('client_id'):
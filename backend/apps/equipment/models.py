@@ -306,6 +306,9 @@ class EquipmentUsageLog(BaseModel):
         verbose_name = '设备使用记录'
         verbose_name_plural = '设备使用记录列表'
         ordering = ['-start_time']
+        indexes = [
+            models.Index(fields=['start_time', 'id'], name='idx_usage_log_cursor'),
+        ]
     
     def __str__(self):
         return f"{self.equipment.code} - {self.user.username} - {self.start_time}"
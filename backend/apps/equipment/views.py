@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from common.response import success_response, error_response
 from common.permissions import RoleBasedPermission
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
 from .models import Laboratory, Equipment, CalibrationRecord, EquipmentUsageLog
 from .serializers import (
     LaboratorySerializer, EquipmentListSerializer, EquipmentDetailSerializer,
@@ -12,9 +13,9 @@ from .serializers import (
 )
 
 
-class LaboratoryViewSet(viewsets.ModelViewSet):
+class LaboratoryViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """试验室视图集"""
-    queryset = Laboratory.objects.filter(is_deleted=False)
+    queryset = Laboratory.objects.all()
     serializer_class = LaboratorySerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['is_active', 'responsible_person']
@@ -33,9 +34,9 @@ class LaboratoryViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
 
-class EquipmentViewSet(viewsets.ModelViewSet):
+class EquipmentViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """设备视图集"""
-    queryset = Equipment.objects.filter(is_deleted=False)
+    queryset = Equipment.objects.all()
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['laboratory', 'status', 'custodian']
     search_fields = ['name', 'code', 'model']
@@ -64,7 +65,7 @@ class EquipmentViewSet(viewsets.ModelViewSet):
         from django.db.models import Max
         
         equipments = Equipment.objects.filter(
-            is_deleted=False, status='normal'
+            status='normal'
         ).annotate(
             latest_valid_until=Max('calibrations__valid_until')
         ).filter(
@@ -74,9 +75,9 @@ class EquipmentViewSet(viewsets.ModelViewSet):
         return success_response(EquipmentListSerializer(equipments, many=True).data)
 
 
-class CalibrationRecordViewSet(viewsets.ModelViewSet):
+class CalibrationRecordViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """校准记录视图集"""
-    queryset = CalibrationRecord.objects.filter(is_deleted=False)
+    queryset = CalibrationRecord.objects.all()
     serializer_class = CalibrationRecordSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['equipment', 'result']
@@ -94,13 +95,14 @@ class CalibrationRecordViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
 
-class EquipmentUsageLogViewSet(viewsets.ModelViewSet):
+class EquipmentUsageLogViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """设备使用记录视图集"""
-    queryset = EquipmentUsageLog.objects.filter(is_deleted=False)
+    queryset = EquipmentUsageLog.objects.all()
     serializer_class = EquipmentUsageLogSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['equipment', 'user']
     ordering_fields = ['start_time']
+    cursor_ordering = ('-start_time', '-id')  # ?pagination=cursor 时使用游标分页
     
     role_permissions = {
         'list': ['admin', 'tester', 'reviewer', 'approver'],
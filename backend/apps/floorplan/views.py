@@ -4,13 +4,14 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from common.response import success_response
 from common.permissions import RoleBasedPermission
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
 from .models import FloorPlan, FloorPlanNode
 from .serializers import FloorPlanSerializer, FloorPlanNodeSerializer
 
 
-class FloorPlanViewSet(viewsets.ModelViewSet):
+class FloorPlanViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """平面图视图集"""
-    queryset = FloorPlan.objects.filter(is_deleted=False)
+    queryset = FloorPlan.objects.all()
     serializer_class = FloorPlanSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['building', 'is_active']
@@ -38,17 +39,16 @@ class FloorPlanViewSet(viewsets.ModelViewSet):
             from apps.equipment.models import Equipment
             from apps.equipment.serializers import EquipmentListSerializer
             equipments = Equipment.objects.filter(
-                laboratory_id=node['laboratory'],
-                is_deleted=False
+                laboratory_id=node['laboratory']
             )
             node['equipments'] = EquipmentListSerializer(equipments, many=True).data
         
         return success_response(data)
 
 
-class FloorPlanNodeViewSet(viewsets.ModelViewSet):
+class FloorPlanNodeViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """平面图节点视图集"""
-    queryset = FloorPlanNode.objects.filter(is_deleted=False)
+    queryset = FloorPlanNode.objects.all()
     serializer_class = FloorPlanNodeSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['floor_plan', 'laboratory']
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ScanFile, OCRResult, Report
+from .models import ScanFile, OCRResult, OCRPageResult, Report
 
 
 @admin.register(ScanFile)
@@ -13,8 +13,14 @@ class OCRResultAdmin(admin.ModelAdmin):
     list_display = ['scan_file', 'confidence', 'process_time', 'created_at']
 
 
+@admin.register(OCRPageResult)
+class OCRPageResultAdmin(admin.ModelAdmin):
+    list_display = ['scan_file', 'page_number', 'status', 'confidence', 'process_time']
+    list_filter = ['status']
+
+
 @admin.register(Report)
 class ReportAdmin(admin.ModelAdmin):
-    list_display = ['report_code', 'title', 'status', 'editor', 'issue_date']
-    list_filter = ['status', 'issue_date']
+    list_display = ['report_code', 'title', 'status', 'pdf_status', 'editor', 'issue_date']
+    list_filter = ['status', 'pdf_status', 'issue_date']
     search_fields = ['report_code', 'title']
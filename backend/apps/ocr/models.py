@@ -51,11 +51,23 @@ class ScanFile(BaseModel):
         default='pending',
         verbose_name='识别状态'
     )
+    content_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        default='',
+        db_index=True,
+        verbose_name='内容哈希',
+        help_text='文件内容MD5，用于复用相同文件的识别结果'
+    )
     
     class Meta:
         db_table = 'lims_scan_file'
         verbose_name = '扫描件'
         verbose_name_plural = '扫描件列表'
+        indexes = [
+            models.Index(fields=['is_deleted', 'status', 'created_at'], name='idx_scan_file_status'),
+            models.Index(fields=['is_deleted', 'created_at'], name='idx_scan_file_live'),
+        ]
     
     def __str__(self):
         return self.file_name
@@ -93,6 +105,15 @@ class OCRResult(BaseModel):
         verbose_name='处理时间',
         help_text='秒'
     )
+    reused_from = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='reuses',
+        verbose_name='复用来源',
+        help_text='相同内容文件的原始识别结果，为空表示由OCR服务识别'
+    )
     
     class Meta:
         db_table = 'lims_ocr_result'
@@ -103,6 +124,74 @@ class OCRResult(BaseModel):
         return f"OCR结果 - {self.scan_file.file_name}"
 
 
+class OCRPageResult(BaseModel):
+    """
+    PDF分页识别结果模型
+
+    多页PDF按页栅格化后逐页识别，每页单独记录状态，失败的页可单独重试
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', '待识别'),
+        ('completed', '识别完成'),
+        ('failed', '识别失败'),
+    ]
+    
+    scan_file = models.ForeignKey(
+        ScanFile,
+        on_delete=models.CASCADE,
+        related_name='pages',
+        verbose_name='扫描件'
+    )
+    page_number = models.IntegerField(
+        verbose_name='页码'
+    )
+    image_path = models.CharField(
+        max_length=500,
+        verbose_name='页面图片路径'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name='识别状态'
+    )
+    raw_text = models.TextField(
+        blank=True,
+        default='',
+        verbose_name='识别文本'
+    )
+    details = models.JSONField(
+        default=list,
+        verbose_name='识别详情'
+    )
+    confidence = models.FloatField(
+        default=0,
+        verbose_name='识别置信度'
+    )
+    process_time = models.FloatField(
+        default=0,
+        verbose_name='处理时间',
+        help_text='秒'
+    )
+    error_message = models.CharField(
+        max_length=500,
+        blank=True,
+        default='',
+        verbose_name='错误信息'
+    )
+    
+    class Meta:
+        db_table = 'lims_ocr_page_result'
+        verbose_name = 'PDF分页识别结果'
+        verbose_name_plural = 'PDF分页识别结果列表'
+        ordering = ['scan_file', 'page_number']
+        unique_together = [['scan_file', 'page_number']]
+    
+    def __str__(self):
+        return f"{self.scan_file.file_name} 第{self.page_number}页"
+
+
 class Report(BaseModel):
     """
     检测报告模型
@@ -115,6 +204,14 @@ class Report(BaseModel):
         ('issued', '已发放'),
     ]
     
+    PDF_STATUS_CHOICES = [
+        ('none', '未生成'),
+        ('pending', '待生成'),
+        ('rendering', '生成中'),
+        ('completed', '已生成'),
+        ('failed', '生成失败'),
+    ]
+    
     report_code = models.CharField(
         max_length=50,
         unique=True,
@@ -145,6 +242,19 @@ class Report(BaseModel):
         null=True,
         verbose_name='PDF文件路径'
     )
+    pdf_status = models.CharField(
+        max_length=20,
+        choices=PDF_STATUS_CHOICES,
+        default='none',
+        verbose_name='PDF生成状态'
+    )
+    pdf_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        verbose_name='PDF内容哈希',
+        help_text='生成当前PDF时报告内容、原始记录等输入的哈希，输入不变时不重新生成'
+    )
     status = models.CharField(
         max_length=20,
         choices=STATUS_CHOICES,
@@ -194,6 +304,10 @@ class Report(BaseModel):
         verbose_name = '检测报告'
         verbose_name_plural = '检测报告列表'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_deleted', 'status', 'created_at'], name='idx_report_status'),
+            models.Index(fields=['is_deleted', 'created_at'], name='idx_report_live'),
+        ]
     
     def __str__(self):
         return f"{self.report_code} - {self.title}"
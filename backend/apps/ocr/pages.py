@@ -0,0 +1,217 @@
+"""
+PDF分页识别
+
+多页PDF整体发送给OCR服务容易超时，这里按页拆分后并行识别：
+1. 从MinIO下载PDF，逐页栅格化为PNG上传，每页创建一条 OCRPageResult
+2. 线程池并行识别未完成的页（OCR_CONFIG['PAGE_WORKERS']），每个请求占用一个OCR并发槽位
+3. 全部页识别完成后合并为一条 OCRResult，details 中每项带页码
+
+已识别完成的页不会重复识别，失败的页可单独重试。
+栅格化依赖 PyMuPDF，未安装时返回None，由调用方退回整份文档识别。
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+
+from common.cache import CacheSemaphore
+from common.services import get_minio_service, get_ocr_service
+from .models import ScanFile, OCRResult, OCRPageResult
+
+logger = logging.getLogger(__name__)
+
+# 等待OCR并发槽位的轮询间隔与最长等待时间（秒）
+SLOT_POLL_SECONDS = 0.5
+SLOT_WAIT_TIMEOUT = 120
+
+
+class PageSplitError(Exception):
+    """PDF拆分失败"""
+    pass
+
+
+def is_pdf(scan_file: ScanFile) -> bool:
+    return scan_file.file_type == 'application/pdf'
+
+
+def _page_image_path(scan_file: ScanFile, page_number: int) -> str:
+    base, _ = os.path.splitext(scan_file.file_path)
+    return f'{base}_pages/{page_number}.png'
+
+
+def split_pages(scan_file: ScanFile, user_id: int = None) -> Optional[List[OCRPageResult]]:
+    """
+    将PDF拆分为页面图片
+
+    已拆分过的扫描件直接返回已有的页记录
+
+    Args:
+        scan_file: PDF扫描件
+        user_id: 操作人ID
+
+    Returns:
+        list: 按页码排序的 OCRPageResult，未安装 PyMuPDF 时返回None
+
+    Raises:
+        PageSplitError: 下载、解析或上传页面图片失败
+    """
+    pages = list(scan_file.pages.all())
+    if pages:
+        return pages
+
+    try:
+        import fitz
+    except ImportError:
+        logger.warning("未安装PyMuPDF，PDF将整体识别")
+        return None
+
+    minio_service = get_minio_service()
+    data = minio_service.download_file(scan_file.file_path)
+    if not data:
+        raise PageSplitError('下载PDF文件失败')
+
+    dpi = settings.OCR_CONFIG.get('PDF_DPI', 200)
+    try:
+        document = fitz.open(stream=data, filetype='pdf')
+    except Exception as e:
+        raise PageSplitError(f'PDF解析失败: {e}')
+
+    pages = []
+    with document:
+        for index, page in enumerate(document, start=1):
+            # 逐页栅格化并上传，避免整份文档的图片同时驻留内存
+            image = page.get_pixmap(dpi=dpi).tobytes('png')
+            image_path = _page_image_path(scan_file, index)
+            if minio_service.upload_bytes(image, image_path, 'image/png') is None:
+                raise PageSplitError(f'第{index}页图片上传失败')
+            pages.append(OCRPageResult(
+                scan_file=scan_file,
+                page_number=index,
+                image_path=image_path,
+                created_by_id=user_id,
+            ))
+
+    if not pages:
+        raise PageSplitError('PDF没有页面')
+    OCRPageResult.objects.bulk_create(pages)
+    return list(scan_file.pages.all())
+
+
+def _recognize_page(ocr_service, semaphore: CacheSemaphore, image_path: str) -> Tuple[dict, float]:
+    """在工作线程中识别单页，只做网络调用，不访问数据库"""
+    slot = semaphore.acquire()
+    waited = 0.0
+    while slot is None and waited < SLOT_WAIT_TIMEOUT:
+        time.sleep(SLOT_POLL_SECONDS)
+        waited += SLOT_POLL_SECONDS
+        slot = semaphore.acquire()
+    if slot is None:
+        return {'success': False, 'message': '等待OCR并发槽位超时'}, 0.0
+
+    try:
+        start_time = time.time()
+        result = ocr_service.recognize(image_path)
+        return result or {'success': False, 'message': 'OCR服务无响应'}, time.time() - start_time
+    finally:
+        semaphore.release(slot)
+
+
+def recognize_pages(pages: List[OCRPageResult], semaphore: CacheSemaphore) -> List[OCRPageResult]:
+    """
+    并行识别未完成的页
+
+    Args:
+        pages: 页记录
+        semaphore: OCR并发信号量
+
+    Returns:
+        list: 本次识别失败的页
+    """
+    todo = [page for page in pages if page.status != 'completed']
+    if not todo:
+        return []
+
+    ocr_service = get_ocr_service()
+    workers = min(settings.OCR_CONFIG.get('PAGE_WORKERS', 4), len(todo))
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ocr-page') as executor:
+        futures = {
+            executor.submit(_recognize_page, ocr_service, semaphore, page.image_path): page
+            for page in todo
+        }
+        for future in as_completed(futures):
+            page = futures[future]
+            try:
+                result, process_time = future.result()
+            except Exception as e:
+                result, process_time = {'success': False, 'message': str(e)}, 0.0
+
+            page.process_time = process_time
+            if result.get('success'):
+                page.status = 'completed'
+                page.raw_text = result.get('text', '')
+                page.details = result.get('details', [])
+                page.confidence = result.get('confidence', 0)
+                page.error_message = ''
+            else:
+                page.status = 'failed'
+                page.error_message = str(result.get('message', '未知错误'))[:500]
+                failed.append(page)
+            page.save(update_fields=[
+                'status', 'raw_text', 'details', 'confidence', 'process_time', 'error_message', 'updated_at'
+            ])
+    return failed
+
+
+def merge_pages(scan_file: ScanFile, pages: List[OCRPageResult], user_id: int = None) -> OCRResult:
+    """
+    合并各页识别结果
+
+    - raw_text: 各页文本按页码拼接，每页前加页码标记
+    - details: 各页识别详情，每项增加 page 字段
+    - process_time: 各页识别耗时之和，每页耗时记录在 structured_data['pages']
+
+    Args:
+        scan_file: 扫描件
+        pages: 已全部识别完成的页记录
+        user_id: 操作人ID
+
+    Returns:
+        OCRResult: 合并后的识别结果
+    """
+    pages = sorted(pages, key=lambda page: page.page_number)
+    raw_text = '\n\n'.join(f'[第{page.page_number}页]\n{page.raw_text}' for page in pages)
+    details = [
+        {**item, 'page': page.page_number} if isinstance(item, dict) else {'value': item, 'page': page.page_number}
+        for page in pages
+        for item in page.details
+    ]
+    confidence = sum(page.confidence for page in pages) / len(pages)
+
+    result, _ = OCRResult.objects.update_or_create(
+        scan_file=scan_file,
+        defaults={
+            'raw_text': raw_text,
+            'structured_data': {
+                'page_count': len(pages),
+                'pages': [
+                    {
+                        'page': page.page_number,
+                        'confidence': page.confidence,
+                        'process_time': round(page.process_time, 3),
+                    }
+                    for page in pages
+                ],
+            },
+            'confidence': round(confidence, 4),
+            'details': details,
+            'process_time': sum(page.process_time for page in pages),
+            'reused_from': None,
+            'created_by_id': user_id,
+        }
+    )
+    return result
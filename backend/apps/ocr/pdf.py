@@ -0,0 +1,208 @@
+"""
+检测报告PDF生成
+
+根据报告内容、检测结论和关联的原始记录生成PDF，上传MinIO后写入 Report.file_path：
+- 内容寻址：输入（报告、样品信息、原始记录、版式版本）的 sha256 即为对象名，
+  输入不变的报告不重新生成（Report.pdf_hash 记录当前PDF对应的哈希）
+- 异步生成：在 Celery worker 中执行（pdf 队列，见 tasks.py），批量发放的报告并行生成，不占用接口进程
+- 中文字体使用 reportlab 内置的 STSong-Light（CID字体），无需额外字体文件
+"""
+
+import hashlib
+import json
+from io import BytesIO
+from typing import Dict, List
+
+from django.core.serializers.json import DjangoJSONEncoder
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from .models import Report
+
+# 版式变更时递增，使已生成的PDF全部重新生成
+RENDERER_VERSION = 1
+
+FONT_NAME = 'STSong-Light'
+
+pdfmetrics.registerFont(UnicodeCIDFont(FONT_NAME))
+
+STYLES = {
+    'title': ParagraphStyle('title', fontName=FONT_NAME, fontSize=18, leading=24, alignment=1, spaceAfter=6 * mm),
+    'heading': ParagraphStyle('heading', fontName=FONT_NAME, fontSize=12, leading=18, spaceBefore=4 * mm, spaceAfter=2 * mm),
+    'body': ParagraphStyle('body', fontName=FONT_NAME, fontSize=10, leading=15),
+}
+
+TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('BACKGROUND', (0, 0), (0, -1), colors.whitesmoke),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+
+# ==================== 输入与哈希 ====================
+
+def _username(user) -> str:
+    return user.username if user else ''
+
+
+def report_inputs(report: Report) -> Dict:
+    """
+    收集生成PDF所需的全部输入
+
+    Args:
+        report: 检测报告
+
+    Returns:
+        dict: 可JSON序列化的输入，相同输入生成相同PDF
+    """
+    commission = report.workflow.sample_receive.commission
+    records = (
+        report.workflow.original_records
+        .filter(is_deleted=False)
+        .select_related('template', 'tester')
+        .order_by('id')
+    )
+    return {
+        'version': RENDERER_VERSION,
+        'report': {
+            'report_code': report.report_code,
+            'title': report.title,
+            'content': report.content,
+            'conclusion': report.conclusion or '',
+            'status': report.get_status_display(),
+            'issue_date': report.issue_date,
+            'editor': _username(report.editor),
+            'reviewer': _username(report.reviewer),
+            'approver': _username(report.approver),
+        },
+        'sample': {
+            'client': commission.client.name,
+            'project_name': commission.project_name,
+            'sample_name': commission.sample_name,
+            'commission_code': commission.code,
+        },
+        'records': [
+            {
+                'record_code': record.record_code,
+                'template': record.template.name,
+                'units': {field.get('name'): field.get('unit', '') for field in record.template.fields or []},
+                'test_date': record.test_date,
+                'tester': _username(record.tester),
+                'data': record.data,
+            }
+            for record in records
+        ],
+    }
+
+
+def inputs_hash(inputs: Dict) -> str:
+    """输入的 sha256"""
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def pdf_object_name(digest: str) -> str:
+    """PDF在对象存储中的路径"""
+    return f'reports/pdf/{digest[:2]}/{digest}.pdf'
+
+
+# ==================== 渲染 ====================
+
+def _text(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, cls=DjangoJSONEncoder)
+    return str(value)
+
+
+def _cell(value) -> Paragraph:
+    return Paragraph(_text(value).replace('&', '&amp;').replace('<', '&lt;'), STYLES['body'])
+
+
+def _table(rows: List[List], col_widths: List[float], header: bool = False) -> Table:
+    table = Table([[_cell(value) for value in row] for row in rows], colWidths=col_widths)
+    table.setStyle(TABLE_STYLE)
+    if header:
+        table.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.whitesmoke)]))
+    return table
+
+
+def _content_flowables(content) -> List:
+    """报告内容：键值展开为两列表格，对象列表展开为带表头的表格"""
+    if not isinstance(content, dict):
+        return [Paragraph(_text(content), STYLES['body'])] if content else []
+
+    flowables, pairs = [], []
+    for key, value in content.items():
+        if isinstance(value, dict):
+            flowables += [Paragraph(_text(key), STYLES['heading']),
+                          _table([[k, v] for k, v in value.items()], [60 * mm, 110 * mm])]
+        elif isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+            columns = list(dict.fromkeys(column for item in value for column in item))
+            width = 170 * mm / len(columns)
+            flowables += [Paragraph(_text(key), STYLES['heading']),
+                          _table([columns] + [[item.get(column) for column in columns] for item in value],
+                                 [width] * len(columns), header=True)]
+        elif value not in (None, '', [], {}):
+            pairs.append([key, value])
+    if pairs:
+        flowables.insert(0, _table(pairs, [60 * mm, 110 * mm]))
+    return flowables
+
+
+def render_pdf(inputs: Dict) -> bytes:
+    """
+    生成PDF
+
+    Args:
+        inputs: report_inputs 的返回值
+
+    Returns:
+        bytes: PDF内容（invariant 模式，相同输入输出相同字节）
+    """
+    report, sample = inputs['report'], inputs['sample']
+    story = [
+        Paragraph(_text(report['title']), STYLES['title']),
+        _table([
+            ['报告编号', report['report_code'], '委托编号', sample['commission_code']],
+            ['委托单位', sample['client'], '工程名称', sample['project_name']],
+            ['样品名称', sample['sample_name'], '发放日期', report['issue_date']],
+        ], [25 * mm, 60 * mm, 25 * mm, 60 * mm]),
+        Paragraph('检测内容', STYLES['heading']),
+        *_content_flowables(report['content']),
+    ]
+
+    for record in inputs['records']:
+        story.append(Paragraph(
+            f"原始记录 {_text(record['record_code'])}（{_text(record['template'])}，"
+            f"试验日期 {_text(record['test_date'])}，试验人员 {_text(record['tester'])}）",
+            STYLES['heading'],
+        ))
+        rows = [['检测项目', '结果', '单位']] + [
+            [name, value, record['units'].get(name, '')] for name, value in (record['data'] or {}).items()
+        ]
+        story.append(_table(rows, [70 * mm, 70 * mm, 30 * mm], header=True))
+
+    story += [
+        Paragraph('检测结论', STYLES['heading']),
+        Paragraph(_text(report['conclusion']) or '—', STYLES['body']),
+        Spacer(1, 10 * mm),
+        _table([['编制', report['editor'], '审核', report['reviewer'], '批准', report['approver']]],
+               [20 * mm, 37 * mm, 20 * mm, 37 * mm, 20 * mm, 36 * mm]),
+    ]
+
+    buffer = BytesIO()
+    document = SimpleDocTemplate(
+        buffer, pagesize=A4, title=_text(report['title']), invariant=True,
+        leftMargin=20 * mm, rightMargin=20 * mm, topMargin=20 * mm, bottomMargin=20 * mm,
+    )
+    document.build(story)
+    return buffer.getvalue()
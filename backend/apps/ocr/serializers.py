@@ -3,7 +3,7 @@ OCR模块序列化器
 """
 
 from rest_framework import serializers
-from .models import ScanFile, OCRResult, Report
+from .models import ScanFile, OCRResult, OCRPageResult, Report
 
 
 class ScanFileSerializer(serializers.ModelSerializer):
@@ -13,9 +13,9 @@ class ScanFileSerializer(serializers.ModelSerializer):
         model = ScanFile
         fields = [
             'id', 'file_name', 'file_path', 'file_type', 'file_size',
-            'workflow', 'status', 'status_display', 'created_at'
+            'workflow', 'status', 'status_display', 'content_hash', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'content_hash', 'created_at']
 
 
 class OCRResultSerializer(serializers.ModelSerializer):
@@ -25,11 +25,22 @@ class OCRResultSerializer(serializers.ModelSerializer):
         model = OCRResult
         fields = [
             'id', 'scan_file', 'file_name', 'raw_text', 'structured_data',
-            'confidence', 'details', 'process_time', 'created_at'
+            'confidence', 'details', 'process_time', 'reused_from', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
 
 
+class OCRPageResultSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    
+    class Meta:
+        model = OCRPageResult
+        fields = [
+            'id', 'page_number', 'image_path', 'status', 'status_display',
+            'raw_text', 'confidence', 'process_time', 'error_message', 'updated_at'
+        ]
+
+
 class ReportListSerializer(serializers.ModelSerializer):
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     editor_name = serializers.CharField(source='editor.username', read_only=True)
@@ -40,7 +51,7 @@ class ReportListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'report_code', 'workflow', 'title', 'sample_name',
             'status', 'status_display', 'editor', 'editor_name',
-            'issue_date', 'created_at'
+            'pdf_status', 'issue_date', 'created_at'
         ]
 
 
@@ -54,9 +65,9 @@ class ReportDetailSerializer(serializers.ModelSerializer):
         model = Report
         fields = [
             'id', 'report_code', 'workflow', 'title', 'content', 'conclusion',
-            'file_path', 'status', 'status_display',
+            'file_path', 'pdf_status', 'pdf_hash', 'status', 'status_display',
             'editor', 'editor_name', 'reviewer', 'reviewer_name',
             'approver', 'approver_name', 'review_date', 'approve_date',
             'issue_date', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'report_code', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'report_code', 'pdf_status', 'pdf_hash', 'created_at', 'updated_at']
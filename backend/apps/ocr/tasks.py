@@ -0,0 +1,288 @@
+"""
+OCR异步任务
+
+识别任务在 Celery worker 中执行（ocr 队列），状态流转：
+pending -> processing -> completed / failed
+
+- 并发控制：CacheSemaphore 限制同时发往OCR服务的请求数（OCR_CONFIG['MAX_CONCURRENCY']）
+- 重试策略：识别失败按 RETRY_BACKOFF * 2^n 秒退避重试，超过 MAX_RETRIES 次标记为失败
+- 结果复用：内容哈希相同且已识别完成的文件直接复制识别结果，不调用OCR服务
+- PDF：按页拆分并行识别，重试时只识别失败的页
+
+检测报告PDF生成任务（pdf 队列）见 render_report_pdf，状态流转：
+none/completed/failed -> pending -> rendering -> completed / failed
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from common.cache import CacheSemaphore
+from common.services import get_minio_service, get_ocr_service
+from .models import ScanFile, OCRResult, Report
+from .pages import PageSplitError, is_pdf, merge_pages, recognize_pages, split_pages
+from .pdf import inputs_hash, pdf_object_name, render_pdf, report_inputs
+
+logger = logging.getLogger(__name__)
+
+# 并发槽位已满时的等待间隔（秒）
+SLOT_WAIT_SECONDS = 2
+
+# 识别中状态超过该时长视为 worker 异常退出，允许重新领取（秒）
+PROCESSING_STALE_SECONDS = 600
+
+
+def _ocr_semaphore() -> CacheSemaphore:
+    # 槽位过期时间略大于OCR请求超时，防止 worker 崩溃后槽位永久占用
+    return CacheSemaphore('ocr', settings.OCR_CONFIG.get('MAX_CONCURRENCY', 4), timeout=90)
+
+
+def reuse_existing_result(scan_file: ScanFile, user_id: int = None):
+    """
+    复用相同内容文件的识别结果
+
+    按内容哈希查找已完成识别的其他扫描件，复制其识别结果并标记为已完成，不再调用OCR服务。
+
+    Args:
+        scan_file: 扫描件
+        user_id: 提交人ID
+
+    Returns:
+        OCRResult: 复用生成的识别结果，没有可复用结果时返回None
+    """
+    if not scan_file.content_hash:
+        return None
+    source = (
+        OCRResult.objects
+        .filter(
+            scan_file__content_hash=scan_file.content_hash,
+            scan_file__status='completed',
+            scan_file__is_deleted=False,
+        )
+        .exclude(scan_file_id=scan_file.pk)
+        .order_by('-id')
+        .first()
+    )
+    if source is None:
+        return None
+
+    result, _ = OCRResult.objects.update_or_create(
+        scan_file=scan_file,
+        defaults={
+            'raw_text': source.raw_text,
+            'structured_data': source.structured_data,
+            'confidence': source.confidence,
+            'details': source.details,
+            'process_time': 0,
+            # 始终指向真正调用OCR服务得到的结果
+            'reused_from_id': source.reused_from_id or source.pk,
+            'created_by_id': user_id,
+        }
+    )
+    ScanFile.objects.filter(pk=scan_file.pk).update(status='completed', updated_at=timezone.now())
+    scan_file.status = 'completed'
+    return result
+
+
+def enqueue_recognition(scan_file: ScanFile, user=None, reuse: bool = True) -> bool:
+    """
+    提交识别任务
+
+    已完成或识别中的扫描件不重复提交；失败的扫描件重置为待识别后重新提交。
+
+    Args:
+        scan_file: 扫描件
+        user: 提交人
+        reuse: 是否允许复用相同内容文件的识别结果
+
+    Returns:
+        bool: 是否已提交
+    """
+    updated = ScanFile.objects.filter(
+        pk=scan_file.pk, status__in=['pending', 'failed']
+    ).update(status='pending', updated_at=timezone.now())
+    if not updated:
+        return False
+    scan_file.status = 'pending'
+    recognize_scan_file.delay(scan_file_id=scan_file.pk, user_id=user.pk if user else None, reuse=reuse)
+    return True
+
+
+@shared_task(bind=True, acks_late=True, max_retries=None)
+def recognize_scan_file(self, scan_file_id: int, user_id: int = None, attempt: int = 0, reuse: bool = True):
+    """
+    识别扫描件
+
+    PDF按页拆分并行识别（见 pages.py），其他文件整体识别
+
+    Args:
+        scan_file_id: 扫描件ID
+        user_id: 提交人ID，记录为识别结果的创建人
+        attempt: 已失败的识别次数（等待并发槽位不计入）
+        reuse: 是否允许复用相同内容文件的识别结果
+    """
+    now = timezone.now()
+
+    # 条件更新领取任务，避免重复投递时多个 worker 同时识别同一文件：
+    # 待识别的可以领取；重试时扫描件已是识别中；识别中但长时间未更新的视为 worker 已崩溃
+    claimable = Q(status='pending') | Q(
+        status='processing', updated_at__lt=now - timedelta(seconds=PROCESSING_STALE_SECONDS)
+    )
+    if self.request.retries:
+        claimable |= Q(status='processing')
+    claimed = ScanFile.objects.filter(claimable, pk=scan_file_id).update(status='processing', updated_at=now)
+    if not claimed:
+        logger.info(f"扫描件 {scan_file_id} 已被处理，跳过")
+        return
+
+    scan_file = ScanFile.objects.get(pk=scan_file_id)
+
+    # 排队期间相同内容的文件可能已识别完成
+    if reuse and reuse_existing_result(scan_file, user_id):
+        return
+
+    semaphore = _ocr_semaphore()
+
+    if is_pdf(scan_file):
+        try:
+            pages = split_pages(scan_file, user_id)
+        except PageSplitError as e:
+            return _retry_or_fail(self, scan_file_id, user_id, attempt, reuse, str(e))
+        if pages is not None:
+            failed = recognize_pages(pages, semaphore)
+            if failed:
+                numbers = ','.join(str(page.page_number) for page in failed)
+                return _retry_or_fail(self, scan_file_id, user_id, attempt, reuse, f'第{numbers}页识别失败')
+            merge_pages(scan_file, pages, user_id)
+            ScanFile.objects.filter(pk=scan_file_id).update(status='completed', updated_at=timezone.now())
+            return
+
+    slot = semaphore.acquire()
+    if slot is None:
+        # 并发已满，不计入失败次数
+        raise self.retry(countdown=SLOT_WAIT_SECONDS)
+
+    try:
+        start_time = time.time()
+        result = get_ocr_service().recognize(scan_file.file_path)
+        process_time = time.time() - start_time
+    finally:
+        semaphore.release(slot)
+
+    if result.get('success'):
+        OCRResult.objects.update_or_create(
+            scan_file=scan_file,
+            defaults={
+                'raw_text': result.get('text', ''),
+                'structured_data': result.get('structured_data', {}),
+                'confidence': result.get('confidence', 0),
+                'details': result.get('details', []),
+                'process_time': process_time,
+                'reused_from': None,
+                'created_by_id': user_id,
+            }
+        )
+        ScanFile.objects.filter(pk=scan_file_id).update(status='completed', updated_at=timezone.now())
+        return
+
+    _retry_or_fail(self, scan_file_id, user_id, attempt, reuse, result.get('message', '未知错误'))
+
+
+def _retry_or_fail(task, scan_file_id: int, user_id: int, attempt: int, reuse: bool, message: str):
+    """未超过重试次数时退避重试，否则标记为识别失败"""
+    config = settings.OCR_CONFIG
+    if attempt < config.get('MAX_RETRIES', 3):
+        countdown = config.get('RETRY_BACKOFF', 10) * (2 ** attempt)
+        logger.warning(f"扫描件 {scan_file_id} 识别失败，{countdown}秒后重试: {message}")
+        raise task.retry(
+            countdown=countdown,
+            kwargs={'scan_file_id': scan_file_id, 'user_id': user_id, 'attempt': attempt + 1, 'reuse': reuse},
+        )
+
+    logger.error(f"扫描件 {scan_file_id} 识别失败: {message}")
+    ScanFile.objects.filter(pk=scan_file_id).update(status='failed', updated_at=timezone.now())
+
+
+# ==================== 检测报告PDF ====================
+
+def pdf_up_to_date(report: Report, digest: str = None) -> bool:
+    """报告PDF已生成且输入未变化"""
+    digest = digest or inputs_hash(report_inputs(report))
+    return report.pdf_status == 'completed' and bool(report.file_path) and report.pdf_hash == digest
+
+
+def enqueue_pdf(report: Report, force: bool = False) -> bool:
+    """
+    提交PDF生成任务
+
+    输入未变化的报告不重新生成；已在排队或生成中的报告不重复提交。
+
+    Args:
+        report: 检测报告
+        force: 输入未变化时也重新生成
+
+    Returns:
+        bool: 是否已提交
+    """
+    if not force and pdf_up_to_date(report):
+        return False
+    updated = Report.objects.filter(pk=report.pk).exclude(
+        pdf_status__in=['pending', 'rendering']
+    ).update(pdf_status='pending', updated_at=timezone.now())
+    if not updated:
+        return False
+    report.pdf_status = 'pending'
+    render_report_pdf.delay(report_id=report.pk, force=force)
+    return True
+
+
+@shared_task(acks_late=True)
+def render_report_pdf(report_id: int, force: bool = False):
+    """
+    生成检测报告PDF并上传MinIO
+
+    Args:
+        report_id: 报告ID
+        force: 输入未变化时也重新生成
+    """
+    now = timezone.now()
+    claimable = Q(pdf_status='pending') | Q(
+        pdf_status='rendering', updated_at__lt=now - timedelta(seconds=PROCESSING_STALE_SECONDS)
+    )
+    claimed = Report.objects.filter(claimable, pk=report_id).update(pdf_status='rendering', updated_at=now)
+    if not claimed:
+        logger.info(f"报告 {report_id} 的PDF已被处理，跳过")
+        return
+
+    report = Report.objects.select_related(
+        'editor', 'reviewer', 'approver', 'workflow__sample_receive__commission__client'
+    ).get(pk=report_id)
+    inputs = report_inputs(report)
+    digest = inputs_hash(inputs)
+
+    # 排队期间可能已由其他任务生成；对象名即内容哈希，相同输入直接复用
+    if not force and report.pdf_hash == digest and report.file_path:
+        Report.objects.filter(pk=report_id).update(pdf_status='completed', updated_at=timezone.now())
+        return
+
+    try:
+        data = render_pdf(inputs)
+    except Exception:
+        logger.exception(f"报告 {report_id} PDF生成失败")
+        Report.objects.filter(pk=report_id).update(pdf_status='failed', updated_at=timezone.now())
+        return
+
+    object_name = pdf_object_name(digest)
+    if not get_minio_service().upload_bytes(data, object_name, content_type='application/pdf'):
+        logger.error(f"报告 {report_id} PDF上传失败")
+        Report.objects.filter(pk=report_id).update(pdf_status='failed', updated_at=timezone.now())
+        return
+
+    Report.objects.filter(pk=report_id).update(
+        file_path=object_name, pdf_hash=digest, pdf_status='completed', updated_at=timezone.now()
+    )
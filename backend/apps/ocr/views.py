@@ -5,28 +5,41 @@ OCR识别与报告生成模块视图
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.utils import timezone
 from common.response import success_response, error_response
 from common.permissions import RoleBasedPermission
-from common.services import get_ocr_service, get_minio_service
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
+from common.services import get_minio_service
+from common.utils import calculate_md5, generate_file_path
 from .models import ScanFile, OCRResult, Report
+from .tasks import enqueue_pdf, enqueue_recognition, pdf_up_to_date, reuse_existing_result
 from .serializers import (
-    ScanFileSerializer, OCRResultSerializer,
+    ScanFileSerializer, OCRResultSerializer, OCRPageResultSerializer,
     ReportListSerializer, ReportDetailSerializer
 )
 
 
-class ScanFileViewSet(viewsets.ModelViewSet):
+# 批量识别单次最多提交的扫描件数量
+BATCH_RECOGNIZE_LIMIT = 200
+
+# 批量生成PDF单次最多提交的报告数量
+BATCH_PDF_LIMIT = 200
+
+
+class ScanFileViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     扫描件管理视图集
     
     接口列表：
     - GET /scans/ - 获取扫描件列表
     - POST /scans/upload/ - 上传扫描件
-    - POST /scans/{id}/recognize/ - 触发OCR识别
+    - POST /scans/{id}/recognize/ - 触发OCR识别（异步）
+    - POST /scans/batch_recognize/ - 批量提交OCR识别
+    - GET /scans/{id}/pages/ - PDF分页识别状态
+    - POST /scans/{id}/retry_pages/ - 重试PDF中识别失败（或指定）的页
     """
-    queryset = ScanFile.objects.filter(is_deleted=False)
+    queryset = ScanFile.objects.all()
     serializer_class = ScanFileSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     parser_classes = [MultiPartParser, FormParser]
@@ -36,6 +49,9 @@ class ScanFileViewSet(viewsets.ModelViewSet):
         'retrieve': ['admin', 'tester', 'reviewer', 'approver'],
         'upload': ['admin', 'tester'],
         'recognize': ['admin', 'tester'],
+        'batch_recognize': ['admin', 'tester'],
+        'pages': ['admin', 'tester', 'reviewer', 'approver'],
+        'retry_pages': ['admin', 'tester'],
     }
     
     @action(detail=False, methods=['post'])
@@ -56,9 +72,11 @@ class ScanFileViewSet(viewsets.ModelViewSet):
         if file.content_type not in allowed_types:
             return error_response('不支持的文件类型')
         
+        # 计算内容哈希，相同文件可复用识别结果
+        content_hash = calculate_md5(file)
+        
         # 上传到MinIO
         minio_service = get_minio_service()
-        from common.utils import generate_file_path
         file_path = generate_file_path('scans', file.name)
         
         url = minio_service.upload_bytes(
@@ -73,6 +91,7 @@ class ScanFileViewSet(viewsets.ModelViewSet):
             file_path=file_path,
             file_type=file.content_type,
             file_size=file.size,
+            content_hash=content_hash,
             workflow_id=workflow_id if workflow_id else None,
             created_by=request.user
         )
@@ -86,8 +105,8 @@ class ScanFileViewSet(viewsets.ModelViewSet):
     def recognize(self, request, pk=None):
         """
         触发OCR识别
-        
-        调用PaddleOCR服务进行识别
+
+        提交异步识别任务后立即返回，识别进度通过扫描件的 status 查询
         """
         scan_file = self.get_object()
         
@@ -102,45 +121,115 @@ class ScanFileViewSet(viewsets.ModelViewSet):
                     OCRResultSerializer(result).data,
                     '获取已有识别结果'
                 )
+            # 状态为已完成但结果丢失，重新识别
+            ScanFile.objects.filter(pk=scan_file.pk).update(status='pending')
         
-        # 更新状态为识别中
-        scan_file.status = 'processing'
-        scan_file.save(update_fields=['status', 'updated_at'])
-        
-        # 调用OCR服务
-        ocr_service = get_ocr_service()
-        
-        import time
-        start_time = time.time()
-        result = ocr_service.recognize(scan_file.file_path)
-        process_time = time.time() - start_time
-        
-        if result.get('success'):
-            # 保存识别结果
-            ocr_result = OCRResult.objects.create(
-                scan_file=scan_file,
-                raw_text=result.get('text', ''),
-                structured_data=result.get('structured_data', {}),
-                confidence=result.get('confidence', 0),
-                details=result.get('details', []),
-                process_time=process_time,
-                created_by=request.user
-            )
-            
-            scan_file.status = 'completed'
-            scan_file.save(update_fields=['status', 'updated_at'])
-            
+        # 相同内容的文件已识别过，直接复用结果
+        reused = reuse_existing_result(scan_file, request.user.pk)
+        if reused:
             return success_response(
-                OCRResultSerializer(ocr_result).data,
-                '识别完成'
+                OCRResultSerializer(reused).data,
+                '复用相同文件的识别结果'
             )
+        
+        if not enqueue_recognition(scan_file, request.user):
+            return error_response('文件正在识别中')
+        
+        scan_file.refresh_from_db()
+        return success_response(
+            ScanFileSerializer(scan_file).data,
+            '识别任务已提交',
+            code=202
+        )
+    
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser])
+    def batch_recognize(self, request):
+        """
+        批量提交OCR识别
+
+        请求参数：
+        - ids: 扫描件ID列表
+
+        已完成或识别中的扫描件会被跳过
+        """
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not ids:
+            return error_response('请选择要识别的扫描件')
+        if len(ids) > BATCH_RECOGNIZE_LIMIT:
+            return error_response(f'单次最多提交{BATCH_RECOGNIZE_LIMIT}个扫描件')
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return error_response('扫描件ID格式错误')
+        
+        queued, skipped = [], []
+        for scan_file in self.filter_queryset(self.get_queryset()).filter(pk__in=ids):
+            if enqueue_recognition(scan_file, request.user):
+                queued.append(scan_file.pk)
+            else:
+                skipped.append(scan_file.pk)
+        
+        found = set(queued) | set(skipped)
+        return success_response(
+            {
+                'queued': queued,
+                'skipped': skipped,
+                'not_found': [pk for pk in ids if pk not in found],
+            },
+            f'已提交{len(queued)}个识别任务',
+            code=202
+        )
+
+
+    @action(detail=True, methods=['get'])
+    def pages(self, request, pk=None):
+        """获取PDF分页识别状态"""
+        scan_file = self.get_object()
+        return success_response(OCRPageResultSerializer(scan_file.pages.all(), many=True).data)
+    
+    @action(detail=True, methods=['post'], parser_classes=[JSONParser])
+    def retry_pages(self, request, pk=None):
+        """
+        重试PDF分页识别
+
+        请求参数：
+        - pages: 页码列表，可选；为空时重试所有识别失败的页
+
+        已识别完成的其他页保留原结果，不会重复识别
+        """
+        scan_file = self.get_object()
+        
+        if scan_file.status == 'processing':
+            return error_response('文件正在识别中')
+        if not scan_file.pages.exists():
+            return error_response('该文件没有分页识别记录')
+        
+        numbers = request.data.get('pages')
+        targets = scan_file.pages.all()
+        if numbers:
+            if not isinstance(numbers, list):
+                return error_response('页码格式错误')
+            targets = targets.filter(page_number__in=numbers)
         else:
-            scan_file.status = 'failed'
-            scan_file.save(update_fields=['status', 'updated_at'])
-            return error_response(f"识别失败: {result.get('message', '未知错误')}")
+            targets = targets.filter(status='failed')
+        
+        count = targets.update(status='pending', error_message='', updated_at=timezone.now())
+        if not count:
+            return error_response('没有需要重试的页')
+        
+        # 已完成的文件重试指定页时需重新合并结果
+        ScanFile.objects.filter(pk=scan_file.pk, status='completed').update(status='pending')
+        enqueue_recognition(scan_file, request.user, reuse=False)
+        
+        scan_file.refresh_from_db()
+        return success_response(
+            ScanFileSerializer(scan_file).data,
+            f'已提交{count}页重新识别',
+            code=202
+        )
 
 
-class OCRResultViewSet(viewsets.ReadOnlyModelViewSet):
+class OCRResultViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """OCR识别结果视图集（只读）"""
     queryset = OCRResult.objects.all()
     serializer_class = OCRResultSerializer
@@ -148,7 +237,7 @@ class OCRResultViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['scan_file']
 
 
-class ReportViewSet(viewsets.ModelViewSet):
+class ReportViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     检测报告视图集
     
@@ -159,9 +248,10 @@ class ReportViewSet(viewsets.ModelViewSet):
     - PUT /reports/{id}/ - 更新报告
     - POST /reports/{id}/review/ - 审核报告
     - POST /reports/{id}/approve/ - 批准报告
-    - POST /reports/{id}/generate_pdf/ - 生成PDF
+    - POST /reports/{id}/generate_pdf/ - 生成PDF（异步）
+    - POST /reports/batch_generate_pdf/ - 批量生成PDF（异步）
     """
-    queryset = Report.objects.filter(is_deleted=False)
+    queryset = Report.objects.all()
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['workflow', 'status', 'editor']
     search_fields = ['report_code', 'title']
@@ -174,6 +264,8 @@ class ReportViewSet(viewsets.ModelViewSet):
         'update': ['admin', 'tester'],
         'review': ['admin', 'reviewer'],
         'approve': ['admin', 'approver'],
+        'generate_pdf': ['admin', 'tester', 'reviewer', 'approver'],
+        'batch_generate_pdf': ['admin', 'tester', 'reviewer', 'approver'],
     }
     
     def get_serializer_class(self):
@@ -222,6 +314,8 @@ class ReportViewSet(viewsets.ModelViewSet):
         report.approve_date = timezone.now()
         report.issue_date = timezone.now().date()
         report.save()
+        # 发放的报告自动生成PDF（含批准人与发放日期）
+        enqueue_pdf(report)
         
         return success_response(ReportDetailSerializer(report).data, '报告已批准发放')
     
@@ -230,11 +324,64 @@ class ReportViewSet(viewsets.ModelViewSet):
         """
         生成PDF报告
         
-        预留接口，后续实现PDF生成逻辑
+        在 pdf 队列中异步生成，通过报告详情的 pdf_status 查询进度；
+        报告内容、样品信息和原始记录均未变化时直接返回已生成的PDF
+        
+        请求参数：
+        - force: 内容未变化时也重新生成，默认 false
         """
         report = self.get_object()
+        force = str(request.data.get('force', '')).lower() in ('1', 'true')
+        
+        if not force and pdf_up_to_date(report):
+            return success_response(ReportDetailSerializer(report).data, 'PDF已是最新')
+        if not enqueue_pdf(report, force=force):
+            return error_response('PDF正在生成中，请稍后查询')
+        return success_response(
+            {'id': report.pk, 'pdf_status': report.pdf_status},
+            'PDF生成任务已提交',
+            code=202
+        )
+    
+    @action(detail=False, methods=['post'])
+    def batch_generate_pdf(self, request):
+        """
+        批量生成PDF报告
         
-        # TODO: 实现PDF生成逻辑
-        # 可使用 reportlab 或 weasyprint 库
+        请求参数：
+        - ids: 报告ID列表
+        - force: 内容未变化时也重新生成，默认 false
         
-        return success_response(message='PDF生成功能待实现')
+        内容未变化或正在生成的报告计入 skipped
+        """
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not ids:
+            return error_response('请选择要生成的报告')
+        if len(ids) > BATCH_PDF_LIMIT:
+            return error_response(f'单次最多提交{BATCH_PDF_LIMIT}份报告')
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return error_response('报告ID格式错误')
+        force = str(request.data.get('force', '')).lower() in ('1', 'true')
+        
+        queued, skipped = [], []
+        reports = self.filter_queryset(self.get_queryset()).filter(pk__in=ids).select_related(
+            'editor', 'reviewer', 'approver', 'workflow__sample_receive__commission__client'
+        )
+        for report in reports:
+            if enqueue_pdf(report, force=force):
+                queued.append(report.pk)
+            else:
+                skipped.append(report.pk)
+        
+        found = set(queued) | set(skipped)
+        return success_response(
+            {
+                'queued': queued,
+                'skipped': skipped,
+                'not_found': [pk for pk in ids if pk not in found],
+            },
+            f'已提交{len(queued)}个PDF生成任务',
+            code=202
+        )
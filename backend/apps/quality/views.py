@@ -5,14 +5,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from common.response import success_response, error_response
 from common.permissions import RoleBasedPermission
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
 from common.services import get_minio_service
 from .models import QualityDocument, DocumentCategory, DocumentVersion
 from .serializers import QualityDocumentSerializer, DocumentCategorySerializer, DocumentVersionSerializer
 
 
-class DocumentCategoryViewSet(viewsets.ModelViewSet):
+class DocumentCategoryViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """文件分类视图集"""
-    queryset = DocumentCategory.objects.filter(is_deleted=False)
+    queryset = DocumentCategory.objects.all()
     serializer_class = DocumentCategorySerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     
@@ -28,14 +29,14 @@ class DocumentCategoryViewSet(viewsets.ModelViewSet):
     def tree(self, request):
         """获取分类树形结构"""
         root_categories = DocumentCategory.objects.filter(
-            parent__isnull=True, is_deleted=False
+            parent__isnull=True
         ).order_by('sort_order')
         return success_response(DocumentCategorySerializer(root_categories, many=True).data)
 
 
-class QualityDocumentViewSet(viewsets.ModelViewSet):
+class QualityDocumentViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """质量体系文件视图集"""
-    queryset = QualityDocument.objects.filter(is_deleted=False)
+    queryset = QualityDocument.objects.all()
     serializer_class = QualityDocumentSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     parser_classes = [MultiPartParser, FormParser]
@@ -96,9 +97,9 @@ class QualityDocumentViewSet(viewsets.ModelViewSet):
         return error_response('获取下载链接失败')
 
 
-class DocumentVersionViewSet(viewsets.ReadOnlyModelViewSet):
+class DocumentVersionViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """文件版本视图集（只读）"""
-    queryset = DocumentVersion.objects.filter(is_deleted=False)
+    queryset = DocumentVersion.objects.all()
     serializer_class = DocumentVersionSerializer
     permission_classes = [IsAuthenticated]
     filterset_fields = ['document']
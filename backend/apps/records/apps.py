@@ -5,3 +5,6 @@ class RecordsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.records'
     verbose_name = '原始记录管理'
+
+    def ready(self):
+        from . import signals  # noqa: F401  注册模板变更时清理参考数据缓存的信号
@@ -193,8 +193,8 @@ class OriginalRecord(BaseModel):
         ordering = ['-test_date', '-created_at']
         indexes = [
             models.Index(fields=['record_code'], name='idx_record_code'),
-            models.Index(fields=['status'], name='idx_record_status'),
-            models.Index(fields=['test_date'], name='idx_record_date'),
+            models.Index(fields=['is_deleted', 'status', 'test_date', 'created_at'], name='idx_record_status'),
+            models.Index(fields=['is_deleted', 'test_date', 'created_at'], name='idx_record_date'),
         ]
     
     def __str__(self):
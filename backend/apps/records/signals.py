@@ -0,0 +1,19 @@
+"""
+原始记录管理信号处理
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.cache import invalidate_namespace
+from .models import RecordTemplate
+
+# 参考数据缓存命名空间（见 views.py）
+TEMPLATE_CACHE = 'records.templates'
+
+
+@receiver(post_save, sender=RecordTemplate)
+@receiver(post_delete, sender=RecordTemplate)
+def invalidate_template_cache(sender, **kwargs):
+    """模板分类随模板变更"""
+    invalidate_namespace(TEMPLATE_CACHE)
@@ -6,17 +6,20 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
+from common.cache import read_through
 from common.response import success_response, error_response
 from common.permissions import RoleBasedPermission
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
 from .models import RecordTemplate, OriginalRecord, RecordAttachment
 from .serializers import (
     RecordTemplateSerializer,
     OriginalRecordListSerializer, OriginalRecordDetailSerializer, OriginalRecordCreateSerializer,
     RecordAttachmentSerializer
 )
+from .signals import TEMPLATE_CACHE
 
 
-class RecordTemplateViewSet(viewsets.ModelViewSet):
+class RecordTemplateViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     原始记录模板视图集
     
@@ -28,7 +31,7 @@ class RecordTemplateViewSet(viewsets.ModelViewSet):
     - DELETE /templates/{id}/ - 删除模板
     - GET /templates/categories/ - 获取模板分类
     """
-    queryset = RecordTemplate.objects.filter(is_deleted=False, is_active=True)
+    queryset = RecordTemplate.objects.filter(is_active=True)
     serializer_class = RecordTemplateSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['category', 'is_active']
@@ -49,14 +52,16 @@ class RecordTemplateViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def categories(self, request):
-        """获取所有模板分类"""
-        categories = RecordTemplate.objects.filter(
-            is_deleted=False, is_active=True
-        ).values_list('category', flat=True).distinct()
-        return success_response(list(categories))
+        """获取所有模板分类（缓存，模板变更时失效）"""
+        categories = read_through(TEMPLATE_CACHE, 'categories', lambda: list(
+            RecordTemplate.objects.filter(
+                is_active=True
+            ).values_list('category', flat=True).distinct()
+        ))
+        return success_response(categories)
 
 
-class OriginalRecordViewSet(viewsets.ModelViewSet):
+class OriginalRecordViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     原始记录视图集
     
@@ -69,7 +74,7 @@ class OriginalRecordViewSet(viewsets.ModelViewSet):
     - POST /records/{id}/approve/ - 审核记录
     - POST /records/generate/ - 根据委托单生成记录
     """
-    queryset = OriginalRecord.objects.filter(is_deleted=False)
+    queryset = OriginalRecord.objects.all()
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['template', 'workflow', 'status', 'tester']
     search_fields = ['record_code']
@@ -95,7 +100,7 @@ class OriginalRecordViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        queryset = OriginalRecord.objects.filter(is_deleted=False)
+        queryset = OriginalRecord.objects.all()
         
         if user.role == 'tester':
             return queryset.filter(tester=user)
@@ -188,9 +193,9 @@ class OriginalRecordViewSet(viewsets.ModelViewSet):
         )
 
 
-class RecordAttachmentViewSet(viewsets.ModelViewSet):
+class RecordAttachmentViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """记录附件视图集"""
-    queryset = RecordAttachment.objects.filter(is_deleted=False)
+    queryset = RecordAttachment.objects.all()
     serializer_class = RecordAttachmentSerializer
     permission_classes = [IsAuthenticated]
     filterset_fields = ['record']
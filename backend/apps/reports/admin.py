@@ -1,7 +1,12 @@
 from django.contrib import admin
-from .models import StatisticsReport
+from .models import CommissionDailyStat, StatisticsReport
 
 @admin.register(StatisticsReport)
 class StatisticsReportAdmin(admin.ModelAdmin):
     list_display = ['name', 'report_type', 'start_date', 'end_date', 'created_at']
     list_filter = ['report_type', 'created_at']
+
+@admin.register(CommissionDailyStat)
+class CommissionDailyStatAdmin(admin.ModelAdmin):
+    list_display = ['date', 'status', 'client', 'count', 'revenue', 'updated_at']
+    list_filter = ['status']
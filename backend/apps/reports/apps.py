@@ -4,3 +4,6 @@ class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.reports'
     verbose_name = '数据查询与汇总'
+
+    def ready(self):
+        from . import signals  # noqa: F401  注册相关数据变更时清理仪表盘缓存的信号
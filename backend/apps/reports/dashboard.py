@@ -0,0 +1,87 @@
+"""
+首页仪表盘统计
+
+每张表用一条条件聚合查询算出全部指标，结果按日期缓存 REPORTS_CONFIG['DASHBOARD_CACHE_TTL'] 秒：
+- 委托单、流转、设备、校准记录保存或删除时清除缓存（见 signals.py）
+- 批量 update / bulk_create 不触发信号，由有效期兜底
+"""
+
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+DASHBOARD_CACHE_KEY = 'reports:dashboard'
+
+# 未完成的委托单状态
+PENDING_COMMISSION_STATUSES = ['submitted', 'received', 'testing']
+
+# 检测中的流转状态
+IN_PROGRESS_WORKFLOW_STATUSES = ['assigned', 'testing', 'report_editing']
+
+
+def dashboard_cache_key(day) -> str:
+    # 本月委托数、待校准设备数随日期变化，按日期区分缓存
+    return f'{DASHBOARD_CACHE_KEY}:{day.isoformat()}'
+
+
+def invalidate_dashboard():
+    """清除当天的仪表盘缓存"""
+    cache.delete(dashboard_cache_key(timezone.localdate()))
+
+
+def compute_dashboard(today) -> Dict:
+    """
+    计算仪表盘指标
+
+    Args:
+        today: 统计日期
+
+    Returns:
+        dict: 仪表盘指标
+    """
+    from apps.samples.models import Commission
+    from apps.workflow.models import SampleWorkflow
+    from apps.equipment.models import Equipment, CalibrationRecord
+
+    result = {}
+
+    commissions = Commission.objects.aggregate(
+        total=Count('id'),
+        month=Count('id', filter=Q(commission_date__gte=today.replace(day=1))),
+        pending=Count('id', filter=Q(status__in=PENDING_COMMISSION_STATUSES)),
+    )
+    result['total_commissions'] = commissions['total']
+    result['month_commissions'] = commissions['month']
+    result['pending_commissions'] = commissions['pending']
+
+    result['in_progress_workflows'] = SampleWorkflow.objects.filter(
+        current_status__in=IN_PROGRESS_WORKFLOW_STATUSES
+    ).count()
+
+    # 需要校准：正常使用的设备有校准记录且最近一次校准已到期，与设备接口 need_calibration 一致
+    calibrations = CalibrationRecord.objects.filter(equipment=OuterRef('pk'))
+    equipments = Equipment.objects.annotate(
+        calibrated=Exists(calibrations),
+        calibration_valid=Exists(calibrations.filter(valid_until__gt=today)),
+    ).aggregate(
+        total=Count('id'),
+        need_calibration=Count('id', filter=Q(status='normal', calibrated=True, calibration_valid=False)),
+    )
+    result['total_equipments'] = equipments['total']
+    result['need_calibration'] = equipments['need_calibration']
+
+    return result
+
+
+def get_dashboard() -> Dict:
+    """获取仪表盘指标，优先读取缓存"""
+    today = timezone.localdate()
+    key = dashboard_cache_key(today)
+    result = cache.get(key)
+    if result is None:
+        result = compute_dashboard(today)
+        cache.set(key, result, settings.REPORTS_CONFIG.get('DASHBOARD_CACHE_TTL', 60))
+    return result
@@ -0,0 +1,252 @@
+"""
+数据导出
+
+按数据集导出委托单、样品流转、原始记录、设备校准记录和设备使用记录，支持 CSV 和 Excel：
+- 分块读取：按主键分段查询（WHERE id > 上一段末尾 ORDER BY id LIMIT n），
+  每次只在内存中保留一段数据，MariaDB 下也不会一次取回全部结果
+- CSV：边查询边输出（StreamingHttpResponse），导出开始即开始下载，不限行数
+- Excel：不是流式输出。openpyxl 只写模式逐行写入临时文件，全部生成后才开始下载；
+  xlsx 为 zip 格式，目录写在文件末尾，无法在生成过程中输出。生成耗时和临时文件大小随行数增长，
+  因此限制行数（REPORTS_CONFIG['EXPORT_XLSX_MAX_ROWS']），超出时提示缩小范围或改用 CSV
+- 列定义中的选项字段导出显示值，时间转换为本地时间
+"""
+
+import csv
+import json
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from openpyxl import Workbook
+
+from apps.equipment.models import CalibrationRecord, EquipmentUsageLog
+from apps.records.models import OriginalRecord
+from apps.samples.models import Commission
+from apps.workflow.models import SampleWorkflow
+
+# 单个工作表的最大数据行数（xlsx 上限 1048576 行，含表头）
+XLSX_SHEET_ROWS = 1048575
+
+EXPORT_FORMATS = ['csv', 'excel']
+
+
+# 数据集：模型、日期筛选字段、列（表头, 查询字段）
+DATASETS = {
+    'commissions': {
+        'name': '委托单',
+        'model': Commission,
+        'date_field': 'commission_date',
+        'columns': [
+            ('委托编号', 'code'),
+            ('委托单位', 'client__name'),
+            ('工程名称', 'project_name'),
+            ('样品名称', 'sample_name'),
+            ('样品数量', 'sample_quantity'),
+            ('样品单位', 'sample_unit'),
+            ('委托日期', 'commission_date'),
+            ('要求完成日期', 'required_date'),
+            ('状态', 'status'),
+            ('检测费用', 'total_price'),
+            ('创建时间', 'created_at'),
+        ],
+    },
+    'workflows': {
+        'name': '样品流转',
+        'model': SampleWorkflow,
+        'date_field': 'created_at__date',
+        'status_field': 'current_status',
+        'columns': [
+            ('委托编号', 'sample_receive__commission__code'),
+            ('收样编号', 'sample_receive__receive_code'),
+            ('样品名称', 'sample_receive__commission__sample_name'),
+            ('当前状态', 'current_status'),
+            ('负责人', 'assigned_to__username'),
+            ('优先级', 'priority'),
+            ('预计完成日期', 'expected_complete_date'),
+            ('实际完成日期', 'actual_complete_date'),
+            ('创建时间', 'created_at'),
+        ],
+    },
+    'records': {
+        'name': '原始记录',
+        'model': OriginalRecord,
+        'date_field': 'test_date',
+        'columns': [
+            ('记录编号', 'record_code'),
+            ('记录模板', 'template__name'),
+            ('委托编号', 'workflow__sample_receive__commission__code'),
+            ('试验人员', 'tester__username'),
+            ('试验日期', 'test_date'),
+            ('试验地点', 'test_location'),
+            ('状态', 'status'),
+            ('审核人员', 'reviewer__username'),
+            ('记录数据', 'data'),
+        ],
+    },
+    'calibrations': {
+        'name': '设备校准记录',
+        'model': CalibrationRecord,
+        'date_field': 'calibration_date',
+        'columns': [
+            ('设备编号', 'equipment__code'),
+            ('设备名称', 'equipment__name'),
+            ('校准日期', 'calibration_date'),
+            ('有效期至', 'valid_until'),
+            ('校准机构', 'calibration_org'),
+            ('证书编号', 'certificate_number'),
+            ('校准结果', 'result'),
+            ('校准费用', 'cost'),
+        ],
+    },
+    'usage_logs': {
+        'name': '设备使用记录',
+        'model': EquipmentUsageLog,
+        'date_field': 'start_time__date',
+        'columns': [
+            ('设备编号', 'equipment__code'),
+            ('设备名称', 'equipment__name'),
+            ('使用人', 'user__username'),
+            ('开始时间', 'start_time'),
+            ('结束时间', 'end_time'),
+            ('用途', 'purpose'),
+            ('样品信息', 'sample_info'),
+            ('使用前状态', 'condition_before'),
+            ('使用后状态', 'condition_after'),
+        ],
+    },
+}
+
+
+def _field_choices(model, lookup: str) -> Dict:
+    """查询字段的选项（值 -> 显示值），非选项字段返回空字典"""
+    *relations, name = lookup.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return dict(model._meta.get_field(name).flatchoices)
+
+
+def _format(value, choices: Dict):
+    if value is None:
+        return ''
+    if choices:
+        return choices.get(value, value)
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S') if timezone.is_aware(value) else value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def export_queryset(dataset: str, filters: Dict) -> QuerySet:
+    """
+    数据集的导出范围
+
+    Args:
+        dataset: 数据集名称
+        filters: 筛选条件（start_date、end_date、status）
+
+    Returns:
+        QuerySet: 未删除的数据
+    """
+    spec = DATASETS[dataset]
+    queryset = spec['model'].objects.all()
+    if filters.get('start_date'):
+        queryset = queryset.filter(**{f"{spec['date_field']}__gte": filters['start_date']})
+    if filters.get('end_date'):
+        queryset = queryset.filter(**{f"{spec['date_field']}__lte": filters['end_date']})
+    if filters.get('status'):
+        queryset = queryset.filter(**{spec.get('status_field', 'status'): filters['status']})
+    return queryset
+
+
+def xlsx_row_limit() -> int:
+    """Excel 导出的最大数据行数"""
+    return settings.REPORTS_CONFIG.get('EXPORT_XLSX_MAX_ROWS', 100000)
+
+
+def exceeds_xlsx_limit(queryset: QuerySet) -> bool:
+    """导出范围是否超过 Excel 行数限制，只统计到上限加一行，不做全表计数"""
+    limit = xlsx_row_limit()
+    return queryset.order_by()[:limit + 1].count() > limit
+
+
+def iter_rows(queryset: QuerySet, columns: Sequence[Tuple[str, str]], chunk_size: int = None) -> Iterator[List]:
+    """
+    按主键分段读取导出行
+
+    Args:
+        queryset: 导出范围
+        columns: 列定义
+        chunk_size: 每段行数
+
+    Yields:
+        list: 格式化后的一行
+    """
+    chunk_size = chunk_size or settings.REPORTS_CONFIG.get('EXPORT_CHUNK_SIZE', 2000)
+    lookups = [lookup for _, lookup in columns]
+    choices = [_field_choices(queryset.model, lookup) for lookup in lookups]
+    rows = queryset.order_by('pk').values_list('pk', *lookups)
+
+    last_pk = None
+    while True:
+        chunk = list((rows.filter(pk__gt=last_pk) if last_pk is not None else rows)[:chunk_size])
+        for row in chunk:
+            yield [_format(value, column_choices) for value, column_choices in zip(row[1:], choices)]
+        if len(chunk) < chunk_size:
+            return
+        last_pk = chunk[-1][0]
+
+
+class _Echo:
+    """csv.writer 的输出目标，直接返回写入的内容"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(headers: List[str], rows: Iterator[List]) -> Iterator[str]:
+    """
+    逐行生成CSV内容
+
+    以 UTF-8 BOM 开头，Excel 打开时中文不乱码
+    """
+    writer = csv.writer(_Echo())
+    yield '\ufeff' + writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_xlsx(title: str, headers: List[str], rows: Iterator[List]):
+    """
+    以只写模式生成Excel文件
+
+    超过单表行数上限时自动新建工作表
+
+    Args:
+        title: 工作表名称
+        headers: 表头
+        rows: 数据行
+
+    Returns:
+        file: 已定位到开头的临时文件，关闭后自动删除
+    """
+    workbook = Workbook(write_only=True)
+    sheet, count, index = None, XLSX_SHEET_ROWS, 0
+    for row in rows:
+        if count >= XLSX_SHEET_ROWS:
+            index += 1
+            sheet = workbook.create_sheet(title if index == 1 else f'{title}{index}')
+            sheet.append(headers)
+            count = 0
+        sheet.append(row)
+        count += 1
+    if sheet is None:
+        workbook.create_sheet(title).append(headers)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
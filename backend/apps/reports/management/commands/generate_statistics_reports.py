@@ -0,0 +1,40 @@
+"""
+生成周期统计报表
+
+定时任务由 Celery beat 执行，此命令用于 cron 部署、首次上线回填或重新计算：
+    python manage.py generate_statistics_reports
+    python manage.py generate_statistics_reports --types monthly --periods 12
+    python manage.py generate_statistics_reports --date 2024-07-01 --force
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.reports.snapshots import PERIOD_TYPES, generate_period_reports
+
+
+class Command(BaseCommand):
+    help = '统计已结束的日、周、月、季、年周期并保存为统计报表'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, default=None,
+                            help='当前日期（YYYY-MM-DD），只统计在此之前结束的周期，默认今天')
+        parser.add_argument('--types', nargs='+', choices=PERIOD_TYPES, default=None, help='报表类型，默认全部')
+        parser.add_argument('--periods', type=int, default=1, help='每种类型回溯的周期数（默认1）')
+        parser.add_argument('--force', action='store_true', help='已有报表时重新计算')
+
+    def handle(self, *args, **options):
+        if options['periods'] <= 0:
+            raise CommandError('periods 必须大于0')
+
+        reports = generate_period_reports(
+            options['date'] or timezone.localdate(),
+            report_types=options['types'],
+            periods=options['periods'],
+            force=options['force'],
+        )
+        for report in reports:
+            self.stdout.write(f'  {report.name}  {report.start_date} ~ {report.end_date}')
+        self.stdout.write(self.style.SUCCESS(f'共生成 {len(reports)} 份统计报表'))
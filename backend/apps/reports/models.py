@@ -53,6 +53,58 @@ class StatisticsReport(BaseModel):
         verbose_name = '统计报表'
         verbose_name_plural = '统计报表列表'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['report_type', 'start_date', 'end_date'], name='idx_statreport_period'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.start_date} ~ {self.end_date})"
+
+
+class CommissionDailyStat(models.Model):
+    """
+    委托单日汇总模型
+    
+    按 委托日期 × 状态 × 委托方 汇总委托单数量和费用，统计查询直接读取汇总表，
+    不再扫描委托单明细。委托单保存、删除时增量更新（见 rollups.py），
+    可通过 rebuild_commission_stats 命令重建
+    """
+    date = models.DateField(
+        verbose_name='委托日期'
+    )
+    status = models.CharField(
+        max_length=20,
+        verbose_name='委托单状态'
+    )
+    client = models.ForeignKey(
+        'samples.Client',
+        on_delete=models.CASCADE,
+        related_name='daily_stats',
+        verbose_name='委托方'
+    )
+    count = models.IntegerField(
+        default=0,
+        verbose_name='委托单数'
+    )
+    revenue = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='费用合计'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='更新时间'
+    )
+    
+    class Meta:
+        db_table = 'lims_commission_daily_stat'
+        verbose_name = '委托单日汇总'
+        verbose_name_plural = '委托单日汇总列表'
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'status', 'client'], name='uniq_commission_daily_stat'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.status} {self.client_id}: {self.count}"
@@ -0,0 +1,88 @@
+"""
+委托单日汇总
+
+CommissionDailyStat 按 委托日期 × 状态 × 委托方 存放委托单数量和费用：
+- 增量维护：委托单保存、删除时按明细重算受影响的汇总行（修改前后各一行，见 signals.py），
+  重算结果与明细一致，重复执行无副作用，并与委托单的修改处于同一事务
+- 全量重建：批量导入、queryset.update 等不触发信号的写入之后，
+  执行 python manage.py rebuild_commission_stats [--start --end]
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from apps.samples.models import Commission
+from .models import CommissionDailyStat
+
+# 汇总键：(委托日期, 状态, 委托方ID)
+Bucket = Tuple
+
+BULK_SIZE = 1000
+
+
+def commission_bucket(values: Dict) -> Optional[Bucket]:
+    """委托单所属的汇总键，已删除的委托单不计入汇总"""
+    if values is None or values.get('is_deleted'):
+        return None
+    return values['commission_date'], values['status'], values['client_id']
+
+
+def refresh_buckets(buckets: Iterable[Bucket]):
+    """
+    按明细重算汇总行
+
+    Args:
+        buckets: 汇总键
+    """
+    for day, status, client_id in {bucket for bucket in buckets if bucket is not None}:
+        totals = Commission.objects.filter(
+            commission_date=day, status=status, client_id=client_id
+        ).aggregate(count=Count('id'), revenue=Sum('total_price'))
+        if totals['count']:
+            CommissionDailyStat.objects.update_or_create(
+                date=day, status=status, client_id=client_id,
+                defaults={'count': totals['count'], 'revenue': totals['revenue'] or 0},
+            )
+        else:
+            CommissionDailyStat.objects.filter(date=day, status=status, client_id=client_id).delete()
+
+
+def rebuild_commission_stats(start=None, end=None) -> int:
+    """
+    全量重建日汇总
+
+    Args:
+        start: 开始日期，为空表示不限
+        end: 结束日期，为空表示不限
+
+    Returns:
+        int: 生成的汇总行数
+    """
+    date_filter = {}
+    if start:
+        date_filter['commission_date__gte'] = start
+    if end:
+        date_filter['commission_date__lte'] = end
+
+    rows = (
+        Commission.objects.filter(**date_filter)
+        .values('commission_date', 'status', 'client_id')
+        .annotate(count=Count('id'), revenue=Sum('total_price'))
+        .order_by()
+    )
+    stats = [
+        CommissionDailyStat(
+            date=row['commission_date'], status=row['status'], client_id=row['client_id'],
+            count=row['count'], revenue=row['revenue'] or 0,
+        )
+        for row in rows.iterator()
+    ]
+
+    with transaction.atomic():
+        CommissionDailyStat.objects.filter(**{
+            key.replace('commission_date', 'date'): value for key, value in date_filter.items()
+        }).delete()
+        CommissionDailyStat.objects.bulk_create(stats, batch_size=BULK_SIZE)
+    return len(stats)
@@ -1,5 +1,6 @@
 """报表序列化器"""
 from rest_framework import serializers
+from .exports import DATASETS, EXPORT_FORMATS
 from .models import StatisticsReport
 
 
@@ -25,3 +26,17 @@ class StatisticsQuerySerializer(serializers.Serializer):
         required=False,
         default='sample_type'
     )
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """导出参数序列化器"""
+    dataset = serializers.ChoiceField(choices=list(DATASETS))
+    export_type = serializers.ChoiceField(choices=EXPORT_FORMATS, required=False, default='excel')
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    status = serializers.CharField(required=False, allow_blank=True)
+    
+    def validate(self, attrs):
+        if attrs.get('start_date') and attrs.get('end_date') and attrs['start_date'] > attrs['end_date']:
+            raise serializers.ValidationError('开始日期不能晚于结束日期')
+        return attrs
@@ -0,0 +1,52 @@
+"""
+数据汇总信号处理
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.equipment.models import CalibrationRecord, Equipment
+from apps.samples.models import Commission
+from apps.workflow.models import SampleWorkflow
+from .dashboard import invalidate_dashboard
+from .rollups import commission_bucket, refresh_buckets
+
+BUCKET_FIELDS = ('commission_date', 'status', 'client_id', 'is_deleted')
+
+
+@receiver(post_save, sender=Commission)
+@receiver(post_delete, sender=Commission)
+@receiver(post_save, sender=SampleWorkflow)
+@receiver(post_delete, sender=SampleWorkflow)
+@receiver(post_save, sender=Equipment)
+@receiver(post_delete, sender=Equipment)
+@receiver(post_save, sender=CalibrationRecord)
+@receiver(post_delete, sender=CalibrationRecord)
+def invalidate_dashboard_cache(sender, **kwargs):
+    """仪表盘统计涉及的数据变更后清除缓存"""
+    invalidate_dashboard()
+
+
+@receiver(pre_save, sender=Commission)
+def remember_commission_bucket(sender, instance, raw=False, **kwargs):
+    """记录修改前所属的汇总键，修改日期、状态、委托方或删除时需同时更新原汇总行"""
+    if raw or instance.pk is None:
+        instance._stats_bucket = None
+        return
+    previous = sender._base_manager.filter(pk=instance.pk).values(*BUCKET_FIELDS).first()
+    instance._stats_bucket = commission_bucket(previous)
+
+
+@receiver(post_save, sender=Commission)
+def update_commission_stats(sender, instance, raw=False, **kwargs):
+    """委托单保存后更新日汇总"""
+    if raw:
+        return
+    current = {field: getattr(instance, field) for field in BUCKET_FIELDS}
+    refresh_buckets([getattr(instance, '_stats_bucket', None), commission_bucket(current)])
+
+
+@receiver(post_delete, sender=Commission)
+def remove_commission_stats(sender, instance, **kwargs):
+    """委托单删除后更新日汇总"""
+    refresh_buckets([commission_bucket({field: getattr(instance, field) for field in BUCKET_FIELDS})])
@@ -0,0 +1,160 @@
+"""
+统计报表快照
+
+周期结束后计算一次该周期的统计数据并存为 StatisticsReport，查看历史周期时直接读取，
+不再重复聚合。由 Celery beat 每天凌晨触发（见 tasks.py），也可以通过
+generate_statistics_reports 命令手动执行或回填。
+
+- 周期：日报（自然日）、周报（周一至周日）、月报、季报、年报
+- 幂等：同一类型、同一周期已有报表时跳过（force 时重新计算并覆盖）
+"""
+
+import json
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from rest_framework.utils.encoders import JSONEncoder
+from django.db.models import Sum
+
+from .models import CommissionDailyStat, StatisticsReport
+
+# 自动生成的报表类型
+PERIOD_TYPES = ['daily', 'weekly', 'monthly', 'quarterly', 'yearly']
+
+
+def compute_statistics(start_date: date, end_date: date, by_client: bool = False) -> Dict:
+    """
+    计算委托单统计，读取日汇总表（见 rollups.py）
+
+    Args:
+        start_date: 开始日期
+        end_date: 结束日期
+        by_client: 是否按委托方统计
+
+    Returns:
+        dict: 统计结果
+    """
+    stats = CommissionDailyStat.objects.filter(date__gte=start_date, date__lte=end_date)
+    result = {}
+
+    totals = stats.aggregate(count=Sum('count'), revenue=Sum('revenue'))
+    result['commission_count'] = totals['count'] or 0
+    result['commission_by_status'] = list(
+        stats.values('status').annotate(count=Sum('count')).order_by('status')
+    )
+
+    # 按日期统计
+    result['commission_by_date'] = list(
+        stats.values('date').annotate(count=Sum('count')).order_by('date')
+    )
+
+    # 按委托方统计
+    if by_client:
+        result['by_client'] = list(
+            stats.values('client__name').annotate(count=Sum('count')).order_by('client__name')
+        )
+
+    # 收入统计
+    result['total_revenue'] = totals['revenue'] or 0
+    return result
+
+
+def _month_start(day: date, months_back: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 - months_back
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def period_bounds(report_type: str, day: date) -> Tuple[date, date]:
+    """
+    包含指定日期的统计周期
+
+    Args:
+        report_type: 报表类型
+        day: 日期
+
+    Returns:
+        tuple: (开始日期, 结束日期)
+    """
+    if report_type == 'daily':
+        return day, day
+    if report_type == 'weekly':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    if report_type == 'monthly':
+        start = _month_start(day)
+    elif report_type == 'quarterly':
+        start = date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    elif report_type == 'yearly':
+        start = date(day.year, 1, 1)
+    else:
+        raise ValueError(f'不支持的报表类型: {report_type}')
+    months = {'monthly': 1, 'quarterly': 3, 'yearly': 12}[report_type]
+    return start, _month_start(start, -months) - timedelta(days=1)
+
+
+def closed_periods(report_type: str, today: date, count: int = 1) -> List[Tuple[date, date]]:
+    """
+    今天之前已结束的最近 count 个周期，按时间先后排列
+
+    Args:
+        report_type: 报表类型
+        today: 当前日期
+        count: 周期个数
+
+    Returns:
+        list: [(开始日期, 结束日期)]
+    """
+    periods = []
+    # 当前周期尚未结束，从上一个周期开始回溯
+    start, _ = period_bounds(report_type, today)
+    for _ in range(count):
+        start, end = period_bounds(report_type, start - timedelta(days=1))
+        periods.append((start, end))
+    return periods[::-1]
+
+
+def report_name(report_type: str, start: date) -> str:
+    """报表名称"""
+    if report_type == 'daily':
+        return f'{start.isoformat()} 日报'
+    if report_type == 'weekly':
+        year, week, _ = start.isocalendar()
+        return f'{year}年第{week}周 周报'
+    if report_type == 'monthly':
+        return f'{start.year}年{start.month}月 月报'
+    if report_type == 'quarterly':
+        return f'{start.year}年第{(start.month - 1) // 3 + 1}季度 季报'
+    return f'{start.year}年 年报'
+
+
+def generate_period_reports(today: date, report_types: List[str] = None, periods: int = 1,
+                            force: bool = False) -> List[StatisticsReport]:
+    """
+    生成已结束周期的统计报表
+
+    Args:
+        today: 当前日期，只统计在此之前结束的周期
+        report_types: 报表类型，默认全部周期类型
+        periods: 每种类型回溯的周期数
+        force: 已有报表时是否重新计算
+
+    Returns:
+        list: 新生成或更新的报表
+    """
+    generated = []
+    for report_type in report_types or PERIOD_TYPES:
+        for start, end in closed_periods(report_type, today, periods):
+            existing = StatisticsReport.objects.filter(
+                report_type=report_type, start_date=start, end_date=end
+            ).first()
+            if existing is not None and not force:
+                continue
+            # 与接口输出一致：日期为ISO字符串，金额为数值
+            data = json.loads(json.dumps(compute_statistics(start, end, by_client=True), cls=JSONEncoder))
+            if existing is None:
+                existing = StatisticsReport(report_type=report_type, start_date=start, end_date=end)
+            existing.name = report_name(report_type, start)
+            existing.statistics_data = data
+            existing.save()
+            generated.append(existing)
+    return generated
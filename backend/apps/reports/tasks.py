@@ -0,0 +1,21 @@
+"""
+数据汇总定时任务
+
+由 Celery beat 按 CELERY_BEAT_SCHEDULE 每天凌晨触发（启动：celery -A config beat）
+"""
+
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+
+from .snapshots import generate_period_reports
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def generate_statistics_reports():
+    """生成刚结束的日、周、月、季、年统计报表，已生成的周期跳过"""
+    reports = generate_period_reports(timezone.localdate())
+    logger.info(f"已生成 {len(reports)} 份统计报表: {', '.join(report.name for report in reports)}")
@@ -1,19 +1,25 @@
 """数据汇总视图"""
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Sum
-from django.db.models.functions import TruncDate, TruncMonth
 from common.response import success_response, error_response
-from common.permissions import RoleBasedPermission
+from common.permissions import IsLabStaff, RoleBasedPermission
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
+from .dashboard import get_dashboard
+from .exports import (
+    DATASETS, exceeds_xlsx_limit, export_queryset, iter_rows, stream_csv, write_xlsx, xlsx_row_limit
+)
+from .snapshots import compute_statistics
 from .models import StatisticsReport
-from .serializers import StatisticsReportSerializer, StatisticsQuerySerializer
+from .serializers import StatisticsReportSerializer, StatisticsQuerySerializer, ExportQuerySerializer
 
 
-class StatisticsReportViewSet(viewsets.ModelViewSet):
+class StatisticsReportViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """统计报表视图集"""
-    queryset = StatisticsReport.objects.filter(is_deleted=False)
+    queryset = StatisticsReport.objects.all()
     serializer_class = StatisticsReportSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['report_type']
@@ -56,38 +62,7 @@ class StatisticsView(APIView):
         end_date = data['end_date']
         dimension = data.get('dimension', 'sample_type')
         
-        result = {}
-        
-        # 委托单统计
-        from apps.samples.models import Commission
-        commissions = Commission.objects.filter(
-            commission_date__gte=start_date,
-            commission_date__lte=end_date,
-            is_deleted=False
-        )
-        
-        result['commission_count'] = commissions.count()
-        result['commission_by_status'] = list(
-            commissions.values('status').annotate(count=Count('id'))
-        )
-        
-        # 按日期统计
-        result['commission_by_date'] = list(
-            commissions.annotate(date=TruncDate('commission_date'))
-            .values('date').annotate(count=Count('id')).order_by('date')
-        )
-        
-        # 按委托方统计
-        if dimension == 'client':
-            result['by_client'] = list(
-                commissions.values('client__name').annotate(count=Count('id'))
-            )
-        
-        # 收入统计
-        result['total_revenue'] = commissions.aggregate(
-            total=Sum('total_price')
-        )['total'] or 0
-        
+        result = compute_statistics(start_date, end_date, by_client=dimension == 'client')
         return success_response(result)
 
 
@@ -95,67 +70,56 @@ class DashboardView(APIView):
     """
     仪表盘统计视图
     
-    提供首页仪表盘所需的统计数据
+    提供首页仪表盘所需的统计数据，结果短时缓存，相关数据变更时清除
     """
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        today = timezone.now().date()
-        month_start = today.replace(day=1)
-        
-        result = {}
-        
-        # 委托单统计
-        from apps.samples.models import Commission
-        result['total_commissions'] = Commission.objects.filter(is_deleted=False).count()
-        result['month_commissions'] = Commission.objects.filter(
-            commission_date__gte=month_start,
-            is_deleted=False
-        ).count()
-        result['pending_commissions'] = Commission.objects.filter(
-            status__in=['submitted', 'received', 'testing'],
-            is_deleted=False
-        ).count()
-        
-        # 流转统计
-        from apps.workflow.models import SampleWorkflow
-        result['in_progress_workflows'] = SampleWorkflow.objects.filter(
-            current_status__in=['assigned', 'testing', 'report_editing'],
-            is_deleted=False
-        ).count()
-        
-        # 设备统计
-        from apps.equipment.models import Equipment
-        result['total_equipments'] = Equipment.objects.filter(is_deleted=False).count()
-        result['need_calibration'] = 0  # 需要根据校准记录计算
-        
-        return success_response(result)
+        # 指标与用户无关，所有用户共用缓存（见 dashboard.py）
+        return success_response(get_dashboard())
 
 
 class ExportView(APIView):
     """
     导出视图
     
-    提供Excel/PDF导出功能
+    按数据集导出全部数据（不分页），CSV 边查询边下载；Excel 生成后下载，限制行数，见 exports.py
     """
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsLabStaff]
     
     def post(self, request):
         """
-        导出统计数据
+        导出数据
         
         请求参数：
-        - export_type: 导出类型 (excel/pdf)
-        - data: 要导出的数据
+        - dataset: 数据集 (commissions/workflows/records/calibrations/usage_logs)
+        - export_type: 导出格式 (excel/csv)，默认 excel
+        - start_date: 开始日期，可选
+        - end_date: 结束日期，可选
+        - status: 状态，可选
         """
-        export_type = request.data.get('export_type', 'excel')
-        data = request.data.get('data', {})
-        
-        # TODO: 实现导出逻辑
-        # 可使用 openpyxl 导出 Excel
-        # 可使用 reportlab 导出 PDF
+        serializer = ExportQuerySerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(serializer.errors)
         
-        return success_response(message='导出功能待实现')
+        params = serializer.validated_data
+        spec = DATASETS[params['dataset']]
+        headers = [header for header, _ in spec['columns']]
+        queryset = export_queryset(params['dataset'], params)
+        rows = iter_rows(queryset, spec['columns'])
+        filename = f"{params['dataset']}_{timezone.localtime().strftime('%Y%m%d%H%M%S')}"
+        
+        if params['export_type'] == 'csv':
+            response = StreamingHttpResponse(stream_csv(headers, rows), content_type='text/csv; charset=utf-8')
+            response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+            return response
+        
+        if exceeds_xlsx_limit(queryset):
+            return error_response(f'Excel 导出最多{xlsx_row_limit()}行，请缩小筛选范围或改用 CSV 导出')
+        
+        return FileResponse(
+            write_xlsx(spec['name'], headers, rows),
+            as_attachment=True,
+            filename=f'{filename}.xlsx',
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
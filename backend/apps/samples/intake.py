@@ -0,0 +1,221 @@
+"""
+委托单批量导入
+
+一次请求提交多份委托单，数据为 JSON 数组或上传的 XLSX/CSV 文件：
+- 文件用 pandas 读取，表头可以是字段名、字段中文名或委托单导出文件的表头；
+  日期列统一转换为 YYYY-MM-DD，检测参数可用逗号、顿号分隔
+- 委托方按 ID、编号或名称一次查询解析，各行校验时不再查询数据库
+- 校验通过的行在一个事务中 bulk_create，校验失败的行返回行号与错误，不影响其他行
+- 委托单编号预先生成，一次查询排除与已有编号冲突的编号
+- bulk_create 不触发信号，导入后按涉及的汇总键更新日汇总并清除仪表盘缓存
+"""
+
+import json
+import re
+from io import StringIO
+from typing import Dict, Iterable, List, Optional, Tuple
+from zipfile import BadZipFile
+
+import pandas as pd
+from django.db import transaction
+from django.db.models import Q
+
+from apps.reports.dashboard import invalidate_dashboard
+from apps.reports.rollups import commission_bucket, refresh_buckets
+from common.utils import generate_code, get_file_extension
+from .models import Client, Commission
+from .serializers import CommissionBulkItemSerializer
+
+# 单次导入的最大行数
+BULK_CREATE_LIMIT = 1000
+
+# 每条 INSERT 语句写入的行数
+INSERT_BATCH_SIZE = 500
+
+UPLOAD_FORMATS = ['xlsx', 'csv']
+
+FIELDS = CommissionBulkItemSerializer.Meta.fields
+
+DATE_FIELDS = ['commission_date', 'required_date']
+
+# 表头 -> 字段名：字段名、字段中文名，以及导出文件中的表头
+HEADERS = {
+    **{name: name for name in FIELDS},
+    **{str(Commission._meta.get_field(name).verbose_name): name for name in FIELDS},
+    '委托单位': 'client',
+}
+
+PARAMETER_SEPARATORS = re.compile(r'[,，、;；\n]+')
+
+# 一行数据：(行号, 字段数据)
+Row = Tuple[int, Dict]
+
+
+def read_upload(upload) -> List[Row]:
+    """
+    读取上传的委托单文件
+
+    Args:
+        upload: 上传的 XLSX/CSV 文件
+
+    Returns:
+        list: (行号, 数据) 列表，行号为表格中的行号（表头为第1行），空行跳过
+
+    Raises:
+        ValueError: 文件格式不支持或无法解析
+    """
+    extension = get_file_extension(upload.name)
+    if extension not in UPLOAD_FORMATS:
+        raise ValueError('仅支持 xlsx、csv 文件')
+    try:
+        if extension == 'xlsx':
+            frame = pd.read_excel(upload, dtype=str, keep_default_na=False)
+        else:
+            frame = _read_csv(upload)
+    except (ValueError, OSError, BadZipFile) as e:
+        raise ValueError(f'文件解析失败：{e}')
+
+    frame = frame.rename(columns=lambda column: HEADERS.get(str(column).strip(), str(column).strip()))
+    frame = frame[[column for column in frame.columns if column in FIELDS]].fillna('')
+    frame = frame.apply(lambda column: column.astype(str).str.strip())
+    for name in DATE_FIELDS:
+        if name in frame:
+            frame[name] = _normalize_dates(frame[name])
+    frame = frame[(frame != '').any(axis=1)]
+
+    return [
+        (index + 2, {name: value for name, value in row.items() if value != ''})
+        for index, row in zip(frame.index, frame.to_dict('records'))
+    ]
+
+
+def _read_csv(upload) -> pd.DataFrame:
+    """读取 CSV，Excel 另存的中文 CSV 通常为 GBK 编码"""
+    content = upload.read()
+    for encoding in ('utf-8-sig', 'gbk'):
+        try:
+            text = content.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        return pd.read_csv(StringIO(text), dtype=str, keep_default_na=False)
+    raise ValueError('无法识别文件编码')
+
+
+def _normalize_dates(column: pd.Series) -> pd.Series:
+    """能识别的日期（如 2024/3/1、Excel 日期单元格）转换为 YYYY-MM-DD，其余原样保留由校验报错"""
+    parsed = pd.to_datetime(column.where(column != ''), errors='coerce', format='mixed')
+    return parsed.dt.strftime('%Y-%m-%d').where(parsed.notna(), column)
+
+
+def _normalize_parameters(value) -> Optional[str]:
+    """检测参数统一为 JSON 数组字符串"""
+    if isinstance(value, (list, tuple)):
+        return json.dumps(list(value), ensure_ascii=False)
+    if not isinstance(value, str) or value.lstrip().startswith('['):
+        return value
+    items = [item.strip() for item in PARAMETER_SEPARATORS.split(value) if item.strip()]
+    return json.dumps(items, ensure_ascii=False)
+
+
+def resolve_clients(values: Iterable, user) -> Dict[str, Optional[Client]]:
+    """
+    一次查询解析各行填写的委托方
+
+    Args:
+        values: 各行填写的委托方（ID、编号或名称）
+        user: 当前用户，委托方用户只能为自己的委托方下单
+
+    Returns:
+        dict: 填写值 -> 委托方，同名委托方不止一个时为 None；找不到的值不在结果中
+    """
+    keys = {str(value).strip() for value in values if value not in (None, '')}
+    if not keys:
+        return {}
+    queryset = Client.objects.all()
+    if user.role == 'client':
+        queryset = queryset.filter(user=user)
+    ids = [int(key) for key in keys if key.isdigit()]
+    by_pk, by_code, by_name = {}, {}, {}
+    for client in queryset.filter(Q(pk__in=ids) | Q(code__in=keys) | Q(name__in=keys)):
+        by_pk[str(client.pk)] = client
+        by_code[client.code] = client
+        by_name.setdefault(client.name, []).append(client)
+
+    clients = {}
+    for key in keys:
+        if key in by_pk or key in by_code:
+            clients[key] = by_pk.get(key) or by_code[key]
+        elif key in by_name:
+            clients[key] = by_name[key][0] if len(by_name[key]) == 1 else None
+    return clients
+
+
+def validate_rows(rows: List[Row], user) -> Tuple[List[Tuple[int, Dict]], List[Dict]]:
+    """
+    校验各行数据
+
+    Args:
+        rows: (行号, 数据) 列表
+        user: 当前用户
+
+    Returns:
+        tuple: (校验通过的 (行号, 校验后数据), 校验失败的 {row, errors})
+    """
+    clients = resolve_clients((data.get('client') for _, data in rows if isinstance(data, dict)), user)
+    valid, errors = [], []
+    for number, data in rows:
+        if isinstance(data, dict) and 'test_parameters' in data:
+            data = {**data, 'test_parameters': _normalize_parameters(data['test_parameters'])}
+        serializer = CommissionBulkItemSerializer(data=data, context={'clients': clients})
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            errors.append({'row': number, 'errors': serializer.errors})
+    return valid, errors
+
+
+def unique_codes(count: int) -> List[str]:
+    """生成 count 个互不相同且未被使用的委托单编号"""
+    codes = set()
+    while len(codes) < count:
+        candidates = {generate_code('WT', 8) for _ in range(count - len(codes))} - codes
+        codes |= candidates - set(Commission.all_objects.filter(code__in=candidates).values_list('code', flat=True))
+    return list(codes)
+
+
+def create_commissions(valid: List[Tuple[int, Dict]], user) -> List[Commission]:
+    """
+    在一个事务中批量写入委托单
+
+    Args:
+        valid: 校验通过的 (行号, 数据)
+        user: 创建人
+
+    Returns:
+        list: 写入的委托单，与 valid 顺序一致
+    """
+    if not valid:
+        return []
+    commissions = [
+        Commission(code=code, created_by=user, **data)
+        for code, (_, data) in zip(unique_codes(len(valid)), valid)
+    ]
+    with transaction.atomic():
+        Commission.objects.bulk_create(commissions, batch_size=INSERT_BATCH_SIZE)
+        refresh_buckets({
+            commission_bucket({
+                'commission_date': commission.commission_date, 'status': commission.status,
+                'client_id': commission.client_id, 'is_deleted': False,
+            })
+            for commission in commissions
+        })
+    invalidate_dashboard()
+
+    # MySQL 的 bulk_create 不回填主键，按编号查询
+    if any(commission.pk is None for commission in commissions):
+        ids = dict(Commission.objects.filter(
+            code__in=[commission.code for commission in commissions]
+        ).values_list('code', 'id'))
+        for commission in commissions:
+            commission.pk = ids[commission.code]
+    return commissions
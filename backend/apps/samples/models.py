@@ -218,8 +218,9 @@ class Commission(BaseModel):
         ordering = ['-commission_date', '-created_at']
         indexes = [
             models.Index(fields=['code'], name='idx_commission_code'),
-            models.Index(fields=['status'], name='idx_commission_status'),
+            models.Index(fields=['is_deleted', 'status', 'commission_date', 'created_at'], name='idx_commission_status'),
             models.Index(fields=['client', 'status'], name='idx_commission_client_status'),
+            models.Index(fields=['is_deleted', 'commission_date', 'created_at', 'id'], name='idx_commission_cursor'),
         ]
     
     def __str__(self):
@@ -67,6 +67,39 @@ class CommissionCreateSerializer(serializers.ModelSerializer):
         ]
 
 
+class ClientLookupField(serializers.Field):
+    """
+    按委托方ID、编号或名称解析委托方
+
+    从 context['clients'] 中查找（值为 None 表示同名委托方不止一个），批量导入时各行不再逐行查询
+    """
+    default_error_messages = {
+        'required': '请填写委托方',
+        'not_found': '委托方“{value}”不存在',
+        'ambiguous': '存在多个名为“{value}”的委托方，请填写委托方编号',
+    }
+
+    def to_internal_value(self, data):
+        value = str(data).strip()
+        clients = self.context['clients']
+        if value not in clients:
+            self.fail('not_found', value=value)
+        if clients[value] is None:
+            self.fail('ambiguous', value=value)
+        return clients[value]
+
+    def to_representation(self, value):
+        return value.pk
+
+
+class CommissionBulkItemSerializer(CommissionCreateSerializer):
+    """委托单批量导入的单行数据"""
+    client = ClientLookupField()
+
+    class Meta(CommissionCreateSerializer.Meta):
+        pass
+
+
 class SampleReceiveSerializer(serializers.ModelSerializer):
     """收样记录序列化器"""
     commission_code = serializers.CharField(source='commission.code', read_only=True)
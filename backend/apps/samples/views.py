@@ -10,6 +10,8 @@ from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
 from common.response import success_response, error_response
 from common.permissions import RoleBasedPermission, DataPermission
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
+from .intake import BULK_CREATE_LIMIT, create_commissions, read_upload, validate_rows
 from .models import Client, Commission, SampleReceive
 from .serializers import (
     ClientSerializer,
@@ -18,7 +20,7 @@ from .serializers import (
 )
 
 
-class ClientViewSet(viewsets.ModelViewSet):
+class ClientViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     委托方管理视图集
     
@@ -33,7 +35,7 @@ class ClientViewSet(viewsets.ModelViewSet):
     - 管理员可管理所有委托方
     - 委托方用户只能查看自己的信息
     """
-    queryset = Client.objects.filter(is_deleted=False)
+    queryset = Client.objects.all()
     serializer_class = ClientSerializer
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['credit_level']
@@ -52,14 +54,14 @@ class ClientViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         if user.role == 'client':
-            return Client.objects.filter(user=user, is_deleted=False)
-        return Client.objects.filter(is_deleted=False)
+            return Client.objects.filter(user=user)
+        return Client.objects.all()
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
 
-class CommissionViewSet(viewsets.ModelViewSet):
+class CommissionViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     委托单管理视图集
     
@@ -71,22 +73,25 @@ class CommissionViewSet(viewsets.ModelViewSet):
     - DELETE /commissions/{id}/ - 删除委托单
     - POST /commissions/{id}/submit/ - 提交委托单
     - POST /commissions/{id}/cancel/ - 取消委托单
+    - POST /commissions/bulk/ - 批量导入委托单
     
     权限：
     - 委托方只能查看和管理自己的委托单
     - 收样人员可以查看所有委托单
     - 管理员可以管理所有委托单
     """
-    queryset = Commission.objects.filter(is_deleted=False)
+    queryset = Commission.objects.all()
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['client', 'status']
     search_fields = ['code', 'project_name', 'sample_name']
     ordering_fields = ['commission_date', 'created_at', 'status']
+    cursor_ordering = ('-commission_date', '-created_at', '-id')  # ?pagination=cursor 时使用游标分页
     
     role_permissions = {
         'list': ['admin', 'client', 'receiver', 'tester', 'reviewer', 'approver'],
         'retrieve': ['admin', 'client', 'receiver', 'tester', 'reviewer', 'approver'],
         'create': ['admin', 'client'],
+        'bulk': ['admin', 'client'],
         'update': ['admin', 'client'],
         'partial_update': ['admin', 'client'],
         'destroy': ['admin'],
@@ -103,7 +108,7 @@ class CommissionViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        queryset = Commission.objects.filter(is_deleted=False)
+        queryset = Commission.objects.all()
         
         if user.role == 'client':
             # 委托方只能看自己的委托单
@@ -114,6 +119,44 @@ class CommissionViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        批量导入委托单
+        
+        请求体为委托单数组（或 {"commissions": [...]}），也可上传 xlsx/csv 文件（file）。
+        委托方填写ID、编号或名称；校验失败的行返回行号与错误，其余行照常导入
+        """
+        upload = request.FILES.get('file')
+        if upload is not None:
+            try:
+                rows = read_upload(upload)
+            except ValueError as e:
+                return error_response(str(e))
+        else:
+            items = request.data if isinstance(request.data, list) else request.data.get('commissions')
+            if not isinstance(items, list):
+                return error_response('请提交委托单列表或上传文件')
+            rows = list(enumerate(items, start=1))
+        
+        if not rows:
+            return error_response('没有要导入的委托单')
+        if len(rows) > BULK_CREATE_LIMIT:
+            return error_response(f'单次最多导入{BULK_CREATE_LIMIT}份委托单')
+        
+        valid, errors = validate_rows(rows, request.user)
+        commissions = create_commissions(valid, request.user)
+        return success_response({
+            'total': len(rows),
+            'created': len(commissions),
+            'failed': len(errors),
+            'results': [
+                {'row': number, 'id': commission.pk, 'code': commission.code}
+                for (number, _), commission in zip(valid, commissions)
+            ],
+            'errors': errors,
+        }, f'成功导入{len(commissions)}份委托单，失败{len(errors)}份')
+    
     @action(detail=True, methods=['post'])
     def submit(self, request, pk=None):
         """
@@ -150,7 +193,7 @@ class CommissionViewSet(viewsets.ModelViewSet):
         return success_response(message='委托单已取消')
 
 
-class SampleReceiveViewSet(viewsets.ModelViewSet):
+class SampleReceiveViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     收样记录视图集
     
@@ -163,7 +206,7 @@ class SampleReceiveViewSet(viewsets.ModelViewSet):
     - 收样人员可以创建和查看收样记录
     - 委托方可以查看自己的收样记录
     """
-    queryset = SampleReceive.objects.filter(is_deleted=False)
+    queryset = SampleReceive.objects.all()
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['commission', 'receiver', 'sample_condition']
     search_fields = ['receive_code', 'commission__code']
@@ -185,7 +228,7 @@ class SampleReceiveViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        queryset = SampleReceive.objects.filter(is_deleted=False)
+        queryset = SampleReceive.objects.all()
         
         if user.role == 'client':
             return queryset.filter(commission__client__user=user)
@@ -14,6 +14,6 @@ class UsersConfig(AppConfig):
         """
         应用就绪时执行
         
-        可在此注册信号处理器等
+        注册部门变更时清理部门树缓存的信号
         """
-        pass
+        from . import signals  # noqa: F401
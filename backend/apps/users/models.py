@@ -222,6 +222,7 @@ class UserLoginLog(TimeStampedModel):
         ordering = ['-login_time']
         indexes = [
             models.Index(fields=['user', 'login_time'], name='idx_login_user_time'),
+            models.Index(fields=['login_time', 'id'], name='idx_login_time_cursor'),
         ]
     
     def __str__(self):
@@ -0,0 +1,19 @@
+"""
+用户权限管理信号处理
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.cache import invalidate_namespace
+from .models import Department
+
+# 参考数据缓存命名空间（见 views.py）
+DEPARTMENT_CACHE = 'users.departments'
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_department_cache(sender, **kwargs):
+    """部门树随部门变更"""
+    invalidate_namespace(DEPARTMENT_CACHE)
@@ -10,9 +10,10 @@ from .views import AuthViewSet, UserViewSet, DepartmentViewSet, UserLoginLogView
 
 # 创建路由器
 router = DefaultRouter()
-router.register('', UserViewSet, basename='user')
 router.register('departments', DepartmentViewSet, basename='department')
 router.register('login-logs', UserLoginLogViewSet, basename='login-log')
+# 空前缀需最后注册，否则会覆盖其他前缀的路由
+router.register('', UserViewSet, basename='user')
 
 urlpatterns = [
     # 认证相关接口（不需要登录）
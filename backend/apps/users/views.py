@@ -9,14 +9,17 @@ from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from common.cache import read_through
 from common.response import success_response, error_response, created_response
 from common.permissions import IsAdminUser, RoleBasedPermission
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin
 from .models import User, Department, UserLoginLog
 from .serializers import (
     UserSerializer, UserCreateSerializer, UserUpdateSerializer,
     PasswordChangeSerializer, PasswordResetSerializer, LoginSerializer,
     DepartmentSerializer, UserLoginLogSerializer, UserProfileSerializer
 )
+from .signals import DEPARTMENT_CACHE
 
 
 class AuthViewSet(viewsets.ViewSet):
@@ -140,7 +143,7 @@ class AuthViewSet(viewsets.ViewSet):
         return request.META.get('REMOTE_ADDR', '0.0.0.0')
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     用户管理视图集
     
@@ -252,7 +255,7 @@ class UserViewSet(viewsets.ModelViewSet):
         return success_response(message='密码重置成功')
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     部门管理视图集
     
@@ -283,19 +286,20 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def tree(self, request):
         """
-        获取部门树形结构
+        获取部门树形结构（缓存，部门变更时失效）
         """
-        # 获取顶级部门
-        root_departments = Department.objects.filter(
-            parent__isnull=True,
-            is_active=True
-        ).order_by('sort_order')
+        def build():
+            # 获取顶级部门
+            root_departments = Department.objects.filter(
+                parent__isnull=True,
+                is_active=True
+            ).order_by('sort_order')
+            return DepartmentSerializer(root_departments, many=True).data
         
-        serializer = DepartmentSerializer(root_departments, many=True)
-        return success_response(serializer.data)
+        return success_response(read_through(DEPARTMENT_CACHE, 'tree', build))
 
 
-class UserLoginLogViewSet(viewsets.ReadOnlyModelViewSet):
+class UserLoginLogViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """
     登录日志视图集
     
@@ -307,3 +311,4 @@ class UserLoginLogViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['user', 'status']
     search_fields = ['user__username', 'ip_address']
     ordering_fields = ['login_time']
+    cursor_ordering = ('-login_time', '-id')  # ?pagination=cursor 时使用游标分页
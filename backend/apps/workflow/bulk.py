@@ -0,0 +1,187 @@
+"""
+样品流转批量操作
+
+一次请求对多条流转记录执行同一状态变更或分配同一负责人：
+- 流转记录在事务中一次查询取出并加行锁，按 WorkflowStatus.TRANSITIONS 预先逐条校验；
+  不存在、无权查看或不能流转的记录返回原因，不影响其他记录
+- 校验通过的记录目标状态相同，用一条 UPDATE 更新，流转日志 bulk_create
+- queryset.update、bulk_create 不触发信号：完成时同步的委托单同样加行锁后更新，
+  按修改前后的汇总键更新日汇总，处理后清除仪表盘缓存
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.reports.dashboard import invalidate_dashboard
+from apps.reports.rollups import commission_bucket, refresh_buckets
+from apps.reports.signals import BUCKET_FIELDS
+from apps.samples.models import Commission, SampleReceive
+from .models import SampleWorkflow, WorkflowLog, WorkflowStatus
+
+# 单次批量操作的最大记录数
+BULK_WORKFLOW_LIMIT = 500
+
+STATUS_NAMES = dict(WorkflowStatus.CHOICES)
+
+
+def _lock_workflows(queryset, ids: List[int]) -> Tuple[List[SampleWorkflow], Dict[int, Dict]]:
+    """
+    一次查询取出并锁定流转记录，须在事务中调用
+
+    Args:
+        queryset: 当前用户可见的流转记录
+        ids: 流转记录ID（已去重）
+
+    Returns:
+        tuple: (找到的流转记录，与 ids 顺序一致, 找不到的 ID -> 错误)
+    """
+    found = queryset.select_for_update().in_bulk(ids)
+    errors = {pk: {'id': pk, 'message': '流转记录不存在'} for pk in ids if pk not in found}
+    return [found[pk] for pk in ids if pk in found], errors
+
+
+def _new_logs(workflows: Iterable[SampleWorkflow], to_status: str, user, remarks: str) -> List[WorkflowLog]:
+    return [
+        WorkflowLog(
+            workflow=workflow,
+            from_status=workflow.current_status,
+            to_status=to_status,
+            operator=user,
+            action=WorkflowStatus.ACTIONS.get(to_status, 'other'),
+            remarks=remarks,
+            created_by=user,
+        )
+        for workflow in workflows
+    ]
+
+
+def _complete_commissions(workflow_ids: List[int], now):
+    """
+    流转完成时同步委托单状态，并更新修改前后所属的日汇总
+
+    委托单先加行锁再读取汇总字段，与流转记录的行锁处于同一事务，
+    避免并发的单条流转或委托单修改使修改前的汇总键过期
+    """
+    commission_ids = SampleReceive.all_objects.filter(
+        workflow__pk__in=workflow_ids
+    ).values_list('commission_id', flat=True)
+    locked = Commission.all_objects.select_for_update().filter(pk__in=list(commission_ids)).order_by('pk')
+    previous = [values for values in locked.values('id', *BUCKET_FIELDS) if values['status'] != 'completed']
+    if not previous:
+        return
+    Commission.all_objects.filter(pk__in=[values['id'] for values in previous]).update(
+        status='completed', updated_at=now
+    )
+    refresh_buckets(
+        [commission_bucket(values) for values in previous]
+        + [commission_bucket({**values, 'status': 'completed'}) for values in previous]
+    )
+
+
+def _summary(ids: List[int], workflows: List[SampleWorkflow], errors: Dict[int, Dict]) -> Dict:
+    """按提交顺序汇总处理结果"""
+    updated = {workflow.pk: workflow for workflow in workflows}
+    return {
+        'total': len(ids),
+        'updated': len(updated),
+        'failed': len(errors),
+        'results': [
+            {'id': pk, 'current_status': updated[pk].current_status}
+            for pk in ids if pk in updated
+        ],
+        'errors': [errors[pk] for pk in ids if pk in errors],
+    }
+
+
+def transition_workflows(queryset, ids: List[int], to_status: str, user, remarks: str = '') -> Dict:
+    """
+    批量状态变更
+
+    Args:
+        queryset: 当前用户可见的流转记录
+        ids: 流转记录ID
+        to_status: 目标状态
+        user: 操作人
+        remarks: 备注
+
+    Returns:
+        dict: total/updated/failed 数量，results 为更新后的状态，errors 为失败原因
+    """
+    ids = list(dict.fromkeys(ids))
+    with transaction.atomic():
+        workflows, errors = _lock_workflows(queryset, ids)
+        movable = []
+        for workflow in workflows:
+            if workflow.can_transition_to(to_status):
+                movable.append(workflow)
+            else:
+                errors[workflow.pk] = {
+                    'id': workflow.pk,
+                    'message': f'当前状态 "{workflow.get_current_status_display()}" '
+                               f'不能流转到 "{STATUS_NAMES.get(to_status)}"',
+                }
+
+        if movable:
+            now = timezone.now()
+            pks = [workflow.pk for workflow in movable]
+            WorkflowLog.objects.bulk_create(_new_logs(movable, to_status, user, remarks))
+            updates = {'current_status': to_status, 'updated_at': now}
+            # 如果完成，记录实际完成日期并同步委托单状态
+            if to_status == WorkflowStatus.COMPLETED:
+                updates['actual_complete_date'] = now.date()
+                _complete_commissions(pks, now)
+            SampleWorkflow.objects.filter(pk__in=pks).update(**updates)
+            for workflow in movable:
+                workflow.current_status = to_status
+
+    if movable:
+        invalidate_dashboard()
+    return _summary(ids, movable, errors)
+
+
+def assign_workflows(queryset, ids: List[int], assignee, user, priority: Optional[int] = None,
+                     expected_complete_date=None, remarks: Optional[str] = None) -> Dict:
+    """
+    批量分配负责人
+
+    与单条分配一致：所有记录更新负责人，已收样的记录流转为已分配并记录日志
+
+    Args:
+        queryset: 当前用户可见的流转记录
+        ids: 流转记录ID
+        assignee: 负责人
+        user: 操作人
+        priority: 优先级，不填时保持不变
+        expected_complete_date: 预计完成日期，不填时保持不变
+        remarks: 日志备注，默认为“分配给 用户名”
+
+    Returns:
+        dict: total/updated/failed 数量，results 为更新后的状态，errors 为失败原因
+    """
+    ids = list(dict.fromkeys(ids))
+    if remarks is None:
+        remarks = f'分配给 {assignee.username}'
+    with transaction.atomic():
+        workflows, errors = _lock_workflows(queryset, ids)
+        if workflows:
+            updates = {'assigned_to': assignee, 'updated_at': timezone.now()}
+            if priority is not None:
+                updates['priority'] = priority
+            if expected_complete_date:
+                updates['expected_complete_date'] = expected_complete_date
+            SampleWorkflow.objects.filter(pk__in=[workflow.pk for workflow in workflows]).update(**updates)
+
+            received = [workflow for workflow in workflows if workflow.current_status == WorkflowStatus.RECEIVED]
+            if received:
+                WorkflowLog.objects.bulk_create(_new_logs(received, WorkflowStatus.ASSIGNED, user, remarks))
+                SampleWorkflow.objects.filter(
+                    pk__in=[workflow.pk for workflow in received]
+                ).update(current_status=WorkflowStatus.ASSIGNED)
+                for workflow in received:
+                    workflow.current_status = WorkflowStatus.ASSIGNED
+
+    if workflows:
+        invalidate_dashboard()
+    return _summary(ids, workflows, errors)
@@ -48,6 +48,18 @@ class WorkflowStatus:
         UNDER_APPROVAL: [COMPLETED, REJECTED],
         REJECTED: [ASSIGNED],
     }
+    
+    # 目标状态 -> 流转日志的操作类型
+    ACTIONS = {
+        ASSIGNED: 'assign',
+        TESTING: 'start',
+        TEST_COMPLETED: 'complete',
+        REPORT_EDITING: 'submit',
+        UNDER_REVIEW: 'submit',
+        UNDER_APPROVAL: 'review',
+        COMPLETED: 'approve',
+        REJECTED: 'reject',
+    }
 
 
 class SampleWorkflow(BaseModel):
@@ -117,7 +129,13 @@ class SampleWorkflow(BaseModel):
         verbose_name_plural = '样品流转列表'
         ordering = ['-priority', 'expected_complete_date', '-created_at']
         indexes = [
-            models.Index(fields=['current_status'], name='idx_workflow_status'),
+            models.Index(
+                fields=['is_deleted', 'current_status', '-priority', 'expected_complete_date', '-created_at'],
+                name='idx_workflow_status',
+            ),
+            models.Index(
+                fields=['is_deleted', '-priority', 'expected_complete_date', '-created_at'], name='idx_workflow_live'
+            ),
             models.Index(fields=['assigned_to', 'current_status'], name='idx_workflow_assignee'),
         ]
     
@@ -202,6 +220,9 @@ class WorkflowLog(BaseModel):
         verbose_name = '流转日志'
         verbose_name_plural = '流转日志列表'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='idx_workflow_log_cursor'),
+        ]
     
     def __str__(self):
         return f"{self.workflow.sample_receive.receive_code}: {self.get_from_status_display()} -> {self.get_to_status_display()}"
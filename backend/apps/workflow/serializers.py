@@ -78,6 +78,23 @@ class WorkflowAssignSerializer(serializers.Serializer):
     remarks = serializers.CharField(required=False, allow_blank=True, help_text='备注')
 
 
+class WorkflowBulkTransitionSerializer(WorkflowTransitionSerializer):
+    """批量状态变更序列化器"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, help_text='流转记录ID列表'
+    )
+
+
+class WorkflowBulkAssignSerializer(WorkflowAssignSerializer):
+    """批量分配序列化器，未填写优先级时保持原优先级"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, help_text='流转记录ID列表'
+    )
+    priority = serializers.ChoiceField(
+        choices=SampleWorkflow.PRIORITY_CHOICES, required=False, help_text='优先级'
+    )
+
+
 class TestTaskSerializer(serializers.ModelSerializer):
     """试验任务序列化器"""
     receive_code = serializers.CharField(source='workflow.sample_receive.receive_code', read_only=True)
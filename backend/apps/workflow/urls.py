@@ -7,9 +7,10 @@ from rest_framework.routers import DefaultRouter
 from .views import SampleWorkflowViewSet, WorkflowLogViewSet, TestTaskViewSet
 
 router = DefaultRouter()
-router.register('', SampleWorkflowViewSet, basename='workflow')
 router.register('logs', WorkflowLogViewSet, basename='workflow-log')
 router.register('tasks', TestTaskViewSet, basename='test-task')
+# 空前缀需最后注册，否则会覆盖其他前缀的路由
+router.register('', SampleWorkflowViewSet, basename='workflow')
 
 urlpatterns = [
     path('', include(router.urls)),
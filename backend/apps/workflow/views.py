@@ -10,15 +10,18 @@ from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from common.response import success_response, error_response
 from common.permissions import RoleBasedPermission
+from common.mixins import ConditionalGetMixin, RelatedQuerysetMixin, optimize_queryset
 from .models import SampleWorkflow, WorkflowLog, TestTask, WorkflowStatus
 from .serializers import (
     SampleWorkflowListSerializer, SampleWorkflowDetailSerializer,
     WorkflowLogSerializer, WorkflowTransitionSerializer, WorkflowAssignSerializer,
+    WorkflowBulkTransitionSerializer, WorkflowBulkAssignSerializer,
     TestTaskSerializer, TestTaskCreateSerializer
 )
+from .bulk import BULK_WORKFLOW_LIMIT, assign_workflows, transition_workflows
 
 
-class SampleWorkflowViewSet(viewsets.ModelViewSet):
+class SampleWorkflowViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     样品流转管理视图集
     
@@ -27,6 +30,8 @@ class SampleWorkflowViewSet(viewsets.ModelViewSet):
     - GET /workflows/{id}/ - 获取流转详情
     - POST /workflows/{id}/transition/ - 状态变更
     - POST /workflows/{id}/assign/ - 分配负责人
+    - POST /workflows/bulk_transition/ - 批量状态变更
+    - POST /workflows/bulk_assign/ - 批量分配负责人
     - GET /workflows/my_tasks/ - 获取我的任务
     - GET /workflows/status_options/ - 获取状态选项
     
@@ -36,7 +41,7 @@ class SampleWorkflowViewSet(viewsets.ModelViewSet):
     - 审核人员可以审核
     - 批准人员可以批准
     """
-    queryset = SampleWorkflow.objects.filter(is_deleted=False)
+    queryset = SampleWorkflow.objects.all()
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['current_status', 'assigned_to', 'priority']
     search_fields = ['sample_receive__receive_code', 'sample_receive__commission__code']
@@ -47,6 +52,8 @@ class SampleWorkflowViewSet(viewsets.ModelViewSet):
         'retrieve': ['admin', 'receiver', 'tester', 'reviewer', 'approver'],
         'transition': ['admin', 'receiver', 'tester', 'reviewer', 'approver'],
         'assign': ['admin', 'receiver'],
+        'bulk_transition': ['admin', 'receiver', 'tester', 'reviewer', 'approver'],
+        'bulk_assign': ['admin', 'receiver'],
     }
     
     def get_serializer_class(self):
@@ -56,7 +63,7 @@ class SampleWorkflowViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        queryset = SampleWorkflow.objects.filter(is_deleted=False)
+        queryset = SampleWorkflow.objects.all()
         
         # 试验人员只能看到分配给自己的任务
         if user.role == 'tester':
@@ -162,6 +169,59 @@ class SampleWorkflowViewSet(viewsets.ModelViewSet):
             f'已分配给 {assignee.username}'
         )
     
+    @action(detail=False, methods=['post'])
+    def bulk_transition(self, request):
+        """
+        批量状态变更
+        
+        请求体：{"ids": [...], "to_status": "...", "remarks": "..."}。
+        所有记录先按流转规则校验，不能流转的记录返回原因，其余记录在一个事务中更新
+        """
+        serializer = WorkflowBulkTransitionSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return error_response(serializer.errors)
+        
+        data = serializer.validated_data
+        if len(data['ids']) > BULK_WORKFLOW_LIMIT:
+            return error_response(f'单次最多处理{BULK_WORKFLOW_LIMIT}条流转记录')
+        
+        result = transition_workflows(
+            self.get_queryset(), data['ids'], data['to_status'], request.user, data.get('remarks', '')
+        )
+        return success_response(result, f'成功更新{result["updated"]}条，失败{result["failed"]}条')
+    
+    @action(detail=False, methods=['post'])
+    def bulk_assign(self, request):
+        """
+        批量分配负责人
+        
+        请求体：{"ids": [...], "assigned_to": 用户ID, "priority": ..., "expected_complete_date": ..., "remarks": ...}。
+        已收样的记录流转为已分配，所有记录在一个事务中更新
+        """
+        serializer = WorkflowBulkAssignSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return error_response(serializer.errors)
+        
+        data = serializer.validated_data
+        if len(data['ids']) > BULK_WORKFLOW_LIMIT:
+            return error_response(f'单次最多处理{BULK_WORKFLOW_LIMIT}条流转记录')
+        
+        from apps.users.models import User
+        try:
+            assignee = User.objects.get(pk=data['assigned_to'])
+        except User.DoesNotExist:
+            return error_response('指定的用户不存在')
+        
+        result = assign_workflows(
+            self.get_queryset(), data['ids'], assignee, request.user,
+            priority=data.get('priority'),
+            expected_complete_date=data.get('expected_complete_date'),
+            remarks=data.get('remarks'),
+        )
+        return success_response(result, f'已分配给 {assignee.username}：成功{result["updated"]}条，失败{result["failed"]}条')
+    
     @action(detail=False, methods=['get'])
     def my_tasks(self, request):
         """
@@ -169,7 +229,6 @@ class SampleWorkflowViewSet(viewsets.ModelViewSet):
         """
         user = request.user
         queryset = SampleWorkflow.objects.filter(
-            is_deleted=False,
             assigned_to=user,
             current_status__in=[
                 WorkflowStatus.ASSIGNED,
@@ -181,7 +240,7 @@ class SampleWorkflowViewSet(viewsets.ModelViewSet):
             ]
         ).order_by('-priority', 'expected_complete_date')
         
-        serializer = SampleWorkflowListSerializer(queryset, many=True)
+        serializer = SampleWorkflowListSerializer(optimize_queryset(queryset, SampleWorkflowListSerializer), many=True)
         return success_response(serializer.data)
     
     @action(detail=False, methods=['get'])
@@ -196,20 +255,10 @@ class SampleWorkflowViewSet(viewsets.ModelViewSet):
     
     def _get_action_type(self, to_status):
         """根据目标状态获取操作类型"""
-        action_map = {
-            WorkflowStatus.ASSIGNED: 'assign',
-            WorkflowStatus.TESTING: 'start',
-            WorkflowStatus.TEST_COMPLETED: 'complete',
-            WorkflowStatus.REPORT_EDITING: 'submit',
-            WorkflowStatus.UNDER_REVIEW: 'submit',
-            WorkflowStatus.UNDER_APPROVAL: 'review',
-            WorkflowStatus.COMPLETED: 'approve',
-            WorkflowStatus.REJECTED: 'reject',
-        }
-        return action_map.get(to_status, 'other')
+        return WorkflowStatus.ACTIONS.get(to_status, 'other')
 
 
-class WorkflowLogViewSet(viewsets.ReadOnlyModelViewSet):
+class WorkflowLogViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """
     流转日志视图集（只读）
     """
@@ -218,9 +267,10 @@ class WorkflowLogViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
     filterset_fields = ['workflow', 'operator', 'action']
     ordering_fields = ['created_at']
+    cursor_ordering = ('-created_at', '-id')  # ?pagination=cursor 时使用游标分页
 
 
-class TestTaskViewSet(viewsets.ModelViewSet):
+class TestTaskViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
     """
     试验任务视图集
     
@@ -230,7 +280,7 @@ class TestTaskViewSet(viewsets.ModelViewSet):
     - POST /tasks/{id}/start/ - 开始任务
     - POST /tasks/{id}/complete/ - 完成任务
     """
-    queryset = TestTask.objects.filter(is_deleted=False)
+    queryset = TestTask.objects.all()
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     filterset_fields = ['workflow', 'tester', 'status']
     ordering_fields = ['created_at', 'start_time']
@@ -250,7 +300,7 @@ class TestTaskViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        queryset = TestTask.objects.filter(is_deleted=False)
+        queryset = TestTask.objects.all()
         
         if user.role == 'tester':
             return queryset.filter(tester=user)
@@ -0,0 +1,193 @@
+"""
+缓存后端
+
+在 Django 缓存后端基础上记录命中/未命中次数，供 Prometheus 指标导出。
+
+read_through 提供参考数据（标准分类、检测参数、部门树等）的读穿缓存：
+- 版本化键：refcache:{命名空间}:{版本}:{键}，数据变更时 invalidate_namespace 递增版本号，
+  旧版本的键不再被读取，到期后自动清除，无需逐个删除
+- 防击穿：缓存未命中时只有抢到重建锁的进程查询数据库，其他进程等待重建结果
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django_redis.cache import RedisCache
+
+from . import metrics
+
+_MISSING = object()
+
+
+class CacheMetricsMixin:
+    """
+    缓存命中率统计
+
+    通过哨兵对象区分“未命中”和“缓存值为None”
+    """
+
+    metrics_label = 'default'
+
+    def get(self, key, default=None, version=None, **kwargs):
+        value = super().get(key, _MISSING, version=version, **kwargs)
+        if value is _MISSING:
+            metrics.record_cache(self.metrics_label, 0, 1)
+            return default
+        metrics.record_cache(self.metrics_label, 1, 0)
+        return value
+
+    def get_many(self, keys, version=None, **kwargs):
+        keys = list(keys)
+        result = super().get_many(keys, version=version, **kwargs)
+        metrics.record_cache(self.metrics_label, len(result), len(keys) - len(result))
+        return result
+
+
+class InstrumentedRedisCache(CacheMetricsMixin, RedisCache):
+    """带命中率统计的 Redis 缓存"""
+    metrics_label = 'redis'
+
+
+class InstrumentedLocMemCache(CacheMetricsMixin, LocMemCache):
+    """带命中率统计的本地内存缓存（测试环境使用）"""
+    metrics_label = 'locmem'
+
+
+class CacheSemaphore:
+    """
+    基于缓存的分布式信号量
+
+    用 cache.add 的原子性抢占 limit 个槽位之一，跨进程、跨 worker 限制并发。
+    槽位带过期时间，持有者异常退出后会自动释放。
+
+    用法：
+        semaphore = CacheSemaphore('ocr', limit=4, timeout=120)
+        slot = semaphore.acquire()
+        if slot is None:
+            ...  # 已满，稍后重试
+        try:
+            ...
+        finally:
+            semaphore.release(slot)
+    """
+
+    def __init__(self, name: str, limit: int, timeout: int = 300, cache_alias: str = 'default'):
+        self.name = name
+        self.limit = max(limit, 1)
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.cache_alias]
+
+    def _key(self, slot: int) -> str:
+        return f'semaphore:{self.name}:{slot}'
+
+    def acquire(self):
+        """
+        获取一个槽位
+
+        Returns:
+            int: 槽位编号，已满时返回None
+        """
+        for slot in range(self.limit):
+            if self.cache.add(self._key(slot), 1, self.timeout):
+                return slot
+        return None
+
+    def release(self, slot):
+        """释放槽位"""
+        if slot is not None:
+            self.cache.delete(self._key(slot))
+
+
+# ==================== 参考数据读穿缓存 ====================
+
+# 等待其他进程重建缓存时的轮询间隔（秒）
+REBUILD_POLL_INTERVAL = 0.05
+
+
+def _version_key(namespace: str) -> str:
+    return f'refcache:{namespace}:version'
+
+
+def namespace_version(namespace: str) -> int:
+    """
+    命名空间当前版本号
+
+    版本号不过期；被淘汰后以当前毫秒时间戳重新初始化，保证大于淘汰前的版本
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(namespace: str):
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.add(_version_key(namespace), int(time.time() * 1000), None)
+
+
+def invalidate_namespace(namespace: str):
+    """
+    使命名空间下的全部缓存失效
+
+    立即递增一次版本号；在事务中调用时提交后再递增一次，
+    避免提交前其他请求读到旧数据并写入新版本的缓存
+    """
+    _bump(namespace)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(namespace))
+
+
+def read_through(namespace: str, key: str, builder, timeout: int = None):
+    """
+    读穿缓存
+
+    Args:
+        namespace: 命名空间，相关数据变更时通过 invalidate_namespace 整体失效
+        key: 命名空间内的键（如请求参数），过长时取哈希
+        builder: 未命中时生成数据的函数，返回值需可 pickle
+        timeout: 过期时间（秒），默认 REFERENCE_CACHE['TTL']
+
+    Returns:
+        缓存或新生成的数据
+    """
+    config = getattr(settings, 'REFERENCE_CACHE', {})
+    timeout = timeout if timeout is not None else config.get('TTL', 3600)
+    lock_timeout = config.get('LOCK_TIMEOUT', 10)
+
+    if len(key) > 64:
+        key = hashlib.md5(key.encode('utf-8')).hexdigest()
+    cache_key = f'refcache:{namespace}:{namespace_version(namespace)}:{key}'
+    value = cache.get(cache_key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    lock_key = f'{cache_key}:lock'
+    if cache.add(lock_key, 1, lock_timeout):
+        try:
+            value = builder()
+            cache.set(cache_key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    # 其他进程正在重建，等待其结果；超时（重建进程异常）后自行查询
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(REBUILD_POLL_INTERVAL)
+        value = cache.get(cache_key, _MISSING)
+        if value is not _MISSING:
+            return value
+    return builder()
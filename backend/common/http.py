@@ -0,0 +1,157 @@
+"""
+外部HTTP服务连接池
+
+OCR、AI 等外部服务共用进程级的 requests.Session，按服务名各建一个，
+通过 keep-alive 复用TCP连接，避免每次调用都重新建立连接。
+
+配置项（settings.HTTP_CLIENT_CONFIG）：
+- POOL_CONNECTIONS: 每个服务缓存的连接池数量（按 host 区分）
+- POOL_MAXSIZE: 每个连接池保持的最大连接数，应不小于该服务的并发请求数
+- RETRIES: 重试次数。连接失败对所有方法重试；请求发出后连接被重置只对幂等方法（GET 等）重试，
+  OCR/AI 的 POST 不会重复提交；读超时不重试
+- BACKOFF: 重试退避基数（秒）
+- TIMEOUTS: 按接口配置的 (连接超时, 读取超时)，键为 track_service_call 使用的接口名
+
+连接的新建与复用次数记录在 lims_http_connections_total 指标中。
+gunicorn/celery 在 fork 之后才会首次创建会话，各进程互不共享连接。
+"""
+
+import logging
+import threading
+from typing import Dict, Tuple, Union
+
+from django.conf import settings
+from django.core.signals import setting_changed
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.exceptions import ReadTimeoutError
+    from urllib3.util.retry import Retry
+except ImportError:  # pragma: no cover - 依赖缺失时降级
+    requests = None
+
+# 未配置的接口使用的默认超时（秒）
+DEFAULT_TIMEOUT = (5, 30)
+
+_sessions: Dict[str, 'requests.Session'] = {}
+_lock = threading.Lock()
+
+
+def _config() -> dict:
+    return getattr(settings, 'HTTP_CLIENT_CONFIG', {})
+
+
+def get_timeout(endpoint: str) -> Union[float, Tuple[float, float]]:
+    """
+    获取接口超时
+
+    Args:
+        endpoint: 接口名，如 ocr.recognize
+
+    Returns:
+        tuple: (连接超时, 读取超时)
+    """
+    timeout = _config().get('TIMEOUTS', {}).get(endpoint, DEFAULT_TIMEOUT)
+    return tuple(timeout) if isinstance(timeout, (list, tuple)) else timeout
+
+
+if requests is not None:
+    class ResetRetry(Retry):
+        """
+        只在连接失败或连接被重置时重试
+
+        沿用 urllib3 默认的幂等方法列表：连接未建立时请求尚未发出，任何方法都可以重试；
+        请求发出后的读错误只对幂等方法重试，AI 对话等 POST 重复提交会重复计费、重复处理。
+        读超时说明服务端仍在处理，重试只会加重负载，即使是幂等方法也直接抛出。
+        """
+
+        def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+            if isinstance(error, ReadTimeoutError):
+                raise error
+            return super().increment(method, url, response, error, _pool, _stacktrace)
+
+    class PooledAdapter(HTTPAdapter):
+        """记录连接复用情况的适配器"""
+
+        def __init__(self, service: str, **kwargs):
+            self.service = service
+            super().__init__(**kwargs)
+
+        def _opened_connections(self) -> int:
+            pools = self.poolmanager.pools
+            return sum(pool.num_connections for pool in map(pools.get, pools.keys()) if pool is not None)
+
+        def send(self, request, *args, **kwargs):
+            opened = self._opened_connections()
+            try:
+                return super().send(request, *args, **kwargs)
+            finally:
+                # 并发请求时计数是近似值，足以观察复用率
+                metrics.record_http_connection(self.service, reused=self._opened_connections() <= opened)
+
+
+def _build_session(service: str) -> 'requests.Session':
+    config = _config()
+    retries = config.get('RETRIES', 2)
+    adapter = PooledAdapter(
+        service,
+        pool_connections=config.get('POOL_CONNECTIONS', 4),
+        pool_maxsize=config.get('POOL_MAXSIZE', 10),
+        max_retries=ResetRetry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=0,
+            backoff_factor=config.get('BACKOFF', 0.2),
+            raise_on_status=False,
+        ),
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(service: str) -> 'requests.Session':
+    """
+    获取服务的共享会话
+
+    Args:
+        service: 服务名，如 ocr、ai
+
+    Returns:
+        requests.Session: 进程内共享的会话
+
+    Raises:
+        RuntimeError: 未安装 requests
+    """
+    if requests is None:
+        raise RuntimeError('未安装requests')
+    session = _sessions.get(service)
+    if session is None:
+        with _lock:
+            session = _sessions.get(service)
+            if session is None:
+                session = _sessions[service] = _build_session(service)
+    return session
+
+
+def close_sessions():
+    """关闭所有会话，下次调用时按当前配置重新创建"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _reset_on_setting_change(setting, **kwargs):
+    if setting == 'HTTP_CLIENT_CONFIG':
+        close_sessions()
+
+
+setting_changed.connect(_reset_on_setting_change)
@@ -0,0 +1,229 @@
+"""
+请求性能采集
+
+按请求记录以下耗时，供 RequestTimingMiddleware 输出 Server-Timing 头和结构化日志：
+- 数据库：查询次数与总耗时（connection.execute_wrapper）
+- 序列化：Serializer.data 的耗时（只统计最外层，嵌套调用不重复计入）
+- 渲染：JSONRenderer.render 的耗时
+- 外部服务：common/services.py 中 MinIO/OCR/AI 调用的耗时与成败
+
+采集数据保存在 contextvars 中，未开启采集的请求没有额外开销。
+"""
+
+import functools
+import inspect
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from django.db import connections
+
+_current_profile: ContextVar[Optional['RequestProfile']] = ContextVar('lims_request_profile', default=None)
+
+# 外部服务调用监听器，签名为 listener(name, duration, ok)，不依赖请求采集是否开启
+_service_call_listeners: List[Callable[[str, float, bool], None]] = []
+
+_installed = False
+
+
+class RequestProfile:
+    """
+    单个请求的耗时采集结果
+
+    Attributes:
+        verbose: 是否记录明细（慢查询SQL、每次服务调用）
+        db_count: SQL查询次数
+        db_time: SQL总耗时（秒）
+        serialize_time: 序列化耗时（秒）
+        render_time: 渲染耗时（秒）
+        service_calls: 外部服务调用列表 [(名称, 耗时, 是否成功)]
+        queries: 明细模式下的SQL列表 [(耗时, SQL)]
+    """
+
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+        self.db_count = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+        self.service_calls = []
+        self.queries = []
+        self._serialize_depth = 0
+
+    @property
+    def service_time(self) -> float:
+        return sum(duration for _, duration, _ in self.service_calls)
+
+    def service_summary(self) -> Dict[str, Dict]:
+        """按服务名汇总调用次数、耗时和失败次数"""
+        summary = {}
+        for name, duration, ok in self.service_calls:
+            item = summary.setdefault(name, {'count': 0, 'ms': 0.0, 'errors': 0})
+            item['count'] += 1
+            item['ms'] += duration * 1000
+            item['errors'] += 0 if ok else 1
+        for item in summary.values():
+            item['ms'] = round(item['ms'], 2)
+        return summary
+
+    def slowest_queries(self, limit: int = 5) -> List[Dict]:
+        """明细模式下耗时最长的SQL"""
+        queries = sorted(self.queries, key=lambda item: item[0], reverse=True)[:limit]
+        return [{'ms': round(duration * 1000, 2), 'sql': sql[:500]} for duration, sql in queries]
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """获取当前请求的采集对象，未开启采集时返回None"""
+    return _current_profile.get()
+
+
+def _db_wrapper(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        profile.db_count += 1
+        profile.db_time += duration
+        if profile.verbose:
+            profile.queries.append((duration, sql))
+
+
+@contextmanager
+def profile_request(verbose: bool = False):
+    """
+    在上下文内采集当前请求的耗时
+
+    Args:
+        verbose: 是否记录明细
+
+    Yields:
+        RequestProfile: 采集对象
+    """
+    install()
+    profile = RequestProfile(verbose=verbose)
+    token = _current_profile.set(profile)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_db_wrapper))
+            yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+# ==================== 外部服务调用 ====================
+
+def add_service_call_listener(listener: Callable[[str, float, bool], None]):
+    """注册外部服务调用监听器（如指标采集）"""
+    if listener not in _service_call_listeners:
+        _service_call_listeners.append(listener)
+
+
+def _is_success(result) -> bool:
+    """服务适配层以 None/False/{'success': False} 表示失败"""
+    if result is None or result is False:
+        return False
+    if isinstance(result, dict) and result.get('success') is False:
+        return False
+    return True
+
+
+def track_service_call(name: str):
+    """
+    外部服务调用耗时采集装饰器
+
+    Args:
+        name: 服务调用名称，如 'ocr.recognize'
+    """
+    def record(duration: float, ok: bool):
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.service_calls.append((name, duration, ok))
+        for listener in _service_call_listeners:
+            listener(name, duration, ok)
+
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+            # 流式调用：从开始到生成器耗尽计时，中途抛出异常或被关闭视为失败
+            @functools.wraps(func)
+            def stream_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                ok = False
+                try:
+                    yield from func(*args, **kwargs)
+                    ok = True
+                finally:
+                    record(time.perf_counter() - start, ok)
+            return stream_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = func(*args, **kwargs)
+                ok = _is_success(result)
+                return result
+            finally:
+                record(time.perf_counter() - start, ok)
+        return wrapper
+    return decorator
+
+
+# ==================== 序列化与渲染 ====================
+
+def _timed_serializer_data(prop):
+    """包装 Serializer.data，只统计最外层序列化器"""
+    getter = prop.fget
+
+    @functools.wraps(getter)
+    def data(self):
+        profile = _current_profile.get()
+        if profile is None:
+            return getter(self)
+        profile._serialize_depth += 1
+        start = time.perf_counter()
+        try:
+            return getter(self)
+        finally:
+            profile._serialize_depth -= 1
+            if profile._serialize_depth == 0:
+                profile.serialize_time += time.perf_counter() - start
+    return property(data)
+
+
+def _timed_render(render):
+    @functools.wraps(render)
+    def wrapper(self, *args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return render(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            profile.render_time += time.perf_counter() - start
+    return wrapper
+
+
+def install():
+    """
+    挂载序列化与渲染的计时钩子（幂等）
+
+    DRF 的序列化在访问 .data 时才真正执行，这里包装 Serializer/ListSerializer 的 data 属性
+    """
+    global _installed
+    if _installed:
+        return
+    from rest_framework import serializers
+    from rest_framework.renderers import JSONRenderer
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        cls.data = _timed_serializer_data(cls.__dict__['data'])
+    JSONRenderer.render = _timed_render(JSONRenderer.render)
+    _installed = True
@@ -0,0 +1,262 @@
+"""
+Prometheus 指标
+
+导出以下指标，由 /metrics 接口提供给 Prometheus 抓取：
+- lims_http_request_duration_seconds: 按 DRF 视图和 action 统计的请求耗时
+- lims_db_queries_per_request: 每个请求的SQL查询次数
+- lims_cache_requests_total: 缓存命中/未命中次数
+- lims_service_call_duration_seconds / lims_service_call_errors_total: MinIO/OCR/AI 调用耗时与失败次数
+- lims_http_connections_total: OCR/AI 请求新建与复用连接的次数
+- lims_workflows / lims_scan_files: 按状态统计的流转与OCR任务数量（抓取时实时查询）
+
+gunicorn 多进程部署时设置环境变量 PROMETHEUS_MULTIPROC_DIR，各 worker 的指标写入该目录，
+抓取时由 MultiProcessCollector 汇总。
+
+prometheus_client 为可选依赖，未安装时所有记录函数为空操作，/metrics 返回 503。
+"""
+
+import ipaddress
+import logging
+import os
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+
+from .instrumentation import add_service_call_listener
+
+logger = logging.getLogger(__name__)
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Histogram
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # pragma: no cover - 依赖缺失时降级
+    prometheus_client = None
+
+# 请求耗时分桶（秒）
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# 外部服务耗时分桶（秒），AI 调用可能长达数十秒
+SERVICE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# 每请求查询次数分桶
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        'lims_http_request_duration_seconds', 'API请求耗时',
+        ['view', 'action', 'method', 'status'], buckets=LATENCY_BUCKETS,
+    )
+    REQUEST_QUERIES = Histogram(
+        'lims_db_queries_per_request', '每个请求的SQL查询次数',
+        ['view', 'action'], buckets=QUERY_BUCKETS,
+    )
+    CACHE_REQUESTS = Counter(
+        'lims_cache_requests_total', '缓存读取次数',
+        ['cache', 'result'],
+    )
+    SERVICE_LATENCY = Histogram(
+        'lims_service_call_duration_seconds', '外部服务调用耗时',
+        ['service'], buckets=SERVICE_BUCKETS,
+    )
+    SERVICE_ERRORS = Counter(
+        'lims_service_call_errors_total', '外部服务调用失败次数',
+        ['service'],
+    )
+    HTTP_CONNECTIONS = Counter(
+        'lims_http_connections_total', '外部HTTP请求使用的连接（新建/复用）',
+        ['service', 'reused'],
+    )
+
+
+def is_available() -> bool:
+    """指标采集是否可用"""
+    return prometheus_client is not None and getattr(settings, 'METRICS_CONFIG', {}).get('ENABLED', True)
+
+
+# ==================== 记录函数 ====================
+
+def record_cache(cache_alias: str, hits: int, misses: int):
+    """记录缓存命中与未命中次数"""
+    if prometheus_client is None:
+        return
+    if hits:
+        CACHE_REQUESTS.labels(cache_alias, 'hit').inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(cache_alias, 'miss').inc(misses)
+
+
+def record_service_call(name: str, duration: float, ok: bool):
+    """记录外部服务调用，由 track_service_call 回调"""
+    if prometheus_client is None:
+        return
+    service = name.split('.', 1)[0]
+    SERVICE_LATENCY.labels(service).observe(duration)
+    if not ok:
+        SERVICE_ERRORS.labels(service).inc()
+
+
+add_service_call_listener(record_service_call)
+
+
+def record_http_connection(service: str, reused: bool):
+    """记录外部HTTP请求是否复用了连接池中的连接"""
+    if prometheus_client is None:
+        return
+    HTTP_CONNECTIONS.labels(service, 'true' if reused else 'false').inc()
+
+
+# ==================== 业务状态采集 ====================
+
+class BusinessStateCollector:
+    """
+    业务状态采集器
+
+    在抓取时查询数据库，按状态统计流转和OCR任务数量。
+    只在提供 /metrics 的进程内执行，不受多进程模式影响。
+    """
+
+    def describe(self):
+        # 返回空列表，避免注册时执行 collect 查询数据库
+        return []
+
+    def collect(self):
+        from django.db.models import Count
+        from apps.workflow.models import SampleWorkflow, WorkflowStatus
+        from apps.ocr.models import ScanFile
+
+        workflows = GaugeMetricFamily('lims_workflows', '按状态统计的样品流转数量', labels=['status'])
+        counts = dict(
+            SampleWorkflow.objects.all()
+            .values_list('current_status').annotate(count=Count('id'))
+        )
+        for status, _ in WorkflowStatus.CHOICES:
+            workflows.add_metric([status], counts.get(status, 0))
+        yield workflows
+
+        scans = GaugeMetricFamily('lims_scan_files', '按状态统计的OCR任务数量', labels=['status'])
+        counts = dict(
+            ScanFile.objects.all()
+            .values_list('status').annotate(count=Count('id'))
+        )
+        for status, _ in ScanFile.STATUS_CHOICES:
+            scans.add_metric([status], counts.get(status, 0))
+        yield scans
+
+
+_business_collector = BusinessStateCollector()
+if prometheus_client is not None and not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    prometheus_client.REGISTRY.register(_business_collector)
+
+
+def _build_registry():
+    """获取抓取用的注册表，多进程模式下汇总各 worker 的指标文件"""
+    if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        return prometheus_client.REGISTRY
+    from prometheus_client import CollectorRegistry, multiprocess
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(_business_collector)
+    return registry
+
+
+def _from_allowed_address(request, allowed) -> bool:
+    """请求来源地址（REMOTE_ADDR，不信任 X-Forwarded-For）是否在允许的地址或网段内"""
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    for network in allowed:
+        try:
+            if address in ipaddress.ip_network(network, strict=False):
+                return True
+        except ValueError:
+            logger.warning('METRICS_CONFIG ALLOWED_IPS 中的地址无效: %s', network)
+    return False
+
+
+def metrics_view(request):
+    """
+    Prometheus 抓取接口
+
+    默认拒绝访问，满足以下任一条件时放行：
+    - 携带 Authorization: Bearer <METRICS_CONFIG['TOKEN']>
+    - 请求来源地址在 METRICS_CONFIG['ALLOWED_IPS'] 内
+    - METRICS_CONFIG['PUBLIC'] 为 True
+    """
+    if not is_available():
+        return HttpResponse('metrics unavailable', status=503, content_type='text/plain')
+
+    config = settings.METRICS_CONFIG
+    token = config.get('TOKEN')
+    if not (
+        config.get('PUBLIC')
+        or (token and request.META.get('HTTP_AUTHORIZATION') == f'Bearer {token}')
+        or _from_allowed_address(request, config.get('ALLOWED_IPS', []))
+    ):
+        if token:
+            return HttpResponse('unauthorized', status=401, content_type='text/plain')
+        return HttpResponse('forbidden', status=403, content_type='text/plain')
+
+    output = prometheus_client.generate_latest(_build_registry())
+    return HttpResponse(output, content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+# ==================== 请求指标中间件 ====================
+
+class MetricsMiddleware:
+    """
+    请求指标中间件
+
+    在 process_view 中记录 DRF 视图类与 action，请求结束后写入耗时和查询次数。
+    标签只使用视图名而非URL路径，避免详情接口的ID导致标签基数膨胀。
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = is_available()
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        query_count = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            query_count[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_queries))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        view, action = getattr(request, '_metrics_view', ('unresolved', ''))
+        if view == 'metrics':
+            return response
+        REQUEST_LATENCY.labels(view, action, request.method, response.status_code).observe(duration)
+        REQUEST_QUERIES.labels(view, action).observe(query_count[0])
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = self._resolve_view_name(request, view_func)
+
+    @staticmethod
+    def _resolve_view_name(request, view_func):
+        """
+        获取视图名与 action
+
+        ViewSet.as_view 会在视图函数上记录 cls 与 actions（HTTP方法 -> action名）
+        """
+        if view_func is metrics_view:
+            return 'metrics', ''
+        cls = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        name = cls.__name__ if cls else getattr(view_func, '__name__', 'unknown')
+        actions = getattr(view_func, 'actions', None) or {}
+        action = actions.get(request.method.lower(), request.method.lower() if not actions else '')
+        return name, action
@@ -0,0 +1,121 @@
+"""
+自定义中间件
+"""
+
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .instrumentation import profile_request
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimingMiddleware:
+    """
+    请求耗时采集中间件
+
+    对抽样命中的请求采集数据库、序列化、渲染和外部服务耗时，
+    输出 Server-Timing 响应头并记录一行 JSON 格式日志。
+
+    配置项（settings.INSTRUMENTATION）：
+    - ENABLED: 是否启用
+    - SAMPLE_RATE: 抽样比例（0~1）
+    - SLOW_REQUEST_MS: 超过该耗时的请求即使未抽样也记录日志（只含总耗时）
+    - VERBOSE_HEADER: 管理员（或 DEBUG 模式下任意请求）携带该头时必定抽样并开启明细模式；
+      其他请求携带该头不影响抽样，避免匿名请求随意开启采集
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, 'INSTRUMENTATION', {})
+        self.enabled = config.get('ENABLED', False)
+        self.sample_rate = config.get('SAMPLE_RATE', 1.0)
+        self.slow_request_ms = config.get('SLOW_REQUEST_MS', 1000)
+        verbose_header = config.get('VERBOSE_HEADER', 'X-Lims-Timing')
+        self.verbose_meta_key = 'HTTP_' + verbose_header.upper().replace('-', '_')
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        verbose = bool(request.META.get(self.verbose_meta_key)) and self._verbose_allowed(request)
+        sampled = verbose or random.random() < self.sample_rate
+        start = time.perf_counter()
+
+        if not sampled:
+            response = self.get_response(request)
+            total_ms = (time.perf_counter() - start) * 1000
+            if total_ms >= self.slow_request_ms:
+                self._log(request, response, {'total_ms': round(total_ms, 2), 'sampled': False})
+            return response
+
+        with profile_request(verbose=verbose) as profile:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        response['Server-Timing'] = self._server_timing(profile, total_ms)
+        entry = {
+            'total_ms': round(total_ms, 2),
+            'db_queries': profile.db_count,
+            'db_ms': round(profile.db_time * 1000, 2),
+            'serialize_ms': round(profile.serialize_time * 1000, 2),
+            'render_ms': round(profile.render_time * 1000, 2),
+            'service_ms': round(profile.service_time * 1000, 2),
+            'services': profile.service_summary(),
+            'sampled': True,
+        }
+        if profile.verbose:
+            entry['slow_queries'] = profile.slowest_queries()
+        self._log(request, response, entry)
+        return response
+
+    @staticmethod
+    def _verbose_allowed(request) -> bool:
+        """
+        明细模式仅对管理员开放
+
+        JWT 认证在视图内完成，此时 request.user 尚未确定，需要在抽样前自行校验令牌；
+        只有携带明细头的请求才会多一次用户查询
+        """
+        if settings.DEBUG:
+            return True
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return result is not None and getattr(result[0], 'role', None) == 'admin'
+
+    @staticmethod
+    def _server_timing(profile, total_ms: float) -> str:
+        metrics = [
+            f'db;dur={profile.db_time * 1000:.2f};desc="{profile.db_count} queries"',
+            f'serialize;dur={profile.serialize_time * 1000:.2f}',
+            f'render;dur={profile.render_time * 1000:.2f}',
+        ]
+        if profile.service_calls:
+            metrics.append(f'services;dur={profile.service_time * 1000:.2f}')
+        if profile.verbose:
+            for name, item in profile.service_summary().items():
+                metrics.append(
+                    f'{name.replace(".", "-")};dur={item["ms"]:.2f};desc="{item["count"]} calls {item["errors"]} errors"'
+                )
+        metrics.append(f'total;dur={total_ms:.2f}')
+        return ', '.join(metrics)
+
+    @staticmethod
+    def _log(request, response, entry: dict):
+        user = getattr(request, 'user', None)
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user_id': user.pk if user is not None and user.is_authenticated else None,
+            **entry,
+        }
+        logger.info(json.dumps(entry, ensure_ascii=False))
@@ -0,0 +1,349 @@
+"""
+视图集通用 Mixin
+
+RelatedQuerysetMixin 根据序列化器字段自动为查询集添加 select_related / prefetch_related，
+避免列表接口因 source='a.b.c' 等跨表字段逐行查询（N+1）：
+- 外键、一对一路径（含多级，如 sample_receive.commission.client.name）使用 select_related
+- 反向外键、多对多（many=True 的嵌套序列化器或关联字段）使用 prefetch_related，
+  嵌套序列化器内部的跨表字段继续在预取查询中 select_related
+- 只输出主键的关联字段（PrimaryKeyRelatedField）直接读取外键列，不关联查询
+- SerializerMethodField 中的查询无法推导，仍需在方法中自行处理
+
+ConditionalGetMixin 为列表、详情接口提供 ETag / Last-Modified 条件请求，数据未变化时返回 304，
+不执行序列化。校验值取自 updated_at：本表记录，以及序列化器输出的关联记录（同上推导的
+select_related 路径上各表、预取的多值关联的最新 updated_at 与条数）。
+"""
+
+import hashlib
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist, ValidationError
+from django.db.models import Count, Max, Prefetch, QuerySet
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.permissions import BasePermission
+from rest_framework.relations import RelatedField
+from rest_framework.response import Response
+
+
+def _relation(model, name: str):
+    """模型上名为 name 的关联字段，不是关联字段返回 None"""
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if not field.is_relation or field.related_model is None:
+        return None
+    return field
+
+
+def _pk_only(field, relation) -> bool:
+    """关联字段只输出主键且可直接读取外键列"""
+    return (
+        isinstance(field, RelatedField)
+        and field.use_pk_only_optimization()
+        and relation.concrete
+        and not relation.many_to_many
+    )
+
+
+def _collect(serializer, model, prefix: str, select: Set[str], prefetch: Dict[str, Prefetch]):
+    """收集序列化器各字段需要的关联，路径以 prefix 开头"""
+    for field in serializer.fields.values():
+        if field.write_only or isinstance(field, (serializers.SerializerMethodField, serializers.HiddenField)):
+            continue
+        if field.source == '*':
+            if isinstance(field, serializers.BaseSerializer):
+                _collect(field, model, prefix, select, prefetch)
+            continue
+
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        current, joined = model, []
+        for index, attr in enumerate(field.source_attrs):
+            relation = _relation(current, attr)
+            if relation is None:
+                break
+            last = index == len(field.source_attrs) - 1
+            if relation.many_to_many or relation.one_to_many:
+                # 多值关联只能预取，其中的跨表字段由嵌套序列化器在预取查询中处理
+                if last:
+                    path = prefix + '__'.join(joined + [attr])
+                    prefetch[path] = _prefetch(path, relation.related_model, nested)
+                break
+            if last and _pk_only(field, relation):
+                break
+            joined.append(attr)
+            current = relation.related_model
+            if last and isinstance(nested, serializers.BaseSerializer):
+                _collect(nested, current, prefix + '__'.join(joined) + '__', select, prefetch)
+        if joined:
+            select.add(prefix + '__'.join(joined))
+
+
+def _prefetch(path: str, model, nested) -> Prefetch:
+    """多值关联的预取，嵌套序列化器需要的关联在预取查询中一并加载"""
+    queryset = model._default_manager.all()
+    if isinstance(nested, serializers.BaseSerializer):
+        select, prefetch = set(), {}
+        _collect(nested, model, '', select, prefetch)
+        queryset = _apply(queryset, select, prefetch)
+    return Prefetch(path, queryset=queryset)
+
+
+def _select_paths(select: Set[str]) -> Tuple[str, ...]:
+    """去掉被更长路径包含的 select_related 路径"""
+    return tuple(sorted(path for path in select if not any(other.startswith(path + '__') for other in select)))
+
+
+def _apply(queryset: QuerySet, select: Set[str], prefetch: Dict[str, Prefetch]) -> QuerySet:
+    paths = _select_paths(select)
+    if paths:
+        queryset = queryset.select_related(*paths)
+    if prefetch:
+        queryset = queryset.prefetch_related(*(prefetch[path] for path in sorted(prefetch)))
+    return queryset
+
+
+@lru_cache(maxsize=None)
+def serializer_relations(serializer_class, model) -> Tuple[Tuple[str, ...], Tuple[Prefetch, ...]]:
+    """
+    推导序列化器需要的关联查询
+
+    Args:
+        serializer_class: 序列化器类
+        model: 查询集的模型
+
+    Returns:
+        tuple: (select_related 路径, prefetch_related 的 Prefetch 对象)
+    """
+    select, prefetch = set(), {}
+    _collect(serializer_class(), model, '', select, prefetch)
+    return _select_paths(select), tuple(prefetch[path] for path in sorted(prefetch))
+
+
+def optimize_queryset(queryset: QuerySet, serializer_class) -> QuerySet:
+    """
+    按序列化器字段为查询集添加 select_related / prefetch_related
+
+    Args:
+        queryset: 查询集
+        serializer_class: 用于输出该查询集的序列化器类
+
+    Returns:
+        QuerySet: 添加关联查询后的查询集
+    """
+    if not (isinstance(serializer_class, type) and issubclass(serializer_class, serializers.Serializer)):
+        return queryset
+    select, prefetch = serializer_relations(serializer_class, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class RelatedQuerysetMixin:
+    """
+    根据当前动作的序列化器自动添加关联查询
+
+    在 filter_queryset 中处理，视图自行重写 get_queryset 时同样生效：
+
+    class ReportViewSet(RelatedQuerysetMixin, viewsets.ModelViewSet):
+        ...
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return optimize_queryset(queryset, self.get_serializer_class())
+
+
+def _has_version(model) -> bool:
+    try:
+        model._meta.get_field('updated_at')
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def _path_model(model, path: str):
+    for attr in path.split('__'):
+        model = model._meta.get_field(attr).related_model
+    return model
+
+
+@lru_cache(maxsize=None)
+def version_paths(serializer_class, model) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    条件请求需要比较 updated_at 的关联路径
+
+    Args:
+        serializer_class: 序列化器类
+        model: 查询集的模型
+
+    Returns:
+        tuple: (单值关联路径, 多值关联路径)，只包含有 updated_at 字段的表
+    """
+    select, prefetch = serializer_relations(serializer_class, model)
+    single = {'__'.join(path.split('__')[:end]) for path in select for end in range(1, path.count('__') + 2)}
+    many = {item.prefetch_through for item in prefetch}
+    return (
+        tuple(sorted(path for path in single if _has_version(_path_model(model, path)))),
+        tuple(sorted(path for path in many if _has_version(_path_model(model, path)))),
+    )
+
+
+def _aggregate_versions(queryset: QuerySet, single, many) -> Tuple[int, List]:
+    """一次聚合查询取结果集的条数与各表最新 updated_at"""
+    expressions = {'count': Count('pk', distinct=bool(many)), 'v': Max('updated_at')}
+    for index, path in enumerate(single):
+        expressions[f's{index}'] = Max(f'{path}__updated_at')
+    for index, path in enumerate(many):
+        expressions[f'm{index}'] = Max(f'{path}__updated_at')
+        expressions[f'n{index}'] = Count(f'{path}__pk', distinct=True)
+    row = queryset.order_by().aggregate(**expressions)
+    values = [row['v'], *(row[f's{index}'] for index in range(len(single)))]
+    for index in range(len(many)):
+        values += [row[f'm{index}'], row[f'n{index}']]
+    return row['count'], values
+
+
+def _follow(obj, attrs):
+    for attr in attrs:
+        try:
+            obj = getattr(obj, attr)
+        except ObjectDoesNotExist:
+            return None
+        if obj is None:
+            return None
+    return obj
+
+
+def _instance_versions(instance, single, many) -> List:
+    """已加载对象的校验值，与 _aggregate_versions 顺序一致，关联数据已由预取加载，不再查询"""
+    values = [instance.updated_at]
+    for path in single:
+        related = _follow(instance, path.split('__'))
+        values.append(related.updated_at if related is not None else None)
+    for path in many:
+        *head, name = path.split('__')
+        owner = _follow(instance, head)
+        rows = list(getattr(owner, name).all()) if owner is not None else []
+        values += [max((row.updated_at for row in rows), default=None), len(rows)]
+    return values
+
+
+class ConditionalGetMixin:
+    """
+    列表、详情接口的条件请求（ETag / Last-Modified）
+
+    - 详情：请求带 If-None-Match / If-Modified-Since 时先用一次聚合查询取校验值，未变化直接返回 304；
+      否则按原流程查询、序列化，校验值取自已加载的对象，不额外查询
+    - 列表：一次聚合查询取整个结果集（筛选后、分页前）的条数与最新 updated_at，只查本表，
+      不关联其他表；条数与分页器的 COUNT 相同，直接作为分页总数，不再单独 COUNT。
+      关联表（如委托方名称）单独修改不改变列表的校验值。游标分页不处理
+    - 模型没有 updated_at 字段时不处理
+
+    ETag 与当前用户、请求地址有关，响应带 Cache-Control: private, no-cache，浏览器每次使用前重新校验。
+    只比较 updated_at 与多值关联的条数，queryset.update() 等不更新 updated_at 的写入不会改变校验值；
+    Last-Modified 精确到秒且不反映删除，客户端应优先使用 ETag。
+
+    class CommissionViewSet(ConditionalGetMixin, RelatedQuerysetMixin, viewsets.ModelViewSet):
+        ...
+    """
+    # 列表已另行缓存等情况下关闭列表的条件请求
+    conditional_list = True
+
+    def _version_paths(self, model):
+        serializer_class = self.get_serializer_class()
+        if not (
+            _has_version(model)
+            and isinstance(serializer_class, type)
+            and issubclass(serializer_class, serializers.Serializer)
+        ):
+            return None
+        return version_paths(serializer_class, model)
+
+    def _validators(self, count: int, values) -> Tuple[str, Optional[int]]:
+        stamps = [value for value in values if isinstance(value, datetime)]
+        digest = hashlib.md5(repr((
+            self.request.user.pk,
+            self.request.get_full_path(),
+            count,
+            [value.timestamp() if isinstance(value, datetime) else value for value in values],
+        )).encode('utf-8')).hexdigest()
+        return f'W/"{digest}"', int(max(stamps).timestamp()) if stamps else None
+
+    @staticmethod
+    def _conditional(request, etag: str, last_modified: Optional[int]):
+        """校验值未变化时返回 304 响应，否则返回 None"""
+        return get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+
+    @staticmethod
+    def _with_validators(response, etag: str, last_modified: Optional[int]):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Authorization',))
+        return response
+
+    def _has_object_permissions(self) -> bool:
+        return any(
+            type(permission).has_object_permission is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        )
+
+    def list(self, request, *args, **kwargs):
+        paginator = self.paginator
+        if not self.conditional_list or (
+            paginator is not None and getattr(paginator, 'uses_keyset', lambda *args: False)(request, self)
+        ):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        paths = self._version_paths(queryset.model)
+        if paths is None:
+            return super().list(request, *args, **kwargs)
+
+        # 无条件的列表请求同样需要返回校验值，只聚合本表，避免对整个结果集关联、去重计数
+        count, values = _aggregate_versions(queryset, (), ())
+        etag, last_modified = self._validators(count, values)
+        response = self._conditional(request, etag, last_modified)
+        if response is None:
+            # 本表聚合的条数即分页总数，分页器不再 COUNT
+            self.queryset_count = count
+            response = super().list(request, *args, **kwargs)
+        return self._with_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        paths = self._version_paths(queryset.model)
+        if paths is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        # 对象级权限需要先取得对象，此时跳过预先的聚合查询
+        conditional = 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+        if conditional and not self._has_object_permissions():
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                queryset = self.filter_queryset(queryset).filter(
+                    **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+                )
+                count, values = _aggregate_versions(queryset, *paths)
+            except (TypeError, ValueError, ValidationError):
+                count = 0
+            if count == 1:
+                etag, last_modified = self._validators(count, values)
+                response = self._conditional(request, etag, last_modified)
+                if response is not None:
+                    return self._with_validators(response, etag, last_modified)
+
+        instance = self.get_object()
+        etag, last_modified = self._validators(1, _instance_versions(instance, *paths))
+        response = self._conditional(request, etag, last_modified) if conditional else None
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self._with_validators(response, etag, last_modified)
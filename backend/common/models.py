@@ -8,6 +8,19 @@ from django.db import models
 from django.conf import settings
 
 
+class SoftDeleteManager(models.Manager):
+    """
+    软删除管理器
+    
+    自动过滤掉已软删除的记录，BaseModel 的子类默认提供：
+
+        MyModel.objects.filter(...)      # 不含已删除记录
+        MyModel.all_objects.filter(...)  # 包含已删除记录
+    """
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
 class BaseModel(models.Model):
     """
     基础模型抽象类
@@ -17,6 +30,14 @@ class BaseModel(models.Model):
     - updated_at: 更新时间
     - created_by: 创建人
     - is_deleted: 软删除标记
+
+    管理器：
+    - objects: 自动过滤已软删除的记录，业务查询直接使用，无需再写 filter(is_deleted=False)
+    - all_objects: 包含已删除记录，用于恢复、审计等场景
+
+    all_objects 声明在前，作为默认管理器（_default_manager）。反向关联管理器、预取、序列化器
+    唯一性校验、admin 都使用默认管理器，保持包含已删除记录：例如已删除记录的编号仍会被唯一性
+    校验发现，而不是在写入时违反数据库唯一约束。反向关联需要排除已删除记录时仍需显式过滤。
     
     Attributes:
         created_at: 创建时间，自动填充
@@ -49,6 +70,9 @@ class BaseModel(models.Model):
         help_text='软删除标记，True表示已删除'
     )
 
+    all_objects = models.Manager()
+    objects = SoftDeleteManager()
+
     class Meta:
         abstract = True
         ordering = ['-created_at']
@@ -72,21 +96,6 @@ class BaseModel(models.Model):
         self.save(update_fields=['is_deleted', 'updated_at'])
 
 
-class SoftDeleteManager(models.Manager):
-    """
-    软删除管理器
-    
-    自动过滤掉已软删除的记录
-    
-    用法：
-        class MyModel(BaseModel):
-            objects = SoftDeleteManager()
-            all_objects = models.Manager()  # 包含已删除记录
-    """
-    def get_queryset(self):
-        return super().get_queryset().filter(is_deleted=False)
-
-
 class TimeStampedModel(models.Model):
     """
     时间戳模型抽象类
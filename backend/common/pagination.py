@@ -2,11 +2,38 @@
 自定义分页器
 
 提供统一的分页响应格式，支持前端分页组件
+
+页码分页每页需要 COUNT(*) 和 OFFSET 扫描，页码越大越慢。声明了 cursor_ordering 的视图
+可以按请求切换为游标（keyset）分页：按排序字段的值定位下一页，第 N 页与第 1 页开销相同，
+总数按需返回（缓存的精确值或数据库估算值）。
 """
 
-from rest_framework.pagination import PageNumberPagination
+import base64
+import hashlib
+import json
+from functools import partial, reduce
+from operator import or_
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
 
+# 游标分页精确总数的缓存时间（秒）
+COUNT_CACHE_TTL = 60
+
+
+class CountedPaginator(Paginator):
+    """可直接传入总数的分页器，总数已知时不再执行 COUNT 查询"""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
 
 class StandardPagination(PageNumberPagination):
     """
@@ -33,6 +60,26 @@ class StandardPagination(PageNumberPagination):
     max_page_size = 100
     page_query_param = 'page'
 
+    # 游标分页：?pagination=cursor 开始，之后使用响应中的 next/previous 作为 cursor 参数
+    mode_query_param = 'pagination'
+
+    def uses_keyset(self, request, view) -> bool:
+        """请求是否使用游标分页"""
+        return bool(getattr(view, 'cursor_ordering', None)) and (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.uses_keyset(request, view):
+            self.keyset = KeysetPagination()
+            self.keyset.max_page_size = self.max_page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+        # 视图已查询过总数（条件请求校验值的本表聚合）时直接使用
+        self.django_paginator_class = partial(CountedPaginator, count=getattr(view, 'queryset_count', None))
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
         """
         返回统一格式的分页响应
@@ -43,6 +90,8 @@ class StandardPagination(PageNumberPagination):
         Returns:
             Response: 包含分页信息的响应对象
         """
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
         return Response({
             'code': 200,
             'message': 'success',
@@ -64,3 +113,160 @@ class LargeResultsSetPagination(PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 500
+
+
+class KeysetPagination(BasePagination):
+    """
+    游标（keyset）分页器
+
+    按视图的 cursor_ordering（如 ('-created_at', '-id')）排序，游标记录当前页首/末行的排序字段值，
+    下一页条件为 (created_at, id) < (游标值)，走排序字段索引，不使用 OFFSET：
+    - 排序字段须为本表非空字段，且最后一个字段唯一（通常为 id）
+    - 游标分页时忽略 ordering 查询参数
+
+    支持以下查询参数：
+    - cursor: 游标，来自上一次响应的 next / previous
+    - page_size: 每页数量，默认20，最大100
+    - total: 总数，默认不返回；cached 返回缓存的精确值，estimate 返回数据库估算值
+
+    响应格式：
+    {
+        "code": 200,
+        "message": "success",
+        "data": {
+            "total": null,
+            "page_size": 20,
+            "next": "eyJwIjog...",
+            "previous": null,
+            "results": [...]
+        }
+    }
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    total_query_param = 'total'
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        model = queryset.model
+        ordering = [(name.lstrip('-'), name.startswith('-')) for name in view.cursor_ordering]
+        fields = [model._meta.get_field(name) for name, _ in ordering]
+
+        position, reverse = self.decode_cursor(request, fields)
+        if reverse:
+            ordering = [(name, not descending) for name, descending in ordering]
+
+        page = queryset.order_by(*[('-' if descending else '') + name for name, descending in ordering])
+        if position is not None:
+            page = page.filter(self._after(ordering, position))
+        rows = list(page[:self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        if reverse:
+            rows.reverse()
+
+        has_next, has_previous = (position is not None, has_more) if reverse else (has_more, position is not None)
+        self.next_cursor = self.encode_cursor(rows[-1], fields, False) if has_next and rows else None
+        self.previous_cursor = self.encode_cursor(rows[0], fields, True) if has_previous and rows else None
+        self.total = self.get_total(queryset, request)
+        return rows
+
+    @staticmethod
+    def _after(ordering, position) -> Q:
+        """排序在游标之后的行：(a, b, id) > (va, vb, vid)，按各字段方向比较"""
+        clauses = []
+        for index, (name, descending) in enumerate(ordering):
+            equal = {prefix: value for (prefix, _), value in zip(ordering[:index], position)}
+            clauses.append(Q(**equal, **{f"{name}__{'lt' if descending else 'gt'}": position[index]}))
+        return reduce(or_, clauses)
+
+    def encode_cursor(self, row, fields, reverse: bool) -> str:
+        payload = {'p': [field.value_to_string(row) for field in fields], 'r': int(reverse)}
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def decode_cursor(self, request, fields):
+        """
+        解析游标
+
+        Returns:
+            tuple: (排序字段值列表，无游标时为 None, 是否向前翻页)
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            values = payload['p']
+            if len(values) != len(fields):
+                raise ValueError(token)
+            return [field.to_python(value) for field, value in zip(fields, values)], bool(payload.get('r'))
+        except Exception:
+            raise NotFound('无效的分页游标')
+
+    def get_total(self, queryset, request):
+        """
+        按需返回总数
+
+        - cached: 精确 COUNT(*)，按查询语句缓存 COUNT_CACHE_TTL 秒，翻页时不重复计数
+        - estimate: MySQL/MariaDB 执行计划中的估算行数，其他数据库使用 cached
+        """
+        mode = request.query_params.get(self.total_query_param)
+        if mode == 'estimate':
+            estimate = self._estimate_count(queryset)
+            if estimate is not None:
+                return estimate
+        if mode in ('cached', 'estimate'):
+            sql, params = queryset.order_by().query.sql_with_params()
+            key = 'pagination:count:' + hashlib.md5(f'{sql}|{params}'.encode()).hexdigest()
+            return cache.get_or_set(key, queryset.count, COUNT_CACHE_TTL)
+        return None
+
+    @staticmethod
+    def _estimate_count(queryset):
+        if connections[queryset.db].vendor != 'mysql':
+            return None
+        try:
+            plan = json.loads(queryset.order_by().explain(format='JSON'))
+        except Exception:
+            return None
+
+        def first_rows(node):
+            if isinstance(node, dict):
+                if 'rows' in node:
+                    return node['rows']
+                nodes = node.values()
+            elif isinstance(node, list):
+                nodes = node
+            else:
+                return None
+            for child in nodes:
+                rows = first_rows(child)
+                if rows is not None:
+                    return rows
+            return None
+
+        rows = first_rows(plan)
+        return int(rows) if rows is not None else None
+
+    def get_paginated_response(self, data):
+        return Response({
+            'code': 200,
+            'message': 'success',
+            'data': {
+                'total': self.total,
+                'page_size': self.page_size_value,
+                'next': self.next_cursor,
+                'previous': self.previous_cursor,
+                'results': data
+            }
+        })
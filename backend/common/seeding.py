@@ -0,0 +1,848 @@
+"""
+合成数据生成器
+
+为压测和性能基准批量生成覆盖所有业务模块的合成数据：
+- 使用固定随机种子，相同参数多次运行生成的数据完全一致
+- 主键预先分配，按块 bulk_create，不依赖数据库返回自增ID
+- 委托单链路（收样→流转→日志→原始记录→报告）按块生成，内存占用与总量无关
+
+用法：
+    LimsSeeder(commissions=100000, seed=42).run()
+"""
+
+import hashlib
+import random
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.users.models import User, Department, UserLoginLog
+from apps.samples.models import Client, Commission, SampleReceive
+from apps.workflow.models import SampleWorkflow, WorkflowLog, TestTask, WorkflowStatus
+from apps.records.models import RecordTemplate, OriginalRecord, RecordAttachment
+from apps.ocr.models import ScanFile, OCRResult, OCRPageResult, Report
+from apps.quality.models import QualityDocument, DocumentCategory, DocumentVersion
+from apps.capability.models import TestStandard, TestParameter, ParameterPrice
+from apps.equipment.models import Laboratory, Equipment, CalibrationRecord, EquipmentUsageLog
+from apps.floorplan.models import FloorPlan, FloorPlanNode
+from apps.reports.models import CommissionDailyStat, StatisticsReport
+from apps.reports.rollups import rebuild_commission_stats
+from apps.ai_verify.cache import bump_rules_version
+from apps.ai_verify.models import VerifyBatchJob, VerifyRecord, VerifyRule
+from apps.cloud_query.models import QueryApplication, QueryLog
+from apps.capability.signals import PARAMETER_CACHE, STANDARD_CACHE
+from apps.records.signals import TEMPLATE_CACHE
+from apps.users.signals import DEPARTMENT_CACHE
+from common.cache import invalidate_namespace
+
+# 所有参与生成的模型，用于主键分配与时间戳控制
+SEEDED_MODELS = [
+    Department, User, UserLoginLog,
+    Client, Commission, SampleReceive,
+    SampleWorkflow, WorkflowLog, TestTask,
+    RecordTemplate, OriginalRecord, RecordAttachment,
+    ScanFile, OCRResult, OCRPageResult, Report,
+    DocumentCategory, QualityDocument, DocumentVersion,
+    TestStandard, TestParameter, ParameterPrice,
+    Laboratory, Equipment, CalibrationRecord, EquipmentUsageLog,
+    FloorPlan, FloorPlanNode,
+    StatisticsReport, CommissionDailyStat,
+    VerifyRule, VerifyBatchJob, VerifyRecord,
+    QueryApplication, QueryLog,
+]
+
+# 正常流程的状态序列
+HAPPY_PATH = [
+    WorkflowStatus.RECEIVED,
+    WorkflowStatus.ASSIGNED,
+    WorkflowStatus.TESTING,
+    WorkflowStatus.TEST_COMPLETED,
+    WorkflowStatus.REPORT_EDITING,
+    WorkflowStatus.UNDER_REVIEW,
+    WorkflowStatus.UNDER_APPROVAL,
+    WorkflowStatus.COMPLETED,
+]
+
+# 目标状态 -> 流转日志操作类型
+ACTION_BY_STATUS = {
+    WorkflowStatus.ASSIGNED: 'assign',
+    WorkflowStatus.TESTING: 'start',
+    WorkflowStatus.TEST_COMPLETED: 'complete',
+    WorkflowStatus.REPORT_EDITING: 'submit',
+    WorkflowStatus.UNDER_REVIEW: 'submit',
+    WorkflowStatus.UNDER_APPROVAL: 'review',
+    WorkflowStatus.COMPLETED: 'approve',
+    WorkflowStatus.REJECTED: 'reject',
+}
+
+# 流转状态 -> 报告状态
+REPORT_STATUS_BY_WORKFLOW = {
+    WorkflowStatus.REPORT_EDITING: 'draft',
+    WorkflowStatus.UNDER_REVIEW: 'reviewing',
+    WorkflowStatus.UNDER_APPROVAL: 'approved',
+    WorkflowStatus.COMPLETED: 'issued',
+}
+
+# 样品类别及其原始记录模板字段
+SAMPLE_CATEGORIES = {
+    '水泥': [
+        {'name': '试验编号', 'type': 'text', 'required': True},
+        {'name': '试验日期', 'type': 'date', 'required': True},
+        {'name': '抗折强度', 'type': 'number', 'unit': 'MPa', 'min': 3, 'max': 10, 'required': True},
+        {'name': '抗压强度', 'type': 'number', 'unit': 'MPa', 'min': 20, 'max': 65, 'required': True},
+        {'name': '初凝时间', 'type': 'number', 'unit': 'min', 'min': 45, 'max': 300},
+    ],
+    '混凝土': [
+        {'name': '试验编号', 'type': 'text', 'required': True},
+        {'name': '试验日期', 'type': 'date', 'required': True},
+        {'name': '龄期', 'type': 'number', 'unit': 'd', 'min': 3, 'max': 28, 'required': True},
+        {'name': '抗压强度', 'type': 'number', 'unit': 'MPa', 'min': 15, 'max': 60, 'required': True},
+        {'name': '坍落度', 'type': 'number', 'unit': 'mm', 'min': 50, 'max': 220},
+    ],
+    '钢筋': [
+        {'name': '试验编号', 'type': 'text', 'required': True},
+        {'name': '试验日期', 'type': 'date', 'required': True},
+        {'name': '屈服强度', 'type': 'number', 'unit': 'MPa', 'min': 300, 'max': 600, 'required': True},
+        {'name': '抗拉强度', 'type': 'number', 'unit': 'MPa', 'min': 420, 'max': 750, 'required': True},
+        {'name': '断后伸长率', 'type': 'number', 'unit': '%', 'min': 10, 'max': 30},
+    ],
+    '砂石': [
+        {'name': '试验编号', 'type': 'text', 'required': True},
+        {'name': '试验日期', 'type': 'date', 'required': True},
+        {'name': '含泥量', 'type': 'number', 'unit': '%', 'min': 0.1, 'max': 5, 'required': True},
+        {'name': '细度模数', 'type': 'number', 'unit': '', 'min': 1.6, 'max': 3.7},
+    ],
+}
+
+# 各角色的默认用户数量
+DEFAULT_STAFF = {
+    'admin': 2,
+    'receiver': 5,
+    'tester': 20,
+    'reviewer': 5,
+    'approver': 3,
+}
+
+# 种子数据统一密码
+SEED_PASSWORD = 'seed-pass-123'
+
+
+@contextmanager
+def manual_timestamps(models):
+    """
+    临时关闭 auto_now / auto_now_add
+
+    bulk_create 会在插入时覆盖自动时间戳，关闭后可写入分布在历史区间内的时间
+    """
+    patched = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                patched.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = False
+                field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in patched:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class LimsSeeder:
+    """
+    LIMS合成数据生成器
+
+    Attributes:
+        commissions: 委托单数量，其余业务数据按比例派生
+        clients: 委托方数量
+        equipment: 设备数量
+        seed: 随机种子
+        chunk_size: 每次 bulk_create 的记录数
+        days: 数据分布的历史天数
+        end_date: 数据时间区间的截止日期
+    """
+
+    def __init__(
+        self,
+        commissions: int = 1000,
+        clients: Optional[int] = None,
+        equipment: Optional[int] = None,
+        seed: int = 42,
+        chunk_size: int = 2000,
+        days: int = 365,
+        end_date=None,
+        progress: Optional[Callable[[str], None]] = None,
+    ):
+        self.commissions = commissions
+        self.clients = clients if clients is not None else max(commissions // 50, 5)
+        self.equipment = equipment if equipment is not None else max(commissions // 200, 10)
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.days = max(days, 1)
+        self.end_date = end_date or timezone.localdate()
+        self.progress = progress or (lambda message: None)
+
+        self.rng = random.Random(seed)
+        self.counts = Counter()
+        self._next_pk = {}
+        self._password = make_password(SEED_PASSWORD)
+        self._end = timezone.make_aware(datetime.combine(self.end_date, time(18, 0)))
+        self._timestamp_fields = {
+            model: [
+                field.attname for field in model._meta.concrete_fields
+                if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+            ]
+            for model in SEEDED_MODELS
+        }
+
+    # ==================== 入口 ====================
+
+    def run(self) -> Dict[str, int]:
+        """
+        生成全部数据
+
+        Returns:
+            dict: 各模型生成的记录数
+        """
+        self._init_pk_counters()
+        with manual_timestamps(SEEDED_MODELS):
+            with transaction.atomic():
+                self._seed_organization()
+                self._seed_capability()
+                self._seed_templates()
+                self._seed_equipment()
+                self._seed_quality()
+                self._seed_misc()
+            self._seed_commissions()
+            with transaction.atomic():
+                self._finish_batch_jobs()
+                self._seed_cloud_query()
+        # bulk_create 不触发信号，按明细重建委托单日汇总（需自动时间戳，放在 manual_timestamps 之外）
+        self.counts[CommissionDailyStat._meta.label] += rebuild_commission_stats()
+        for namespace in (STANDARD_CACHE, PARAMETER_CACHE, TEMPLATE_CACHE, DEPARTMENT_CACHE):
+            invalidate_namespace(namespace)
+        self._reset_sequences()
+        return dict(self.counts)
+
+    # ==================== 基础工具 ====================
+
+    def _init_pk_counters(self):
+        for model in SEEDED_MODELS:
+            current = model._base_manager.aggregate(max_pk=Max('pk'))['max_pk'] or 0
+            self._next_pk[model] = current + 1
+
+    def _pk(self, model) -> int:
+        pk = self._next_pk[model]
+        self._next_pk[model] = pk + 1
+        return pk
+
+    def _new(self, model, /, when: Optional[datetime] = None, **kwargs):
+        """构造模型实例并分配主键、时间戳"""
+        obj = model(pk=self._pk(model), **kwargs)
+        when = when or self._end
+        # manual_timestamps 已关闭自动时间戳，未显式指定的统一赋值
+        for attname in self._timestamp_fields[model]:
+            if getattr(obj, attname) is None:
+                setattr(obj, attname, when)
+        return obj
+
+    def _insert(self, model, objs: List):
+        """按块批量插入"""
+        for start in range(0, len(objs), self.chunk_size):
+            model._base_manager.bulk_create(objs[start:start + self.chunk_size])
+        self.counts[model._meta.label] += len(objs)
+
+    def _random_time(self, max_days_ago: Optional[int] = None) -> datetime:
+        """在历史区间内随机取一个时间点"""
+        max_days_ago = self.days if max_days_ago is None else max_days_ago
+        return self._end - timedelta(
+            days=self.rng.randint(0, max_days_ago),
+            seconds=self.rng.randint(0, 10 * 3600),
+        )
+
+    def _reset_sequences(self):
+        """显式写入主键后，重置需要序列的数据库（如PostgreSQL）的自增序列"""
+        statements = connection.ops.sequence_reset_sql(no_style(), SEEDED_MODELS)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    # ==================== 组织与用户 ====================
+
+    def _seed_organization(self):
+        rng = self.rng
+        root = self._new(Department, name='试验室', code=f'SEED-DEPT-{self._next_pk[Department]}', sort_order=0)
+        departments = [root] + [
+            self._new(
+                Department, name=f'{category}室', parent_id=root.pk, sort_order=i,
+                code=f'SEED-DEPT-{self._next_pk[Department]}',
+            )
+            for i, category in enumerate(SAMPLE_CATEGORIES, start=1)
+        ]
+        self._insert(Department, departments)
+
+        users = []
+        self.staff = {}
+        for role, count in DEFAULT_STAFF.items():
+            self.staff[role] = []
+            for _ in range(count):
+                pk = self._next_pk[User]
+                user = self._new(
+                    User, username=f'seed_{role}_{pk}', password=self._password, role=role,
+                    department_id=rng.choice(departments).pk, email=f'seed_{role}_{pk}@example.com',
+                    date_joined=self._random_time(), is_staff=(role == 'admin'),
+                )
+                users.append(user)
+                self.staff[role].append(user)
+
+        # 每个委托方一个登录账户
+        self.client_users = []
+        for _ in range(self.clients):
+            pk = self._next_pk[User]
+            user = self._new(
+                User, username=f'seed_client_{pk}', password=self._password, role='client',
+                date_joined=self._random_time(),
+            )
+            users.append(user)
+            self.client_users.append(user)
+        self._insert(User, users)
+
+        client_objs = []
+        for i, user in enumerate(self.client_users):
+            pk = self._next_pk[Client]
+            client_objs.append(self._new(
+                Client, when=user.date_joined, name=f'建设工程有限公司{pk}', code=f'CL-S{pk:08d}',
+                contact_person=f'联系人{pk}', contact_phone=f'139{pk:08d}'[:20],
+                address=f'工程路{pk}号', user_id=user.pk,
+                credit_level=rng.choice(['A', 'B', 'B', 'C']),
+                created_by_id=self.staff['admin'][0].pk,
+            ))
+        self._insert(Client, client_objs)
+        self.client_objs = client_objs
+
+        logs = []
+        for user in users:
+            for _ in range(rng.randint(1, 10)):
+                when = self._random_time()
+                logs.append(self._new(
+                    UserLoginLog, when=when, user_id=user.pk, login_time=when,
+                    ip_address=f'10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+                    user_agent='Mozilla/5.0 (seed)',
+                    status='success' if rng.random() > 0.05 else 'failed',
+                ))
+        self._insert(UserLoginLog, logs)
+        self.progress(f'用户: {len(users)}, 委托方: {len(client_objs)}, 登录日志: {len(logs)}')
+
+    # ==================== 能力管理 ====================
+
+    def _seed_capability(self):
+        rng = self.rng
+        admin_id = self.staff['admin'][0].pk
+        standards = []
+        for category in SAMPLE_CATEGORIES:
+            for _ in range(5):
+                pk = self._next_pk[TestStandard]
+                standards.append(self._new(
+                    TestStandard, code=f'GB/T S{pk:06d}-2019', name=f'{category}检测标准{pk}',
+                    category=category, version='2019', effective_date=self.end_date - timedelta(days=1000),
+                    created_by_id=admin_id,
+                ))
+        self._insert(TestStandard, standards)
+
+        parameters, prices = [], []
+        self.parameter_prices = {}
+        for standard in standards:
+            fields = [f for f in SAMPLE_CATEGORIES[standard.category] if f['type'] == 'number']
+            for field in fields:
+                pk = self._next_pk[TestParameter]
+                parameter = self._new(
+                    TestParameter, name=field['name'], code=f'P-S{pk:06d}', standard_id=standard.pk,
+                    unit=field.get('unit'), method='标准方法', created_by_id=admin_id,
+                )
+                parameters.append(parameter)
+                price = Decimal(rng.randint(5, 80) * 10)
+                self.parameter_prices.setdefault(standard.category, []).append(price)
+                for price_type, factor in [('normal', 1), ('urgent', 2)]:
+                    prices.append(self._new(
+                        ParameterPrice, parameter_id=parameter.pk, price=price * factor,
+                        price_type=price_type, effective_date=self.end_date - timedelta(days=self.days),
+                        created_by_id=admin_id,
+                    ))
+        self._insert(TestParameter, parameters)
+        self._insert(ParameterPrice, prices)
+
+    # ==================== 原始记录模板 ====================
+
+    def _seed_templates(self):
+        admin_id = self.staff['admin'][0].pk
+        templates = []
+        self.templates_by_category = {}
+        for category, fields in SAMPLE_CATEGORIES.items():
+            for version in ['1.0', '2.0']:
+                pk = self._next_pk[RecordTemplate]
+                template = self._new(
+                    RecordTemplate, name=f'{category}原始记录', code=f'TP-S{pk:06d}',
+                    category=category, fields=fields, version=version,
+                    header_info={'title': f'{category}检测原始记录'}, created_by_id=admin_id,
+                )
+                templates.append(template)
+                self.templates_by_category.setdefault(category, []).append(template)
+        self._insert(RecordTemplate, templates)
+
+    # ==================== 设备与平面图 ====================
+
+    def _seed_equipment(self):
+        rng = self.rng
+        admin_id = self.staff['admin'][0].pk
+        testers = self.staff['tester']
+
+        laboratories = []
+        for category in SAMPLE_CATEGORIES:
+            pk = self._next_pk[Laboratory]
+            laboratories.append(self._new(
+                Laboratory, name=f'{category}试验室', room_number=f'S{pk:05d}',
+                temperature_range='20±2℃', humidity_range='50%±10%',
+                responsible_person_id=rng.choice(testers).pk, created_by_id=admin_id,
+            ))
+        self._insert(Laboratory, laboratories)
+
+        equipments, calibrations, usage_logs = [], [], []
+        for _ in range(self.equipment):
+            pk = self._next_pk[Equipment]
+            commissioning = self.end_date - timedelta(days=rng.randint(400, 3000))
+            equipment = self._new(
+                Equipment, name=rng.choice(['压力试验机', '万能试验机', '电子天平', '恒温水浴', '振实台']),
+                code=f'EQ-S{pk:06d}', model=f'型号{rng.randint(100, 999)}',
+                manufacturer='仪器厂', laboratory_id=rng.choice(laboratories).pk,
+                purchase_date=commissioning - timedelta(days=30), commissioning_date=commissioning,
+                status=rng.choice(['normal'] * 8 + ['calibrating', 'maintenance']),
+                custodian_id=rng.choice(testers).pk, created_by_id=admin_id,
+            )
+            equipments.append(equipment)
+
+            # 每年一次校准，最近一次的有效期在今天前后分布，保证有待校准设备
+            latest_valid = self.end_date + timedelta(days=rng.randint(-60, 300))
+            for years_ago in range(3):
+                valid_until = latest_valid - timedelta(days=365 * years_ago)
+                calibration_date = valid_until - timedelta(days=365)
+                calibrations.append(self._new(
+                    CalibrationRecord,
+                    when=timezone.make_aware(datetime.combine(calibration_date, time(9, 0))),
+                    equipment_id=equipment.pk, calibration_date=calibration_date,
+                    valid_until=valid_until, calibration_org='省计量科学研究院',
+                    certificate_number=f'JZ{pk:06d}-{years_ago}',
+                    result='qualified' if rng.random() > 0.03 else 'unqualified',
+                    calibration_data={'deviation': round(rng.uniform(-0.5, 0.5), 3)},
+                    cost=Decimal(rng.randint(3, 20) * 100), created_by_id=admin_id,
+                ))
+
+            for _ in range(rng.randint(5, 20)):
+                start = self._random_time()
+                user = rng.choice(testers)
+                usage_logs.append(self._new(
+                    EquipmentUsageLog, when=start, equipment_id=equipment.pk, user_id=user.pk,
+                    start_time=start, end_time=start + timedelta(minutes=rng.randint(10, 240)),
+                    purpose='样品检测', condition_before='正常', condition_after='正常',
+                    created_by_id=user.pk,
+                ))
+
+            if len(usage_logs) >= self.chunk_size:
+                self._flush_equipment(equipments, calibrations, usage_logs)
+        self._flush_equipment(equipments, calibrations, usage_logs)
+
+        plans, nodes = [], []
+        for floor in range(1, 3):
+            plan = self._new(
+                FloorPlan, name=f'{floor}层平面图', building='试验楼', floor=str(floor),
+                image_path=f'floorplan/seed_{floor}.png', image_width=1920, image_height=1080,
+                created_by_id=admin_id,
+            )
+            plans.append(plan)
+            for i, laboratory in enumerate(laboratories):
+                nodes.append(self._new(
+                    FloorPlanNode, floor_plan_id=plan.pk, laboratory_id=laboratory.pk,
+                    x=10 + i * 15, y=20 + floor * 10, label=laboratory.name, created_by_id=admin_id,
+                ))
+        self._insert(FloorPlan, plans)
+        self._insert(FloorPlanNode, nodes)
+
+    def _flush_equipment(self, equipments, calibrations, usage_logs):
+        self._insert(Equipment, equipments)
+        self._insert(CalibrationRecord, calibrations)
+        self._insert(EquipmentUsageLog, usage_logs)
+        equipments.clear()
+        calibrations.clear()
+        usage_logs.clear()
+
+    # ==================== 质量体系 ====================
+
+    def _seed_quality(self):
+        admin_id = self.staff['admin'][0].pk
+        categories = []
+        root = self._new(DocumentCategory, name='体系文件', code=f'QC-S{self._next_pk[DocumentCategory]:05d}')
+        categories.append(root)
+        for name in ['质量手册', '程序文件', '作业指导书', '记录表格']:
+            categories.append(self._new(
+                DocumentCategory, name=name, parent_id=root.pk,
+                code=f'QC-S{self._next_pk[DocumentCategory]:05d}',
+            ))
+        self._insert(DocumentCategory, categories)
+
+        documents, versions = [], []
+        doc_types = [t for t, _ in QualityDocument.TYPE_CHOICES]
+        for _ in range(50):
+            pk = self._next_pk[QualityDocument]
+            document = self._new(
+                QualityDocument, when=self._random_time(), name=f'体系文件{pk}', code=f'QD-S{pk:06d}',
+                doc_type=self.rng.choice(doc_types), version='2.0',
+                category_id=self.rng.choice(categories[1:]).pk, file_path=f'quality/seed_{pk}.pdf',
+                file_size=self.rng.randint(10, 5000) * 1024, created_by_id=admin_id,
+            )
+            documents.append(document)
+            for version in ['1.0', '2.0']:
+                versions.append(self._new(
+                    DocumentVersion, when=document.created_at, document_id=document.pk,
+                    version=version, file_path=document.file_path, change_log=f'发布 v{version}',
+                ))
+        self._insert(QualityDocument, documents)
+        self._insert(DocumentVersion, versions)
+
+    # ==================== 其他基础数据 ====================
+
+    def _seed_misc(self):
+        admin_id = self.staff['admin'][0].pk
+        # 同名字段在不同类别下范围不同，用 when 限定规则只对该类别的记录生效
+        rules = [
+            self._new(
+                VerifyRule, name=f'{category}{field["name"]}范围检查', rule_type='range',
+                rule_content={
+                    'field': field['name'], 'min': field['min'], 'max': field['max'], 'unit': field['unit'],
+                    'when': category,
+                },
+                description=f'{category}{field["name"]}合理范围', created_by_id=admin_id,
+            )
+            for category, fields in SAMPLE_CATEGORIES.items()
+            for field in fields if field['type'] == 'number'
+        ]
+        rules += [
+            self._new(
+                VerifyRule, name=f'{category}必填字段', rule_type='required',
+                rule_content={'fields': [field['name'] for field in fields if field.get('required')], 'when': category},
+                description=f'{category}原始记录必填字段', created_by_id=admin_id,
+            )
+            for category, fields in SAMPLE_CATEGORIES.items()
+        ]
+        self._insert(VerifyRule, rules)
+        # bulk_create 不触发信号，手动使校验结果缓存失效
+        bump_rules_version()
+
+        # 最近一周每天一次批量校验，校验记录在委托单链路中关联，文档列表在链路生成后回填
+        reviewer_id = self.staff['reviewer'][0].pk
+        self.batch_jobs = {}
+        self.batch_job_documents = defaultdict(list)
+        for days_ago in range(7):
+            day = self.end_date - timedelta(days=days_ago)
+            finished = self._end - timedelta(days=days_ago)
+            self.batch_jobs[day] = self._new(
+                VerifyBatchJob, when=finished, document_type='original_record', verify_type='data',
+                filters={'status': 'submitted', 'date_from': str(day), 'date_to': str(day)},
+                status='completed', started_at=finished, finished_at=finished,
+                operator_id=reviewer_id, created_by_id=reviewer_id,
+            )
+        self._insert(VerifyBatchJob, list(self.batch_jobs.values()))
+
+        reports = []
+        for month in range(1, 4):
+            end = self.end_date - timedelta(days=30 * (month - 1))
+            reports.append(self._new(
+                StatisticsReport, name=f'自定义统计{month}', report_type='custom',
+                start_date=end - timedelta(days=30), end_date=end,
+                statistics_data={'generated_by': 'seed'}, created_by_id=admin_id,
+            ))
+        self._insert(StatisticsReport, reports)
+
+    # ==================== 委托单链路 ====================
+
+    def _seed_commissions(self):
+        generated = 0
+        while generated < self.commissions:
+            size = min(self.chunk_size, self.commissions - generated)
+            batch = self._build_commission_batch(size)
+            with transaction.atomic():
+                for model in [
+                    Commission, SampleReceive, SampleWorkflow, WorkflowLog, TestTask,
+                    OriginalRecord, RecordAttachment, ScanFile, OCRPageResult, OCRResult, Report, VerifyRecord,
+                ]:
+                    self._insert(model, batch[model])
+            generated += size
+            self.progress(f'委托单: {generated}/{self.commissions}')
+
+    def _finish_batch_jobs(self):
+        """回填批量校验任务的文档列表与进度"""
+        for job in self.batch_jobs.values():
+            document_ids = self.batch_job_documents[job.pk]
+            VerifyBatchJob._base_manager.filter(pk=job.pk).update(
+                document_ids=document_ids, total=len(document_ids), processed=len(document_ids),
+            )
+
+    def _build_commission_batch(self, size: int) -> Dict:
+        rng = self.rng
+        batch = {model: [] for model in [
+            Commission, SampleReceive, SampleWorkflow, WorkflowLog, TestTask,
+            OriginalRecord, RecordAttachment, ScanFile, OCRPageResult, OCRResult, Report, VerifyRecord,
+        ]}
+        categories = list(SAMPLE_CATEGORIES)
+
+        for _ in range(size):
+            client = rng.choice(self.client_objs)
+            category = rng.choice(categories)
+            created = self._random_time()
+            age_days = (self._end - created).days
+
+            roll = rng.random()
+            if roll < 0.03:
+                commission_status = 'draft'
+            elif roll < 0.06:
+                commission_status = 'submitted'
+            elif roll < 0.08:
+                commission_status = 'cancelled'
+            else:
+                commission_status = None  # 由流转状态决定
+
+            pk = self._next_pk[Commission]
+            prices = self.parameter_prices.get(category) or [Decimal(100)]
+            commission = self._new(
+                Commission, when=created, code=f'WT-S{pk:010d}', client_id=client.pk,
+                project_name=f'{client.name[:8]}第{rng.randint(1, 20)}标段', project_location='施工现场',
+                sample_name=category, sample_model=f'规格{rng.randint(1, 9)}',
+                sample_quantity=rng.randint(1, 6), sample_unit='组', sample_source='搅拌站',
+                sample_batch=f'PC{rng.randint(10000, 99999)}', test_basis='GB/T 标准',
+                test_parameters='["' + '","'.join(f['name'] for f in SAMPLE_CATEGORIES[category][2:]) + '"]',
+                commission_date=timezone.localtime(created).date(),
+                required_date=timezone.localtime(created).date() + timedelta(days=rng.randint(3, 28)),
+                status=commission_status or 'received',
+                total_price=sum(rng.sample(prices, k=min(len(prices), 2)), Decimal(0)),
+                created_by_id=client.user_id,
+            )
+            batch[Commission].append(commission)
+            if commission_status:
+                continue
+
+            # 越早的委托单越可能已完成
+            progress = min(1.0, age_days / 30)
+            if rng.random() < progress:
+                target = len(HAPPY_PATH) - 1
+            else:
+                target = rng.randrange(len(HAPPY_PATH) - 1)
+            # 只在允许退回的状态上生成退回记录
+            rejected = (
+                target >= 2
+                and WorkflowStatus.REJECTED in WorkflowStatus.TRANSITIONS.get(HAPPY_PATH[target], [])
+                and rng.random() < 0.03
+            )
+
+            receiver = rng.choice(self.staff['receiver'])
+            tester = rng.choice(self.staff['tester'])
+            reviewer = rng.choice(self.staff['reviewer'])
+            approver = rng.choice(self.staff['approver'])
+            received_at = created + timedelta(hours=rng.randint(1, 48))
+
+            receive = self._new(
+                SampleReceive, when=received_at, commission_id=commission.pk,
+                receive_code=f'SY-S{self._next_pk[SampleReceive]:010d}', receiver_id=receiver.pk,
+                receive_time=received_at, actual_quantity=commission.sample_quantity,
+                sample_condition='normal' if rng.random() > 0.05 else 'damaged',
+                storage_location=f'样品室{rng.randint(1, 5)}-{rng.randint(1, 40)}',
+                created_by_id=receiver.pk,
+            )
+            batch[SampleReceive].append(receive)
+
+            current_status = WorkflowStatus.REJECTED if rejected else HAPPY_PATH[target]
+            step_time = received_at
+            workflow = self._new(
+                SampleWorkflow, when=received_at, sample_receive_id=receive.pk,
+                current_status=current_status, assigned_to_id=tester.pk if target >= 1 else None,
+                priority=rng.choice([1, 1, 1, 2, 3]),
+                expected_complete_date=commission.required_date,
+                created_by_id=receiver.pk,
+            )
+            batch[SampleWorkflow].append(workflow)
+
+            operators = {
+                WorkflowStatus.ASSIGNED: receiver, WorkflowStatus.UNDER_APPROVAL: reviewer,
+                WorkflowStatus.COMPLETED: approver,
+            }
+            for step in range(1, target + 1):
+                step_time = step_time + timedelta(hours=rng.randint(2, 72))
+                to_status = HAPPY_PATH[step]
+                operator = operators.get(to_status, tester)
+                batch[WorkflowLog].append(self._new(
+                    WorkflowLog, when=step_time, workflow_id=workflow.pk,
+                    from_status=HAPPY_PATH[step - 1], to_status=to_status,
+                    operator_id=operator.pk, action=ACTION_BY_STATUS[to_status],
+                    created_by_id=operator.pk,
+                ))
+            if rejected:
+                step_time = step_time + timedelta(hours=rng.randint(2, 24))
+                batch[WorkflowLog].append(self._new(
+                    WorkflowLog, when=step_time, workflow_id=workflow.pk,
+                    from_status=HAPPY_PATH[target], to_status=WorkflowStatus.REJECTED,
+                    operator_id=reviewer.pk, action='reject', remarks='数据复核不通过',
+                    created_by_id=reviewer.pk,
+                ))
+            workflow.updated_at = step_time
+            if current_status == WorkflowStatus.COMPLETED:
+                workflow.actual_complete_date = timezone.localtime(step_time).date()
+                commission.status = 'completed'
+            elif target >= 2:
+                commission.status = 'testing'
+            commission.updated_at = step_time
+
+            if target < 2:
+                continue
+
+            test_time = received_at + timedelta(hours=rng.randint(4, 96))
+            batch[TestTask].append(self._new(
+                TestTask, when=test_time, workflow_id=workflow.pk, tester_id=tester.pk,
+                test_items=[f['name'] for f in SAMPLE_CATEGORIES[category] if f['type'] == 'number'],
+                status='completed' if target >= 3 else 'in_progress',
+                start_time=test_time,
+                end_time=test_time + timedelta(hours=rng.randint(1, 8)) if target >= 3 else None,
+                created_by_id=receiver.pk,
+            ))
+
+            template = rng.choice(self.templates_by_category[category])
+            record_status = 'draft' if target == 2 else ('submitted' if target <= 4 else 'approved')
+            record = self._new(
+                OriginalRecord, when=test_time, template_id=template.pk, workflow_id=workflow.pk,
+                record_code=f'YS-S{self._next_pk[OriginalRecord]:010d}',
+                data=self._record_data(template, receive, test_time),
+                tester_id=tester.pk, test_date=timezone.localtime(test_time).date(),
+                test_location=f'{category}试验室',
+                equipment_info=[f'EQ-S{rng.randint(1, max(self.equipment, 1)):06d}'],
+                environment_info={'temperature': round(rng.uniform(18, 22), 1), 'humidity': rng.randint(40, 60)},
+                status=record_status,
+                reviewer_id=reviewer.pk if record_status == 'approved' else None,
+                review_date=step_time if record_status == 'approved' else None,
+                created_by_id=tester.pk,
+            )
+            batch[OriginalRecord].append(record)
+
+            if rng.random() < 0.5:
+                batch[RecordAttachment].append(self._new(
+                    RecordAttachment, when=test_time, record_id=record.pk,
+                    file_name=f'{record.record_code}.jpg', file_path=f'records/{record.record_code}.jpg',
+                    file_type='image/jpeg', file_size=rng.randint(100, 4000) * 1024,
+                    created_by_id=tester.pk,
+                ))
+
+            if rng.random() < 0.3:
+                # 约四分之一的扫描件为多页PDF，按页生成识别结果
+                page_count = rng.randint(2, 4) if rng.random() < 0.25 else 0
+                extension, file_type = ('pdf', 'application/pdf') if page_count else ('png', 'image/png')
+                scan = self._new(
+                    ScanFile, when=test_time, file_name=f'{record.record_code}.{extension}',
+                    file_path=f'scans/seed/{record.record_code}.{extension}', file_type=file_type,
+                    file_size=rng.randint(200, 3000) * 1024, workflow_id=workflow.pk,
+                    content_hash=hashlib.md5(record.record_code.encode()).hexdigest(),
+                    status='completed', created_by_id=tester.pk,
+                )
+                batch[ScanFile].append(scan)
+                text = ' '.join(f'{k} {v}' for k, v in record.data.items())
+                details = [{'text': f'{k} {v}', 'confidence': 0.95} for k, v in record.data.items()]
+                process_time = round(rng.uniform(0.5, 8), 2)
+                for number in range(1, page_count + 1):
+                    batch[OCRPageResult].append(self._new(
+                        OCRPageResult, when=test_time, scan_file_id=scan.pk, page_number=number,
+                        image_path=f'scans/seed/{record.record_code}_pages/{number}.png', status='completed',
+                        raw_text=text if number == 1 else '', details=details if number == 1 else [],
+                        confidence=0.95, process_time=round(process_time / page_count, 2),
+                        created_by_id=tester.pk,
+                    ))
+                if page_count:
+                    details = [{**item, 'page': 1} for item in details]
+                batch[OCRResult].append(self._new(
+                    OCRResult, when=test_time, scan_file_id=scan.pk, raw_text=text,
+                    confidence=round(rng.uniform(0.85, 0.99), 3),
+                    details=details, process_time=process_time, created_by_id=tester.pk,
+                ))
+
+            if rng.random() < 0.2:
+                job = self.batch_jobs.get(timezone.localtime(test_time).date())
+                if job is not None:
+                    self.batch_job_documents[job.pk].append(record.pk)
+                batch[VerifyRecord].append(self._new(
+                    VerifyRecord, when=test_time, document_type='original_record', document_id=record.pk,
+                    batch_job_id=job.pk if job else None,
+                    content=f'{category} ' + ' '.join(f'{k}: {v}' for k, v in record.data.items()),
+                    verify_type='data', status='completed', issues=[], summary='未发现问题',
+                    model_used='seed', process_time=round(rng.uniform(1, 30), 2),
+                    operator_id=reviewer.pk, created_by_id=reviewer.pk,
+                ))
+
+            if target >= 4 and not rejected:
+                report_status = REPORT_STATUS_BY_WORKFLOW[HAPPY_PATH[target]]
+                issued = report_status == 'issued'
+                batch[Report].append(self._new(
+                    Report, when=step_time, report_code=f'BG-S{self._next_pk[Report]:010d}',
+                    workflow_id=workflow.pk, title=f'{category}检测报告',
+                    content={'sample_name': category, 'results': record.data},
+                    conclusion='所检项目符合标准要求', status=report_status, editor_id=tester.pk,
+                    reviewer_id=reviewer.pk if report_status in ('approved', 'issued') else None,
+                    approver_id=approver.pk if issued else None,
+                    review_date=step_time if report_status in ('approved', 'issued') else None,
+                    approve_date=step_time if issued else None,
+                    issue_date=timezone.localtime(step_time).date() if issued else None,
+                    created_by_id=tester.pk,
+                ))
+        return batch
+
+    def _record_data(self, template, receive, test_time) -> Dict:
+        """按模板字段配置生成记录数据"""
+        data = {}
+        for field in template.fields:
+            if field['type'] == 'number':
+                value = self.rng.uniform(field['min'], field['max'])
+                data[field['name']] = round(value, 2)
+            elif field['type'] == 'date':
+                data[field['name']] = timezone.localtime(test_time).date().isoformat()
+            else:
+                data[field['name']] = receive.receive_code
+        return data
+
+    # ==================== 云查询 ====================
+
+    def _seed_cloud_query(self):
+        rng = self.rng
+        admin = self.staff['admin'][0]
+        applications, logs = [], []
+        for client in self.client_objs[:max(len(self.client_objs) // 10, 1)]:
+            created = self._random_time(30)
+            application = self._new(
+                QueryApplication, when=created, applicant_id=client.user_id, applicant_role='client',
+                organization=client.name, query_type='report', query_scope={'client_id': client.pk},
+                reason='查看检测报告', status='approved', valid_from=created,
+                valid_until=created + timedelta(days=30), reviewer_id=admin.pk,
+                review_time=created, created_by_id=client.user_id,
+            )
+            applications.append(application)
+            for _ in range(rng.randint(1, 10)):
+                logs.append(self._new(
+                    QueryLog, when=created + timedelta(hours=rng.randint(1, 200)),
+                    application_id=application.pk, query_user_id=client.user_id,
+                    query_content='report', query_params={},
+                    ip_address=f'172.16.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+                    created_by_id=client.user_id,
+                ))
+        self._insert(QueryApplication, applications)
+        self._insert(QueryLog, logs)
@@ -5,9 +5,14 @@
 后续只需修改此文件即可切换服务实现
 """
 
+import json
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 from django.conf import settings
+from django.core.signals import setting_changed
+
+from .http import get_session, get_timeout
+from .instrumentation import track_service_call
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +68,7 @@ class MinIOService:
             logger.warning(f"MinIO客户端初始化失败: {e}")
             self.client = None
     
+    @track_service_call('minio.upload_file')
     def upload_file(self, file_path: str, object_name: str, content_type: str = None) -> Optional[str]:
         """
         上传文件
@@ -91,6 +97,7 @@ class MinIOService:
             logger.error(f"文件上传失败: {e}")
             return None
     
+    @track_service_call('minio.upload_bytes')
     def upload_bytes(self, data: bytes, object_name: str, content_type: str = None) -> Optional[str]:
         """
         上传字节数据
@@ -121,6 +128,7 @@ class MinIOService:
             logger.error(f"字节数据上传失败: {e}")
             return None
     
+    @track_service_call('minio.download_file')
     def download_file(self, object_name: str) -> Optional[bytes]:
         """
         下载文件
@@ -141,6 +149,7 @@ class MinIOService:
             logger.error(f"文件下载失败: {e}")
             return None
     
+    @track_service_call('minio.delete_file')
     def delete_file(self, object_name: str) -> bool:
         """
         删除文件
@@ -161,6 +170,7 @@ class MinIOService:
             logger.error(f"文件删除失败: {e}")
             return False
     
+    @track_service_call('minio.presigned_url')
     def get_presigned_url(self, object_name: str, expires: int = 3600) -> Optional[str]:
         """
         获取预签名URL
@@ -204,6 +214,7 @@ class OCRService:
         self.enabled = settings.OCR_CONFIG.get('ENABLED', False)
         self.api_url = settings.OCR_CONFIG.get('API_URL')
     
+    @track_service_call('ocr.recognize')
     def recognize(self, image_path: str) -> Optional[Dict[str, Any]]:
         """
         识别图片中的文字
@@ -226,11 +237,10 @@ class OCRService:
             return {'success': False, 'message': 'OCR服务未启用'}
         
         try:
-            import requests
-            response = requests.post(
+            response = get_session('ocr').post(
                 f"{self.api_url}/ocr",
                 json={'image': image_path},
-                timeout=30
+                timeout=get_timeout('ocr.recognize')
             )
             if response.status_code == 200:
                 return response.json()
@@ -240,6 +250,7 @@ class OCRService:
             logger.error(f"OCR识别失败: {e}")
             return {'success': False, 'message': str(e)}
     
+    @track_service_call('ocr.recognize_table')
     def recognize_table(self, image_path: str) -> Optional[Dict[str, Any]]:
         """
         识别图片中的表格
@@ -254,11 +265,10 @@ class OCRService:
             return {'success': False, 'message': 'OCR服务未启用'}
         
         try:
-            import requests
-            response = requests.post(
+            response = get_session('ocr').post(
                 f"{self.api_url}/table",
                 json={'image': image_path},
-                timeout=60
+                timeout=get_timeout('ocr.recognize_table')
             )
             if response.status_code == 200:
                 return response.json()
@@ -271,6 +281,11 @@ class OCRService:
 
 # ==================== AI 大模型服务 ====================
 
+class AIServiceError(Exception):
+    """AI服务调用失败（流式调用无法通过返回值表示失败）"""
+    pass
+
+
 class AIService:
     """
     AI大模型服务
@@ -309,7 +324,31 @@ class AIService:
         if not self.enabled:
             return {'success': False, 'message': 'AI服务未启用'}
         
-        prompt = f"""请检查以下文档内容，找出其中的错别字、语法错误和数据不合理之处：
+        result = self._chat(self._verify_prompt(content))
+        if not result.get('success'):
+            return result
+        return {'success': True, **self.parse_verify_result(self._response_text(result['data']))}
+    
+    def stream_verify_document(self, content: str) -> Iterator[str]:
+        """
+        流式校验文档内容
+        
+        Args:
+            content: 文档内容
+            
+        Returns:
+            Iterator[str]: 模型逐段生成的文本，拼接后用 parse_verify_result 解析
+            
+        Raises:
+            AIServiceError: 服务未启用或调用失败
+        """
+        if not self.enabled:
+            raise AIServiceError('AI服务未启用')
+        return self.stream_chat(self._verify_prompt(content))
+    
+    @staticmethod
+    def _verify_prompt(content: str) -> str:
+        return f"""请检查以下文档内容，找出其中的错别字、语法错误和数据不合理之处：
 
 {content}
 
@@ -317,8 +356,41 @@ class AIService:
 - issues: 问题列表，每个问题包含type(问题类型)、position(位置)、original(原文)、suggestion(建议)
 - summary: 问题总结
 """
+    
+    @staticmethod
+    def _response_text(data: Dict[str, Any]) -> str:
+        """取出模型响应中的文本（Ollama: response；OpenAI: choices[0].message.content）"""
+        if 'response' in data:
+            return data.get('response') or ''
+        choices = data.get('choices') or [{}]
+        return (choices[0].get('message') or {}).get('content') or ''
+    
+    @staticmethod
+    def parse_verify_result(text: str) -> Dict[str, Any]:
+        """
+        解析模型输出的校验结果
         
-        return self._chat(prompt)
+        模型可能在JSON前后附带说明文字或代码块标记，取第一个 { 到最后一个 } 之间的内容解析
+        
+        Args:
+            text: 模型输出的完整文本
+            
+        Returns:
+            dict: {'issues': [...], 'summary': '...'}，无法解析时 issues 为空、summary 为原文
+        """
+        start, end = text.find('{'), text.rfind('}')
+        if start != -1 and end > start:
+            try:
+                data = json.loads(text[start:end + 1])
+            except ValueError:
+                data = None
+            if isinstance(data, dict):
+                issues = data.get('issues')
+                return {
+                    'issues': issues if isinstance(issues, list) else [],
+                    'summary': str(data.get('summary', '')),
+                }
+        return {'issues': [], 'summary': text.strip()}
     
     def check_data_validity(self, data: Dict[str, Any], rules: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -347,6 +419,7 @@ class AIService:
         
         return self._chat(prompt)
     
+    @track_service_call('ai.chat')
     def _chat(self, prompt: str) -> Dict[str, Any]:
         """
         调用大模型进行对话
@@ -358,18 +431,19 @@ class AIService:
             dict: 模型响应
         """
         try:
-            import requests
+            session = get_session('ai')
+            timeout = get_timeout('ai.chat')
             
             # Ollama API格式
-            if 'ollama' in self.api_url or '11434' in self.api_url:
-                response = requests.post(
+            if self._is_ollama:
+                response = session.post(
                     f"{self.api_url}/api/generate",
                     json={
                         'model': self.model_name,
                         'prompt': prompt,
                         'stream': False
                     },
-                    timeout=120
+                    timeout=timeout
                 )
             else:
                 # OpenAI兼容格式
@@ -377,14 +451,14 @@ class AIService:
                 if self.api_key:
                     headers['Authorization'] = f'Bearer {self.api_key}'
                 
-                response = requests.post(
+                response = session.post(
                     f"{self.api_url}/v1/chat/completions",
                     headers=headers,
                     json={
                         'model': self.model_name,
                         'messages': [{'role': 'user', 'content': prompt}]
                     },
-                    timeout=120
+                    timeout=timeout
                 )
             
             if response.status_code == 200:
@@ -396,10 +470,105 @@ class AIService:
         except Exception as e:
             logger.error(f"AI服务调用失败: {e}")
             return {'success': False, 'message': str(e)}
+    
+    @property
+    def _is_ollama(self) -> bool:
+        return 'ollama' in self.api_url or '11434' in self.api_url
+    
+    @track_service_call('ai.stream_chat')
+    def stream_chat(self, prompt: str) -> Iterator[str]:
+        """
+        流式调用大模型
+        
+        Ollama 返回逐行JSON，OpenAI兼容接口返回 SSE（data: {...}），统一转换为文本片段
+        
+        Args:
+            prompt: 提示词
+            
+        Yields:
+            str: 模型生成的文本片段
+            
+        Raises:
+            AIServiceError: 调用失败或服务返回错误
+        """
+        try:
+            session = get_session('ai')
+            timeout = get_timeout('ai.stream_chat')
+            
+            if self._is_ollama:
+                response = session.post(
+                    f"{self.api_url}/api/generate",
+                    json={
+                        'model': self.model_name,
+                        'prompt': prompt,
+                        'stream': True
+                    },
+                    timeout=timeout,
+                    stream=True
+                )
+            else:
+                headers = {}
+                if self.api_key:
+                    headers['Authorization'] = f'Bearer {self.api_key}'
+                
+                response = session.post(
+                    f"{self.api_url}/v1/chat/completions",
+                    headers=headers,
+                    json={
+                        'model': self.model_name,
+                        'messages': [{'role': 'user', 'content': prompt}],
+                        'stream': True
+                    },
+                    timeout=timeout,
+                    stream=True
+                )
+            
+            with response:
+                if response.status_code != 200:
+                    raise AIServiceError(f'AI服务返回错误: {response.status_code}')
+                # chunk_size=None：按服务端发送的分块读取，避免凑满缓冲区才返回
+                for line in response.iter_lines(chunk_size=None):
+                    line = line.decode('utf-8').strip() if line else ''
+                    if not line:
+                        continue
+                    if self._is_ollama:
+                        chunk = json.loads(line)
+                        if chunk.get('error'):
+                            raise AIServiceError(chunk['error'])
+                        text, done = chunk.get('response', ''), chunk.get('done', False)
+                    else:
+                        if not line.startswith('data:'):
+                            continue
+                        payload = line[5:].strip()
+                        if payload == '[DONE]':
+                            break
+                        choices = json.loads(payload).get('choices') or [{}]
+                        text, done = (choices[0].get('delta') or {}).get('content') or '', False
+                    if text:
+                        yield text
+                    if done:
+                        break
+        except AIServiceError:
+            raise
+        except Exception as e:
+            logger.error(f"AI流式调用失败: {e}")
+            raise AIServiceError(str(e)) from e
 
 
 # ==================== 服务实例 ====================
 
+# OCR/AI 服务无状态，进程内复用同一实例；配置变更（如测试中 override_settings）时重建
+_service_instances: Dict[str, Any] = {}
+
+
+def _reset_services(setting, **kwargs):
+    if setting in ('OCR_CONFIG', 'AI_CONFIG'):
+        _service_instances.clear()
+
+
+setting_changed.connect(_reset_services)
+
+
 # 单例模式获取服务实例
 def get_minio_service() -> MinIOService:
     """获取MinIO服务实例"""
@@ -408,9 +577,13 @@ def get_minio_service() -> MinIOService:
 
 def get_ocr_service() -> OCRService:
     """获取OCR服务实例"""
-    return OCRService()
+    if 'ocr' not in _service_instances:
+        _service_instances['ocr'] = OCRService()
+    return _service_instances['ocr']
 
 
 def get_ai_service() -> AIService:
     """获取AI服务实例"""
-    return AIService()
+    if 'ai' not in _service_instances:
+        _service_instances['ai'] = AIService()
+    return _service_instances['ai']
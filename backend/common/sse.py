@@ -0,0 +1,48 @@
+"""
+Server-Sent Events
+
+用于把长耗时任务（如大模型生成）的中间结果实时推送给前端。
+"""
+
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def sse_event(event: str, data) -> bytes:
+    """
+    编码一条SSE消息
+
+    Args:
+        event: 事件名
+        data: 消息数据，序列化为JSON
+
+    Returns:
+        bytes: 以空行结尾的SSE消息
+    """
+    payload = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+    return f'event: {event}\ndata: {payload}\n\n'.encode('utf-8')
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    text/event-stream 渲染器
+
+    流式接口本身直接返回 StreamingHttpResponse，该渲染器用于：
+    1. 让携带 Accept: text/event-stream 的请求通过DRF内容协商
+    2. 参数校验失败、未认证等普通响应以 error 事件返回
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return sse_event('error', data)
+
+
+def event_stream_headers(response):
+    """设置流式响应头：禁止缓存，关闭 nginx 代理缓冲"""
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -74,20 +74,28 @@ def generate_file_path(category: str, filename: str) -> str:
     return f"{category}/{date_path}/{new_filename}"
 
 
-def calculate_md5(file_path: str) -> Optional[str]:
+def calculate_md5(file_path) -> Optional[str]:
     """
     计算文件MD5值
     
     Args:
-        file_path: 文件路径
+        file_path: 文件路径，或上传文件对象（Django UploadedFile 等支持 chunks() 的对象）
         
     Returns:
         str: MD5哈希值，文件不存在返回None
     """
+    hash_md5 = hashlib.md5()
+    
+    if hasattr(file_path, 'chunks'):
+        # 上传文件：分块读取后复位，便于后续继续读取文件内容
+        for chunk in file_path.chunks():
+            hash_md5.update(chunk)
+        file_path.seek(0)
+        return hash_md5.hexdigest()
+    
     if not os.path.exists(file_path):
         return None
     
-    hash_md5 = hashlib.md5()
     with open(file_path, 'rb') as f:
         for chunk in iter(lambda: f.read(4096), b''):
             hash_md5.update(chunk)
@@ -1,3 +1,8 @@
 """
 JKTAC LIMS 后端配置包
 """
+
+# 确保 Django 启动时加载 Celery 应用，使 @shared_task 绑定到该应用
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
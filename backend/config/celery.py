@@ -0,0 +1,21 @@
+"""
+Celery 配置
+
+启动 worker：
+    celery -A config worker -Q celery,ocr,ai,pdf -c 4
+
+启动定时任务（只能运行一个实例）：
+    celery -A config beat
+
+配置项统一以 CELERY_ 前缀写在 settings.py 中
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('lims')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -15,6 +15,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
+from celery.schedules import crontab
 
 # 加载环境变量
 load_dotenv()
@@ -78,6 +79,8 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # CORS必须在最前面
+    'common.middleware.RequestTimingMiddleware',  # 请求耗时采集，尽量靠前以覆盖其他中间件
+    'common.metrics.MetricsMiddleware',  # Prometheus 请求指标
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -130,7 +133,7 @@ DATABASES = {
 
 CACHES = {
     'default': {
-        'BACKEND': 'django_redis.cache.RedisCache',
+        'BACKEND': 'common.cache.InstrumentedRedisCache',  # django-redis + 命中率统计
         'LOCATION': f"redis://:{os.getenv('REDIS_PASSWORD', '')}@{os.getenv('REDIS_HOST', '127.0.0.1')}:{os.getenv('REDIS_PORT', '6379')}/{os.getenv('REDIS_DB', '0')}",
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
@@ -138,6 +141,12 @@ CACHES = {
     }
 }
 
+# 参考数据读穿缓存（common.cache.read_through），数据变更时通过信号失效
+REFERENCE_CACHE = {
+    'TTL': int(os.getenv('REFERENCE_CACHE_TTL', '3600')),  # 过期时间（秒）
+    'LOCK_TIMEOUT': 10,  # 重建锁超时（秒），其他请求最多等待该时长
+}
+
 # Session使用Redis存储
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
@@ -251,6 +260,11 @@ MINIO_CONFIG = {
 OCR_CONFIG = {
     'ENABLED': os.getenv('OCR_ENABLED', 'False').lower() == 'true',
     'API_URL': os.getenv('OCR_API_URL', 'http://127.0.0.1:8866'),
+    'MAX_CONCURRENCY': int(os.getenv('OCR_MAX_CONCURRENCY', '4')),  # 同时发往OCR服务的最大请求数（跨所有worker）
+    'MAX_RETRIES': int(os.getenv('OCR_MAX_RETRIES', '3')),  # 识别失败后的最大重试次数
+    'RETRY_BACKOFF': int(os.getenv('OCR_RETRY_BACKOFF', '10')),  # 重试基础间隔（秒），按2的幂递增
+    'PDF_DPI': int(os.getenv('OCR_PDF_DPI', '200')),  # PDF栅格化分辨率
+    'PAGE_WORKERS': int(os.getenv('OCR_PAGE_WORKERS', '4')),  # 单个PDF并行识别的页数
 }
 
 # ==================== AI大模型配置 ====================
@@ -260,6 +274,36 @@ AI_CONFIG = {
     'API_URL': os.getenv('AI_API_URL', 'http://127.0.0.1:11434'),
     'MODEL_NAME': os.getenv('AI_MODEL_NAME', 'qwen2:7b'),
     'API_KEY': os.getenv('AI_API_KEY', ''),
+    'VERIFY_CHUNK_SIZE': int(os.getenv('AI_VERIFY_CHUNK_SIZE', '2000')),  # 分段校验的片段长度（字符）
+    'VERIFY_CHUNK_OVERLAP': int(os.getenv('AI_VERIFY_CHUNK_OVERLAP', '200')),  # 相邻片段重叠长度
+    'VERIFY_PARALLELISM': int(os.getenv('AI_VERIFY_PARALLELISM', '2')),  # 单次校验并行请求的片段数
+    'VERIFY_CACHE_TTL': int(os.getenv('AI_VERIFY_CACHE_TTL', '86400')),  # 校验结果缓存时间（秒），0为不缓存
+    'BATCH_WORKERS': int(os.getenv('AI_BATCH_WORKERS', '4')),  # 批量校验同时校验的文档数
+}
+
+# ==================== 数据汇总 ====================
+
+REPORTS_CONFIG = {
+    'DASHBOARD_CACHE_TTL': int(os.getenv('DASHBOARD_CACHE_TTL', '60')),  # 首页仪表盘缓存时间（秒）
+    'EXPORT_CHUNK_SIZE': int(os.getenv('EXPORT_CHUNK_SIZE', '2000')),  # 数据导出每次查询的行数
+    # Excel 导出需全部生成后才能下载，超过该行数时提示改用 CSV（CSV 流式输出不限行数）
+    'EXPORT_XLSX_MAX_ROWS': int(os.getenv('EXPORT_XLSX_MAX_ROWS', '100000')),
+}
+
+# ==================== 外部HTTP服务连接池 ====================
+
+HTTP_CLIENT_CONFIG = {
+    'POOL_CONNECTIONS': int(os.getenv('HTTP_POOL_CONNECTIONS', '4')),
+    'POOL_MAXSIZE': int(os.getenv('HTTP_POOL_MAXSIZE', '10')),  # 不小于单进程内的OCR/AI并发请求数
+    'RETRIES': int(os.getenv('HTTP_RETRIES', '2')),  # 连接失败时的重试次数，POST 发出后被重置不重试
+    'BACKOFF': float(os.getenv('HTTP_RETRY_BACKOFF', '0.2')),
+    # (连接超时, 读取超时) 秒
+    'TIMEOUTS': {
+        'ocr.recognize': (3, float(os.getenv('OCR_TIMEOUT', '30'))),
+        'ocr.recognize_table': (3, float(os.getenv('OCR_TABLE_TIMEOUT', '60'))),
+        'ai.chat': (5, float(os.getenv('AI_TIMEOUT', '120'))),
+        'ai.stream_chat': (5, float(os.getenv('AI_STREAM_TIMEOUT', '60'))),  # 流式调用为两段输出之间的最长间隔
+    },
 }
 
 # ==================== 云服务配置 ====================
@@ -268,6 +312,50 @@ CLOUD_CONFIG = {
     'API_SECRET': os.getenv('CLOUD_API_SECRET', ''),
 }
 
+# ==================== Celery异步任务 ====================
+
+CELERY_BROKER_URL = os.getenv(
+    'CELERY_BROKER_URL',
+    f"redis://:{os.getenv('REDIS_PASSWORD', '')}@{os.getenv('REDIS_HOST', '127.0.0.1')}:{os.getenv('REDIS_PORT', '6379')}/1"
+)
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True  # worker 异常退出时任务重新投递
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # OCR任务耗时长，避免单个worker预取过多
+CELERY_TASK_ROUTES = {
+    'apps.ocr.tasks.render_report_pdf': {'queue': 'pdf'},  # 需在 apps.ocr.tasks.* 之前匹配
+    'apps.ocr.tasks.*': {'queue': 'ocr'},
+    'apps.ai_verify.tasks.*': {'queue': 'ai'},
+}
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    # 凌晨生成前一天（及刚结束的周、月、季、年）的统计报表
+    'generate-statistics-reports': {
+        'task': 'apps.reports.tasks.generate_statistics_reports',
+        'schedule': crontab(hour=0, minute=30),
+    },
+}
+
+# ==================== 请求耗时采集 ====================
+
+INSTRUMENTATION = {
+    'ENABLED': os.getenv('INSTRUMENTATION_ENABLED', 'True').lower() == 'true',
+    'SAMPLE_RATE': float(os.getenv('INSTRUMENTATION_SAMPLE_RATE', '0.1')),
+    'SLOW_REQUEST_MS': int(os.getenv('INSTRUMENTATION_SLOW_REQUEST_MS', '1000')),
+    'VERBOSE_HEADER': 'X-Lims-Timing',
+}
+
+# ==================== Prometheus 指标 ====================
+# gunicorn 多进程部署时需设置环境变量 PROMETHEUS_MULTIPROC_DIR
+
+METRICS_CONFIG = {
+    'ENABLED': os.getenv('METRICS_ENABLED', 'True').lower() == 'true',
+    # /metrics 默认拒绝访问：携带 Bearer Token、来源地址在 ALLOWED_IPS 内或 PUBLIC 为 True 时放行
+    'TOKEN': os.getenv('METRICS_TOKEN', ''),
+    # 逗号分隔的地址或网段，按 REMOTE_ADDR 判断；经本机反向代理转发时不要加入 127.0.0.1
+    'ALLOWED_IPS': [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()],
+    'PUBLIC': os.getenv('METRICS_PUBLIC', 'False').lower() == 'true',
+}
+
 # ==================== 日志配置 ====================
 
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -0,0 +1,69 @@
+"""
+测试环境配置
+
+在 settings.py 基础上覆盖外部依赖相关的配置，使测试与性能基准可以在
+不依赖 MariaDB/Redis/MinIO 的环境中运行：
+1. 数据库 - SQLite 内存库
+2. 缓存 - 本地内存缓存
+3. 密码哈希 - 使用快速哈希算法
+4. 日志 - 仅输出警告以上级别到控制台
+5. 请求耗时采集 - 关闭，避免影响基准耗时
+6. Celery - 内存broker + eager模式，任务在当前进程同步执行
+"""
+
+from .settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+# ==================== 数据库配置 ====================
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+# ==================== 缓存配置 ====================
+
+CACHES = {
+    'default': {
+        'BACKEND': 'common.cache.InstrumentedLocMemCache',
+        'LOCATION': 'lims-test',
+    }
+}
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+
+# ==================== 密码哈希 ====================
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# ==================== Celery异步任务 ====================
+
+CELERY_BROKER_URL = 'memory://'
+CELERY_TASK_ALWAYS_EAGER = True
+# eager 模式下 retry 会先同步执行重试再抛出 Retry，不传播异常，以任务结果状态为准
+CELERY_TASK_EAGER_PROPAGATES = False
+
+# ==================== 请求耗时采集 ====================
+
+INSTRUMENTATION = {**INSTRUMENTATION, 'ENABLED': False}  # noqa: F405
+
+# ==================== 日志配置 ====================
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': 'WARNING',
+    },
+}
@@ -11,6 +11,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from common.metrics import metrics_view
+
 # API版本前缀
 API_V1_PREFIX = 'api/v1/'
 
@@ -58,6 +60,9 @@ urlpatterns = [
     
     # JWT Token刷新
     path(f'{API_V1_PREFIX}token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+
+    # Prometheus 指标
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # 开发环境下提供媒体文件访问
@@ -0,0 +1,28 @@
+"""
+gunicorn 配置
+
+PROMETHEUS_MULTIPROC_DIR 设置时启用 Prometheus 多进程模式：
+启动前清空指标目录，worker 退出时清理其进程级指标文件。
+"""
+
+import os
+import shutil
+
+bind = '0.0.0.0:8000'
+workers = int(os.getenv('GUNICORN_WORKERS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+# threads > 1 时使用 gthread worker，流式接口（SSE）只占用一个线程而不是整个进程
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+
+def on_starting(server):
+    metrics_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
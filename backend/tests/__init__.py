@@ -0,0 +1,5 @@
+"""
+后端测试
+
+- benchmarks/: 接口查询次数、耗时与响应大小基准
+"""
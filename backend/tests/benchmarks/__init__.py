@@ -0,0 +1,6 @@
+"""
+接口性能基准测试
+
+基于固定种子生成的数据集，逐个请求 config/urls.py 中注册的路由接口，
+记录 SQL 查询次数、耗时和响应大小，超出预算即失败。
+"""
@@ -0,0 +1,95 @@
+"""
+基准测试公共夹具
+
+- benchmark_dataset: 会话级数据集，整个测试会话只生成一次
+- bench_client: 以指定角色登录（JWT）的 APIClient 工厂
+- measure: 执行请求并记录查询次数、耗时、响应大小
+"""
+
+import json
+import os
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .dataset import seed_benchmark_dataset
+
+# 每个接口重复请求次数，耗时取最小值以降低抖动
+REPEAT = int(os.getenv('BENCHMARK_REPEAT', '3'))
+
+# 耗时预算放大系数，较慢的CI机器可调大
+TIME_FACTOR = float(os.getenv('BENCHMARK_TIME_FACTOR', '1.0'))
+
+# 基准结果输出文件（JSON），为空则不输出
+REPORT_FILE = os.getenv('BENCHMARK_REPORT', '')
+
+_results = []
+
+
+@pytest.fixture(scope='session')
+def benchmark_dataset(django_db_setup, django_db_blocker):
+    """生成会话级基准数据集"""
+    with django_db_blocker.unblock():
+        return seed_benchmark_dataset()
+
+
+@pytest.fixture
+def bench_client(benchmark_dataset, db, api_client):
+    """
+    返回一个函数，按角色获取已登录的 APIClient
+
+    使用真实的 JWT 认证头，使认证查询也计入预算
+    """
+    def _client(role='admin'):
+        return api_client(benchmark_dataset['users'][role])
+    return _client
+
+
+@pytest.fixture
+def measure():
+    """
+    返回一个函数，执行 GET 请求并返回测量结果
+
+    每次请求前清空缓存，测量的是冷启动路径的开销
+    """
+    def _measure(client, name, url):
+        query_counts = []
+        timings = []
+        response = None
+        for _ in range(REPEAT):
+            cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                response = client.get(url)
+                elapsed = (time.perf_counter() - start) * 1000
+            query_counts.append(len(ctx.captured_queries))
+            timings.append(elapsed)
+        result = {
+            'name': name,
+            'url': url,
+            'status': response.status_code,
+            'queries': max(query_counts),
+            'time_ms': round(min(timings), 2),
+            'bytes': len(response.content),
+        }
+        _results.append(result)
+        return response, result
+    return _measure
+
+
+def pytest_terminal_summary(terminalreporter):
+    """在测试结束时输出各接口的基准结果"""
+    if not _results:
+        return
+    terminalreporter.section('接口基准结果')
+    terminalreporter.write_line(f"{'接口':<36}{'状态':>6}{'查询数':>8}{'耗时(ms)':>12}{'大小(B)':>10}")
+    for r in sorted(_results, key=lambda item: item['name']):
+        terminalreporter.write_line(
+            f"{r['name']:<36}{r['status']:>6}{r['queries']:>8}{r['time_ms']:>12}{r['bytes']:>10}"
+        )
+    if REPORT_FILE:
+        with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(_results, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,255 @@
+"""
+基准测试数据集
+
+使用固定随机种子生成一份覆盖所有业务模块的小规模数据集，
+保证每个列表接口至少能填满一页（默认每页20条），从而暴露 N+1 查询。
+"""
+
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+# 每个主表生成的记录数，需大于默认分页大小
+DEFAULT_SCALE = 30
+
+ROLES = ['admin', 'receiver', 'tester', 'reviewer', 'approver', 'client']
+
+
+def seed_benchmark_dataset(scale: int = DEFAULT_SCALE, seed: int = 20240101) -> dict:
+    """
+    生成基准测试数据集
+
+    Args:
+        scale: 每个主表的记录数
+        seed: 随机种子，保证多次运行的数据一致
+
+    Returns:
+        dict: 各角色用户及部分关键对象，供测试用例引用
+    """
+    from apps.users.models import User, Department, UserLoginLog
+    from apps.samples.models import Client, Commission, SampleReceive
+    from apps.workflow.models import SampleWorkflow, WorkflowLog, TestTask, WorkflowStatus
+    from apps.records.models import RecordTemplate, OriginalRecord, RecordAttachment
+    from apps.ocr.models import ScanFile, OCRResult, Report
+    from apps.quality.models import DocumentCategory, QualityDocument, DocumentVersion
+    from apps.capability.models import TestStandard, TestParameter, ParameterPrice
+    from apps.equipment.models import Laboratory, Equipment, CalibrationRecord, EquipmentUsageLog
+    from apps.floorplan.models import FloorPlan, FloorPlanNode
+    from apps.reports.models import StatisticsReport
+    from apps.ai_verify.models import VerifyBatchJob, VerifyRecord, VerifyRule
+    from apps.cloud_query.models import QueryApplication, QueryLog
+
+    rng = random.Random(seed)
+    today = timezone.now().date()
+    now = timezone.now()
+
+    # ---------- 用户与部门 ----------
+    root_dept = Department.objects.create(name='试验室', code='LAB', sort_order=1)
+    departments = [root_dept] + [
+        Department.objects.create(name=f'试验室{i}组', code=f'LAB-{i}', parent=root_dept, sort_order=i)
+        for i in range(1, 4)
+    ]
+    users = {}
+    for role in ROLES:
+        users[role] = User.objects.create_user(
+            username=f'bench_{role}',
+            password='bench-pass-123',
+            role=role,
+            department=rng.choice(departments),
+        )
+    staff = [users['tester'], users['receiver'], users['reviewer']]
+    for i in range(scale):
+        UserLoginLog.objects.create(
+            user=rng.choice(list(users.values())),
+            ip_address=f'10.0.0.{i % 250 + 1}',
+            user_agent='benchmark',
+        )
+
+    # ---------- 能力管理 ----------
+    standards = [
+        TestStandard.objects.create(
+            code=f'GB/T {50000 + i}-2019', name=f'检测标准{i}',
+            category=rng.choice(['水泥', '混凝土', '钢筋', '砂石']),
+            created_by=users['admin'],
+        )
+        for i in range(scale)
+    ]
+    parameters = []
+    for i in range(scale):
+        parameter = TestParameter.objects.create(
+            name=f'参数{i}', code=f'P{i:04d}', standard=rng.choice(standards),
+            unit=rng.choice(['MPa', 'mm', '%', 'kg/m³']), created_by=users['admin'],
+        )
+        ParameterPrice.objects.create(
+            parameter=parameter, price=Decimal(rng.randint(50, 500)),
+            effective_date=today - timedelta(days=30), created_by=users['admin'],
+        )
+        parameters.append(parameter)
+
+    # ---------- 委托收样 ----------
+    clients = [
+        Client.objects.create(
+            name=f'建设单位{i}', contact_person=f'联系人{i}',
+            contact_phone=f'1380000{i:04d}', created_by=users['admin'],
+        )
+        for i in range(max(scale // 3, 1))
+    ]
+    clients[0].user = users['client']
+    clients[0].save(update_fields=['user'])
+
+    statuses = [s for s, _ in Commission.STATUS_CHOICES]
+    commissions = []
+    for i in range(scale):
+        commissions.append(Commission.objects.create(
+            client=rng.choice(clients),
+            project_name=f'工程项目{i}',
+            sample_name=rng.choice(['水泥', '混凝土试块', '钢筋', '砂']),
+            sample_quantity=rng.randint(1, 6),
+            test_parameters='["抗压强度"]',
+            commission_date=today - timedelta(days=rng.randint(0, 90)),
+            status=rng.choice(statuses),
+            total_price=Decimal(rng.randint(100, 5000)),
+            created_by=users['client'],
+        ))
+
+    workflow_statuses = [s for s, _ in WorkflowStatus.CHOICES]
+    workflows = []
+    for commission in commissions:
+        receive = SampleReceive.objects.create(
+            commission=commission, receiver=users['receiver'],
+            receive_time=now, actual_quantity=commission.sample_quantity,
+            created_by=users['receiver'],
+        )
+        workflow = SampleWorkflow.objects.create(
+            sample_receive=receive,
+            current_status=rng.choice(workflow_statuses),
+            assigned_to=users['tester'],
+            priority=rng.randint(1, 3),
+            expected_complete_date=today + timedelta(days=rng.randint(1, 14)),
+            created_by=users['receiver'],
+        )
+        for _ in range(3):
+            WorkflowLog.objects.create(
+                workflow=workflow, from_status=WorkflowStatus.RECEIVED,
+                to_status=WorkflowStatus.ASSIGNED, operator=rng.choice(staff),
+                action='assign', created_by=users['receiver'],
+            )
+        TestTask.objects.create(
+            workflow=workflow, tester=users['tester'], test_items=['抗压强度'],
+            created_by=users['receiver'],
+        )
+        workflows.append(workflow)
+
+    # ---------- 原始记录 ----------
+    templates = [
+        RecordTemplate.objects.create(
+            name=f'记录模板{i}', category=rng.choice(['水泥', '混凝土', '钢筋']),
+            fields=[
+                {'name': '试验编号', 'type': 'text', 'required': True},
+                {'name': '抗压强度', 'type': 'number', 'unit': 'MPa', 'required': True},
+            ],
+            created_by=users['admin'],
+        )
+        for i in range(scale)
+    ]
+    for workflow in workflows:
+        record = OriginalRecord.objects.create(
+            template=rng.choice(templates), workflow=workflow,
+            data={'试验编号': workflow.sample_receive.receive_code, '抗压强度': round(rng.uniform(20, 60), 1)},
+            tester=users['tester'], test_date=today, created_by=users['tester'],
+        )
+        RecordAttachment.objects.create(
+            record=record, file_name='photo.jpg', file_path='records/photo.jpg',
+            file_type='image/jpeg', file_size=1024, created_by=users['tester'],
+        )
+
+    # ---------- OCR与报告 ----------
+    for i, workflow in enumerate(workflows):
+        scan = ScanFile.objects.create(
+            file_name=f'scan{i}.png', file_path=f'scans/scan{i}.png',
+            file_type='image/png', file_size=2048, workflow=workflow,
+            status='completed', created_by=users['tester'],
+        )
+        OCRResult.objects.create(
+            scan_file=scan, raw_text='抗压强度 35.2MPa', confidence=0.95,
+            details=[{'text': '抗压强度 35.2MPa', 'confidence': 0.95}],
+            created_by=users['tester'],
+        )
+        Report.objects.create(
+            workflow=workflow, title=f'检测报告{i}', content={'items': []},
+            conclusion='合格', status='issued', editor=users['tester'],
+            issue_date=today, created_by=users['tester'],
+        )
+
+    # ---------- 质量体系 ----------
+    category = DocumentCategory.objects.create(name='质量手册', code='QM')
+    for i in range(3):
+        DocumentCategory.objects.create(name=f'程序文件{i}', code=f'QP{i}', parent=category)
+    for i in range(scale):
+        document = QualityDocument.objects.create(
+            name=f'体系文件{i}', code=f'QD-{i:04d}', doc_type='procedure',
+            category=category, file_path=f'quality/doc{i}.pdf', created_by=users['admin'],
+        )
+        DocumentVersion.objects.create(document=document, version='1.0', file_path=document.file_path)
+
+    # ---------- 设备管理与平面图 ----------
+    laboratories = [
+        Laboratory.objects.create(name=f'试验室{i}', room_number=f'R{100 + i}', responsible_person=users['tester'])
+        for i in range(5)
+    ]
+    for i in range(scale):
+        equipment = Equipment.objects.create(
+            name=f'压力试验机{i}', code=f'EQ-{i:04d}', laboratory=rng.choice(laboratories),
+            custodian=users['tester'], created_by=users['admin'],
+        )
+        CalibrationRecord.objects.create(
+            equipment=equipment, calibration_date=today - timedelta(days=365),
+            valid_until=today + timedelta(days=rng.randint(-30, 60)),
+            calibration_org='计量院', created_by=users['admin'],
+        )
+        EquipmentUsageLog.objects.create(
+            equipment=equipment, user=users['tester'], start_time=now,
+            purpose='抗压试验', created_by=users['tester'],
+        )
+    floor_plan = FloorPlan.objects.create(name='一层平面图', image_path='floorplan/1f.png')
+    for i, laboratory in enumerate(laboratories):
+        FloorPlanNode.objects.create(floor_plan=floor_plan, laboratory=laboratory, x=10 * i, y=10)
+
+    # ---------- 统计报表、AI校验、云查询 ----------
+    batch_jobs = [
+        VerifyBatchJob.objects.create(
+            document_type='original_record', verify_type='data', filters={'status': 'submitted'},
+            status='completed', total=scale, processed=scale, operator=users['reviewer'],
+        )
+        for _ in range(scale)
+    ]
+    for i in range(scale):
+        StatisticsReport.objects.create(
+            name=f'月报{i}', report_type='monthly',
+            start_date=today - timedelta(days=30), end_date=today,
+            statistics_data={'commission_count': i},
+        )
+        VerifyRecord.objects.create(
+            document_type='original_record', content='抗压强度 35.2MPa',
+            status='completed', batch_job=batch_jobs[0], operator=users['reviewer'],
+        )
+        VerifyRule.objects.create(name=f'规则{i}', rule_type='regex', rule_content={'pattern': '\\d+'})
+
+    application = QueryApplication.objects.create(
+        applicant=users['admin'], organization='监理单位', query_type='report',
+        reason='基准测试', status='approved',
+        valid_from=now, valid_until=now + timedelta(days=30),
+    )
+    for i in range(scale):
+        QueryLog.objects.create(
+            application=application, query_user=users['admin'],
+            query_content='report', ip_address='10.0.0.1',
+        )
+
+    return {
+        'users': users,
+        'commission': commissions[0],
+        'workflow': workflows[0],
+    }
@@ -0,0 +1,176 @@
+"""
+接口基准测试
+
+ENDPOINTS 中每一项对应一个 GET 接口及其预算：
+- queries: 最大 SQL 查询次数（含 JWT 认证查询）
+- time_ms: 最大耗时（毫秒），受 BENCHMARK_TIME_FACTOR 放大
+- bytes: 最大响应大小（字节）
+
+新增路由时需要在此登记预算，test_all_list_routes_have_budget 会检查遗漏。
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+from django.urls import get_resolver, URLPattern, URLResolver
+
+from .conftest import TIME_FACTOR
+
+pytestmark = pytest.mark.benchmark
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """接口预算定义"""
+    name: str
+    url: str
+    queries: int
+    time_ms: float = 300
+    bytes: int = 64 * 1024
+    role: str = 'admin'
+    model: Optional[str] = None  # 详情接口：用于替换 url 中 {pk} 的模型（app_label.Model）
+
+
+ENDPOINTS = [
+    # ---------- 用户权限 ----------
+    Endpoint('user-list', '/api/v1/users/', queries=3),
+    Endpoint('user-detail', '/api/v1/users/{pk}/', queries=2, model='users.User'),
+    Endpoint('user-me', '/api/v1/users/me/', queries=2),
+    Endpoint('department-list', '/api/v1/users/departments/', queries=11),
+    Endpoint('department-detail', '/api/v1/users/departments/{pk}/', queries=7, model='users.Department'),
+    Endpoint('department-tree', '/api/v1/users/departments/tree/', queries=7),
+    Endpoint('login-log-list', '/api/v1/users/login-logs/', queries=3),
+    # ---------- 委托收样 ----------
+    Endpoint('client-list', '/api/v1/samples/clients/', queries=3),
+    Endpoint('client-detail', '/api/v1/samples/clients/{pk}/', queries=2, model='samples.Client'),
+    Endpoint('commission-list', '/api/v1/samples/commissions/', queries=3),
+    Endpoint('commission-list-cursor', '/api/v1/samples/commissions/?pagination=cursor&total=cached', queries=3),
+    Endpoint('commission-detail', '/api/v1/samples/commissions/{pk}/', queries=2, model='samples.Commission'),
+    Endpoint('sample-receive-list', '/api/v1/samples/receives/', queries=3),
+    Endpoint('sample-receive-detail', '/api/v1/samples/receives/{pk}/', queries=2, model='samples.SampleReceive'),
+    # ---------- 样品流转 ----------
+    Endpoint('workflow-list', '/api/v1/workflow/', queries=3),
+    Endpoint('workflow-detail', '/api/v1/workflow/{pk}/', queries=3, model='workflow.SampleWorkflow'),
+    Endpoint('workflow-my-tasks', '/api/v1/workflow/my_tasks/', queries=2, role='tester'),
+    Endpoint('workflow-status-options', '/api/v1/workflow/status_options/', queries=1),
+    Endpoint('workflow-log-list', '/api/v1/workflow/logs/', queries=3),
+    Endpoint('workflow-log-detail', '/api/v1/workflow/logs/{pk}/', queries=2, model='workflow.WorkflowLog'),
+    Endpoint('test-task-list', '/api/v1/workflow/tasks/', queries=3),
+    Endpoint('test-task-detail', '/api/v1/workflow/tasks/{pk}/', queries=2, model='workflow.TestTask'),
+    # ---------- 原始记录 ----------
+    Endpoint('record-template-list', '/api/v1/records/templates/', queries=3),
+    Endpoint('record-template-detail', '/api/v1/records/templates/{pk}/', queries=2, model='records.RecordTemplate'),
+    Endpoint('record-template-categories', '/api/v1/records/templates/categories/', queries=2),
+    Endpoint('record-attachment-list', '/api/v1/records/attachments/', queries=3),
+    Endpoint('record-attachment-detail', '/api/v1/records/attachments/{pk}/', queries=2, model='records.RecordAttachment'),
+    Endpoint('original-record-list', '/api/v1/records/', queries=3),
+    Endpoint('original-record-detail', '/api/v1/records/{pk}/', queries=7, model='records.OriginalRecord'),
+    # ---------- OCR与报告 ----------
+    Endpoint('scan-file-list', '/api/v1/ocr/scans/', queries=3),
+    Endpoint('scan-file-detail', '/api/v1/ocr/scans/{pk}/', queries=2, model='ocr.ScanFile'),
+    Endpoint('scan-file-pages', '/api/v1/ocr/scans/{pk}/pages/', queries=3, model='ocr.ScanFile'),
+    Endpoint('ocr-result-list', '/api/v1/ocr/results/', queries=3),
+    Endpoint('ocr-result-detail', '/api/v1/ocr/results/{pk}/', queries=2, model='ocr.OCRResult'),
+    Endpoint('report-list', '/api/v1/ocr/reports/', queries=3),
+    Endpoint('report-detail', '/api/v1/ocr/reports/{pk}/', queries=2, model='ocr.Report'),
+    # ---------- 质量体系 ----------
+    Endpoint('document-category-list', '/api/v1/quality/categories/', queries=11),
+    Endpoint('document-category-detail', '/api/v1/quality/categories/{pk}/', queries=7, model='quality.DocumentCategory'),
+    Endpoint('document-category-tree', '/api/v1/quality/categories/tree/', queries=7),
+    Endpoint('quality-document-list', '/api/v1/quality/documents/', queries=3),
+    Endpoint('quality-document-detail', '/api/v1/quality/documents/{pk}/', queries=2, model='quality.QualityDocument'),
+    Endpoint('document-version-list', '/api/v1/quality/versions/', queries=3),
+    Endpoint('document-version-detail', '/api/v1/quality/versions/{pk}/', queries=2, model='quality.DocumentVersion'),
+    # ---------- 能力管理 ----------
+    Endpoint('test-standard-list', '/api/v1/capability/standards/', queries=23),
+    Endpoint('test-standard-detail', '/api/v1/capability/standards/{pk}/', queries=3, model='capability.TestStandard'),
+    Endpoint('test-standard-categories', '/api/v1/capability/standards/categories/', queries=2),
+    Endpoint('test-parameter-list', '/api/v1/capability/parameters/', queries=23),
+    Endpoint('test-parameter-detail', '/api/v1/capability/parameters/{pk}/', queries=3, model='capability.TestParameter'),
+    Endpoint('parameter-price-list', '/api/v1/capability/prices/', queries=3),
+    Endpoint('parameter-price-detail', '/api/v1/capability/prices/{pk}/', queries=2, model='capability.ParameterPrice'),
+    # ---------- 设备管理 ----------
+    Endpoint('laboratory-list', '/api/v1/equipment/laboratories/', queries=8),
+    Endpoint('laboratory-detail', '/api/v1/equipment/laboratories/{pk}/', queries=3, model='equipment.Laboratory'),
+    Endpoint('equipment-list', '/api/v1/equipment/', queries=3),
+    Endpoint('equipment-detail', '/api/v1/equipment/{pk}/', queries=3, model='equipment.Equipment'),
+    Endpoint('equipment-need-calibration', '/api/v1/equipment/need_calibration/', queries=18),
+    Endpoint('calibration-list', '/api/v1/equipment/calibrations/', queries=3),
+    Endpoint('calibration-detail', '/api/v1/equipment/calibrations/{pk}/', queries=2, model='equipment.CalibrationRecord'),
+    Endpoint('usage-log-list', '/api/v1/equipment/usage-logs/', queries=3),
+    Endpoint('usage-log-detail', '/api/v1/equipment/usage-logs/{pk}/', queries=2, model='equipment.EquipmentUsageLog'),
+    # ---------- 平面图 ----------
+    Endpoint('floor-plan-list', '/api/v1/floorplan/', queries=4),
+    Endpoint('floor-plan-detail', '/api/v1/floorplan/{pk}/', queries=3, model='floorplan.FloorPlan'),
+    Endpoint('floor-plan-with-equipment', '/api/v1/floorplan/{pk}/with_equipment/', queries=38, model='floorplan.FloorPlan'),
+    Endpoint('floor-plan-node-list', '/api/v1/floorplan/nodes/', queries=3),
+    Endpoint('floor-plan-node-detail', '/api/v1/floorplan/nodes/{pk}/', queries=2, model='floorplan.FloorPlanNode'),
+    # ---------- 数据汇总 ----------
+    Endpoint('statistics-report-list', '/api/v1/reports/saved/', queries=3),
+    Endpoint('statistics-report-detail', '/api/v1/reports/saved/{pk}/', queries=2, model='reports.StatisticsReport'),
+    Endpoint('statistics', '/api/v1/reports/statistics/?start_date=2000-01-01&end_date=2100-01-01&dimension=client', queries=5),
+    Endpoint('dashboard', '/api/v1/reports/dashboard/', queries=4),
+    # ---------- AI校验 ----------
+    Endpoint('verify-record-list', '/api/v1/ai-verify/records/', queries=3),
+    Endpoint('verify-record-detail', '/api/v1/ai-verify/records/{pk}/', queries=2, model='ai_verify.VerifyRecord'),
+    Endpoint('verify-rule-list', '/api/v1/ai-verify/rules/', queries=3),
+    Endpoint('verify-rule-detail', '/api/v1/ai-verify/rules/{pk}/', queries=2, model='ai_verify.VerifyRule'),
+    Endpoint('verify-batch-list', '/api/v1/ai-verify/batches/', queries=3),
+    Endpoint('verify-batch-detail', '/api/v1/ai-verify/batches/{pk}/', queries=2, model='ai_verify.VerifyBatchJob'),
+    Endpoint('verify-batch-records', '/api/v1/ai-verify/batches/{pk}/records/', queries=4, model='ai_verify.VerifyBatchJob'),
+    # ---------- 云查询 ----------
+    Endpoint('query-application-list', '/api/v1/cloud/applications/', queries=3),
+    Endpoint('query-application-detail', '/api/v1/cloud/applications/{pk}/', queries=2, model='cloud_query.QueryApplication'),
+    Endpoint('query-application-my', '/api/v1/cloud/applications/my/', queries=3),
+    Endpoint('query-application-pending', '/api/v1/cloud/applications/pending/', queries=2),
+    Endpoint('query-log-list', '/api/v1/cloud/logs/', queries=3),
+    Endpoint('query-log-detail', '/api/v1/cloud/logs/{pk}/', queries=2, model='cloud_query.QueryLog'),
+    Endpoint('cloud-data-list', '/api/v1/cloud/data/', queries=124),
+]
+
+
+def _resolve_url(endpoint):
+    """将详情接口 url 中的 {pk} 替换为数据集中的第一条记录"""
+    if not endpoint.model:
+        return endpoint.url
+    from django.apps import apps
+    model = apps.get_model(endpoint.model)
+    pk = model._base_manager.order_by('pk').values_list('pk', flat=True).first()
+    return endpoint.url.format(pk=pk)
+
+
+@pytest.mark.parametrize('endpoint', ENDPOINTS, ids=lambda e: e.name)
+def test_endpoint_budget(endpoint, bench_client, measure):
+    """接口的查询次数、耗时和响应大小不能超出预算"""
+    client = bench_client(endpoint.role)
+    response, result = measure(client, endpoint.name, _resolve_url(endpoint))
+
+    assert response.status_code == 200, f'{endpoint.name} 返回 {response.status_code}: {response.content[:200]!r}'
+    assert result['queries'] <= endpoint.queries, (
+        f"{endpoint.name} 查询次数 {result['queries']} 超出预算 {endpoint.queries}"
+    )
+    assert result['time_ms'] <= endpoint.time_ms * TIME_FACTOR, (
+        f"{endpoint.name} 耗时 {result['time_ms']}ms 超出预算 {endpoint.time_ms * TIME_FACTOR}ms"
+    )
+    assert result['bytes'] <= endpoint.bytes, (
+        f"{endpoint.name} 响应大小 {result['bytes']}B 超出预算 {endpoint.bytes}B"
+    )
+
+
+def _iter_route_names(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _iter_route_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern.name
+
+
+def test_all_list_routes_have_budget():
+    """config/urls.py 中所有路由器注册的列表接口都必须登记预算"""
+    budgeted = {endpoint.name for endpoint in ENDPOINTS}
+    missing = sorted(
+        name for name in set(_iter_route_names(get_resolver().url_patterns))
+        if name.endswith('-list') and name not in budgeted
+    )
+    assert not missing, f'以下列表接口未登记基准预算: {missing}'
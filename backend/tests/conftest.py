@@ -0,0 +1,25 @@
+"""
+测试公共夹具
+
+- api_client: 以指定用户登录（JWT）的 APIClient 工厂
+"""
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+@pytest.fixture
+def api_client():
+    """
+    返回一个函数，获取以指定用户登录的 APIClient
+
+    用法：client = api_client(user)
+    """
+
+    def _client(user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    return _client
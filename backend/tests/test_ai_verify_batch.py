@@ -0,0 +1,183 @@
+"""
+批量AI校验测试
+"""
+
+from datetime import date
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.ai_verify.batch import record_content, report_content
+from apps.ai_verify.models import VerifyBatchJob, VerifyRecord, VerifyRule
+from apps.ai_verify.rules import RULE_ENGINE_NAME
+from apps.ai_verify.tasks import run_verify_batch
+from apps.ocr.models import Report
+from apps.records.models import OriginalRecord, RecordTemplate
+from apps.samples.models import Client, Commission, SampleReceive
+from apps.users.models import User
+from apps.workflow.models import SampleWorkflow
+
+BATCHES = '/api/v1/ai-verify/batches/'
+RESULT = {'success': True, 'issues': [{'type': 'typo', 'position': 0, 'original': '水泥', 'suggestion': '水泥'}], 'summary': '发现1处问题'}
+
+
+@pytest.fixture
+def reviewer(db):
+    cache.clear()
+    return User.objects.create_user(username='batch_reviewer', password='x', role='reviewer')
+
+
+@pytest.fixture
+def api(reviewer, api_client):
+    return api_client(reviewer)
+
+
+@pytest.fixture
+def documents(reviewer):
+    """两个模板下不同状态、日期的原始记录，以及一份审核中的报告"""
+    client = Client.objects.create(name='建设单位', contact_person='张三', contact_phone='13800000000')
+    commission = Commission.objects.create(
+        client=client, project_name='项目', sample_name='水泥', sample_quantity=1,
+        test_parameters='["抗压强度"]', commission_date=date(2024, 3, 1), created_by=reviewer,
+    )
+    receive = SampleReceive.objects.create(
+        commission=commission, receiver=reviewer, receive_time=timezone.now(), actual_quantity=1,
+    )
+    workflow = SampleWorkflow.objects.create(sample_receive=receive)
+    cement = RecordTemplate.objects.create(name='水泥胶砂强度', code='T-SN', category='水泥')
+    rebar = RecordTemplate.objects.create(name='钢筋拉伸', code='T-GJ', category='钢筋')
+
+    def record(template, status, day, data):
+        return OriginalRecord.objects.create(
+            template=template, workflow=workflow, data=data, tester=reviewer,
+            test_date=date(2024, 3, day), status=status,
+        )
+
+    records = {
+        'cement': record(cement, 'submitted', 1, {'抗压强度': '70.5MPa'}),
+        'cement_ok': record(cement, 'submitted', 1, {'抗压强度': '42.5MPa'}),
+        'rebar': record(rebar, 'submitted', 1, {'屈服强度': '400MPa'}),
+        'other_day': record(cement, 'submitted', 2, {'抗压强度': '40MPa'}),
+        'draft': record(cement, 'draft', 1, {'抗压强度': '40MPa'}),
+    }
+    report = Report.objects.create(
+        workflow=workflow, title='水泥检测报告', content={'sample_name': '水泥', 'results': {'抗压强度': '42.5MPa'}},
+        conclusion='所检项目符合标准要求', status='reviewing', editor=reviewer,
+    )
+    return records, report
+
+
+@pytest.fixture
+def ai_service():
+    service = mock.Mock(model_name='qwen2:7b')
+    service.verify_document.return_value = RESULT
+    with mock.patch('apps.ai_verify.tasks.get_ai_service', return_value=service):
+        yield service
+
+
+def test_document_content(documents):
+    records, report = documents
+    content = record_content(records['cement'])
+    assert content.startswith('水泥 水泥胶砂强度 记录编号: ')
+    assert '试验日期: 2024-03-01' in content and '抗压强度: 70.5MPa' in content
+    assert report_content(report) == (
+        f'水泥检测报告 报告编号: {report.report_code} sample_name: 水泥 results: 抗压强度: 42.5MPa 检测结论: 所检项目符合标准要求'
+    )
+
+
+def test_filter_batch_verifies_matching_records(api, documents, ai_service):
+    records, _ = documents
+    VerifyRule.objects.create(
+        name='水泥抗压强度', rule_type='range',
+        rule_content={'field': '抗压强度', 'min': 20, 'max': 65, 'unit': 'MPa', 'when': '水泥'},
+    )
+    cement = RecordTemplate.objects.get(code='T-SN')
+
+    response = api.post(BATCHES, {
+        'document_type': 'original_record', 'verify_type': 'data',
+        'date_from': '2024-03-01', 'date_to': '2024-03-01', 'template': cement.pk,
+    }, format='json')
+
+    assert response.data['code'] == 202
+    job = VerifyBatchJob.objects.get(pk=response.data['data']['id'])
+    assert job.document_ids == [records['cement'].pk, records['cement_ok'].pk]
+    assert (job.status, job.total, job.processed, job.failed_count, job.issue_count) == ('completed', 2, 2, 0, 1)
+    assert job.progress == 100.0
+
+    # 两条记录的数值都被范围规则覆盖，无需调用大模型
+    ai_service.verify_document.assert_not_called()
+    verified = {record.document_id: record for record in job.records.all()}
+    assert set(verified) == {records['cement'].pk, records['cement_ok'].pk}
+    assert all(record.document_type == 'original_record' and record.operator_id == job.operator_id for record in verified.values())
+    assert verified[records['cement'].pk].model_used == RULE_ENGINE_NAME
+    assert len(verified[records['cement'].pk].issues) == 1
+
+    response = api.get(f'{BATCHES}{job.pk}/records/')
+    assert [item['document_id'] for item in response.data['data']['results']] == sorted(verified)
+
+
+def test_id_batch_uses_model_and_cache(api, documents, ai_service):
+    _, report = documents
+    payload = {'document_type': 'report', 'ids': [report.pk, 999999]}
+
+    first = VerifyBatchJob.objects.get(pk=api.post(BATCHES, payload, format='json').data['data']['id'])
+    second = VerifyBatchJob.objects.get(pk=api.post(BATCHES, payload, format='json').data['data']['id'])
+
+    # 不存在的ID在创建任务时被排除
+    assert first.document_ids == [report.pk]
+    assert ai_service.verify_document.call_count == 1
+    record = first.records.get()
+    assert (record.document_type, record.document_id, record.model_used) == ('report', report.pk, 'qwen2:7b')
+    assert record.issues[0]['source'] == 'ai'
+    assert second.records.get().cache_hit is True
+    assert second.issue_count == 1
+
+
+def test_failed_document_counted_and_job_completes(api, documents, ai_service):
+    ai_service.verify_document.side_effect = [RESULT, RuntimeError('连接被重置'), RESULT]
+
+    response = api.post(BATCHES, {'document_type': 'original_record', 'date_to': '2024-03-01'}, format='json')
+
+    job = VerifyBatchJob.objects.get(pk=response.data['data']['id'])
+    assert (job.status, job.total, job.processed, job.failed_count) == ('completed', 3, 3, 1)
+    assert job.records.filter(status='failed').count() == 1
+
+
+def test_resumed_job_skips_verified_documents(reviewer, documents, ai_service):
+    records, _ = documents
+    ids = [records['cement'].pk, records['rebar'].pk]
+    job = VerifyBatchJob.objects.create(
+        document_type='original_record', document_ids=ids, total=2, operator=reviewer,
+    )
+    VerifyRecord.objects.create(
+        document_type='original_record', document_id=ids[0], content='x', status='completed',
+        issues=[{'type': 'data'}], batch_job=job,
+    )
+
+    run_verify_batch(job.pk)
+    run_verify_batch(job.pk)  # 已完成的任务不会被重复执行
+
+    job.refresh_from_db()
+    assert ai_service.verify_document.call_count == 1
+    assert (job.status, job.processed, job.issue_count) == ('completed', 2, 2)
+    assert job.records.count() == 2
+
+
+@pytest.mark.parametrize('payload, message', [
+    ({'document_type': 'report', 'status': 'issued'}, '没有符合条件的文档'),
+    ({'document_type': 'original_record', 'date_from': '2024-03-02', 'date_to': '2024-03-01'}, '截止日期'),
+    ({'document_type': 'sample'}, 'document_type'),
+])
+def test_invalid_batch_rejected(api, documents, payload, message):
+    response = api.post(BATCHES, payload, format='json')
+    assert response.data['code'] == 400
+    assert message in str(response.data['message'])
+    assert not VerifyBatchJob.objects.exists()
+
+
+def test_batch_requires_reviewer_role(documents, api_client):
+    tester = User.objects.create_user(username='batch_tester', password='x', role='tester')
+    client = api_client(tester)
+    assert client.post(BATCHES, {'document_type': 'report'}, format='json').status_code == 403
@@ -0,0 +1,74 @@
+"""
+AI校验结果缓存测试
+"""
+
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from apps.ai_verify.models import VerifyRecord, VerifyRule
+from apps.users.models import User
+
+RESULT = {'success': True, 'issues': [{'type': 'typo', 'original': '抗压', 'suggestion': '抗压强度'}], 'summary': '发现1处问题'}
+
+
+@pytest.fixture
+def api(db, api_client):
+    cache.clear()
+    user = User.objects.create_user(username='verify_user', password='x', role='reviewer')
+    return api_client(user)
+
+
+@pytest.fixture
+def ai_service():
+    service = mock.Mock(model_name='qwen2:7b')
+    service.verify_document.return_value = RESULT
+    with mock.patch('apps.ai_verify.views.get_ai_service', return_value=service):
+        yield service
+
+
+def _verify(api, content='抗压强度 35.2MPa', **extra):
+    response = api.post('/api/v1/ai-verify/verify/', {'content': content, 'verify_type': 'typo', **extra}, format='json')
+    assert response.status_code == 200
+    return response.data['data']
+
+
+def test_identical_request_hits_cache(api, ai_service):
+    first = _verify(api)
+    second = _verify(api)
+
+    assert ai_service.verify_document.call_count == 1
+    assert first['cache_hit'] is False
+    assert second['cache_hit'] is True
+    assert second['issues'] == first['issues'] != []
+    assert second['model_used'] == 'qwen2:7b'
+    assert VerifyRecord.objects.count() == 2
+
+    _verify(api, content='抗压强度 36.0MPa')
+    _verify(api, verify_type='data')
+    _verify(api, use_cache=False)
+    assert ai_service.verify_document.call_count == 4
+
+
+def test_model_change_misses_cache(api, ai_service):
+    _verify(api)
+    ai_service.model_name = 'qwen2:72b'
+    assert _verify(api)['cache_hit'] is False
+
+
+def test_rule_change_invalidates_cache(api, ai_service):
+    _verify(api)
+    rule = VerifyRule.objects.create(name='强度范围', rule_type='range', rule_content={'min': 0})
+    assert _verify(api)['cache_hit'] is False
+    assert _verify(api)['cache_hit'] is True
+
+    rule.delete()
+    assert _verify(api)['cache_hit'] is False
+
+
+def test_failed_result_is_not_cached(api, ai_service):
+    ai_service.verify_document.return_value = {'success': False, 'message': 'timeout'}
+    _verify(api)
+    ai_service.verify_document.return_value = RESULT
+    assert _verify(api)['cache_hit'] is False
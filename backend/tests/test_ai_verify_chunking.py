@@ -0,0 +1,116 @@
+"""
+长文档分段校验测试
+"""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from apps.ai_verify.chunking import merge_issues, split_content, verify_content
+
+
+def _document(lines=60):
+    return '\n'.join(f'第{index:02d}行：砼试块抗压强度 35.{index % 10}MPa。' for index in range(lines))
+
+
+def test_split_covers_content_with_overlap():
+    content = _document()
+    chunks = split_content(content, size=200, overlap=40)
+
+    assert len(chunks) > 1
+    assert chunks[0].start == 0 and chunks[-1].end == len(content)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start < previous.end  # 相邻片段重叠
+        assert previous.end - chunk.start <= 40
+        assert content[previous.end - 1] in '\n。'  # 在断句处切分
+    for chunk in chunks:
+        assert content[chunk.start:chunk.end] == chunk.text
+        assert len(chunk.text) <= 200
+
+
+def test_short_content_single_chunk():
+    assert [(chunk.start, chunk.end) for chunk in split_content('砼', size=200, overlap=40)] == [(0, 1)]
+
+
+def test_merge_remaps_positions_and_dedupes_overlap():
+    content = _document()
+    chunks = split_content(content, size=200, overlap=40)
+    target = chunks[1].start + 2  # 位于第1、2段重叠区域的问题
+    original = content[target:target + 3]
+    assert chunks[0].start <= target < chunks[0].end
+
+    results = [
+        (chunks[0], [{'type': 'typo', 'position': target - chunks[0].start, 'original': original, 'suggestion': 'x'}]),
+        # 第2段给出的位置不准确，按原文内容定位
+        (chunks[1], [{'type': 'typo', 'position': 150, 'original': original, 'suggestion': 'x'},
+                     {'type': 'data', 'original': '不存在的文字', 'suggestion': 'y'}]),
+    ]
+    issues = merge_issues(results, content)
+
+    assert [issue['position'] for issue in issues] == [target, None]
+    assert content[issues[0]['position']:].startswith(original)
+
+
+def test_verify_content_runs_chunks_in_parallel(settings):
+    settings.AI_CONFIG = {**settings.AI_CONFIG, 'VERIFY_CHUNK_SIZE': 200, 'VERIFY_CHUNK_OVERLAP': 40, 'VERIFY_PARALLELISM': 4}
+    content = _document()
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def verify(text):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return {'success': True, 'issues': [{'type': 'typo', 'original': text[:4], 'suggestion': 'x'}], 'summary': 'ok'}
+
+    service = mock.Mock()
+    service.verify_document.side_effect = verify
+    result = verify_content(service, content)
+
+    chunk_count = len(split_content(content))
+    assert peak[0] == 4
+    assert result['success'] is True
+    assert len(result['chunk_stats']) == chunk_count
+    assert [stat['index'] for stat in result['chunk_stats']] == list(range(chunk_count))
+    assert all(stat['process_time'] >= 0.05 for stat in result['chunk_stats'])
+    assert result['summary'] == f'分{chunk_count}段校验，发现{len(result["issues"])}处问题'
+    assert [issue['position'] for issue in result['issues']] == sorted(stat['start'] for stat in result['chunk_stats'])
+
+
+def test_verify_content_reports_failed_chunks(settings):
+    settings.AI_CONFIG = {**settings.AI_CONFIG, 'VERIFY_CHUNK_SIZE': 200, 'VERIFY_CHUNK_OVERLAP': 40}
+    service = mock.Mock()
+    service.verify_document.side_effect = lambda text: (
+        {'success': False, 'message': 'timeout'} if text.startswith('第00行') else {'success': True, 'issues': []}
+    )
+
+    result = verify_content(service, _document())
+
+    assert result['success'] is False
+    assert result['message'] == '第1段校验失败: timeout'
+    assert result['chunk_stats'][0]['success'] is False
+
+
+@pytest.mark.django_db
+def test_verify_view_records_chunk_stats(settings, api_client):
+    from django.core.cache import cache
+    from apps.ai_verify.models import VerifyRecord
+    from apps.users.models import User
+
+    cache.clear()
+    settings.AI_CONFIG = {**settings.AI_CONFIG, 'VERIFY_CHUNK_SIZE': 200, 'VERIFY_CHUNK_OVERLAP': 40}
+    user = User.objects.create_user(username='chunk_user', password='x', role='reviewer')
+    client = api_client(user)
+    service = mock.Mock(model_name='qwen2:7b')
+    service.verify_document.return_value = {'success': True, 'issues': [], 'summary': '无问题'}
+
+    with mock.patch('apps.ai_verify.views.get_ai_service', return_value=service):
+        response = client.post('/api/v1/ai-verify/verify/', {'content': _document()}, format='json')
+
+    record = VerifyRecord.objects.get(pk=response.data['data']['id'])
+    assert record.status == 'completed'
+    assert len(record.chunk_stats) == service.verify_document.call_count > 1
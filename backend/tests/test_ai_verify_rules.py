@@ -0,0 +1,166 @@
+"""
+本地规则引擎测试
+"""
+
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from apps.ai_verify.models import VerifyRecord, VerifyRule
+from apps.ai_verify.rules import RULE_ENGINE_NAME, RuleCompileError, RuleEngine, compile_rule, get_rule_engine
+from apps.records.models import RecordTemplate
+from apps.users.models import User
+
+CEMENT = '水泥 试验编号: SN-001 试验日期: 2024-03-01 抗压强度: 70.5MPa 抗折强度: 6.2MPa'
+
+
+def _engine(*rules):
+    return RuleEngine([compile_rule(rule_type, content, name=rule_type) for rule_type, content in rules])
+
+
+def test_range_rule_reports_out_of_range_and_unit_mismatch():
+    engine = _engine(
+        ('range', {'field': '抗压强度', 'min': 20, 'max': 65, 'unit': 'MPa'}),
+        ('range', {'field': '抗折强度', 'min': 3, 'max': 10, 'unit': 'kN'}),
+    )
+    outcome = engine.evaluate(CEMENT, 'data')
+
+    assert outcome.decided is True
+    assert [(issue['type'], issue['original']) for issue in outcome.issues] == [
+        ('data', '抗压强度: 70.5MPa'), ('unit', '抗折强度: 6.2MPa'),
+    ]
+    assert CEMENT[outcome.issues[0]['position']:].startswith('抗压强度')
+    assert outcome.issues[0]['source'] == 'rule'
+
+
+def test_data_decided_only_when_all_values_covered():
+    engine = _engine(('range', {'field': '抗压强度', 'min': 20, 'max': 65}))
+    assert engine.evaluate('抗压强度: 35 抗折强度: 6.2', 'data').decided is False
+    # 日期不视为需要范围检查的数值
+    assert engine.evaluate('试验日期: 2024-03-01 抗压强度: 35', 'data').decided is True
+    assert engine.evaluate('抗压强度: 35', 'typo').decided is False
+
+
+def test_range_rule_requires_separator():
+    engine = _engine(('range', {'field': '抗压强度', 'min': 20, 'max': 65, 'unit': 'MPa'}))
+    # 龄期不是抗压强度的数值
+    outcome = engine.evaluate('抗压强度 28d: 35.2MPa', 'data')
+    assert (outcome.issues, outcome.decided) == ([], False)
+
+
+def test_format_decided_only_by_issues_or_decisive_rule():
+    rule = ('regex', {'pattern': r'\d{4}/\d{2}/\d{2}', 'suggestion': '日期格式应为YYYY-MM-DD'})
+    engine = _engine(rule)
+    assert engine.evaluate('试验日期 2024-03-01', 'format').decided is False
+    assert engine.evaluate('试验日期 2024/03/01', 'format').decided is True
+
+    decisive = _engine(('regex', {**rule[1], 'decisive': True}))
+    assert decisive.evaluate('试验日期 2024-03-01', 'format').decided is True
+
+
+def test_when_scopes_rule_to_matching_content():
+    engine = _engine(
+        ('range', {'field': '抗压强度', 'min': 20, 'max': 65, 'when': '水泥'}),
+        ('range', {'field': '抗压强度', 'min': 15, 'max': 60, 'when': '混凝土'}),
+    )
+    assert engine.evaluate('混凝土 抗压强度: 17', 'data').issues == []
+    assert len(engine.evaluate('水泥 抗压强度: 17', 'data').issues) == 1
+
+
+def test_required_regex_and_terminology_rules():
+    engine = _engine(
+        ('required', {'fields': ['试验编号', '龄期']}),
+        ('regex', {'pattern': r'\d{4}/\d{2}/\d{2}', 'suggestion': '日期格式应为YYYY-MM-DD'}),
+        ('terminology', {'terms': {'砼': '混凝土', '砼试块': '混凝土试块'}}),
+    )
+    outcome = engine.evaluate('砼试块 试验编号: C-01 日期 2024/03/01', 'comprehensive')
+
+    assert {(issue['type'], issue['suggestion']) for issue in outcome.issues} == {
+        ('typo', '混凝土试块'), ('format', '日期格式应为YYYY-MM-DD'), ('missing', '缺少龄期'),
+    }
+    assert outcome.decided is False
+
+
+@pytest.mark.parametrize('rule_type, content', [
+    ('range', {'min': 0}),
+    ('regex', {'pattern': '('}),
+    ('terminology', {'terms': []}),
+    ('unknown', {}),
+])
+def test_invalid_rules_rejected(rule_type, content):
+    with pytest.raises(RuleCompileError):
+        compile_rule(rule_type, content)
+
+
+@pytest.fixture
+def api(db, api_client):
+    cache.clear()
+    user = User.objects.create_user(username='rule_admin', password='x', role='admin')
+    return api_client(user)
+
+
+def test_out_of_range_data_skips_model(api):
+    VerifyRule.objects.create(name='抗压', rule_type='range', rule_content={'field': '抗压强度', 'min': 20, 'max': 65, 'unit': 'MPa'})
+    VerifyRule.objects.create(name='抗折', rule_type='range', rule_content={'field': '抗折强度', 'min': 3, 'max': 10, 'unit': 'MPa'})
+    service = mock.Mock(model_name='qwen2:7b')
+
+    with mock.patch('apps.ai_verify.views.get_ai_service', return_value=service):
+        response = api.post('/api/v1/ai-verify/verify/', {'content': CEMENT, 'verify_type': 'data'}, format='json')
+
+    service.verify_document.assert_not_called()
+    record = VerifyRecord.objects.get(pk=response.data['data']['id'])
+    assert record.model_used == RULE_ENGINE_NAME
+    assert [issue['rule'] for issue in record.issues] == ['抗压']
+
+
+def test_undecided_rules_merged_with_model_issues(api):
+    VerifyRule.objects.create(name='术语', rule_type='terminology', rule_content={'terms': {'砼': '混凝土'}})
+    service = mock.Mock(model_name='qwen2:7b')
+    service.verify_document.return_value = {
+        'success': True, 'summary': '发现1处问题',
+        'issues': [{'type': 'typo', 'position': 0, 'original': '水泥', 'suggestion': '水泥'}],
+    }
+
+    with mock.patch('apps.ai_verify.views.get_ai_service', return_value=service):
+        response = api.post('/api/v1/ai-verify/verify/', {'content': '水泥 砼试块', 'verify_type': 'typo'}, format='json')
+
+    issues = response.data['data']['issues']
+    assert [(issue['source'], issue['position']) for issue in issues] == [('ai', 0), ('rule', 3)]
+    assert response.data['data']['model_used'] == 'qwen2:7b'
+
+
+def test_engine_recompiles_after_rule_change(api):
+    assert get_rule_engine().rules == []
+    rule = VerifyRule.objects.create(name='术语', rule_type='terminology', rule_content={'terms': {'砼': '混凝土'}})
+    assert len(get_rule_engine().rules) == 1
+    rule.is_active = False
+    rule.save()
+    assert get_rule_engine().rules == []
+
+
+def test_range_rule_falls_back_to_template_unit(api):
+    VerifyRule.objects.create(name='抗折', rule_type='range', rule_content={'field': '抗折强度', 'min': 3, 'max': 10})
+    assert get_rule_engine().evaluate(CEMENT, 'data').issues == []
+
+    RecordTemplate.objects.create(name='水泥', code='T-CEMENT', category='水泥', fields=[
+        {'name': '抗折强度', 'type': 'number', 'unit': 'kN'},
+    ])
+    issues = get_rule_engine().evaluate(CEMENT, 'data').issues
+    assert [(issue['type'], issue['suggestion']) for issue in issues] == [('unit', '抗折强度单位应为kN')]
+
+    # 同名字段在启用的模板中单位不一致时不使用模板单位
+    mortar = RecordTemplate.objects.create(name='砂浆', code='T-MORTAR', category='砂浆', fields=[
+        {'name': '抗折强度', 'type': 'number', 'unit': 'MPa'},
+    ])
+    assert get_rule_engine().evaluate(CEMENT, 'data').issues == []
+    mortar.soft_delete()
+    assert len(get_rule_engine().evaluate(CEMENT, 'data').issues) == 1
+
+
+def test_rule_api_validates_content(api):
+    response = api.post('/api/v1/ai-verify/rules/', {
+        'name': '坏规则', 'rule_type': 'regex', 'rule_content': {'pattern': '('},
+    }, format='json')
+    assert response.status_code == 400
+    assert not VerifyRule.objects.exists()
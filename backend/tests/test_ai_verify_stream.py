@@ -0,0 +1,135 @@
+"""
+AI流式校验测试
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from apps.ai_verify.models import VerifyRecord
+from apps.users.models import User
+from common import http
+from common.services import AIService, AIServiceError, get_ai_service
+
+ANSWER = ['{"issues": [{"type": "typo", ', '"original": "砼", "suggestion": "混凝土"}], ', '"summary": "发现1处问题"}']
+
+
+class _ModelHandler(BaseHTTPRequestHandler):
+    """模拟 Ollama 与 OpenAI 兼容接口的流式输出（chunked）"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        assert body['stream'] is True
+        if self.path.endswith('/api/generate'):
+            lines = [json.dumps({'response': text, 'done': False}) for text in ANSWER]
+            lines.append(json.dumps({'response': '', 'done': True}))
+        else:
+            lines = [f'data: {json.dumps({"choices": [{"delta": {"content": text}}]})}\n' for text in ANSWER]
+            lines.append('data: [DONE]\n')
+        self.send_response(200)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for line in lines:
+            data = (line + '\n').encode()
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def model_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ModelHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    http.close_sessions()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('suffix', ['/ollama', ''])
+def test_stream_chat_relays_chunks(settings, model_server, suffix):
+    # URL 含 ollama 时按 Ollama 接口格式调用，否则按 OpenAI 兼容格式
+    settings.AI_CONFIG = {**settings.AI_CONFIG, 'ENABLED': True, 'API_URL': model_server + suffix}
+
+    chunks = list(get_ai_service().stream_chat('prompt'))
+
+    assert chunks == ANSWER
+    assert AIService.parse_verify_result(''.join(chunks))['summary'] == '发现1处问题'
+
+
+def test_parse_verify_result_tolerates_surrounding_text():
+    parsed = AIService.parse_verify_result('结果如下：\n```json\n{"issues": [], "summary": "无问题"}\n```')
+    assert parsed == {'issues': [], 'summary': '无问题'}
+    assert AIService.parse_verify_result('无法解析') == {'issues': [], 'summary': '无法解析'}
+
+
+@pytest.fixture
+def api(db, api_client):
+    cache.clear()
+    user = User.objects.create_user(username='stream_user', password='x', role='reviewer')
+    return api_client(user)
+
+
+def _events(response):
+    assert response['Content-Type'] == 'text/event-stream'
+    events = []
+    for message in b''.join(response.streaming_content).decode().split('\n\n'):
+        if message:
+            event, data = message.split('\n')
+            events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def _post(api):
+    return api.post(
+        '/api/v1/ai-verify/verify/stream/', {'content': '砼强度 35MPa', 'verify_type': 'typo'},
+        format='json', HTTP_ACCEPT='text/event-stream',
+    )
+
+
+def test_stream_view_persists_parsed_record(api):
+    service = mock.Mock(model_name='qwen2:7b', parse_verify_result=AIService.parse_verify_result)
+    service.stream_verify_document.return_value = (text for text in ANSWER)
+    with mock.patch('apps.ai_verify.views.get_ai_service', return_value=service):
+        events = _events(_post(api))
+        cached = _events(_post(api))
+
+    assert [name for name, _ in events] == ['record', 'token', 'token', 'token', 'done']
+    assert ''.join(data['text'] for name, data in events if name == 'token') == ''.join(ANSWER)
+    record = VerifyRecord.objects.get(pk=events[0][1]['id'])
+    assert record.status == 'completed'
+    assert record.issues[0]['suggestion'] == '混凝土'
+    assert events[-1][1]['id'] == record.pk
+
+    # 相同内容再次校验直接返回缓存结果
+    assert [name for name, _ in cached] == ['done']
+    assert cached[0][1]['cache_hit'] is True
+    assert service.stream_verify_document.call_count == 1
+
+
+def test_stream_view_reports_failure(api):
+    def broken(content):
+        yield '{"issues": '
+        raise AIServiceError('AI服务返回错误: 500')
+
+    service = mock.Mock(model_name='qwen2:7b')
+    service.stream_verify_document.side_effect = broken
+    with mock.patch('apps.ai_verify.views.get_ai_service', return_value=service):
+        events = _events(_post(api))
+
+    assert [name for name, _ in events] == ['record', 'token', 'error']
+    assert events[-1][1]['message'] == 'AI服务返回错误: 500'
+    assert VerifyRecord.objects.get().status == 'failed'
+
+
+def test_stream_view_validation_error_as_event(api):
+    response = api.post('/api/v1/ai-verify/verify/stream/', {}, format='json', HTTP_ACCEPT='text/event-stream')
+    assert response.content.startswith(b'event: error\n')
@@ -0,0 +1,144 @@
+"""
+委托单批量导入测试
+"""
+
+import json
+import time
+from datetime import date
+from io import BytesIO
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+
+from apps.reports.models import CommissionDailyStat
+from apps.samples.models import Client, Commission
+from apps.users.models import User
+
+BULK = '/api/v1/samples/commissions/bulk/'
+
+
+@pytest.fixture
+def user(db):
+    cache.clear()
+    return User.objects.create_user(username='intake_admin', password='x', role='admin')
+
+
+@pytest.fixture
+def api(user, api_client):
+    return api_client(user)
+
+
+@pytest.fixture
+def clients(db):
+    return [
+        Client.objects.create(name=name, code=code, contact_person='张三', contact_phone='13800000000')
+        for name, code in [('甲单位', 'C001'), ('乙单位', 'C002'), ('乙单位', 'C003')]
+    ]
+
+
+def _row(client, **kwargs):
+    return {
+        'client': client, 'project_name': '项目', 'sample_name': '水泥', 'sample_quantity': 3,
+        'test_parameters': '抗压强度，抗折强度', 'commission_date': '2024-03-01', **kwargs,
+    }
+
+
+def test_json_rows_with_errors(api, user, clients):
+    first, second, _ = clients
+    response = api.post(BULK, [
+        _row(first.pk),
+        _row('C002', test_parameters=['细度']),
+        _row('甲单位', sample_name=''),
+        _row('乙单位'),
+        _row('丙单位'),
+    ], format='json')
+
+    data = response.data['data']
+    assert (data['total'], data['created'], data['failed']) == (5, 2, 3)
+    assert [result['row'] for result in data['results']] == [1, 2]
+    assert {error['row']: list(error['errors']) for error in data['errors']} == {
+        3: ['sample_name'], 4: ['client'], 5: ['client'],
+    }
+    assert '请填写委托方编号' in data['errors'][1]['errors']['client'][0]
+
+    commissions = {commission.pk: commission for commission in Commission.objects.all()}
+    created = [commissions[result['id']] for result in data['results']]
+    assert [commission.code for commission in created] == [result['code'] for result in data['results']]
+    assert [commission.client for commission in created] == [first, second]
+    assert json.loads(created[0].test_parameters) == ['抗压强度', '抗折强度']
+    assert json.loads(created[1].test_parameters) == ['细度']
+    assert created[0].created_by == user and created[0].status == 'draft'
+
+    # bulk_create 不触发信号，日汇总同样更新
+    assert {(stat.client_id, stat.count) for stat in CommissionDailyStat.objects.all()} == {
+        (first.pk, 1), (second.pk, 1),
+    }
+
+
+def test_xlsx_and_csv_upload(api, clients):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['委托单位', '工程名称', '样品名称', '样品数量', '检测参数', '委托日期', '要求完成日期'])
+    sheet.append(['C001', '一号楼', '钢筋', 2, '屈服强度、抗拉强度', date(2024, 3, 1), '2024/3/15'])
+    sheet.append([])
+    sheet.append(['C002', '二号楼', '水泥', 1, '抗压强度', '不是日期', None])
+    content = BytesIO()
+    workbook.save(content)
+
+    data = api.post(BULK, {
+        'file': SimpleUploadedFile('commissions.xlsx', content.getvalue()),
+    }, format='multipart').data['data']
+    assert (data['created'], data['failed']) == (1, 1)
+    # 行号为表格中的行号，空行跳过
+    assert data['results'][0]['row'] == 2
+    assert data['errors'][0]['row'] == 4 and list(data['errors'][0]['errors']) == ['commission_date']
+    commission = Commission.objects.get(pk=data['results'][0]['id'])
+    assert (commission.commission_date, commission.required_date) == (date(2024, 3, 1), date(2024, 3, 15))
+
+    csv_content = 'client,project_name,sample_name,test_parameters,commission_date\nC001,三号楼,砂,含泥量,2024-03-02\n'
+    data = api.post(BULK, {
+        'file': SimpleUploadedFile('commissions.csv', csv_content.encode('gbk')),
+    }, format='multipart').data['data']
+    assert data['created'] == 1
+    assert Commission.objects.get(pk=data['results'][0]['id']).project_name == '三号楼'
+
+
+def test_client_user_limited_to_own_client(api_client, clients):
+    owner = User.objects.create_user(username='intake_client', password='x', role='client')
+    clients[0].user = owner
+    clients[0].save()
+
+    data = api_client(owner).post(BULK, [_row('C001'), _row('C002')], format='json').data['data']
+    assert (data['created'], data['failed']) == (1, 1)
+
+
+def test_thousand_rows_in_one_request(api, clients):
+    rows = [_row('C001', sample_name=f'样品{i}', commission_date=f'2024-03-{i % 28 + 1:02d}') for i in range(1000)]
+
+    started = time.monotonic()
+    with CaptureQueriesContext(connection) as ctx:
+        data = api.post(BULK, {'commissions': rows}, format='json').data['data']
+    elapsed = time.monotonic() - started
+
+    assert data['created'] == 1000
+    assert len({result['code'] for result in data['results']}) == 1000
+    assert Commission.objects.count() == 1000
+    # 委托方、编号各查询一次，不逐行查询；其余为分批 INSERT 和 28 个委托日期的汇总重算
+    selects = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('SELECT')]
+    assert sum('FROM "lims_client"' in sql for sql in selects) == 1
+    assert sum('"lims_commission"."code" FROM' in sql for sql in selects) == 1
+    assert len(ctx.captured_queries) < 250
+    assert elapsed < 10
+
+
+def test_invalid_requests(api, clients):
+    assert api.post(BULK, {}, format='json').data['code'] == 400
+    assert api.post(BULK, [], format='json').data['code'] == 400
+    assert api.post(BULK, [_row('C001')] * 1001, format='json').data['code'] == 400
+    response = api.post(BULK, {'file': SimpleUploadedFile('a.txt', b'x')}, format='multipart')
+    assert response.data['message'] == '仅支持 xlsx、csv 文件'
+    assert Commission.objects.count() == 0
@@ -0,0 +1,109 @@
+"""
+委托单日汇总测试
+"""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.reports.models import CommissionDailyStat
+from apps.samples.models import Client, Commission
+from apps.users.models import User
+
+DAY1, DAY2 = date(2024, 3, 1), date(2024, 3, 2)
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='stats_user', password='x', role='admin')
+
+
+@pytest.fixture
+def clients(db):
+    return [
+        Client.objects.create(name=name, contact_person='张三', contact_phone='13800000000')
+        for name in ['甲单位', '乙单位']
+    ]
+
+
+def _commission(client, user, commission_date=DAY1, status='submitted', price='100'):
+    return Commission.objects.create(
+        client=client, project_name='项目', sample_name='水泥', sample_quantity=1,
+        test_parameters='["抗压强度"]', commission_date=commission_date, status=status,
+        total_price=Decimal(price), created_by=user,
+    )
+
+
+def _stats():
+    return {
+        (stat.date, stat.status, stat.client_id): (stat.count, stat.revenue)
+        for stat in CommissionDailyStat.objects.all()
+    }
+
+
+def test_stats_follow_commission_changes(user, clients):
+    first, second = clients
+    a = _commission(first, user)
+    _commission(first, user, price='50')
+    b = _commission(second, user, commission_date=DAY2)
+    assert _stats() == {
+        (DAY1, 'submitted', first.pk): (2, Decimal('150')),
+        (DAY2, 'submitted', second.pk): (1, Decimal('100')),
+    }
+
+    a.status = 'received'
+    a.save(update_fields=['status', 'updated_at'])
+    b.commission_date = DAY1
+    b.client = first
+    b.save()
+    assert _stats() == {
+        (DAY1, 'submitted', first.pk): (2, Decimal('150')),
+        (DAY1, 'received', first.pk): (1, Decimal('100')),
+    }
+
+    a.soft_delete()
+    b.delete()
+    assert _stats() == {(DAY1, 'submitted', first.pk): (1, Decimal('50'))}
+
+
+def test_rebuild_command_matches_incremental(user, clients):
+    for i in range(6):
+        _commission(clients[i % 2], user, commission_date=[DAY1, DAY2][i % 3 == 0], status=['submitted', 'testing'][i % 2])
+    expected = _stats()
+
+    # 模拟不触发信号的批量写入
+    Commission.objects.filter(commission_date=DAY2).update(status='completed')
+    CommissionDailyStat.objects.filter(date=DAY1).update(count=99)
+    call_command('rebuild_commission_stats', '--start', '2024-03-01', '--end', '2024-03-01', stdout=StringIO())
+
+    rebuilt = _stats()
+    assert {key: value for key, value in rebuilt.items() if key[0] == DAY1} == {
+        key: value for key, value in expected.items() if key[0] == DAY1
+    }
+    # 范围外的汇总不受影响
+    assert all(key[1] != 'completed' for key in rebuilt)
+
+    call_command('rebuild_commission_stats', stdout=StringIO())
+    assert {key[1] for key in _stats() if key[0] == DAY2} == {'completed'}
+
+
+def test_statistics_view_reads_rollups(user, clients, api_client):
+    first, second = clients
+    _commission(first, user, price='100')
+    _commission(first, user, status='testing', price='80')
+    _commission(second, user, commission_date=DAY2, price='20')
+    _commission(second, user, commission_date=date(2024, 4, 1))
+
+    api = api_client(user)
+    data = api.get('/api/v1/reports/statistics/', {
+        'start_date': '2024-03-01', 'end_date': '2024-03-31', 'dimension': 'client',
+    }).data['data']
+
+    assert data['commission_count'] == 3
+    assert data['total_revenue'] == Decimal('200')
+    assert data['commission_by_status'] == [{'status': 'submitted', 'count': 2}, {'status': 'testing', 'count': 1}]
+    assert data['commission_by_date'] == [{'date': DAY1, 'count': 2}, {'date': DAY2, 'count': 1}]
+    assert data['by_client'] == [{'client__name': '乙单位', 'count': 1}, {'client__name': '甲单位', 'count': 2}]
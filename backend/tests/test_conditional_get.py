@@ -0,0 +1,129 @@
+"""
+条件请求（ETag / Last-Modified）测试
+"""
+
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.samples.models import Client, Commission, SampleReceive
+from apps.users.models import User
+from apps.workflow.models import SampleWorkflow, WorkflowLog, WorkflowStatus
+from apps.workflow.serializers import SampleWorkflowDetailSerializer
+from common.mixins import version_paths
+
+COMMISSIONS = '/api/v1/samples/commissions/'
+
+
+@pytest.fixture
+def user(db):
+    cache.clear()
+    return User.objects.create_user(username='etag_admin', password='x', role='admin')
+
+
+@pytest.fixture
+def api(user, api_client):
+    return api_client(user)
+
+
+@pytest.fixture
+def workflow(user):
+    client = Client.objects.create(name='建设单位', contact_person='张三', contact_phone='13800000000')
+    commission = Commission.objects.create(
+        client=client, project_name='项目', sample_name='水泥', sample_quantity=1,
+        test_parameters='["抗压强度"]', commission_date=date(2024, 3, 1), created_by=user,
+    )
+    receive = SampleReceive.objects.create(
+        commission=commission, receiver=user, receive_time=timezone.now(), actual_quantity=1,
+    )
+    return SampleWorkflow.objects.create(sample_receive=receive)
+
+
+def _revalidate(api, url, response, **params):
+    with CaptureQueriesContext(connection) as ctx:
+        again = api.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+    return again, len(ctx.captured_queries)
+
+
+def test_version_paths_follow_serializer():
+    single, many = version_paths(SampleWorkflowDetailSerializer, SampleWorkflow)
+
+    # assigned_to 为用户表，没有 updated_at
+    assert single == ('sample_receive', 'sample_receive__commission', 'sample_receive__commission__client')
+    assert many == ('logs',)
+
+
+def test_detail_not_modified(api, workflow):
+    url = f'/api/v1/workflow/{workflow.pk}/'
+    response = api.get(url)
+    assert response['ETag'].startswith('W/"')
+    assert 'Last-Modified' in response and 'no-cache' in response['Cache-Control']
+
+    again, queries = _revalidate(api, url, response)
+    # JWT 认证 + 聚合查询，不加载对象、不序列化
+    assert (again.status_code, queries, again.content) == (304, 2, b'')
+    assert again['ETag'] == response['ETag']
+
+    # 预取的日志、select_related 路径上的委托方变化都会改变 ETag
+    WorkflowLog.objects.create(
+        workflow=workflow, from_status=WorkflowStatus.RECEIVED, to_status=WorkflowStatus.ASSIGNED,
+        operator=workflow.sample_receive.receiver, action='assign',
+    )
+    changed, _ = _revalidate(api, url, response)
+    assert changed.status_code == 200 and changed['ETag'] != response['ETag']
+    assert len(changed.data['logs']) == 1
+
+    client = workflow.sample_receive.commission.client
+    client.name = '监理单位'
+    client.save()
+    renamed, _ = _revalidate(api, url, changed)
+    assert renamed.status_code == 200 and renamed.data['client_name'] == '监理单位'
+    assert _revalidate(api, url, renamed)[0].status_code == 304
+
+
+def test_list_not_modified(api, workflow):
+    response = api.get(COMMISSIONS, {'page_size': 10})
+    assert response.data['data']['total'] == 1
+
+    again, queries = _revalidate(api, COMMISSIONS, response, page_size=10)
+    assert (again.status_code, queries) == (304, 2)
+    # ETag 与请求地址有关
+    assert _revalidate(api, COMMISSIONS, response, page_size=20)[0].status_code == 200
+
+    commission = Commission.objects.get()
+    older = Commission.objects.create(
+        client=commission.client, project_name='项目', sample_name='钢筋', sample_quantity=1,
+        test_parameters='[]', commission_date=date(2024, 2, 1),
+    )
+    commission.status = 'submitted'
+    commission.save()
+    changed, _ = _revalidate(api, COMMISSIONS, response, page_size=10)
+    assert changed.status_code == 200 and changed.data['data']['total'] == 2
+    assert changed.data['data']['results'][0]['status'] == 'submitted'
+
+    # 删除较早的记录后最新更新时间不变，条数变化同样改变 ETag
+    older.delete()
+    deleted, _ = _revalidate(api, COMMISSIONS, changed, page_size=10)
+    assert deleted.status_code == 200 and deleted.data['data']['total'] == 1
+
+
+def test_unconditional_list_aggregates_base_table_only(api, workflow):
+    with CaptureQueriesContext(connection) as ctx:
+        response = api.get('/api/v1/workflow/')
+    assert response.status_code == 200 and 'ETag' in response
+
+    # JWT 认证、校验值聚合、当前页：聚合的条数即分页总数，分页器不再 COUNT
+    queries = [query['sql'] for query in ctx.captured_queries]
+    assert len(queries) == 3
+    [aggregate] = [sql for sql in queries if 'COUNT(' in sql]
+    assert 'MAX(' in aggregate
+    # 校验值聚合不关联其他表、不去重计数
+    assert 'JOIN' not in aggregate and 'DISTINCT' not in aggregate
+    assert response.data['data']['total'] == 1
+
+    response = api.get(COMMISSIONS, {'pagination': 'cursor'})
+    assert 'ETag' not in response
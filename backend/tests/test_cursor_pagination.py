@@ -0,0 +1,102 @@
+"""
+游标分页测试
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.samples.models import Client, Commission
+from apps.users.models import User
+
+COMMISSIONS = '/api/v1/samples/commissions/'
+
+
+@pytest.fixture
+def user(db):
+    cache.clear()
+    return User.objects.create_user(username='cursor_admin', password='x', role='admin')
+
+
+@pytest.fixture
+def api(user, api_client):
+    return api_client(user)
+
+
+@pytest.fixture
+def commissions(user):
+    """25 个委托单：委托日期、创建时间都有重复，按 id 区分"""
+    client = Client.objects.create(name='建设单位', contact_person='张三', contact_phone='13800000000')
+    created = timezone.now()
+    for i in range(25):
+        commission = Commission.objects.create(
+            client=client, project_name='项目', sample_name=f'样品{i}', sample_quantity=1,
+            test_parameters='["抗压强度"]', commission_date=date(2024, 3, 1) + timedelta(days=i % 3),
+            created_by=user,
+        )
+        Commission.objects.filter(pk=commission.pk).update(created_at=created - timedelta(minutes=i % 4))
+    return list(
+        Commission.objects.order_by('-commission_date', '-created_at', '-id').values_list('id', flat=True)
+    )
+
+
+def test_cursor_pages_follow_ordering(api, commissions):
+    ids, previous = [], []
+    params = {'pagination': 'cursor', 'page_size': 10}
+    while True:
+        data = api.get(COMMISSIONS, params).data['data']
+        ids += [row['id'] for row in data['results']]
+        previous.append(data['previous'])
+        if not data['next']:
+            break
+        params = {'cursor': data['next'], 'page_size': 10}
+
+    assert ids == commissions
+    assert previous[0] is None and all(previous[1:])
+    assert data['total'] is None
+
+    # 从最后一页向前翻
+    back = api.get(COMMISSIONS, {'cursor': data['previous'], 'page_size': 10}).data['data']
+    assert [row['id'] for row in back['results']] == commissions[10:20]
+    assert back['next'] and back['previous']
+    first = api.get(COMMISSIONS, {'cursor': back['previous'], 'page_size': 10}).data['data']
+    assert [row['id'] for row in first['results']] == commissions[:10]
+    assert first['previous'] is None
+
+
+def test_deep_page_costs_same_as_first(api, commissions):
+    with CaptureQueriesContext(connection) as first:
+        data = api.get(COMMISSIONS, {'pagination': 'cursor', 'page_size': 5}).data['data']
+    for _ in range(3):
+        data = api.get(COMMISSIONS, {'cursor': data['next'], 'page_size': 5}).data['data']
+    with CaptureQueriesContext(connection) as deep:
+        api.get(COMMISSIONS, {'cursor': data['next'], 'page_size': 5})
+
+    assert len(deep.captured_queries) == len(first.captured_queries)
+    assert not any('COUNT(' in query['sql'] or 'OFFSET' in query['sql'] for query in deep.captured_queries)
+
+
+def test_cached_total_and_filters(api, commissions):
+    data = api.get(COMMISSIONS, {'pagination': 'cursor', 'total': 'cached'}).data['data']
+    assert data['total'] == 25
+
+    Commission.objects.filter(pk=commissions[0]).update(is_deleted=True)
+    with CaptureQueriesContext(connection) as ctx:
+        data = api.get(COMMISSIONS, {'cursor': data['next'], 'total': 'cached'}).data['data']
+    # 缓存期内不重复计数
+    assert data['total'] == 25
+    assert not any('COUNT(' in query['sql'] for query in ctx.captured_queries)
+    # sqlite 无估算值，使用缓存的精确值
+    assert api.get(COMMISSIONS, {'pagination': 'cursor', 'total': 'estimate'}).data['data']['total'] == 25
+
+
+def test_page_number_mode_unchanged_and_invalid_cursor(api, commissions):
+    data = api.get(COMMISSIONS, {'page': 2, 'page_size': 10}).data['data']
+    assert (data['total'], data['page'], len(data['results'])) == (25, 2, 10)
+
+    response = api.get(COMMISSIONS, {'cursor': 'not-a-cursor'})
+    assert (response.status_code, response.data['message']) == (404, '无效的分页游标')
@@ -0,0 +1,88 @@
+"""
+首页仪表盘测试
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.equipment.models import CalibrationRecord, Equipment
+from apps.samples.models import Client, Commission
+from apps.users.models import User
+
+DASHBOARD = '/api/v1/reports/dashboard/'
+
+
+@pytest.fixture
+def user(db):
+    cache.clear()
+    return User.objects.create_user(username='dashboard_user', password='x', role='tester')
+
+
+@pytest.fixture
+def api(user, api_client):
+    return api_client(user)
+
+
+def _commission(client, user, status, commission_date):
+    return Commission.objects.create(
+        client=client, project_name='项目', sample_name='水泥', sample_quantity=1,
+        test_parameters='["抗压强度"]', commission_date=commission_date, status=status, created_by=user,
+    )
+
+
+def test_dashboard_counts(api, user, api_client):
+    today = timezone.localdate()
+    client = Client.objects.create(name='建设单位', contact_person='张三', contact_phone='13800000000')
+    _commission(client, user, 'submitted', today)
+    _commission(client, user, 'completed', today)
+    _commission(client, user, 'testing', today.replace(day=1) - timedelta(days=1))
+
+    def equipment(code, status, *valid_until):
+        item = Equipment.objects.create(name='压力试验机', code=code, status=status)
+        for day in valid_until:
+            CalibrationRecord.objects.create(
+                equipment=item, calibration_date=day - timedelta(days=365), valid_until=day, calibration_org='计量院',
+            )
+        return item
+
+    equipment('EQ-1', 'normal', today - timedelta(days=1))                              # 已到期
+    equipment('EQ-2', 'normal', today - timedelta(days=400), today + timedelta(days=30))  # 已重新校准
+    equipment('EQ-3', 'normal')                                                           # 无校准记录
+    equipment('EQ-4', 'repair', today - timedelta(days=1))                               # 维修中
+
+    data = api.get(DASHBOARD).data['data']
+
+    assert data == {
+        'total_commissions': 3,
+        'month_commissions': 2,
+        'pending_commissions': 2,
+        'in_progress_workflows': 0,
+        'total_equipments': 4,
+        'need_calibration': 1,
+    }
+    # 与设备接口的待校准列表一致
+    admin = User.objects.create_user(username='dashboard_admin', password='x', role='admin')
+    assert [item['code'] for item in api_client(admin).get('/api/v1/equipment/need_calibration/').data['data']] == ['EQ-1']
+
+
+def test_dashboard_cached_and_invalidated_on_change(api, user):
+    assert api.get(DASHBOARD).data['data']['total_equipments'] == 0
+
+    with CaptureQueriesContext(connection) as ctx:
+        api.get(DASHBOARD)
+    # 只剩 JWT 认证查询
+    assert len(ctx.captured_queries) == 1
+
+    equipment = Equipment.objects.create(name='压力试验机', code='EQ-1')
+    assert api.get(DASHBOARD).data['data']['total_equipments'] == 1
+
+    CalibrationRecord.objects.create(
+        equipment=equipment, calibration_date=timezone.localdate() - timedelta(days=400),
+        valid_until=timezone.localdate() - timedelta(days=35), calibration_org='计量院',
+    )
+    assert api.get(DASHBOARD).data['data']['need_calibration'] == 1
@@ -0,0 +1,109 @@
+"""
+数据导出测试
+"""
+
+import csv
+from datetime import date
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from openpyxl import load_workbook
+
+from apps.reports.exports import DATASETS, export_queryset, iter_rows
+from apps.samples.models import Client, Commission
+from apps.users.models import User
+
+EXPORT = '/api/v1/reports/export/'
+
+
+@pytest.fixture
+def user(db):
+    cache.clear()
+    return User.objects.create_user(username='export_user', password='x', role='reviewer')
+
+
+@pytest.fixture
+def api(user, api_client):
+    return api_client(user)
+
+
+@pytest.fixture
+def commissions(user):
+    client = Client.objects.create(name='建设单位', contact_person='张三', contact_phone='13800000000')
+    return [
+        Commission.objects.create(
+            client=client, project_name='项目', sample_name=f'水泥{i}', sample_quantity=1,
+            test_parameters='["抗压强度"]', commission_date=date(2024, 3, i + 1),
+            status=['submitted', 'completed'][i % 2], total_price=Decimal('100.50'), created_by=user,
+        )
+        for i in range(5)
+    ]
+
+
+def test_rows_are_read_in_chunks(commissions):
+    columns = DATASETS['commissions']['columns']
+
+    with CaptureQueriesContext(connection) as ctx:
+        rows = list(iter_rows(export_queryset('commissions', {}), columns, chunk_size=2))
+
+    assert [row[3] for row in rows] == [f'水泥{i}' for i in range(5)]
+    assert rows[0][8] == '已提交'
+    assert len(ctx.captured_queries) == 3
+    assert all('LIMIT 2' in query['sql'] for query in ctx.captured_queries)
+
+
+def test_csv_export_streams(api, commissions):
+    response = api.post(EXPORT, {
+        'dataset': 'commissions', 'export_type': 'csv', 'start_date': '2024-03-02', 'status': 'completed',
+    }, format='json')
+
+    assert response.streaming
+    assert response['Content-Disposition'].startswith('attachment; filename="commissions_')
+    content = b''.join(response.streaming_content).decode('utf-8')
+    assert content.startswith('\ufeff委托编号,委托单位')
+    rows = list(csv.reader(StringIO(content.lstrip('\ufeff'))))
+    assert [row[3] for row in rows[1:]] == ['水泥1', '水泥3']
+    assert rows[1][8:10] == ['已完成', '100.50']
+
+
+def test_excel_export(api, commissions):
+    response = api.post(EXPORT, {'dataset': 'commissions'}, format='json')
+
+    workbook = load_workbook(BytesIO(b''.join(response.streaming_content)))
+    sheet = workbook['委托单']
+    rows = list(sheet.values)
+    assert rows[0][:2] == ('委托编号', '委托单位')
+    assert len(rows) == 6
+    assert rows[1][6].date() == date(2024, 3, 1)
+
+
+def test_export_validation_and_permission(api, user):
+    assert api.post(EXPORT, {'dataset': 'unknown'}, format='json').data['code'] == 400
+    assert api.post(EXPORT, {
+        'dataset': 'commissions', 'start_date': '2024-03-02', 'end_date': '2024-03-01',
+    }, format='json').data['code'] == 400
+
+    # 空数据集只有表头
+    response = api.post(EXPORT, {'dataset': 'usage_logs', 'export_type': 'csv'}, format='json')
+    assert b''.join(response.streaming_content).decode('utf-8').count('\n') == 1
+
+    user.role = 'client'
+    user.save()
+    assert api.post(EXPORT, {'dataset': 'commissions'}, format='json').status_code == 403
+
+
+def test_excel_row_limit(api, commissions, settings):
+    settings.REPORTS_CONFIG = {**settings.REPORTS_CONFIG, 'EXPORT_XLSX_MAX_ROWS': 3}
+
+    response = api.post(EXPORT, {'dataset': 'commissions'}, format='json')
+    assert response.data['message'] == 'Excel 导出最多3行，请缩小筛选范围或改用 CSV 导出'
+
+    # 筛选后不超过上限可以导出，CSV 不限行数
+    response = api.post(EXPORT, {'dataset': 'commissions', 'status': 'completed'}, format='json')
+    assert len(list(load_workbook(BytesIO(b''.join(response.streaming_content)))['委托单'].values)) == 3
+    response = api.post(EXPORT, {'dataset': 'commissions', 'export_type': 'csv'}, format='json')
+    assert b''.join(response.streaming_content).decode('utf-8').count('\n') == 6
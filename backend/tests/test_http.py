@@ -0,0 +1,118 @@
+"""
+外部HTTP服务连接池测试
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from prometheus_client import REGISTRY
+from urllib3.exceptions import ConnectTimeoutError
+
+from common import http
+from common.services import get_ai_service, get_ocr_service
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # 保持连接
+
+    def do_POST(self):
+        self._respond(json.loads(self.rfile.read(int(self.headers['Content-Length'])))['image'])
+
+    def do_GET(self):
+        self._respond(self.path)
+
+    def _respond(self, text):
+        server = self.server
+        server.requests += 1
+        if server.drop_next:
+            # 模拟连接被对端重置：不返回响应直接断开
+            server.drop_next -= 1
+            self.close_connection = True
+            return
+        payload = json.dumps({'success': True, 'text': text}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ocr_server(settings):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.requests = 0
+    server.drop_next = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.OCR_CONFIG = {**settings.OCR_CONFIG, 'ENABLED': True, 'API_URL': f'http://127.0.0.1:{server.server_port}'}
+    settings.HTTP_CLIENT_CONFIG = {'RETRIES': 2, 'BACKOFF': 0, 'TIMEOUTS': {'ocr.recognize': (1, 2)}}
+    yield server
+    http.close_sessions()
+    server.shutdown()
+    server.server_close()
+
+
+def _connections(reused):
+    return REGISTRY.get_sample_value(
+        'lims_http_connections_total', {'service': 'ocr', 'reused': reused}
+    ) or 0
+
+
+def test_connections_are_reused(ocr_server, db):
+    opened, reused = _connections('false'), _connections('true')
+
+    for index in range(3):
+        assert get_ocr_service().recognize(f'scan-{index}.png')['text'] == f'scan-{index}.png'
+
+    assert _connections('false') - opened == 1
+    assert _connections('true') - reused == 2
+
+
+def test_post_not_resent_after_reset(ocr_server):
+    ocr_server.drop_next = 1
+
+    result = get_ocr_service().recognize('scan.png')
+
+    # 请求已发出，POST 不重复提交
+    assert result['success'] is False
+    assert ocr_server.requests == 1
+
+
+def test_idempotent_reset_is_retried(ocr_server):
+    ocr_server.drop_next = 1
+
+    response = http.get_session('ocr').get(f'http://127.0.0.1:{ocr_server.server_port}/status', timeout=(1, 2))
+
+    assert response.json() == {'success': True, 'text': '/status'}
+    assert ocr_server.requests == 2
+
+
+def test_connect_error_retried_for_post(settings):
+    settings.HTTP_CLIENT_CONFIG = {'RETRIES': 2}
+    retry = http.get_session('ai').get_adapter('http://ai.internal').max_retries
+
+    assert retry.connect == 2
+    assert not retry._is_method_retryable('POST')
+    assert retry.increment('POST', '/chat', error=ConnectTimeoutError()).connect == 1
+
+
+def test_services_are_shared_until_settings_change(settings):
+    ocr, ai = get_ocr_service(), get_ai_service()
+    assert get_ocr_service() is ocr
+    assert get_ai_service() is ai
+    assert http.get_session('ocr') is http.get_session('ocr')
+
+    settings.OCR_CONFIG = {**settings.OCR_CONFIG, 'API_URL': 'http://ocr.internal'}
+    assert get_ocr_service() is not ocr
+    assert get_ocr_service().api_url == 'http://ocr.internal'
+
+
+def test_timeout_per_endpoint(settings):
+    settings.HTTP_CLIENT_CONFIG = {'TIMEOUTS': {'ai.chat': [5, 90]}}
+    assert http.get_timeout('ai.chat') == (5, 90)
+    assert http.get_timeout('ocr.recognize') == http.DEFAULT_TIMEOUT
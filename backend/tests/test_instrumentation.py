@@ -0,0 +1,91 @@
+"""
+请求耗时采集中间件测试
+"""
+
+import pytest
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from common.instrumentation import profile_request, track_service_call
+
+ENABLED = {'ENABLED': True, 'SAMPLE_RATE': 1.0, 'SLOW_REQUEST_MS': 1000, 'VERBOSE_HEADER': 'X-Lims-Timing'}
+
+
+def _user(role):
+    return User.objects.create_user(username=f'timing_{role}', password='x', role=role)
+
+
+def _metrics(header):
+    return {item.split(';')[0].strip(): item for item in header.split(',')}
+
+
+@pytest.mark.django_db
+@override_settings(INSTRUMENTATION=ENABLED)
+def test_server_timing_header(api_client):
+    response = api_client(_user('admin')).get('/api/v1/users/')
+    assert response.status_code == 200
+    metrics = _metrics(response['Server-Timing'])
+    assert {'db', 'serialize', 'render', 'total'} <= set(metrics)
+    assert 'queries' in metrics['db']
+
+
+@pytest.mark.django_db
+@override_settings(INSTRUMENTATION={**ENABLED, 'SAMPLE_RATE': 0.0})
+def test_unsampled_request_has_no_header(api_client):
+    response = api_client(_user('admin')).get('/api/v1/users/')
+    assert 'Server-Timing' not in response
+
+
+@pytest.mark.django_db
+@override_settings(INSTRUMENTATION={**ENABLED, 'SAMPLE_RATE': 0.0})
+def test_verbose_details_admin_only(caplog, api_client):
+    @track_service_call('ocr.recognize')
+    def fake_call():
+        return {'success': False}
+
+    from apps.users import views
+    original = views.UserViewSet.me
+
+    def me(self, request):
+        fake_call()
+        return original(self, request)
+
+    views.UserViewSet.me = me
+    try:
+        admin_response = api_client(_user('admin')).get('/api/v1/users/me/', HTTP_X_LIMS_TIMING='1')
+        tester_response = api_client(_user('tester')).get('/api/v1/users/me/', HTTP_X_LIMS_TIMING='1')
+    finally:
+        views.UserViewSet.me = original
+
+    admin_metrics = _metrics(admin_response['Server-Timing'])
+    assert 'ocr-recognize' in admin_metrics
+    assert '1 errors' in admin_metrics['ocr-recognize']
+    # 非管理员携带明细头不能绕过抽样
+    assert 'Server-Timing' not in tester_response
+
+
+@pytest.mark.django_db
+@override_settings(INSTRUMENTATION={**ENABLED, 'SAMPLE_RATE': 0.0})
+def test_verbose_header_ignored_for_anonymous():
+    response = APIClient().get('/api/v1/users/me/', HTTP_X_LIMS_TIMING='1')
+    assert response.status_code == 401
+    assert 'Server-Timing' not in response
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Bearer invalid')
+    assert 'Server-Timing' not in client.get('/api/v1/users/me/', HTTP_X_LIMS_TIMING='1')
+
+
+@pytest.mark.django_db
+def test_nested_serializer_time_counted_once():
+    from apps.users.models import Department
+    from apps.users.serializers import DepartmentSerializer
+
+    root = Department.objects.create(name='根', code='ROOT')
+    Department.objects.create(name='子', code='CHILD', parent=root)
+    with profile_request() as profile:
+        DepartmentSerializer(root).data
+    assert profile.db_count > 0
+    assert profile._serialize_depth == 0
+    assert 0 < profile.serialize_time <= profile.db_time + 1
@@ -0,0 +1,81 @@
+"""
+Prometheus 指标测试
+"""
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from common.instrumentation import track_service_call
+
+# 测试客户端的 REMOTE_ADDR 为 127.0.0.1
+SCRAPER = {'ENABLED': True, 'TOKEN': '', 'ALLOWED_IPS': ['127.0.0.1']}
+
+
+def _scrape(**extra):
+    response = APIClient().get('/metrics', **extra)
+    return response, response.content.decode()
+
+
+@pytest.mark.django_db
+@override_settings(METRICS_CONFIG=SCRAPER)
+def test_request_metrics_labelled_by_view_and_action(api_client):
+    admin = User.objects.create_user(username='metrics_admin', password='x', role='admin')
+    api_client(admin).get('/api/v1/workflow/status_options/')
+    response, body = _scrape()
+    assert response.status_code == 200
+    assert 'lims_http_request_duration_seconds_count{action="status_options",method="GET",' \
+           'status="200",view="SampleWorkflowViewSet"}' in body
+    assert 'lims_db_queries_per_request_count{action="status_options",view="SampleWorkflowViewSet"}' in body
+
+
+@pytest.mark.django_db
+@override_settings(METRICS_CONFIG=SCRAPER)
+def test_business_gauges_and_cache_counters():
+    cache.set('metrics-test', 1)
+    cache.get('metrics-test')
+    cache.get('metrics-test-missing')
+    _, body = _scrape()
+    assert 'lims_workflows{status="received"} 0.0' in body
+    assert 'lims_scan_files{status="pending"} 0.0' in body
+    assert 'lims_cache_requests_total{cache="locmem",result="hit"}' in body
+    assert 'lims_cache_requests_total{cache="locmem",result="miss"}' in body
+
+
+@pytest.mark.django_db
+@override_settings(METRICS_CONFIG=SCRAPER)
+def test_service_call_errors_counted():
+    @track_service_call('ai.chat')
+    def failing_chat():
+        return {'success': False, 'message': 'down'}
+
+    failing_chat()
+    _, body = _scrape()
+    assert 'lims_service_call_errors_total{service="ai"}' in body
+    assert 'lims_service_call_duration_seconds_count{service="ai"}' in body
+
+
+@pytest.mark.django_db
+@override_settings(METRICS_CONFIG={'ENABLED': True, 'TOKEN': 'secret'})
+def test_metrics_token():
+    assert _scrape()[0].status_code == 401
+    assert _scrape(HTTP_AUTHORIZATION='Bearer secret')[0].status_code == 200
+
+
+@pytest.mark.django_db
+@override_settings(METRICS_CONFIG={'ENABLED': True, 'TOKEN': ''})
+def test_metrics_closed_by_default():
+    response, body = _scrape()
+    assert response.status_code == 403
+    assert 'lims_workflows' not in body
+
+    with override_settings(METRICS_CONFIG={'ENABLED': True, 'ALLOWED_IPS': ['10.0.0.0/8']}):
+        assert _scrape()[0].status_code == 403
+        assert _scrape(REMOTE_ADDR='10.1.2.3')[0].status_code == 200
+        # 不信任 X-Forwarded-For
+        assert _scrape(HTTP_X_FORWARDED_FOR='10.1.2.3')[0].status_code == 403
+
+    with override_settings(METRICS_CONFIG={'ENABLED': True, 'PUBLIC': True}):
+        assert _scrape()[0].status_code == 200
@@ -0,0 +1,95 @@
+"""
+PDF分页识别测试
+"""
+
+from unittest import mock
+
+import pytest
+
+from apps.ocr.models import ScanFile, OCRResult
+
+fitz = pytest.importorskip('fitz')
+
+
+def _pdf_bytes(page_count):
+    document = fitz.open()
+    for number in range(1, page_count + 1):
+        page = document.new_page(width=200, height=200)
+        page.insert_text((20, 50), f'page {number}')
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+@pytest.fixture
+def pdf_scan(db):
+    return ScanFile.objects.create(
+        file_name='records.pdf', file_path='scans/2024/01/records.pdf',
+        file_type='application/pdf', file_size=1,
+    )
+
+
+@pytest.fixture
+def minio():
+    service = mock.Mock()
+    service.download_file.return_value = _pdf_bytes(3)
+    service.upload_bytes.side_effect = lambda data, path, content_type: path
+    with mock.patch('apps.ocr.pages.get_minio_service', return_value=service):
+        yield service
+
+
+def _ocr(fail_pages=()):
+    def recognize(image_path):
+        page = int(image_path.rsplit('/', 1)[1].split('.')[0])
+        if page in fail_pages:
+            return {'success': False, 'message': 'timeout'}
+        return {'success': True, 'text': f'第{page}页文本', 'confidence': 0.9,
+                'details': [{'text': f'line {page}', 'confidence': 0.9}]}
+    service = mock.Mock()
+    service.recognize.side_effect = recognize
+    return service
+
+
+def _run(service, scan_file):
+    from apps.ocr.tasks import enqueue_recognition
+    with mock.patch('apps.ocr.pages.get_ocr_service', return_value=service):
+        enqueue_recognition(scan_file)
+    scan_file.refresh_from_db()
+
+
+def test_pdf_pages_recognized_and_merged(pdf_scan, minio):
+    service = _ocr()
+    _run(service, pdf_scan)
+
+    assert pdf_scan.status == 'completed'
+    assert service.recognize.call_count == 3
+    result = OCRResult.objects.get(scan_file=pdf_scan)
+    assert [item['page'] for item in result.details] == [1, 2, 3]
+    assert result.raw_text.index('[第1页]') < result.raw_text.index('[第3页]')
+    assert [page['page'] for page in result.structured_data['pages']] == [1, 2, 3]
+    assert minio.upload_bytes.call_args_list[0].args[1] == 'scans/2024/01/records_pages/1.png'
+
+
+def test_failed_page_retried_alone(pdf_scan, minio, settings, client, api_client):
+    settings.OCR_CONFIG = {**settings.OCR_CONFIG, 'MAX_RETRIES': 0}
+    _run(_ocr(fail_pages={2}), pdf_scan)
+
+    assert pdf_scan.status == 'failed'
+    statuses = dict(pdf_scan.pages.values_list('page_number', 'status'))
+    assert statuses == {1: 'completed', 2: 'failed', 3: 'completed'}
+    assert not OCRResult.objects.filter(scan_file=pdf_scan).exists()
+
+    from apps.users.models import User
+    user = User.objects.create_user(username='pdf_tester', password='x', role='tester')
+    api = api_client(user)
+
+    service = _ocr()
+    with mock.patch('apps.ocr.pages.get_ocr_service', return_value=service):
+        response = api.post(f'/api/v1/ocr/scans/{pdf_scan.pk}/retry_pages/', {}, format='json')
+    assert response.status_code == 200
+
+    pdf_scan.refresh_from_db()
+    assert pdf_scan.status == 'completed'
+    assert [call.args[0] for call in service.recognize.call_args_list] == ['scans/2024/01/records_pages/2.png']
+    assert minio.download_file.call_count == 1
+    assert len(OCRResult.objects.get(scan_file=pdf_scan).structured_data['pages']) == 3
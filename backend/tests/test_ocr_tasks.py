@@ -0,0 +1,116 @@
+"""
+OCR异步识别任务测试
+
+测试环境使用 eager 模式，任务在请求内同步执行
+"""
+
+import hashlib
+from unittest import mock
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from apps.ocr.models import ScanFile, OCRResult
+from apps.users.models import User
+from common.cache import CacheSemaphore
+
+SUCCESS = {'success': True, 'text': '抗压强度 35.2MPa', 'confidence': 0.95, 'details': []}
+FAILURE = {'success': False, 'message': 'connection reset'}
+
+
+@pytest.fixture
+def tester_client(db, api_client):
+    user = User.objects.create_user(username='ocr_tester', password='x', role='tester')
+    return api_client(user)
+
+
+def _scan(**kwargs):
+    defaults = {'file_name': 'a.png', 'file_path': 'scans/a.png', 'file_type': 'image/png', 'file_size': 1}
+    return ScanFile.objects.create(**{**defaults, **kwargs})
+
+
+def _mock_ocr(*results):
+    service = mock.Mock()
+    service.recognize.side_effect = list(results)
+    return mock.patch('apps.ocr.tasks.get_ocr_service', return_value=service), service
+
+
+def test_recognize_completes_through_task(tester_client):
+    scan = _scan()
+    patcher, service = _mock_ocr(SUCCESS)
+    with patcher:
+        response = tester_client.post(f'/api/v1/ocr/scans/{scan.pk}/recognize/')
+    assert response.status_code == 200
+    assert response.data['code'] == 202
+    scan.refresh_from_db()
+    assert scan.status == 'completed'
+    assert OCRResult.objects.get(scan_file=scan).raw_text == SUCCESS['text']
+
+
+def test_recognize_retries_then_fails(tester_client, settings):
+    settings.OCR_CONFIG = {**settings.OCR_CONFIG, 'MAX_RETRIES': 2, 'RETRY_BACKOFF': 0}
+    scan = _scan()
+    patcher, service = _mock_ocr(FAILURE, FAILURE, FAILURE)
+    with patcher:
+        tester_client.post(f'/api/v1/ocr/scans/{scan.pk}/recognize/')
+    scan.refresh_from_db()
+    assert scan.status == 'failed'
+    assert service.recognize.call_count == 3
+
+
+def test_recognize_retry_recovers(tester_client, settings):
+    settings.OCR_CONFIG = {**settings.OCR_CONFIG, 'MAX_RETRIES': 2, 'RETRY_BACKOFF': 0}
+    scan = _scan(status='failed')
+    patcher, service = _mock_ocr(FAILURE, SUCCESS)
+    with patcher:
+        tester_client.post(f'/api/v1/ocr/scans/{scan.pk}/recognize/')
+    scan.refresh_from_db()
+    assert scan.status == 'completed'
+
+
+def test_batch_recognize_skips_processing(tester_client):
+    pending, processing = _scan(), _scan(status='processing')
+    patcher, _ = _mock_ocr(SUCCESS)
+    with patcher:
+        response = tester_client.post(
+            '/api/v1/ocr/scans/batch_recognize/',
+            {'ids': [pending.pk, processing.pk, 999999]}, format='json',
+        )
+    data = response.data['data']
+    assert data == {'queued': [pending.pk], 'skipped': [processing.pk], 'not_found': [999999]}
+
+
+def test_cache_semaphore_limits_slots(db):
+    semaphore = CacheSemaphore('test', limit=2, timeout=10)
+    first, second = semaphore.acquire(), semaphore.acquire()
+    assert {first, second} == {0, 1}
+    assert semaphore.acquire() is None
+    semaphore.release(first)
+    assert semaphore.acquire() == first
+
+
+def test_upload_records_content_hash(tester_client):
+    upload = SimpleUploadedFile('sheet.png', b'same-bytes', content_type='image/png')
+    with mock.patch('apps.ocr.views.get_minio_service'):
+        response = tester_client.post('/api/v1/ocr/scans/upload/', {'file': upload})
+    assert response.data['data']['content_hash'] == hashlib.md5(b'same-bytes').hexdigest()
+
+
+def test_recognize_reuses_result_for_same_content(tester_client):
+    first = _scan(content_hash='abc')
+    second = _scan(content_hash='abc')
+    third = _scan(content_hash='abc')
+    patcher, service = _mock_ocr(SUCCESS)
+    with patcher:
+        tester_client.post(f'/api/v1/ocr/scans/{first.pk}/recognize/')
+        response = tester_client.post(f'/api/v1/ocr/scans/{second.pk}/recognize/')
+        tester_client.post(f'/api/v1/ocr/scans/{third.pk}/recognize/')
+    assert service.recognize.call_count == 1
+    assert response.data['message'] == '复用相同文件的识别结果'
+    original = OCRResult.objects.get(scan_file=first)
+    for scan in (second, third):
+        scan.refresh_from_db()
+        assert scan.status == 'completed'
+        result = OCRResult.objects.get(scan_file=scan)
+        assert result.reused_from_id == original.pk
+        assert result.raw_text == original.raw_text
@@ -0,0 +1,103 @@
+"""
+参考数据读穿缓存测试
+"""
+
+import threading
+import time
+from datetime import date
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.capability.models import ParameterPrice, TestParameter, TestStandard
+from apps.users.models import Department, User
+from common.cache import invalidate_namespace, namespace_version, read_through
+
+
+@pytest.fixture
+def api(db, api_client):
+    cache.clear()
+    user = User.objects.create_user(username='refcache_admin', password='x', role='admin')
+    return api_client(user)
+
+
+def _queries(api, url, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        data = api.get(url, params).data['data']
+    return data, len(ctx.captured_queries)
+
+
+def test_read_through_versions_keys():
+    cache.clear()
+    builder = mock.Mock(side_effect=[1, 2])
+
+    assert read_through('test.ns', 'key', builder) == 1
+    assert read_through('test.ns', 'key', builder) == 1
+    invalidate_namespace('test.ns')
+    assert read_through('test.ns', 'key', builder) == 2
+    assert builder.call_count == 2
+
+    # 版本号被淘汰后重新初始化，不会回到旧版本
+    version = namespace_version('test.ns')
+    cache.delete('refcache:test.ns:version')
+    time.sleep(0.01)
+    assert namespace_version('test.ns') > version
+
+
+def test_concurrent_rebuild_waits_for_lock_holder():
+    cache.clear()
+    cache_key = f"refcache:test.ns:{namespace_version('test.ns')}:key"
+    cache.add(f'{cache_key}:lock', 1, 10)
+    threading.Timer(0.1, lambda: cache.set(cache_key, 'rebuilt')).start()
+    builder = mock.Mock(return_value='own')
+
+    assert read_through('test.ns', 'key', builder) == 'rebuilt'
+    builder.assert_not_called()
+
+
+def test_categories_cached_until_standard_changes(api):
+    TestStandard.objects.create(code='GB 175', name='通用硅酸盐水泥', category='水泥')
+    url = '/api/v1/capability/standards/categories/'
+
+    assert _queries(api, url) == (['水泥'], 2)
+    # 命中缓存：只剩 JWT 认证查询
+    assert _queries(api, url) == (['水泥'], 1)
+
+    TestStandard.objects.create(code='GB 1499.2', name='热轧带肋钢筋', category='钢筋')
+    data, _ = _queries(api, url)
+    assert sorted(data) == ['水泥', '钢筋']
+
+
+def test_parameter_list_invalidated_by_price(api):
+    standard = TestStandard.objects.create(code='GB 175', name='通用硅酸盐水泥', category='水泥')
+    parameter = TestParameter.objects.create(name='抗压强度', code='KYQD', standard=standard)
+    url = '/api/v1/capability/parameters/'
+
+    data, _ = _queries(api, url, {'standard': standard.pk})
+    assert data['results'][0]['current_price'] is None
+    assert _queries(api, url, {'standard': standard.pk})[1] == 1
+    # 不同查询参数分别缓存
+    assert _queries(api, url, {'standard': standard.pk, 'is_active': 'false'})[0]['results'] == []
+
+    ParameterPrice.objects.create(parameter=parameter, price=120, effective_date=date(2024, 1, 1))
+    data, _ = _queries(api, url, {'standard': standard.pk})
+    assert data['results'][0]['current_price'] == 120.0
+
+    standard.name = '通用硅酸盐水泥（2023版）'
+    standard.save()
+    data, _ = _queries(api, url, {'standard': standard.pk})
+    assert data['results'][0]['standard_name'] == '通用硅酸盐水泥（2023版）'
+
+
+def test_department_tree_invalidated(api):
+    root = Department.objects.create(name='检测中心', code='JC')
+    url = '/api/v1/users/departments/tree/'
+
+    assert [item['name'] for item in _queries(api, url)[0]] == ['检测中心']
+    assert _queries(api, url)[1] == 1
+
+    Department.objects.create(name='力学室', code='LX', parent=root)
+    assert [child['name'] for child in _queries(api, url)[0][0]['children']] == ['力学室']
@@ -0,0 +1,64 @@
+"""
+序列化器关联查询推导测试
+"""
+
+from rest_framework import serializers
+
+from apps.floorplan.models import FloorPlan, FloorPlanNode
+from apps.floorplan.serializers import FloorPlanSerializer
+from apps.ocr.models import Report
+from apps.ocr.serializers import ReportListSerializer
+from apps.workflow.models import SampleWorkflow
+from apps.workflow.serializers import SampleWorkflowDetailSerializer
+from common.mixins import optimize_queryset, serializer_relations
+
+
+def _prefetches(serializer_class, model):
+    _, prefetch = serializer_relations(serializer_class, model)
+    return {
+        item.prefetch_through: (
+            tuple(item.queryset.query.select_related or {}),
+            item.queryset.model,
+        )
+        for item in prefetch
+    }
+
+
+def test_source_paths_use_select_related():
+    select, prefetch = serializer_relations(ReportListSerializer, Report)
+
+    # workflow 只输出主键，不单独关联；sample_name 的路径已包含 workflow
+    assert select == ('editor', 'workflow__sample_receive__commission')
+    assert prefetch == ()
+
+
+def test_many_relations_are_prefetched():
+    select, _ = serializer_relations(SampleWorkflowDetailSerializer, SampleWorkflow)
+
+    assert select == ('assigned_to', 'sample_receive__commission__client')
+    assert set(_prefetches(SampleWorkflowDetailSerializer, SampleWorkflow)) == {'logs'}
+    # 嵌套序列化器中的跨表字段在预取查询中 select_related
+    assert _prefetches(FloorPlanSerializer, FloorPlan) == {'nodes': (('laboratory',), FloorPlanNode)}
+
+
+def test_nested_serializer_and_method_fields():
+    class EditorSerializer(serializers.Serializer):
+        username = serializers.CharField()
+
+    class ReportSerializer(serializers.ModelSerializer):
+        editor = EditorSerializer(read_only=True)
+        summary = serializers.SerializerMethodField()
+        client_name = serializers.CharField(source='workflow.sample_receive.commission.client.name')
+        status_text = serializers.CharField(source='get_status_display')
+
+        class Meta:
+            model = Report
+            fields = ['id', 'editor', 'summary', 'client_name', 'status_text', 'reviewer']
+
+    select, prefetch = serializer_relations(ReportSerializer, Report)
+
+    assert select == ('editor', 'workflow__sample_receive__commission__client')
+    assert prefetch == ()
+    # 非序列化器类不处理
+    queryset = Report.objects.all()
+    assert optimize_queryset(queryset, None) is queryset
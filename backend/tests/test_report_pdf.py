@@ -0,0 +1,148 @@
+"""
+检测报告PDF生成测试
+"""
+
+from datetime import date
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.ocr.models import Report
+from apps.ocr.pdf import inputs_hash, pdf_object_name, render_pdf, report_inputs
+from apps.records.models import OriginalRecord, RecordTemplate
+from apps.samples.models import Client, Commission, SampleReceive
+from apps.users.models import User
+from apps.workflow.models import SampleWorkflow
+
+REPORTS = '/api/v1/ocr/reports/'
+
+
+@pytest.fixture
+def approver(db):
+    cache.clear()
+    return User.objects.create_user(username='pdf_approver', password='x', role='approver')
+
+
+@pytest.fixture
+def api(approver, api_client):
+    return api_client(approver)
+
+
+@pytest.fixture
+def reports(approver):
+    """同一流转下的两份报告，流转包含一条原始记录"""
+    client = Client.objects.create(name='建设单位', contact_person='张三', contact_phone='13800000000')
+    commission = Commission.objects.create(
+        client=client, project_name='综合楼工程', sample_name='水泥', sample_quantity=1,
+        test_parameters='["抗压强度"]', commission_date=date(2024, 3, 1), created_by=approver,
+    )
+    receive = SampleReceive.objects.create(
+        commission=commission, receiver=approver, receive_time=timezone.now(), actual_quantity=1,
+    )
+    workflow = SampleWorkflow.objects.create(sample_receive=receive)
+    template = RecordTemplate.objects.create(
+        name='水泥胶砂强度', code='T-SN', category='水泥',
+        fields=[{'name': '抗压强度', 'unit': 'MPa'}],
+    )
+    OriginalRecord.objects.create(
+        template=template, workflow=workflow, data={'抗压强度': '42.5'}, tester=approver,
+        test_date=date(2024, 3, 2), status='approved',
+    )
+    return [
+        Report.objects.create(
+            workflow=workflow, title=f'水泥检测报告{i}',
+            content={'检测依据': 'GB/T 17671', 'results': [{'项目': '抗压强度', '结果': '42.5'}]},
+            conclusion='所检项目符合标准要求', status='approved', editor=approver,
+        )
+        for i in range(2)
+    ]
+
+
+@pytest.fixture
+def minio():
+    service = mock.Mock()
+    service.upload_bytes.side_effect = lambda data, name, content_type=None: f'http://minio/{name}'
+    with mock.patch('apps.ocr.tasks.get_minio_service', return_value=service):
+        yield service
+
+
+def test_render_is_deterministic(reports):
+    inputs = report_inputs(reports[0])
+
+    assert inputs['sample']['client'] == '建设单位'
+    assert inputs['records'][0]['units'] == {'抗压强度': 'MPa'}
+    data = render_pdf(inputs)
+    assert data.startswith(b'%PDF')
+    assert render_pdf(inputs) == data
+
+
+def test_generate_pdf_skips_unchanged_report(api, reports, minio):
+    report = reports[0]
+
+    response = api.post(f'{REPORTS}{report.pk}/generate_pdf/')
+    assert response.data['code'] == 202
+
+    report.refresh_from_db()
+    digest = inputs_hash(report_inputs(report))
+    assert (report.pdf_status, report.pdf_hash, report.file_path) == ('completed', digest, pdf_object_name(digest))
+    assert minio.upload_bytes.call_args.args[1] == pdf_object_name(digest)
+    assert minio.upload_bytes.call_args.kwargs['content_type'] == 'application/pdf'
+
+    # 内容未变化：不重新生成
+    response = api.post(f'{REPORTS}{report.pk}/generate_pdf/')
+    assert response.data['code'] == 200
+    assert minio.upload_bytes.call_count == 1
+
+    api.post(f'{REPORTS}{report.pk}/generate_pdf/', {'force': True}, format='json')
+    assert minio.upload_bytes.call_count == 2
+
+    # 结论变化：生成新的PDF
+    report.conclusion = '抗压强度不符合标准要求'
+    report.save()
+    api.post(f'{REPORTS}{report.pk}/generate_pdf/')
+    report.refresh_from_db()
+    assert minio.upload_bytes.call_count == 3
+    assert report.pdf_hash != digest
+
+
+def test_approve_renders_issued_report(api, reports, minio):
+    report = reports[0]
+
+    api.post(f'{REPORTS}{report.pk}/approve/')
+
+    report.refresh_from_db()
+    assert report.status == 'issued'
+    assert report.pdf_status == 'completed'
+    assert report_inputs(report)['report']['approver'] == 'pdf_approver'
+
+
+def test_upload_failure_marks_failed(api, reports, minio):
+    minio.upload_bytes.side_effect = None
+    minio.upload_bytes.return_value = None
+    report = reports[0]
+
+    api.post(f'{REPORTS}{report.pk}/generate_pdf/')
+
+    report.refresh_from_db()
+    assert (report.pdf_status, report.pdf_hash, report.file_path) == ('failed', '', None)
+
+
+def test_batch_generate_pdf(api, reports, minio):
+    first, second = reports
+    api.post(f'{REPORTS}{first.pk}/generate_pdf/')
+    Report.objects.filter(pk=second.pk).update(pdf_status='rendering')
+
+    response = api.post(f'{REPORTS}batch_generate_pdf/', {'ids': [first.pk, second.pk, 999999]}, format='json')
+
+    assert response.data['code'] == 202
+    data = response.data['data']
+    assert (data['queued'], sorted(data['skipped']), data['not_found']) == ([], [first.pk, second.pk], [999999])
+
+    Report.objects.filter(pk=second.pk).update(pdf_status='failed')
+    response = api.post(f'{REPORTS}batch_generate_pdf/', {'ids': [first.pk, second.pk]}, format='json')
+    assert response.data['data']['queued'] == [second.pk]
+    assert Report.objects.get(pk=second.pk).pdf_status == 'completed'
+
+    assert api.post(f'{REPORTS}batch_generate_pdf/', {'ids': list(range(201))}, format='json').data['code'] == 400
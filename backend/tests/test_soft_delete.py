@@ -0,0 +1,71 @@
+"""
+软删除管理器测试
+"""
+
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+
+from apps.capability.models import TestStandard
+from apps.samples.models import Client, Commission
+from apps.users.models import User
+
+COMMISSIONS = '/api/v1/samples/commissions/'
+
+
+@pytest.fixture
+def user(db):
+    cache.clear()
+    return User.objects.create_user(username='soft_delete_admin', password='x', role='admin')
+
+
+@pytest.fixture
+def api(user, api_client):
+    return api_client(user)
+
+
+@pytest.fixture
+def commissions(user):
+    client = Client.objects.create(name='建设单位', contact_person='张三', contact_phone='13800000000')
+    return [
+        Commission.objects.create(
+            client=client, project_name='项目', sample_name=f'样品{i}', sample_quantity=1,
+            test_parameters='[]', commission_date=date(2024, 3, 1), created_by=user,
+        )
+        for i in range(3)
+    ]
+
+
+def test_managers(commissions):
+    deleted = commissions[0]
+    deleted.soft_delete()
+
+    assert Commission.objects.count() == 2
+    assert Commission.all_objects.count() == 3
+    assert Commission._default_manager is Commission.all_objects
+    # 反向关联使用默认管理器，仍包含已删除记录
+    assert deleted.client.commissions.count() == 3
+
+    deleted.restore()
+    assert Commission.objects.count() == 3
+
+
+def test_deleted_rows_hidden_from_api(api, commissions):
+    deleted = commissions[0]
+    deleted.soft_delete()
+
+    data = api.get(COMMISSIONS).data['data']
+    assert data['total'] == 2
+    assert deleted.pk not in [row['id'] for row in data['results']]
+    assert api.get(f'{COMMISSIONS}{deleted.pk}/').status_code == 404
+
+
+def test_unique_validation_sees_deleted_rows(api):
+    TestStandard.objects.create(code='GB 175', name='通用硅酸盐水泥', category='水泥').soft_delete()
+
+    response = api.post('/api/v1/capability/standards/', {
+        'code': 'GB 175', 'name': '通用硅酸盐水泥', 'category': '水泥',
+    }, format='json')
+    assert (response.status_code, response.data['code']) == (400, 400)
+    assert '已存在' in response.data['message']
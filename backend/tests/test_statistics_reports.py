@@ -0,0 +1,84 @@
+"""
+周期统计报表生成测试
+"""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from apps.reports.models import StatisticsReport
+from apps.reports.snapshots import closed_periods, generate_period_reports
+from apps.reports.tasks import generate_statistics_reports
+from apps.samples.models import Client, Commission
+from apps.users.models import User
+
+
+@pytest.mark.parametrize('report_type, today, expected', [
+    ('daily', date(2024, 3, 1), [(date(2024, 2, 28), date(2024, 2, 28)), (date(2024, 2, 29), date(2024, 2, 29))]),
+    ('weekly', date(2024, 3, 4), [(date(2024, 2, 19), date(2024, 2, 25)), (date(2024, 2, 26), date(2024, 3, 3))]),
+    ('weekly', date(2024, 3, 6), [(date(2024, 2, 19), date(2024, 2, 25)), (date(2024, 2, 26), date(2024, 3, 3))]),
+    ('monthly', date(2024, 1, 15), [(date(2023, 11, 1), date(2023, 11, 30)), (date(2023, 12, 1), date(2023, 12, 31))]),
+    ('quarterly', date(2024, 4, 1), [(date(2023, 10, 1), date(2023, 12, 31)), (date(2024, 1, 1), date(2024, 3, 31))]),
+    ('yearly', date(2024, 6, 30), [(date(2022, 1, 1), date(2022, 12, 31)), (date(2023, 1, 1), date(2023, 12, 31))]),
+])
+def test_closed_periods(report_type, today, expected):
+    assert closed_periods(report_type, today, count=2) == expected
+
+
+@pytest.fixture
+def commissions(db):
+    user = User.objects.create_user(username='snapshot_admin', password='x', role='admin')
+    client = Client.objects.create(name='甲单位', contact_person='张三', contact_phone='13800000000')
+    for day, price in [(date(2024, 2, 28), '100'), (date(2024, 2, 29), '50.5'), (date(2024, 3, 1), '10')]:
+        Commission.objects.create(
+            client=client, project_name='项目', sample_name='水泥', sample_quantity=1,
+            test_parameters='["抗压强度"]', commission_date=day, status='submitted',
+            total_price=Decimal(price), created_by=user,
+        )
+    return user
+
+
+def test_generate_reports_once_per_period(commissions):
+    reports = generate_period_reports(date(2024, 3, 1), ['daily', 'monthly'])
+
+    assert [(report.name, report.start_date, report.end_date) for report in reports] == [
+        ('2024-02-29 日报', date(2024, 2, 29), date(2024, 2, 29)),
+        ('2024年2月 月报', date(2024, 2, 1), date(2024, 2, 29)),
+    ]
+    monthly = reports[1].statistics_data
+    assert monthly['commission_count'] == 2
+    assert monthly['total_revenue'] == 150.5
+    assert monthly['commission_by_date'] == [{'date': '2024-02-28', 'count': 1}, {'date': '2024-02-29', 'count': 1}]
+    assert monthly['by_client'] == [{'client__name': '甲单位', 'count': 2}]
+
+    assert generate_period_reports(date(2024, 3, 1), ['daily', 'monthly']) == []
+    assert len(generate_period_reports(date(2024, 3, 1), ['daily'], force=True)) == 1
+    assert StatisticsReport.objects.count() == 2
+
+
+def test_snapshot_matches_statistics_api(commissions, api_client):
+    report, = generate_period_reports(date(2024, 3, 1), ['monthly'])
+
+    api = api_client(commissions)
+    live = api.get('/api/v1/reports/statistics/', {
+        'start_date': '2024-02-01', 'end_date': '2024-02-29', 'dimension': 'client',
+    })
+    saved = api.get(f'/api/v1/reports/saved/{report.pk}/')
+
+    assert saved.json()['statistics_data'] == live.json()['data']
+
+
+def test_scheduled_task_and_command(commissions):
+    with mock.patch('apps.reports.tasks.timezone.localdate', return_value=date(2024, 3, 1)):
+        generate_statistics_reports()
+    assert set(StatisticsReport.objects.values_list('report_type', flat=True)) == {
+        'daily', 'weekly', 'monthly', 'quarterly', 'yearly',
+    }
+
+    out = StringIO()
+    call_command('generate_statistics_reports', '--date', '2024-03-01', '--types', 'daily', '--periods', '3', stdout=out)
+    assert '共生成 2 份统计报表' in out.getvalue()
@@ -0,0 +1,151 @@
+"""
+样品流转批量操作测试
+"""
+
+from datetime import date
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.reports.models import CommissionDailyStat
+from apps.samples.models import Client, Commission, SampleReceive
+from apps.users.models import User
+from apps.workflow.models import SampleWorkflow, WorkflowLog, WorkflowStatus
+
+BULK_TRANSITION = '/api/v1/workflow/bulk_transition/'
+BULK_ASSIGN = '/api/v1/workflow/bulk_assign/'
+
+
+@pytest.fixture
+def receiver(db):
+    cache.clear()
+    return User.objects.create_user(username='bulk_receiver', password='x', role='receiver')
+
+
+@pytest.fixture
+def tester(db):
+    return User.objects.create_user(username='bulk_tester', password='x', role='tester')
+
+
+@pytest.fixture
+def commission(receiver):
+    client = Client.objects.create(name='建设单位', contact_person='张三', contact_phone='13800000000')
+    return Commission.objects.create(
+        client=client, project_name='项目', sample_name='水泥', sample_quantity=1,
+        test_parameters='["抗压强度"]', commission_date=date(2024, 3, 1), status='testing', created_by=receiver,
+    )
+
+
+def _workflows(commission, count, **kwargs):
+    return [
+        SampleWorkflow.objects.create(
+            sample_receive=SampleReceive.objects.create(
+                commission=commission, receiver=commission.created_by, receive_time=timezone.now(), actual_quantity=1,
+            ),
+            **kwargs,
+        )
+        for _ in range(count)
+    ]
+
+
+def test_dispatch_two_hundred_samples(api_client, receiver, tester, commission):
+    workflows = _workflows(commission, 200)
+    ids = [workflow.pk for workflow in workflows]
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client(receiver).post(BULK_ASSIGN, {
+            'ids': ids, 'assigned_to': tester.pk, 'priority': 2, 'expected_complete_date': '2024-03-15',
+        }, format='json')
+    data = response.data['data']
+
+    assert (data['total'], data['updated'], data['failed']) == (200, 200, 0)
+    assert [result['id'] for result in data['results']] == ids
+    assert {result['current_status'] for result in data['results']} == {WorkflowStatus.ASSIGNED}
+    # 查询数与记录数无关：认证、负责人、加锁查询、两条 UPDATE、日志 INSERT
+    assert len(ctx.captured_queries) < 15
+
+    assert set(SampleWorkflow.objects.values_list(
+        'current_status', 'assigned_to', 'priority', 'expected_complete_date',
+    )) == {(WorkflowStatus.ASSIGNED, tester.pk, 2, date(2024, 3, 15))}
+    logs = WorkflowLog.objects.filter(workflow__in=ids)
+    assert logs.count() == 200
+    assert set(logs.values_list('action', 'operator', 'remarks')) == {('assign', receiver.pk, '分配给 bulk_tester')}
+
+    # 再次分配不改变状态、不记录日志，未填写的优先级保持不变
+    data = api_client(receiver).post(BULK_ASSIGN, {'ids': ids[:2], 'assigned_to': receiver.pk}, format='json').data['data']
+    assert data['updated'] == 2 and WorkflowLog.objects.count() == 200
+    assert set(SampleWorkflow.objects.filter(pk__in=ids[:2]).values_list('assigned_to', 'priority')) == {(receiver.pk, 2)}
+
+
+def test_transition_validated_per_workflow(api_client, receiver, commission):
+    received, assigned, approving = (
+        _workflows(commission, 1)[0],
+        _workflows(commission, 1, current_status=WorkflowStatus.ASSIGNED)[0],
+        _workflows(commission, 1, current_status=WorkflowStatus.UNDER_APPROVAL)[0],
+    )
+    approving.soft_delete()
+
+    data = api_client(receiver).post(BULK_TRANSITION, {
+        'ids': [received.pk, assigned.pk, assigned.pk, approving.pk, 0], 'to_status': WorkflowStatus.TESTING,
+    }, format='json').data['data']
+
+    # 重复的ID只处理一次
+    assert (data['total'], data['updated'], data['failed']) == (4, 1, 3)
+    assert data['results'] == [{'id': assigned.pk, 'current_status': WorkflowStatus.TESTING}]
+    assert data['errors'] == [
+        {'id': received.pk, 'message': '当前状态 "已收样" 不能流转到 "试验中"'},
+        {'id': approving.pk, 'message': '流转记录不存在'},
+        {'id': 0, 'message': '流转记录不存在'},
+    ]
+    assert WorkflowLog.objects.get().workflow == assigned
+    received.refresh_from_db()
+    assert received.current_status == WorkflowStatus.RECEIVED
+
+
+def test_bulk_complete_syncs_commission(api_client, receiver, commission):
+    ids = [workflow.pk for workflow in _workflows(commission, 3, current_status=WorkflowStatus.UNDER_APPROVAL)]
+
+    # sqlite 不生成 FOR UPDATE，检查加锁的模型：流转记录、委托单依次加锁，之后是日汇总重算
+    with mock.patch.object(QuerySet, 'select_for_update', autospec=True, side_effect=QuerySet.select_for_update) as lock:
+        data = api_client(receiver).post(BULK_TRANSITION, {
+            'ids': ids, 'to_status': WorkflowStatus.COMPLETED, 'remarks': '批准',
+        }, format='json').data['data']
+    assert [call.args[0].model for call in lock.call_args_list][:2] == [SampleWorkflow, Commission]
+
+    assert data['updated'] == 3
+    assert set(SampleWorkflow.objects.values_list('actual_complete_date', flat=True)) == {timezone.now().date()}
+    assert set(WorkflowLog.objects.values_list('action', 'remarks')) == {('approve', '批准')}
+    commission.refresh_from_db()
+    assert commission.status == 'completed'
+    # queryset.update 不触发信号，日汇总同样更新
+    assert list(CommissionDailyStat.objects.values_list('status', 'count')) == [('completed', 1)]
+
+
+def test_tester_limited_to_own_workflows(api_client, tester, commission):
+    own = _workflows(commission, 1, current_status=WorkflowStatus.ASSIGNED, assigned_to=tester)[0]
+    other = _workflows(commission, 1, current_status=WorkflowStatus.ASSIGNED)[0]
+
+    api = api_client(tester)
+    data = api.post(BULK_TRANSITION, {
+        'ids': [own.pk, other.pk], 'to_status': WorkflowStatus.TESTING,
+    }, format='json').data['data']
+    assert [result['id'] for result in data['results']] == [own.pk]
+    assert data['errors'] == [{'id': other.pk, 'message': '流转记录不存在'}]
+
+    response = api.post(BULK_ASSIGN, {'ids': [own.pk], 'assigned_to': tester.pk}, format='json')
+    assert response.status_code == 403
+
+
+def test_invalid_requests(api_client, receiver, commission):
+    api = api_client(receiver)
+    assert api.post(BULK_TRANSITION, {'ids': [], 'to_status': 'testing'}, format='json').data['code'] == 400
+    assert api.post(BULK_TRANSITION, {'ids': [1]}, format='json').data['code'] == 400
+    response = api.post(BULK_TRANSITION, {'ids': list(range(1, 502)), 'to_status': 'testing'}, format='json')
+    assert response.data['message'] == '单次最多处理500条流转记录'
+    response = api.post(BULK_ASSIGN, {'ids': [1], 'assigned_to': 0}, format='json')
+    assert response.data['message'] == '指定的用户不存在'